@@ -56,6 +56,16 @@ class KrakenAPIClient:
             logger.warning("Kraken API credentials not found in environment variables")
             logger.warning("Set KRAKEN_API_KEY and KRAKEN_API_SECRET for live trading")
 
+        # Signing context: decode the secret once and reuse a keyed HMAC template
+        self._hmac_template = None
+        if self.api_secret:
+            try:
+                self._hmac_template = hmac.new(
+                    base64.b64decode(self.api_secret), digestmod=hashlib.sha512
+                )
+            except Exception as e:
+                logger.warning(f"Invalid KRAKEN_API_SECRET format: {e}")
+
         # Request timeout and retry settings
         self.timeout = 30
         self.max_retries = 3
@@ -113,20 +123,20 @@ class KrakenAPIClient:
             ssl_context.verify_mode = ssl.CERT_NONE
             return ssl_context
 
-    def _generate_signature(self, url_path: str, data: Dict[str, Any], nonce: str) -> str:
-        """Generate authentication signature for Kraken API"""
-        if not self.api_secret:
+    def _generate_signature(self, url_path: str, data: Union[Dict[str, Any], str], nonce: str) -> str:
+        """Generate authentication signature for Kraken API
+
+        ``data`` may be the already URL-encoded body so the caller can send
+        exactly the string that was signed.
+        """
+        if self._hmac_template is None:
             raise KrakenAPIError("API secret not configured")
 
-        postdata = urllib.parse.urlencode(data)
-        encoded = (nonce + postdata).encode()
-        message = url_path.encode() + hashlib.sha256(encoded).digest()
+        postdata = data if isinstance(data, str) else urllib.parse.urlencode(data)
 
-        signature = hmac.new(
-            base64.b64decode(self.api_secret),
-            message,
-            hashlib.sha512
-        )
+        signature = self._hmac_template.copy()
+        signature.update(url_path.encode())
+        signature.update(hashlib.sha256((nonce + postdata).encode()).digest())
 
         return base64.b64encode(signature.digest()).decode()
 
@@ -184,8 +194,9 @@ class KrakenAPIClient:
         nonce = str(int(time.time() * 1000))
         data["nonce"] = nonce
 
-        # Generate signature
-        signature = self._generate_signature(url_path, data, nonce)
+        # Encode once; the signed body is the body that gets sent
+        postdata = urllib.parse.urlencode(data)
+        signature = self._generate_signature(url_path, postdata, nonce)
 
         headers = {
             "API-Key": self.api_key,
@@ -200,7 +211,7 @@ class KrakenAPIClient:
             timeout=aiohttp.ClientTimeout(total=self.timeout)
         ) as session:
             try:
-                async with session.post(url, data=data, headers=headers) as response:
+                async with session.post(url, data=postdata, headers=headers) as response:
                     result = await response.json()
 
                     if response.status != 200:
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark archived fill event replay.
+
+Writes a month of synthetic fills for four pairs to a temporary
+FillEventArchive, then times a full-month vectorized replay with the
+default AdvancedFillEventSystem windows and thresholds.
+
+Usage:
+    python benchmarks/bench_event_archive.py [fills_per_pair_per_day]
+"""
+
+import logging
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import structlog
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from trading_systems.exchanges.kraken.advanced_fill_events import AdvancedFillEventSystem
+from trading_systems.exchanges.kraken.fill_event_archive import FillEventArchive
+
+PAIRS = ["XBT/USD", "ETH/USD", "SOL/USD", "ADA/USD"]
+DAYS = 30
+
+
+def make_events(per_day):
+    """Generate time-ordered lightweight events for every pair."""
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    step = 86400 / per_day
+    for i in range(DAYS * per_day):
+        timestamp = start + timedelta(seconds=i * step)
+        for pair in PAIRS:
+            yield SimpleNamespace(
+                event_id=str(uuid.UUID(int=rng.getrandbits(128))),
+                timestamp=timestamp + timedelta(seconds=rng.uniform(0, step / 2)),
+                fill=SimpleNamespace(
+                    pair=pair,
+                    price=100 + rng.gauss(0, 0.5),
+                    volume=rng.uniform(0.9, 1.1),
+                    side="buy" if rng.random() < 0.5 else "sell",
+                    price_improvement=rng.uniform(0.01, 0.03) if rng.random() < 0.2 else None
+                )
+            )
+
+
+def main():
+    per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 8_640  # one fill per 10s per pair
+    total = per_day * DAYS * len(PAIRS)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    with tempfile.TemporaryDirectory() as root:
+        archive = FillEventArchive(root, segment_size=50_000)
+
+        start = time.perf_counter()
+        archive.extend(make_events(per_day))
+        archive.flush()
+        print(f"{'write ' + format(total, ',') + ' fills':<40} {time.perf_counter() - start:10.2f} s")
+
+        config = AdvancedFillEventSystem("BenchEventSystem")._detection_config()
+        start = time.perf_counter()
+        results = archive.replay(datetime(2025, 1, 1), datetime(2025, 1, 1) + timedelta(days=DAYS), config)
+        elapsed = time.perf_counter() - start
+
+        print(f"{'replay one month':<40} {elapsed:10.2f} s")
+        print(f"{'replay throughput':<40} {results['events_replayed'] / elapsed:10.0f} fills/s")
+        print(f"Patterns: {results['pattern_counts']}")
+        print(f"Correlations: {results['correlation_counts']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-fill latency of AdvancedFillEventSystem at capacity.
+
+Prefills the system with backdated events (one per second across four
+pairs), then times process_fill_event for new fills. For comparison it
+also times the full-deque window scans that pattern detection and
+correlation analysis previously ran for every fill, and the ingest latency
+and end-to-end throughput with detection offloaded to a process pool, and
+the per-fill cost of process_fill_events_batch.
+
+Usage:
+    python benchmarks/bench_fill_events.py [stored_events] [measured_fills]
+"""
+
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import structlog
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from trading_systems.exchanges.kraken.advanced_fill_events import (
+    CORRELATION_WINDOW,
+    AdvancedFillEventSystem,
+    FillEvent,
+)
+from trading_systems.exchanges.kraken.fill_processor import TradeFill
+
+PAIRS = ["XBT/USD", "ETH/USD", "SOL/USD", "ADA/USD"]
+
+
+def make_fill(rng, i):
+    """Generate a synthetic fill."""
+    volume = Decimal(f"{rng.uniform(0.1, 2):.4f}")
+    price = Decimal(f"{rng.uniform(100, 101):.2f}")
+    return TradeFill(
+        trade_id=f"T{i}",
+        order_id=f"O{i % 500}",
+        volume=volume,
+        price=price,
+        cost=volume * price,
+        pair=PAIRS[i % len(PAIRS)],
+        side="buy" if rng.random() < 0.5 else "sell"
+    )
+
+
+def legacy_window_scans(events, current, windows):
+    """The per-fill scans previously run over the whole event deque."""
+    for window in windows:
+        [e for e in events if current.timestamp - e.timestamp <= window]
+    [
+        e for e in events
+        if current.timestamp - e.timestamp <= CORRELATION_WINDOW and e.event_id != current.event_id
+    ]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def prefill(system, rng, stored):
+    """Store backdated events, one per second up to now."""
+    now = datetime.now()
+    for i in range(stored):
+        system._store_event(FillEvent(
+            fill=make_fill(rng, i),
+            timestamp=now - timedelta(seconds=stored - i)
+        ))
+
+
+async def run_offloaded(stored, measured):
+    rng = random.Random(42)
+    system = AdvancedFillEventSystem("BenchEventSystem", max_events=stored, offload_detection=True)
+    prefill(system, rng, stored)
+
+    # Warm up the pool so worker start-up is not measured
+    await system.process_fill_event(make_fill(rng, stored))
+    await system.flush_detection()
+
+    latencies = []
+    start_all = time.perf_counter()
+    for i in range(measured):
+        fill = make_fill(rng, stored + 1 + i)
+        start = time.perf_counter()
+        await system.process_fill_event(fill)
+        latencies.append((time.perf_counter() - start) * 1000)
+    await system.flush_detection()
+    elapsed = time.perf_counter() - start_all
+
+    workers = system.detection_pool._max_workers
+    print(f"Offloaded detection ({workers} workers)")
+    print(f"{'ingest: mean':<40} {statistics.mean(latencies):10.3f} ms/fill")
+    print(f"{'ingest: p99':<40} {percentile(latencies, 0.99):10.3f} ms/fill")
+    print(f"{'end-to-end throughput':<40} {measured / elapsed:10.0f} fills/s")
+
+    await system.shutdown()
+
+
+async def run_batched(stored, measured, batch_size=100):
+    rng = random.Random(42)
+    system = AdvancedFillEventSystem("BenchEventSystem", max_events=stored)
+    prefill(system, rng, stored)
+
+    fills = [make_fill(rng, stored + i) for i in range(measured)]
+    start = time.perf_counter()
+    for i in range(0, measured, batch_size):
+        await system.process_fill_events_batch(fills[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+
+    print(f"Batched processing (batches of {batch_size})")
+    print(f"{'batch path: mean':<40} {elapsed / measured * 1000:10.3f} ms/fill")
+
+    await system.shutdown()
+
+
+async def run(stored, measured):
+    rng = random.Random(42)
+    system = AdvancedFillEventSystem("BenchEventSystem", max_events=stored)
+
+    print(f"Prefilling {stored:,} events...")
+    prefill(system, rng, stored)
+
+    latencies = []
+    for i in range(measured):
+        fill = make_fill(rng, stored + i)
+        start = time.perf_counter()
+        await system.process_fill_event(fill)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    legacy = []
+    windows = list(system.pattern_windows.values())
+    events = list(system.events)
+    for current in events[-20:]:
+        start = time.perf_counter()
+        legacy_window_scans(events, current, windows)
+        legacy.append((time.perf_counter() - start) * 1000)
+
+    print(f"Per-fill latency with {stored:,} stored events ({measured:,} fills)")
+    print(f"{'windowed index: mean':<40} {statistics.mean(latencies):10.3f} ms/fill")
+    print(f"{'windowed index: p50':<40} {percentile(latencies, 0.50):10.3f} ms/fill")
+    print(f"{'windowed index: p99':<40} {percentile(latencies, 0.99):10.3f} ms/fill")
+    print(f"{'legacy full-deque scans only: mean':<40} {statistics.mean(legacy):10.3f} ms/fill")
+    print(f"Patterns detected: {len(system.patterns):,}  correlations: {len(system.correlations):,}")
+
+    await system.shutdown()
+
+
+def main():
+    stored = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    measured = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    # Keep pattern/correlation logging out of the measurement
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    asyncio.run(run(stored, measured))
+    asyncio.run(run_batched(stored, measured))
+    asyncio.run(run_offloaded(stored, measured))
+
+
+if __name__ == "__main__":
+    main()
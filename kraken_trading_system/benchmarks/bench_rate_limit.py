@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-client rate limit checks.
+
+Times the SecurityManager.check_rate_limit hot path (LRU touch, sweep
+tick and one GCRA admit) for a single busy client and for a stream of
+distinct client ids, and reports the client table size afterwards.
+
+Usage:
+    python benchmarks/bench_rate_limit.py [checks]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from trading_systems.utils.rate_limit import GCRA, ClientTable
+
+
+class State:
+    __slots__ = ('request_tat',)
+
+    def __init__(self):
+        self.request_tat = 0.0
+
+
+def is_idle(state, now):
+    return state.request_tat <= now
+
+
+def run(client_ids, limit, table):
+    clock = time.monotonic
+    touch = table.touch
+    tick = table.tick
+    admit = limit.admit
+    allowed = 0
+    start = time.perf_counter()
+    for client_id in client_ids:
+        now = clock()
+        state = touch(client_id)
+        tick(now)
+        tat = admit(state.request_tat, now)
+        if tat is not None:
+            state.request_tat = tat
+            allowed += 1
+    return time.perf_counter() - start, allowed
+
+
+def main():
+    checks = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    limit = GCRA(limit=60, period=60.0)
+
+    table = ClientTable(State, is_idle, max_clients=10_000)
+    elapsed, allowed = run(["agent_1"] * checks, limit, table)
+    print(f"{'single client':<40} {elapsed / checks * 1e9:10.0f} ns/check ({allowed} allowed)")
+
+    table = ClientTable(State, is_idle, max_clients=10_000)
+    elapsed, allowed = run([f"client-{i}" for i in range(checks)], limit, table)
+    print(f"{'distinct clients':<40} {elapsed / checks * 1e9:10.0f} ns/check ({allowed} allowed)")
+    print(f"{'tracked clients after run':<40} {len(table):10d} (evicted {table.evictions})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark the pre-trade risk pipeline.
+
+Times single-order validation (including the snapshot built from balance
+and position lists), validation against a precomputed RiskSnapshot, the
+BLOCK short-circuit, and a rebalance basket through validate_orders.
+
+Usage:
+    python benchmarks/bench_risk_checks.py [num_orders]
+"""
+
+import logging
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import structlog
+
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+from trading_systems.exchanges.kraken.account_models import OrderSide
+from trading_systems.exchanges.kraken.order_requests import LimitOrderRequest
+from trading_systems.risk.pre_trade_checks import (
+    AccountBalance,
+    PositionInfo,
+    PreTradeRiskValidator,
+    RiskCheckResult,
+    RiskSnapshot,
+    TradingStatistics,
+)
+
+PAIRS = ["XBTUSD", "ETHUSD", "SOLUSD", "ADAUSD", "DOTUSD", "LINKUSD", "XRPUSD", "LTCUSD"]
+
+
+def make_orders(count, volume):
+    """Limit orders cycling through the pairs."""
+    return [
+        LimitOrderRequest(
+            pair=PAIRS[i % len(PAIRS)],
+            side=OrderSide.BUY if i % 2 == 0 else OrderSide.SELL,
+            volume=volume,
+            price=Decimal("100")
+        )
+        for i in range(count)
+    ]
+
+
+def timed(label, func, orders_per_call, repeat):
+    """Run ``func`` ``repeat`` times and print the mean latency per order."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / (repeat * orders_per_call)
+    print(f"{label:<40} {elapsed * 1e6:10.3f} us/order")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    balances = [
+        AccountBalance(currency="USD", total_balance=Decimal("1000000"), available_balance=Decimal("900000")),
+        AccountBalance(currency="XBT", total_balance=Decimal("2"), available_balance=Decimal("2")),
+    ]
+    positions = [
+        PositionInfo(pair=pair, size=Decimal("10"), current_price=Decimal("100"))
+        for pair in PAIRS
+    ]
+    stats = TradingStatistics(daily_trade_count=3, daily_volume_usd=Decimal("1000"))
+    prices = {pair: Decimal("100") for pair in PAIRS}
+
+    validator = PreTradeRiskValidator()
+    orders = make_orders(count, Decimal("0.5"))
+    oversized = make_orders(count, Decimal("100000"))
+    snapshot = RiskSnapshot(balances, positions, stats, prices)
+
+    print(f"Validating {count:,} orders")
+    timed("validate_order (lists)", lambda: [
+        validator.validate_order(order, balances, positions, stats, Decimal("100"))
+        for order in orders
+    ], count, 1)
+    results = timed("validate_with_snapshot (pass)", lambda: [
+        validator.validate_with_snapshot(order, snapshot) for order in orders
+    ], count, 3)
+    blocked = timed("validate_with_snapshot (block)", lambda: [
+        validator.validate_with_snapshot(order, snapshot) for order in oversized
+    ], count, 3)
+
+    basket = orders[:40]
+    timed("validate_orders (40-order basket)", lambda: validator.validate_orders(
+        basket, balances, positions, stats, prices
+    ), len(basket), max(1, count // len(basket)))
+
+    assert all(r.result == RiskCheckResult.PASS for responses in results for r in responses)
+    assert all(len(responses) == 1 and responses[0].result == RiskCheckResult.BLOCK for responses in blocked)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for Kraken API request signing.
+
+Compares the original per-request implementation (base64-decode the secret
+and key a fresh HMAC on every call) with KrakenSigner, which decodes once
+and copies a pre-keyed HMAC template.
+
+Usage:
+    python benchmarks/bench_signing.py [iterations]
+"""
+
+import base64
+import hashlib
+import hmac
+import sys
+import time
+import urllib.parse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from trading_systems.exchanges.kraken.auth import KrakenSigner
+
+API_SECRET = "kQH5HW/8p1uGOVjbgWA7FunAmGO8lsSUXNsu3eow76sz84Q18fWxnyRzBHCd3pd5nE9qa99HAZtuZuj6F1huXg=="
+URI_PATH = "/0/private/AddOrder"
+ORDER_DATA = {
+    "nonce": "1616492376594",
+    "ordertype": "limit",
+    "pair": "XBTUSD",
+    "price": 37500,
+    "type": "buy",
+    "volume": 1.25
+}
+
+
+def legacy_signature(urlpath, data, secret):
+    """Signature as previously computed at every call site."""
+    postdata = urllib.parse.urlencode(data)
+    encoded = (str(data['nonce']) + postdata).encode()
+    message = urlpath.encode() + hashlib.sha256(encoded).digest()
+    mac = hmac.new(base64.b64decode(secret), message, hashlib.sha512)
+    return base64.b64encode(mac.digest()).decode()
+
+
+def run(label, func, iterations):
+    """Time ``func`` and print signatures per second."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    rate = iterations / elapsed
+    print(f"{label:<32} {rate:>12,.0f} sig/s   {elapsed / iterations * 1e6:7.2f} us/sig")
+    return rate
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    signer = KrakenSigner(API_SECRET)
+    postdata = KrakenSigner.encode_body(ORDER_DATA)
+
+    assert signer.sign_data(URI_PATH, ORDER_DATA)[1] == legacy_signature(URI_PATH, ORDER_DATA, API_SECRET)
+
+    print(f"Kraken signing benchmark ({iterations:,} iterations)")
+    legacy = run("legacy (decode + new HMAC)", lambda: legacy_signature(URI_PATH, ORDER_DATA, API_SECRET), iterations)
+    run("KrakenSigner.sign_data", lambda: signer.sign_data(URI_PATH, ORDER_DATA), iterations)
+    signer_rate = run("KrakenSigner.sign (pre-encoded)", lambda: signer.sign(URI_PATH, "1616492376594", postdata), iterations)
+    print(f"Speedup (pre-encoded vs legacy): {signer_rate / legacy:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
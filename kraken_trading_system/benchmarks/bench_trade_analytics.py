@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark trade summaries over a large own-trade history.
+
+Compares the original comprehension-based get_trading_summary (walking
+KrakenTrade objects and Decimals) with the vectorized ColumnarTradeStore
+and the minute-bucket aggregates now used by AccountDataManager.
+
+Usage:
+    python benchmarks/bench_trade_analytics.py [num_trades]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from trading_systems.exchanges.kraken.account_models import KrakenTrade, OrderType, TradeType
+from trading_systems.exchanges.kraken.trade_aggregates import RollingTradeAggregates
+from trading_systems.exchanges.kraken.trade_store import ColumnarTradeStore
+
+PAIRS = ["XBT/USD", "ETH/USD", "SOL/USD", "ADA/USD"]
+
+
+def make_trades(count):
+    """Generate synthetic trades spread over the last 48 hours."""
+    rng = random.Random(42)
+    now = time.time()
+    trades = []
+    for i in range(count):
+        trades.append(KrakenTrade.model_construct(
+            trade_id=f"T{i}",
+            order_id=f"O{i}",
+            pair=PAIRS[i % len(PAIRS)],
+            time=datetime.fromtimestamp(now - rng.uniform(0, 48 * 3600)),
+            type=TradeType.BUY if rng.random() < 0.5 else TradeType.SELL,
+            order_type=OrderType.LIMIT,
+            price=Decimal(f"{rng.uniform(100, 200):.2f}"),
+            volume=Decimal(f"{rng.uniform(0.01, 2):.4f}"),
+            fee=Decimal(f"{rng.uniform(0, 0.5):.4f}"),
+            fee_currency="USD"
+        ))
+    return trades
+
+
+def legacy_trading_summary(trades, cutoff_time):
+    """The comprehension-based summary previously used by AccountDataManager."""
+    recent_trades = [t for t in trades if t.time >= cutoff_time]
+    total_volume = sum(t.volume for t in recent_trades)
+    total_fees = sum(t.fee for t in recent_trades)
+    buy_trades = len([t for t in recent_trades if t.type == 'buy'])
+    sell_trades = len([t for t in recent_trades if t.type == 'sell'])
+    volume_price_sum = sum(t.volume * t.price for t in recent_trades)
+    avg_price = volume_price_sum / total_volume if total_volume > 0 else Decimal('0')
+    return {
+        'total_trades': len(recent_trades),
+        'total_volume': total_volume,
+        'total_fees': total_fees,
+        'buy_trades': buy_trades,
+        'sell_trades': sell_trades,
+        'avg_price': avg_price,
+        'first_trade_time': min(t.time for t in recent_trades),
+        'last_trade_time': max(t.time for t in recent_trades)
+    }
+
+
+def timed(label, func, repeat):
+    """Run ``func`` ``repeat`` times and print the mean latency."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<40} {elapsed * 1000:10.2f} ms/query")
+    return result, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Generating {count:,} trades...")
+    trades = make_trades(count)
+
+    store = ColumnarTradeStore(capacity=count)
+    aggregates = RollingTradeAggregates()
+    for trade in trades:
+        store.append(trade)
+        aggregates.add_trade(trade)
+
+    since = datetime.now() - timedelta(hours=24)
+    print(f"24h trading summary over {count:,} trades")
+    legacy, legacy_time = timed("legacy comprehension summary", lambda: legacy_trading_summary(trades, since), 3)
+    vector, vector_time = timed("ColumnarTradeStore.summary", lambda: store.summary(since=since), 20)
+    _, bucket_time = timed("RollingTradeAggregates.summarize", lambda: aggregates.summarize(since), 20)
+    timed("ColumnarTradeStore.interval_aggregates", lambda: store.interval_aggregates(3600, since=since), 20)
+    timed("ColumnarTradeStore.volume_profile", lambda: store.volume_profile("XBT/USD", since), 20)
+
+    assert legacy['total_trades'] == vector['total_trades']
+    assert abs(float(legacy['avg_price']) - vector['vwap']) < 1e-6 * vector['vwap']
+
+    print(f"Vectorized speedup: {legacy_time / vector_time:.1f}x")
+    print(f"Bucketed speedup:   {legacy_time / bucket_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,15 +13,20 @@ Usage: python3 agent_focused_trading_server.py [--http]
 # =============================================================================
 
 import asyncio
+import functools
+import inspect
 import json
 import os
 import re
 import sqlite3
 import sys
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
 
 # Add your trading system to path
 project_root = Path(__file__).parent
@@ -42,16 +47,22 @@ except ImportError as e:
     print("Install with: pip install mcp uvicorn starlette")
     sys.exit(1)
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 # Import your trading components (optional)
 try:
     from trading_systems.mcp_server.config import MCPServerConfig
-    from trading_systems.mcp_server.trading_adapter import TradingSystemAdapter
+    from trading_systems.mcp_server.trading_adapter import ReadinessState, TradingSystemAdapter
     print("✅ Trading system components imported successfully")
 except ImportError as e:
     print(f"⚠️ Trading system import failed: {e}")
     print("🎭 Continuing in standalone mode...")
     MCPServerConfig = None
     TradingSystemAdapter = None
+    ReadinessState = None
 
 # =============================================================================
 # CONSTANTS
@@ -59,17 +70,47 @@ except ImportError as e:
 
 AGENT_USERNAME = "agent_1"
 DB_FILE = "balance_tracker.db"
+DB_POOL_SIZE = 4  # worker threads (and SQLite connections) for tool queries
+
+# Concurrent executions allowed per tool; excess calls queue for a slot
+READ_TOOL_CONCURRENCY = 8
+TRADE_TOOL_CONCURRENCY = 2
+TOOL_QUEUE_TIMEOUT = 10.0  # seconds a call may wait before the server reports busy
+MAX_RPC_BATCH_SIZE = 32  # calls accepted in one JSON-RPC batch on /mcp
+TRADING_READY_WAIT = 2.0  # seconds a trade waits for adapter startup probes
+
+# Live prices: one batched Kraken Ticker request per poll covers every pair
+KRAKEN_TICKER_URL = "https://api.kraken.com/0/public/Ticker"
+PRICE_POLL_INTERVAL = float(os.getenv("PRICE_POLL_INTERVAL_SECONDS", "2"))
+PRICE_MAX_AGE = float(os.getenv("PRICE_MAX_AGE_SECONDS", "15"))  # older prices are not shown
+TRADE_PRICE_MAX_AGE = float(os.getenv("TRADE_PRICE_MAX_AGE_SECONDS", "5"))  # older prices are not traded on
+PRICE_MAX_BACKOFF = 30.0  # seconds between polls after repeated failures
 
 # =============================================================================
 # DATABASE MANAGER CLASS
 # =============================================================================
 
 class DatabaseManager:
-    """Manages SQLite database connections and operations."""
-
-    def __init__(self, db_file: str = DB_FILE):
+    """
+    Manages SQLite database connections and operations.
+
+    The synchronous ``execute_*`` methods use the connection opened by
+    ``connect``. Tools use the async ``query``/``update``/``transaction``
+    methods instead: they run on a small thread pool with one connection per
+    worker, so a slow query never blocks the event loop. Writes are
+    serialized (SQLite allows one writer) and WAL mode keeps readers
+    unblocked while a write is in progress.
+    """
+
+    def __init__(self, db_file: str = DB_FILE, pool_size: int = DB_POOL_SIZE):
         self.db_file = db_file
         self.connection = None
+        self.pool_size = pool_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+        self._pool_connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._write_lock = threading.Lock()
 
     def connect(self) -> bool:
         """Connect to the database."""
@@ -79,10 +120,10 @@ class DatabaseManager:
                 print("📝 Creating new database with schema...")
                 self._create_database_schema()
 
-            self.connection = sqlite3.connect(self.db_file, check_same_thread=False)
-            self.connection.row_factory = sqlite3.Row
-            self.connection.execute("PRAGMA foreign_keys = ON")
-            print(f"✅ Connected to database: {self.db_file}")
+            self.connection = self._open_connection()
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="db")
+            print(f"✅ Connected to database: {self.db_file} (pool size {self.pool_size})")
             return True
         except Exception as e:
             print(f"❌ Database connection failed: {e}")
@@ -90,11 +131,90 @@ class DatabaseManager:
 
     def disconnect(self):
         """Disconnect from database."""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._pool_lock:
+            for connection in self._pool_connections:
+                connection.close()
+            self._pool_connections.clear()
         if self.connection:
             self.connection.close()
             self.connection = None
             print("✅ Database disconnected")
 
+    @property
+    def is_connected(self) -> bool:
+        """Whether the database is connected."""
+        return self.connection is not None
+
+    def _open_connection(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_file, check_same_thread=False, timeout=30.0)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA foreign_keys = ON")
+        return connection
+
+    def _pool_connection(self) -> sqlite3.Connection:
+        """Connection owned by the current worker thread."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self._open_connection()
+            with self._pool_lock:
+                self._pool_connections.append(connection)
+        return connection
+
+    def _run_query(self, query: str, params: tuple) -> List[Dict]:
+        try:
+            rows = self._pool_connection().execute(query, params).fetchall()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            raise Exception(f"Query execution failed: {e}")
+
+    def _run_update(self, query: str, params: tuple) -> int:
+        connection = self._pool_connection()
+        with self._write_lock:
+            try:
+                cursor = connection.execute(query, params)
+                connection.commit()
+                return cursor.rowcount
+            except Exception as e:
+                connection.rollback()
+                raise Exception(f"Update execution failed: {e}")
+
+    def _run_transaction(self, work: Callable[[sqlite3.Connection], Any]) -> Any:
+        connection = self._pool_connection()
+        with self._write_lock:
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                result = work(connection)
+                connection.commit()
+                return result
+            except Exception:
+                connection.rollback()
+                raise
+
+    async def _submit(self, func: Callable, *args) -> Any:
+        if not self._executor:
+            raise ConnectionError("Database not connected")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def query(self, query: str, params: tuple = ()) -> List[Dict]:
+        """Execute a SELECT query on the pool and return results."""
+        return await self._submit(self._run_query, query, params)
+
+    async def update(self, query: str, params: tuple = ()) -> int:
+        """Execute an INSERT/UPDATE/DELETE query on the pool and return affected rows."""
+        return await self._submit(self._run_update, query, params)
+
+    async def transaction(self, work: Callable[[sqlite3.Connection], Any]) -> Any:
+        """
+        Run ``work(connection)`` in one write transaction on the pool.
+
+        The transaction commits if ``work`` returns and rolls back if it raises.
+        """
+        return await self._submit(self._run_transaction, work)
+
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict]:
         """Execute a SELECT query and return results."""
         if not self.connection:
@@ -264,6 +384,215 @@ INSERT OR IGNORE INTO trading_pairs (base_currency, quote_currency, symbol, min_
         conn.close()
         print("✅ Database schema created successfully (no mock data)")
 
+# =============================================================================
+# LIVE PRICE SERVICE
+# =============================================================================
+
+# Kraken names for assets whose common ticker differs
+KRAKEN_ASSET_ALIASES = {"BTC": "XBT", "DOGE": "XDG"}
+QUOTE_CURRENCIES = ("USDT", "USDC", "USD", "EUR", "GBP")
+# Fiat currencies Kraken prefixes with Z in legacy pair names (crypto gets X)
+KRAKEN_LEGACY_FIAT = ("USD", "EUR", "GBP", "JPY", "CAD", "AUD")
+UNKNOWN_PAIR_ERROR = "Unknown asset pair"
+
+
+def split_symbol(symbol: str) -> Tuple[str, str]:
+    """Split a symbol like BTCUSD into base and quote currencies."""
+    for quote in QUOTE_CURRENCIES:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)], quote
+    return symbol[:3], symbol[3:]
+
+
+def kraken_asset(asset: str) -> str:
+    """Kraken's name for an asset (BTC -> XBT)."""
+    return KRAKEN_ASSET_ALIASES.get(asset, asset)
+
+
+def kraken_legacy_asset(asset: str) -> str:
+    """Legacy X/Z-prefixed name of a Kraken asset (XBT -> XXBT, USD -> ZUSD)."""
+    return ("Z" if asset in KRAKEN_LEGACY_FIAT else "X") + asset
+
+
+class PriceService:
+    """
+    Latest ticker for each tracked symbol, kept in memory.
+
+    A background task requests all symbols in one Kraken Ticker call per
+    poll, backing off on failures. ``get`` is a dict lookup plus an age
+    check, so tools never wait on the network for a price.
+    """
+
+    def __init__(self, poll_interval: float = PRICE_POLL_INTERVAL,
+                 max_age: float = PRICE_MAX_AGE, url: str = KRAKEN_TICKER_URL):
+        self.poll_interval = poll_interval
+        self.max_age = max_age
+        self.url = url
+        self.prices: Dict[str, Dict[str, Any]] = {}
+        self._received_at: Dict[str, float] = {}
+        self._pairs: Dict[str, List[str]] = {}  # Kraken pair -> symbols
+        self._response_keys: Dict[str, List[str]] = {}  # Kraken result key -> symbols
+        self.rejected_pairs: Dict[str, List[str]] = {}  # pairs Kraken does not know
+        self._client = None
+        self._task: Optional[asyncio.Task] = None
+        self.polls = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def track(self, symbols: List[str]) -> None:
+        """Set the symbols requested on each poll."""
+        self._pairs = {}
+        self._response_keys = {}
+        self.rejected_pairs = {}
+        for symbol in sorted(set(s.upper() for s in symbols)):
+            base, quote = map(kraken_asset, split_symbol(symbol))
+            # Several symbols may name one pair (BTCUSD and XBTUSD)
+            pair_symbols = self._pairs.get(base + quote)
+            if pair_symbols is None:
+                pair_symbols = self._pairs[base + quote] = []
+                # Kraken answers with either the plain name or the legacy
+                # X/Z-prefixed one (XXBTZUSD, XETHXXBT), depending on the pair
+                self._response_keys[base + quote] = pair_symbols
+                self._response_keys[kraken_legacy_asset(base) + kraken_legacy_asset(quote)] = pair_symbols
+            pair_symbols.append(symbol)
+
+    @property
+    def symbols(self) -> List[str]:
+        """Tracked symbols."""
+        return sorted(symbol for pair_symbols in self._pairs.values() for symbol in pair_symbols)
+
+    def _drop_pair(self, pair: str) -> None:
+        pair_symbols = self._pairs.pop(pair)
+        self._response_keys = {
+            key: value for key, value in self._response_keys.items() if value is not pair_symbols
+        }
+        self.rejected_pairs[pair] = pair_symbols
+        print(f"⚠️ Kraken rejected pair {pair} ({', '.join(pair_symbols)}); no live prices for it")
+
+    async def start(self, symbols: List[str]) -> bool:
+        """Load the first prices and start polling. Returns False if HTTP is unavailable."""
+        if httpx is None:
+            self.last_error = "httpx not installed"
+            return False
+        self.track(symbols)
+        self._client = httpx.AsyncClient(timeout=max(self.poll_interval * 2, 5.0))
+        try:
+            await self.refresh()
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def stop(self) -> None:
+        """Stop polling and close the HTTP client."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch(self, pairs: List[str]) -> Dict[str, Any]:
+        response = await self._client.get(self.url, params={"pair": ",".join(pairs)})
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _rejects_pair(payload: Dict[str, Any]) -> bool:
+        return any(UNKNOWN_PAIR_ERROR in str(error) for error in payload.get("error") or ())
+
+    async def _drop_unknown_pairs(self) -> None:
+        """Find the pairs Kraken rejects, one request each, and stop tracking them."""
+        pairs = list(self._pairs)
+        payloads = await asyncio.gather(*(self._fetch([pair]) for pair in pairs))
+        for pair, payload in zip(pairs, payloads):
+            if self._rejects_pair(payload):
+                self._drop_pair(pair)
+
+    async def refresh(self) -> int:
+        """Fetch all tracked tickers in one request. Returns the number updated."""
+        if not self._pairs:
+            return 0
+        payload = await self._fetch(list(self._pairs))
+        if self._rejects_pair(payload):
+            # One unknown pair fails the whole batch; drop it and retry
+            await self._drop_unknown_pairs()
+            if not self._pairs:
+                return 0
+            payload = await self._fetch(list(self._pairs))
+        result = payload.get("result")
+        if not result:
+            raise ValueError(f"Ticker error: {payload.get('error')}")
+
+        received_at = time.monotonic()
+        updated_at = datetime.now().isoformat()
+        updated = 0
+        for key, ticker in result.items():
+            for symbol in self._response_keys.get(key, ()):
+                self.prices[symbol] = self._parse_ticker(symbol, ticker, updated_at)
+                self._received_at[symbol] = received_at
+                updated += 1
+        self.polls += 1
+        return updated
+
+    @staticmethod
+    def _parse_ticker(symbol: str, ticker: Dict[str, Any], updated_at: str) -> Dict[str, Any]:
+        last = float(ticker['c'][0])
+        opening = float(ticker.get('o') or 0)
+        change = (last - opening) / opening * 100 if opening else 0.0
+        return {
+            'symbol': symbol,
+            'price': last,
+            'bid': float(ticker['b'][0]),
+            'ask': float(ticker['a'][0]),
+            'high_24h': float(ticker['h'][1]),
+            'low_24h': float(ticker['l'][1]),
+            'change_24h': f"{change:+.2f}%",
+            'volume_24h': float(ticker['v'][1]),
+            'updated_at': updated_at,
+        }
+
+    async def _run(self) -> None:
+        delay = self.poll_interval
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh()
+                delay = self.poll_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                delay = min(delay * 2, PRICE_MAX_BACKOFF)
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Latest price data for a symbol, or None if unknown or older than ``max_age``."""
+        received_at = self._received_at.get(symbol)
+        if received_at is None:
+            return None
+        if time.monotonic() - received_at > (self.max_age if max_age is None else max_age):
+            return None
+        return self.prices[symbol]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Polling statistics and price ages."""
+        now = time.monotonic()
+        return {
+            "symbols": self.symbols,
+            "rejected_pairs": sorted(self.rejected_pairs),
+            "polls": self.polls,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "max_age_seconds": self.max_age,
+            "age_seconds": {symbol: round(now - t, 1) for symbol, t in self._received_at.items()},
+        }
+
 # =============================================================================
 # GLOBAL STATE
 # =============================================================================
@@ -273,32 +602,135 @@ trading_adapter = None
 server_config = None
 db_manager = None
 agent_user_id = None
+price_service: Optional[PriceService] = None
 
 # Create the MCP server instance
 mcp = FastMCP("Agent-Focused Trading Server for agent_1")
 
 # =============================================================================
-# UTILITY FUNCTIONS
+# TOOL CONCURRENCY LIMITS
 # =============================================================================
 
-def get_market_price_data(symbol: str) -> Optional[Dict[str, Any]]:
-    """Get real market price data for a trading symbol."""
-    global trading_adapter
+class TradeRejected(Exception):
+    """A trade failed validation inside its database transaction."""
 
-    try:
-        # If we have a real trading adapter, use it
-        if trading_adapter:
-            # This would connect to your real trading system
-            # trading_adapter.get_ticker(symbol)
-            pass
-
-        # For now, return None to indicate no real price data available
-        # This forces the system to handle the "no price data" case properly
-        return None
 
-    except Exception as e:
-        print(f"⚠️ Error getting real market data for {symbol}: {e}")
+_tool_semaphores: Dict[str, asyncio.Semaphore] = {}
+tool_in_flight: Dict[str, int] = {}
+
+
+def tool_limit(max_concurrent: int):
+    """
+    Bound concurrent executions of an async tool.
+
+    Calls beyond ``max_concurrent`` wait for a slot; after
+    ``TOOL_QUEUE_TIMEOUT`` seconds they return a busy message instead of
+    piling up behind slow calls.
+    """
+    def decorator(func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            semaphore = _tool_semaphores.get(name)
+            if semaphore is None:
+                semaphore = _tool_semaphores[name] = asyncio.Semaphore(max_concurrent)
+            try:
+                await asyncio.wait_for(semaphore.acquire(), TOOL_QUEUE_TIMEOUT)
+            except asyncio.TimeoutError:
+                return f"❌ Server busy: too many concurrent {name} calls, please retry"
+
+            tool_in_flight[name] = tool_in_flight.get(name, 0) + 1
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                tool_in_flight[name] -= 1
+                semaphore.release()
+
+        return wrapper
+    return decorator
+
+# =============================================================================
+# TOOL REGISTRY
+# =============================================================================
+
+# JSON types accepted for each annotated parameter type
+_JSON_ARG_TYPES = {str: (str,), float: (int, float), int: (int,), bool: (bool,)}
+
+
+class ToolSpec:
+    """
+    A tool callable over the HTTP endpoint.
+
+    The parameter table is built from the function signature once, at
+    registration, so each call only checks the supplied arguments.
+    """
+
+    __slots__ = ('name', 'func', 'params', 'required')
+
+    def __init__(self, func: Callable):
+        self.name = func.__name__
+        self.func = func
+        self.params: Dict[str, Tuple[type, Tuple[type, ...]]] = {}
+        self.required: List[str] = []
+        for param in inspect.signature(func).parameters.values():
+            annotation = param.annotation if param.annotation is not inspect.Parameter.empty else str
+            self.params[param.name] = (annotation, _JSON_ARG_TYPES.get(annotation, (object,)))
+            if param.default is inspect.Parameter.empty:
+                self.required.append(param.name)
+
+    def bind(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate JSON arguments and return keyword arguments for the tool."""
+        if not isinstance(arguments, dict):
+            raise ValueError("arguments must be an object")
+        missing = [name for name in self.required if name not in arguments]
+        if missing:
+            raise ValueError(f"missing required argument(s): {', '.join(missing)}")
+
+        kwargs = {}
+        for name, value in arguments.items():
+            param = self.params.get(name)
+            if param is None:
+                raise ValueError(f"unexpected argument: {name}")
+            annotation, accepted = param
+            # bool is an int subclass; only accept it where bool is declared
+            if not isinstance(value, accepted) or (isinstance(value, bool) and annotation is not bool):
+                raise ValueError(f"argument {name} must be {annotation.__name__}")
+            kwargs[name] = annotation(value) if annotation in (float, int) else value
+        return kwargs
+
+
+TOOL_REGISTRY: Dict[str, ToolSpec] = {}
+
+
+def trading_tool(max_concurrent: int = READ_TOOL_CONCURRENCY, http: bool = True):
+    """
+    Register an async tool with MCP, bounded by ``tool_limit``.
+
+    Tools with ``http=True`` are also callable through the unauthenticated
+    /mcp HTTP endpoint; keep anything that exposes files or internals off it.
+    """
+    def decorator(func):
+        limited = tool_limit(max_concurrent)(func)
+        if http:
+            TOOL_REGISTRY[func.__name__] = ToolSpec(limited)
+        return mcp.tool()(limited)
+    return decorator
+
+# =============================================================================
+# UTILITY FUNCTIONS
+# =============================================================================
+
+def get_market_price_data(symbol: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Get live market price data for a trading symbol from the price cache.
+
+    Returns None when the symbol is not tracked or its last update is older
+    than ``max_age`` seconds (``PRICE_MAX_AGE`` by default).
+    """
+    if price_service is None:
         return None
+    return price_service.get(symbol.upper(), max_age)
 
 async def setup_agent_1() -> bool:
     """Find existing agent_1 user in the database."""
@@ -353,7 +785,7 @@ async def setup_agent_1() -> bool:
 
 async def initialize_system():
     """Initialize the trading system and database."""
-    global trading_adapter, server_config, db_manager
+    global trading_adapter, server_config, db_manager, price_service
 
     print("🚀 Initializing agent-focused trading server...")
     print("🤖 Target agent: agent_1")
@@ -383,12 +815,20 @@ async def initialize_system():
             print("📊 Live market data available")
         except Exception as e:
             print(f"⚠️ Trading system initialization failed: {e}")
-            print("💡 Real-time price data will not be available")
-            print("💡 Connect your trading system for live prices and trade execution")
+            print("💡 Connect your trading system for order execution")
     else:
         print("💡 No real trading system connected")
-        print("💡 Real-time price data will not be available")
-        print("💡 Connect your trading system for live prices and trade execution")
+        print("💡 Connect your trading system for order execution")
+
+    # Start live prices for every active trading pair
+    symbols = [row['symbol'] for row in db_manager.execute_query(
+        "SELECT symbol FROM trading_pairs WHERE is_active = 1"
+    )]
+    price_service = PriceService()
+    if symbols and await price_service.start(symbols):
+        print(f"📊 Live prices for {len(symbols)} pairs (poll every {price_service.poll_interval}s)")
+    else:
+        print(f"⚠️ Live prices unavailable: {price_service.last_error or 'no active trading pairs'}")
 
     print("✅ Agent-focused trading server ready!")
 
@@ -398,6 +838,9 @@ async def shutdown_system():
 
     print("🔄 Shutting down system...")
 
+    if price_service:
+        await price_service.stop()
+
     if trading_adapter:
         await trading_adapter.shutdown()
 
@@ -406,17 +849,32 @@ async def shutdown_system():
 
     print("✅ Shutdown complete!")
 
+async def trading_system_not_ready() -> Optional[str]:
+    """
+    Message for trade tools while the trading adapter is still starting.
+
+    Waits up to ``TRADING_READY_WAIT`` for the startup probes. Degraded or
+    failed adapters do not block simulated trades; they are reported by
+    ``get_server_status``.
+    """
+    if trading_adapter is None or trading_adapter.readiness != ReadinessState.STARTING:
+        return None
+    await trading_adapter.wait_until_ready(TRADING_READY_WAIT)
+    if trading_adapter.readiness == ReadinessState.STARTING:
+        return "⏳ Trading system is still starting up, please retry shortly"
+    return None
+
 # =============================================================================
 # MCP TOOLS - BASIC TOOLS
 # =============================================================================
 
-@mcp.tool()
-def ping() -> str:
+@trading_tool()
+async def ping() -> str:
     """Test connectivity to the trading server."""
     return f"🏓 Pong! Agent-focused trading server responding. Connected as: {AGENT_USERNAME}"
 
-@mcp.tool()
-def get_server_status() -> str:
+@trading_tool()
+async def get_server_status() -> str:
     """Get comprehensive server and trading system status."""
     global trading_adapter, db_manager, agent_user_id
 
@@ -428,7 +886,7 @@ def get_server_status() -> str:
         "features": {
             "database_access": db_manager is not None and db_manager.connection is not None,
             "agent_trading": True,
-            "market_data": trading_adapter is not None,
+            "market_data": bool(price_service and price_service.prices),
             "balance_management": True,
             "trade_execution": True,
             "http_transport": True
@@ -437,21 +895,17 @@ def get_server_status() -> str:
             "file": DB_FILE,
             "connected": db_manager is not None and db_manager.connection is not None
         },
-        "available_tools": [
-            "ping", "get_my_balances", "get_portfolio_summary", "get_all_asset_positions",
-            "get_market_price", "get_available_pairs", "buy_asset", "sell_asset",
-            "get_my_trades", "execute_smart_trade", "get_server_status"
-        ]
+        "available_tools": sorted(TOOL_REGISTRY)
     }
 
     if db_manager and db_manager.connection:
         try:
             # Get database stats
-            user_count = db_manager.execute_query("SELECT COUNT(*) as count FROM users")
+            user_count = await db_manager.query("SELECT COUNT(*) as count FROM users")
             status["database"]["users"] = user_count[0]['count'] if user_count else 0
 
             if agent_user_id:
-                balance_count = db_manager.execute_query(
+                balance_count = await db_manager.query(
                     "SELECT COUNT(*) as count FROM user_balances WHERE user_id = ?",
                     (agent_user_id,)
                 )
@@ -461,14 +915,20 @@ def get_server_status() -> str:
         except Exception as e:
             status["database"]["error"] = str(e)
 
+    status["database"]["pool_size"] = db_manager.pool_size if db_manager else 0
+    if price_service:
+        status["market_data"] = price_service.get_stats()
+    status["tools_in_flight"] = {name: count for name, count in tool_in_flight.items() if count}
+    status["trading_system"] = trading_adapter.get_readiness() if trading_adapter else {"state": "not_connected"}
+
     return f"✅ Server Status:\n{json.dumps(status, indent=2)}"
 
 # =============================================================================
 # MCP TOOLS - BALANCE MANAGEMENT
 # =============================================================================
 
-@mcp.tool()
-def get_my_balances() -> str:
+@trading_tool()
+async def get_my_balances() -> str:
     """Get current balances for agent_1."""
     try:
         if not db_manager or not agent_user_id:
@@ -483,7 +943,7 @@ def get_my_balances() -> str:
             ORDER BY c.is_fiat DESC, ub.total_balance DESC
         """
 
-        balances = db_manager.execute_query(query, (agent_user_id,))
+        balances = await db_manager.query(query, (agent_user_id,))
 
         if not balances:
             return "💰 No balance records found for agent_1"
@@ -539,8 +999,8 @@ def get_my_balances() -> str:
     except Exception as e:
         return f"❌ Error getting balances: {str(e)}"
 
-@mcp.tool()
-def get_all_asset_positions() -> str:
+@trading_tool()
+async def get_all_asset_positions() -> str:
     """Get complete view of all possible assets and agent_1's position in each."""
     try:
         if not db_manager or not agent_user_id:
@@ -559,7 +1019,7 @@ def get_all_asset_positions() -> str:
             ORDER BY c.is_fiat DESC, c.code
         """
 
-        assets = db_manager.execute_query(query, (agent_user_id,))
+        assets = await db_manager.query(query, (agent_user_id,))
 
         if not assets:
             return "📊 No asset data available"
@@ -652,8 +1112,8 @@ def get_all_asset_positions() -> str:
     except Exception as e:
         return f"❌ Error getting asset positions: {str(e)}"
 
-@mcp.tool()
-def debug_agent_info() -> str:
+@trading_tool(http=False)
+async def debug_agent_info() -> str:
     """Debug information about agent_1 connection and data."""
     try:
         global agent_user_id
@@ -671,7 +1131,7 @@ def debug_agent_info() -> str:
 
         # Check user exists
         user_query = "SELECT id, username, email FROM users WHERE id = ?"
-        user_rows = db_manager.execute_query(user_query, (agent_user_id,))
+        user_rows = await db_manager.query(user_query, (agent_user_id,))
 
         if user_rows:
             user = user_rows[0]
@@ -689,7 +1149,7 @@ def debug_agent_info() -> str:
             WHERE ub.user_id = ?
             ORDER BY ub.total_balance DESC
         """
-        balance_rows = db_manager.execute_query(balance_query, (agent_user_id,))
+        balance_rows = await db_manager.query(balance_query, (agent_user_id,))
 
         result += f"\n💰 Balance Records Found: {len(balance_rows)}\n"
         if balance_rows:
@@ -706,7 +1166,7 @@ def debug_agent_info() -> str:
             WHERE ub.total_balance > 0
             LIMIT 5
         """
-        other_balances = db_manager.execute_query(other_balances_query)
+        other_balances = await db_manager.query(other_balances_query)
 
         if other_balances:
             result += f"\n🔍 Other balance records in database:\n"
@@ -718,114 +1178,9 @@ def debug_agent_info() -> str:
 
     except Exception as e:
         return f"❌ Debug error: {str(e)}"
-    """Get a comprehensive portfolio summary with performance metrics."""
-    try:
-        if not db_manager or not agent_user_id:
-            return "❌ Database or agent not initialized"
-
-        # Get ALL balances (including zero balances)
-        balance_query = """
-            SELECT ub.currency_code, ub.total_balance, ub.available_balance, ub.locked_balance,
-                   c.name, c.is_fiat, ub.updated_at
-            FROM user_balances ub
-            JOIN currencies c ON ub.currency_code = c.code
-            WHERE ub.user_id = ?
-            ORDER BY c.is_fiat DESC, ub.total_balance DESC
-        """
-
-        balances = db_manager.execute_query(balance_query, (agent_user_id,))
-
-        if not balances:
-            return "📊 No portfolio data available"
-
-        result = f"📊 COMPLETE PORTFOLIO SUMMARY (agent_1)\n"
-        result += "=" * 55 + "\n"
-
-        total_value = 0
-        crypto_value = 0
-        fiat_value = 0
-        assets_with_balance = 0
-        zero_balance_assets = 0
-
-        result += f"\n💰 ALL HOLDINGS:\n"
 
-        for balance in balances:
-            currency = balance['currency_code']
-            amount = float(balance['total_balance'])
-            available = float(balance['available_balance'])
-            locked = float(balance['locked_balance'])
-            name = balance['name']
-            is_fiat = balance['is_fiat']
-            updated_at = balance['updated_at']
-
-            # Count assets
-            if amount > 0:
-                assets_with_balance += 1
-            else:
-                zero_balance_assets += 1
-
-            if is_fiat:
-                value = amount
-                fiat_value += value
-                if amount > 0:
-                    result += f"   {currency}: ${amount:,.2f}\n"
-                else:
-                    result += f"   {currency}: $0.00 (empty)\n"
-            else:
-                if amount > 0:
-                    price_data = get_market_price_data(f"{currency}USD")
-                    if price_data:
-                        value = amount * price_data['price']
-                        crypto_value += value
-                        result += f"   {currency}: {amount:.6f} (${value:,.2f} @ ${price_data['price']:,.2f})\n"
-                    else:
-                        result += f"   {currency}: {amount:.6f} (Real-time price N/A)\n"
-                else:
-                    result += f"   {currency}: 0.00000000 (empty)\n"
-
-        total_value = fiat_value + crypto_value
-
-        result += f"\n📈 PORTFOLIO STATISTICS:\n"
-        result += f"   Total Assets Tracked: {len(balances)}\n"
-        result += f"   Assets with Balance:  {assets_with_balance}\n"
-        result += f"   Empty Asset Balances: {zero_balance_assets}\n"
-
-        if total_value > 0:
-            result += f"\n💵 VALUE ALLOCATION:\n"
-            result += f"   Fiat (USD):    ${fiat_value:,.2f} ({fiat_value/total_value*100:.1f}%)\n"
-            result += f"   Crypto:        ${crypto_value:,.2f} ({crypto_value/total_value*100:.1f}%)\n"
-            result += f"   TOTAL VALUE:   ${total_value:,.2f}\n"
-        else:
-            result += f"\n💵 TOTAL PORTFOLIO VALUE: $0.00\n"
-
-        # Get trade count
-        trade_query = """
-            SELECT COUNT(*) as trade_count,
-                   SUM(CASE WHEN transaction_type = 'trade_buy' THEN 1 ELSE 0 END) as buys,
-                   SUM(CASE WHEN transaction_type = 'trade_sell' THEN 1 ELSE 0 END) as sells,
-                   MAX(created_at) as last_trade
-            FROM transactions
-            WHERE user_id = ? AND transaction_type IN ('trade_buy', 'trade_sell')
-        """
-
-        trade_stats = db_manager.execute_query(trade_query, (agent_user_id,))
-
-        if trade_stats and trade_stats[0]['trade_count']:
-            stats = trade_stats[0]
-            result += f"\n📊 TRADING ACTIVITY:\n"
-            result += f"   Total Trades:  {stats['trade_count']}\n"
-            result += f"   Buys:          {stats['buys']}\n"
-            result += f"   Sells:         {stats['sells']}\n"
-            result += f"   Last Trade:    {stats['last_trade'] or 'None'}\n"
-        else:
-            result += f"\n📊 TRADING ACTIVITY: No trades recorded\n"
-
-        result += f"\n⏰ Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-
-        return result
-
-    except Exception as e:
-        return f"❌ Error generating portfolio summary: {str(e)}"
+@trading_tool()
+async def get_portfolio_summary() -> str:
     """Get a comprehensive portfolio summary with performance metrics."""
     try:
         if not db_manager or not agent_user_id:
@@ -841,7 +1196,7 @@ def debug_agent_info() -> str:
             ORDER BY c.is_fiat DESC, ub.total_balance DESC
         """
 
-        balances = db_manager.execute_query(balance_query, (agent_user_id,))
+        balances = await db_manager.query(balance_query, (agent_user_id,))
 
         if not balances:
             return "📊 No portfolio data available"
@@ -916,7 +1271,7 @@ def debug_agent_info() -> str:
             WHERE user_id = ? AND transaction_type IN ('trade_buy', 'trade_sell')
         """
 
-        trade_stats = db_manager.execute_query(trade_query, (agent_user_id,))
+        trade_stats = await db_manager.query(trade_query, (agent_user_id,))
 
         if trade_stats and trade_stats[0]['trade_count']:
             stats = trade_stats[0]
@@ -939,8 +1294,8 @@ def debug_agent_info() -> str:
 # MCP TOOLS - MARKET DATA
 # =============================================================================
 
-@mcp.tool()
-def get_market_price(symbol: str) -> str:
+@trading_tool()
+async def get_market_price(symbol: str) -> str:
     """Get current market price for a trading pair (e.g., BTCUSD, ETHUSD)."""
     try:
         symbol = symbol.upper()
@@ -949,7 +1304,7 @@ def get_market_price(symbol: str) -> str:
         price_data = get_market_price_data(symbol)
 
         if not price_data:
-            return f"❌ Real-time price data not available for {symbol}\n💡 Please connect to a real trading system to get live prices"
+            return f"❌ Real-time price data not available for {symbol}\n💡 The live price feed has no recent data for this symbol"
 
         result = f"📊 MARKET DATA: {symbol}\n"
         result += "=" * 30 + "\n"
@@ -967,8 +1322,8 @@ def get_market_price(symbol: str) -> str:
     except Exception as e:
         return f"❌ Error getting price: {str(e)}"
 
-@mcp.tool()
-def get_available_pairs() -> str:
+@trading_tool()
+async def get_available_pairs() -> str:
     """Get list of available trading pairs."""
     try:
         if not db_manager:
@@ -984,7 +1339,7 @@ def get_available_pairs() -> str:
             ORDER BY tp.symbol
         """
 
-        pairs = db_manager.execute_query(query)
+        pairs = await db_manager.query(query)
 
         if not pairs:
             return "❌ No trading pairs available"
@@ -998,7 +1353,7 @@ def get_available_pairs() -> str:
             quote_name = pair['quote_name']
             min_amount = float(pair['min_trade_amount'])
 
-            # Try to get current price from real trading system
+            # Current price from the live price cache
             price_data = get_market_price_data(symbol)
             price_str = f"${price_data['price']:,.2f}" if price_data else "Real-time data N/A"
 
@@ -1007,7 +1362,6 @@ def get_available_pairs() -> str:
             result += f"   Current Price: {price_str}\n"
             result += f"   Min Trade: {min_amount} {pair['base_currency']}\n"
 
-        result += f"\n💡 Connect to real trading system for live prices"
         return result
 
     except Exception as e:
@@ -1017,13 +1371,17 @@ def get_available_pairs() -> str:
 # MCP TOOLS - TRADING EXECUTION
 # =============================================================================
 
-@mcp.tool()
-def buy_asset(symbol: str, amount_usd: float) -> str:
+@trading_tool(TRADE_TOOL_CONCURRENCY)
+async def buy_asset(symbol: str, amount_usd: float) -> str:
     """Buy an asset using USD. Updates balances in database."""
     try:
         if not db_manager or not agent_user_id:
             return "❌ Database or agent not initialized"
 
+        not_ready = await trading_system_not_ready()
+        if not_ready:
+            return not_ready
+
         symbol = symbol.upper()
 
         # Validate amount
@@ -1033,10 +1391,10 @@ def buy_asset(symbol: str, amount_usd: float) -> str:
         if amount_usd > 1000:  # Safety limit
             return f"❌ Amount too large: ${amount_usd} (max $1000 per trade)"
 
-        # Get current price from real trading system
-        price_data = get_market_price_data(symbol)
+        # Get current price from the live price cache
+        price_data = get_market_price_data(symbol, TRADE_PRICE_MAX_AGE)
         if not price_data:
-            return f"❌ Cannot execute trade: Real-time price data not available for {symbol}\n💡 Please connect to a real trading system to execute trades"
+            return f"❌ Cannot execute trade: no live price for {symbol} in the last {TRADE_PRICE_MAX_AGE:.0f}s"
 
         current_price = price_data['price']
         asset_amount = amount_usd / current_price
@@ -1046,41 +1404,39 @@ def buy_asset(symbol: str, amount_usd: float) -> str:
         if base_currency == symbol:  # Handle other quote currencies
             base_currency = symbol[:3]
 
-        # Check USD balance
-        usd_balance_query = """
-            SELECT available_balance FROM user_balances
-            WHERE user_id = ? AND currency_code = 'USD'
-        """
-        usd_balance_rows = db_manager.execute_query(usd_balance_query, (agent_user_id,))
-
-        if not usd_balance_rows:
-            return "❌ No USD balance found"
-
-        available_usd = float(usd_balance_rows[0]['available_balance'])
-        if available_usd < amount_usd:
-            return f"❌ Insufficient USD balance. Available: ${available_usd:.2f}, Required: ${amount_usd:.2f}"
-
         # Calculate fee (0.1%)
         fee_amount = amount_usd * 0.001
         net_amount_usd = amount_usd + fee_amount
+        trade_id = str(uuid.uuid4()).replace('-', '')
+        description = f"Buy {asset_amount:.8f} {base_currency} for ${amount_usd:.2f} @ ${current_price:.2f}"
+
+        def execute_buy(conn: sqlite3.Connection) -> None:
+            # Balance check and updates share one write transaction, so
+            # concurrent buys cannot both spend the same USD
+            row = conn.execute("""
+                SELECT available_balance FROM user_balances
+                WHERE user_id = ? AND currency_code = 'USD'
+            """, (agent_user_id,)).fetchone()
+            if not row:
+                raise TradeRejected("No USD balance found")
 
-        if available_usd < net_amount_usd:
-            return f"❌ Insufficient USD for trade + fees. Available: ${available_usd:.2f}, Required: ${net_amount_usd:.2f}"
+            available_usd = float(row['available_balance'])
+            if available_usd < amount_usd:
+                raise TradeRejected(f"Insufficient USD balance. Available: ${available_usd:.2f}, Required: ${amount_usd:.2f}")
+            if available_usd < net_amount_usd:
+                raise TradeRejected(f"Insufficient USD for trade + fees. Available: ${available_usd:.2f}, Required: ${net_amount_usd:.2f}")
 
-        # Execute the trade in database
-        try:
             # 1. Deduct USD
-            usd_update_query = """
+            conn.execute("""
                 UPDATE user_balances
                 SET available_balance = available_balance - ?,
                     total_balance = total_balance - ?,
                     updated_at = CURRENT_TIMESTAMP
                 WHERE user_id = ? AND currency_code = 'USD'
-            """
-            db_manager.execute_update(usd_update_query, (net_amount_usd, net_amount_usd, agent_user_id))
+            """, (net_amount_usd, net_amount_usd, agent_user_id))
 
             # 2. Add asset
-            asset_update_query = """
+            conn.execute("""
                 INSERT OR REPLACE INTO user_balances
                 (user_id, currency_code, total_balance, available_balance, locked_balance, updated_at)
                 VALUES (?, ?,
@@ -1088,57 +1444,59 @@ def buy_asset(symbol: str, amount_usd: float) -> str:
                     COALESCE((SELECT available_balance FROM user_balances WHERE user_id = ? AND currency_code = ?), 0) + ?,
                     COALESCE((SELECT locked_balance FROM user_balances WHERE user_id = ? AND currency_code = ?), 0),
                     CURRENT_TIMESTAMP)
-            """
-            db_manager.execute_update(asset_update_query,
-                (agent_user_id, base_currency, agent_user_id, base_currency, asset_amount,
-                 agent_user_id, base_currency, asset_amount, agent_user_id, base_currency))
+            """, (agent_user_id, base_currency, agent_user_id, base_currency, asset_amount,
+                  agent_user_id, base_currency, asset_amount, agent_user_id, base_currency))
 
             # 3. Record transaction
-            trade_id = str(uuid.uuid4()).replace('-', '')
-            transaction_query = """
+            conn.execute("""
                 INSERT INTO transactions
                 (id, user_id, transaction_type, status, amount, currency_code, fee_amount, fee_currency_code,
                  description, created_at, processed_at)
                 VALUES (?, ?, 'trade_buy', 'completed', ?, ?, ?, 'USD', ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            """
-            description = f"Buy {asset_amount:.8f} {base_currency} for ${amount_usd:.2f} @ ${current_price:.2f}"
-            db_manager.execute_update(transaction_query,
-                (trade_id, agent_user_id, asset_amount, base_currency, fee_amount, description))
-
-            result = f"✅ BUY ORDER EXECUTED\n"
-            result += "=" * 25 + "\n"
-            result += f"💰 Purchased: {asset_amount:.8f} {base_currency}\n"
-            result += f"💵 Cost: ${amount_usd:.2f}\n"
-            result += f"📊 Price: ${current_price:.2f}\n"
-            result += f"💸 Fee: ${fee_amount:.2f}\n"
-            result += f"🆔 Transaction ID: {trade_id[:8]}...\n"
-            result += f"⏰ Executed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-
-            return result
+            """, (trade_id, agent_user_id, asset_amount, base_currency, fee_amount, description))
 
+        try:
+            await db_manager.transaction(execute_buy)
+        except TradeRejected as e:
+            return f"❌ {e}"
         except Exception as e:
             return f"❌ Trade execution failed: {str(e)}"
 
+        result = f"✅ BUY ORDER EXECUTED\n"
+        result += "=" * 25 + "\n"
+        result += f"💰 Purchased: {asset_amount:.8f} {base_currency}\n"
+        result += f"💵 Cost: ${amount_usd:.2f}\n"
+        result += f"📊 Price: ${current_price:.2f}\n"
+        result += f"💸 Fee: ${fee_amount:.2f}\n"
+        result += f"🆔 Transaction ID: {trade_id[:8]}...\n"
+        result += f"⏰ Executed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+
+        return result
+
     except Exception as e:
         return f"❌ Error processing buy order: {str(e)}"
 
-@mcp.tool()
-def sell_asset(symbol: str, amount: float) -> str:
+@trading_tool(TRADE_TOOL_CONCURRENCY)
+async def sell_asset(symbol: str, amount: float) -> str:
     """Sell an asset for USD. Updates balances in database."""
     try:
         if not db_manager or not agent_user_id:
             return "❌ Database or agent not initialized"
 
+        not_ready = await trading_system_not_ready()
+        if not_ready:
+            return not_ready
+
         symbol = symbol.upper()
 
         # Validate amount
         if amount <= 0:
             return f"❌ Invalid amount: {amount}"
 
-        # Get current price from real trading system
-        price_data = get_market_price_data(symbol)
+        # Get current price from the live price cache
+        price_data = get_market_price_data(symbol, TRADE_PRICE_MAX_AGE)
         if not price_data:
-            return f"❌ Cannot execute trade: Real-time price data not available for {symbol}\n💡 Please connect to a real trading system to execute trades"
+            return f"❌ Cannot execute trade: no live price for {symbol} in the last {TRADE_PRICE_MAX_AGE:.0f}s"
 
         current_price = price_data['price']
         usd_value = amount * current_price
@@ -1148,38 +1506,35 @@ def sell_asset(symbol: str, amount: float) -> str:
         if base_currency == symbol:
             base_currency = symbol[:3]
 
-        # Check asset balance
-        asset_balance_query = """
-            SELECT available_balance FROM user_balances
-            WHERE user_id = ? AND currency_code = ?
-        """
-        asset_balance_rows = db_manager.execute_query(asset_balance_query, (agent_user_id, base_currency))
-
-        if not asset_balance_rows:
-            return f"❌ No {base_currency} balance found"
-
-        available_amount = float(asset_balance_rows[0]['available_balance'])
-        if available_amount < amount:
-            return f"❌ Insufficient {base_currency} balance. Available: {available_amount:.8f}, Required: {amount:.8f}"
-
         # Calculate fee (0.1%)
         fee_amount = usd_value * 0.001
         net_usd_received = usd_value - fee_amount
+        trade_id = str(uuid.uuid4()).replace('-', '')
+        description = f"Sell {amount:.8f} {base_currency} for ${usd_value:.2f} @ ${current_price:.2f}"
+
+        def execute_sell(conn: sqlite3.Connection) -> None:
+            row = conn.execute("""
+                SELECT available_balance FROM user_balances
+                WHERE user_id = ? AND currency_code = ?
+            """, (agent_user_id, base_currency)).fetchone()
+            if not row:
+                raise TradeRejected(f"No {base_currency} balance found")
+
+            available_amount = float(row['available_balance'])
+            if available_amount < amount:
+                raise TradeRejected(f"Insufficient {base_currency} balance. Available: {available_amount:.8f}, Required: {amount:.8f}")
 
-        # Execute the trade
-        try:
             # 1. Deduct asset
-            asset_update_query = """
+            conn.execute("""
                 UPDATE user_balances
                 SET available_balance = available_balance - ?,
                     total_balance = total_balance - ?,
                     updated_at = CURRENT_TIMESTAMP
                 WHERE user_id = ? AND currency_code = ?
-            """
-            db_manager.execute_update(asset_update_query, (amount, amount, agent_user_id, base_currency))
+            """, (amount, amount, agent_user_id, base_currency))
 
             # 2. Add USD
-            usd_update_query = """
+            conn.execute("""
                 INSERT OR REPLACE INTO user_balances
                 (user_id, currency_code, total_balance, available_balance, locked_balance, updated_at)
                 VALUES (?, 'USD',
@@ -1187,36 +1542,34 @@ def sell_asset(symbol: str, amount: float) -> str:
                     COALESCE((SELECT available_balance FROM user_balances WHERE user_id = ? AND currency_code = 'USD'), 0) + ?,
                     COALESCE((SELECT locked_balance FROM user_balances WHERE user_id = ? AND currency_code = 'USD'), 0),
                     CURRENT_TIMESTAMP)
-            """
-            db_manager.execute_update(usd_update_query,
-                (agent_user_id, agent_user_id, net_usd_received, agent_user_id, net_usd_received, agent_user_id))
+            """, (agent_user_id, agent_user_id, net_usd_received, agent_user_id, net_usd_received, agent_user_id))
 
             # 3. Record transaction
-            trade_id = str(uuid.uuid4()).replace('-', '')
-            transaction_query = """
+            conn.execute("""
                 INSERT INTO transactions
                 (id, user_id, transaction_type, status, amount, currency_code, fee_amount, fee_currency_code,
                  description, created_at, processed_at)
                 VALUES (?, ?, 'trade_sell', 'completed', ?, ?, ?, 'USD', ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            """
-            description = f"Sell {amount:.8f} {base_currency} for ${usd_value:.2f} @ ${current_price:.2f}"
-            db_manager.execute_update(transaction_query,
-                (trade_id, agent_user_id, amount, base_currency, fee_amount, description))
-
-            result = f"✅ SELL ORDER EXECUTED\n"
-            result += "=" * 25 + "\n"
-            result += f"📉 Sold: {amount:.8f} {base_currency}\n"
-            result += f"💵 Received: ${net_usd_received:.2f}\n"
-            result += f"📊 Price: ${current_price:.2f}\n"
-            result += f"💸 Fee: ${fee_amount:.2f}\n"
-            result += f"🆔 Transaction ID: {trade_id[:8]}...\n"
-            result += f"⏰ Executed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-
-            return result
+            """, (trade_id, agent_user_id, amount, base_currency, fee_amount, description))
 
+        try:
+            await db_manager.transaction(execute_sell)
+        except TradeRejected as e:
+            return f"❌ {e}"
         except Exception as e:
             return f"❌ Trade execution failed: {str(e)}"
 
+        result = f"✅ SELL ORDER EXECUTED\n"
+        result += "=" * 25 + "\n"
+        result += f"📉 Sold: {amount:.8f} {base_currency}\n"
+        result += f"💵 Received: ${net_usd_received:.2f}\n"
+        result += f"📊 Price: ${current_price:.2f}\n"
+        result += f"💸 Fee: ${fee_amount:.2f}\n"
+        result += f"🆔 Transaction ID: {trade_id[:8]}...\n"
+        result += f"⏰ Executed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+
+        return result
+
     except Exception as e:
         return f"❌ Error processing sell order: {str(e)}"
 
@@ -1224,8 +1577,8 @@ def sell_asset(symbol: str, amount: float) -> str:
 # MCP TOOLS - TRADING HISTORY
 # =============================================================================
 
-@mcp.tool()
-def get_my_trades() -> str:
+@trading_tool()
+async def get_my_trades() -> str:
     """Get recent trading history for agent_1."""
     try:
         if not db_manager or not agent_user_id:
@@ -1240,7 +1593,7 @@ def get_my_trades() -> str:
             LIMIT 10
         """
 
-        trades = db_manager.execute_query(query, (agent_user_id,))
+        trades = await db_manager.query(query, (agent_user_id,))
 
         if not trades:
             return "📋 No trading history found for agent_1"
@@ -1270,8 +1623,8 @@ def get_my_trades() -> str:
 # MCP TOOLS - SMART TRADING
 # =============================================================================
 
-@mcp.tool()
-def execute_smart_trade(command: str) -> str:
+@trading_tool()
+async def execute_smart_trade(command: str) -> str:
     """Execute a natural language trading command (e.g., 'buy $100 of bitcoin', 'sell half my ethereum')."""
     try:
         command = command.lower().strip()
@@ -1294,7 +1647,7 @@ def execute_smart_trade(command: str) -> str:
 
             if usd_match:
                 amount_usd = float(usd_match.group(1))
-                return buy_asset(symbol, amount_usd)
+                return await buy_asset(symbol, amount_usd)
             else:
                 return "❓ Could not parse USD amount. Try: 'buy $100 of bitcoin'"
 
@@ -1330,7 +1683,7 @@ def execute_smart_trade(command: str) -> str:
                     SELECT available_balance FROM user_balances
                     WHERE user_id = ? AND currency_code = ?
                 """
-                balance_rows = db_manager.execute_query(balance_query, (agent_user_id, currency))
+                balance_rows = await db_manager.query(balance_query, (agent_user_id, currency))
                 if balance_rows:
                     amount = float(balance_rows[0]['available_balance']) * 0.5
                 else:
@@ -1341,7 +1694,7 @@ def execute_smart_trade(command: str) -> str:
                     SELECT available_balance FROM user_balances
                     WHERE user_id = ? AND currency_code = ?
                 """
-                balance_rows = db_manager.execute_query(balance_query, (agent_user_id, currency))
+                balance_rows = await db_manager.query(balance_query, (agent_user_id, currency))
                 if balance_rows:
                     amount = float(balance_rows[0]['available_balance'])
                 else:
@@ -1354,31 +1707,31 @@ def execute_smart_trade(command: str) -> str:
                 else:
                     return "❓ Could not parse amount. Try: 'sell 0.1 bitcoin' or 'sell half my ethereum'"
 
-            return sell_asset(symbol, amount)
+            return await sell_asset(symbol, amount)
 
         # Parse balance/portfolio commands
         elif any(word in command for word in ['balance', 'portfolio', 'holdings']):
             if 'summary' in command or 'portfolio' in command:
-                return get_portfolio_summary()
+                return await get_portfolio_summary()
             else:
-                return get_my_balances()
+                return await get_my_balances()
 
         # Parse price commands
         elif 'price' in command:
             if 'bitcoin' in command or 'btc' in command:
-                return get_market_price('BTCUSD')
+                return await get_market_price('BTCUSD')
             elif 'ethereum' in command or 'eth' in command:
-                return get_market_price('ETHUSD')
+                return await get_market_price('ETHUSD')
             elif 'solana' in command or 'sol' in command:
-                return get_market_price('SOLUSD')
+                return await get_market_price('SOLUSD')
             elif 'cardano' in command or 'ada' in command:
-                return get_market_price('ADAUSD')
+                return await get_market_price('ADAUSD')
             else:
                 return "❓ Which asset price? Try: 'bitcoin price' or 'ethereum price'"
 
         # Parse trade history
         elif 'trades' in command or 'history' in command:
-            return get_my_trades()
+            return await get_my_trades()
 
         else:
             return "❓ Command not understood. Try: 'buy $100 bitcoin', 'sell half ethereum', 'show balance', 'bitcoin price'"
@@ -1390,8 +1743,8 @@ def execute_smart_trade(command: str) -> str:
 # MCP TOOLS - FILE ACCESS (kept for compatibility)
 # =============================================================================
 
-@mcp.tool()
-def read_file(file_path: str) -> str:
+@trading_tool(http=False)
+async def read_file(file_path: str) -> str:
     """Read contents of a file from the local repository."""
     try:
         path = Path(file_path)
@@ -1409,8 +1762,7 @@ def read_file(file_path: str) -> str:
         if not path.is_file():
             return f"❌ Error: Path is not a file: {file_path}"
 
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = await asyncio.to_thread(path.read_text, encoding='utf-8')
 
         return f"📄 File: {file_path}\n\n{content}"
 
@@ -1422,7 +1774,7 @@ def read_file(file_path: str) -> str:
 # =============================================================================
 
 @mcp.resource("agent://balances")
-def agent_balances() -> str:
+async def agent_balances() -> str:
     """Current agent balances resource."""
     if not db_manager or not agent_user_id:
         return json.dumps({"error": "Agent not initialized"})
@@ -1433,15 +1785,15 @@ def agent_balances() -> str:
             FROM user_balances ub
             WHERE ub.user_id = ? AND ub.total_balance > 0
         """
-        balances = db_manager.execute_query(query, (agent_user_id,))
+        balances = await db_manager.query(query, (agent_user_id,))
         return json.dumps({"agent": AGENT_USERNAME, "balances": balances}, default=str)
     except Exception as e:
         return json.dumps({"error": str(e)})
 
 @mcp.resource("market://prices")
-def market_prices() -> str:
+async def market_prices() -> str:
     """Current market prices resource."""
-    symbols = ['BTCUSD', 'ETHUSD', 'SOLUSD', 'ADAUSD']
+    symbols = price_service.symbols if price_service else []
     prices = {}
 
     for symbol in symbols:
@@ -1449,14 +1801,76 @@ def market_prices() -> str:
         if price_data:
             prices[symbol] = price_data
         else:
-            prices[symbol] = {"error": "Real-time data not available"}
+            prices[symbol] = {"error": "No live price within the staleness limit"}
 
     return json.dumps({
         "prices": prices,
         "timestamp": datetime.now().isoformat(),
-        "note": "Connect to real trading system for live prices"
+        "max_age_seconds": PRICE_MAX_AGE
     })
 
+# =============================================================================
+# HTTP JSON-RPC DISPATCH
+# =============================================================================
+
+def rpc_error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    """Build a JSON-RPC error response."""
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+async def dispatch_rpc(message: Any) -> Dict[str, Any]:
+    """Execute one JSON-RPC ``tools/call`` request through the tool registry."""
+    if not isinstance(message, dict):
+        return rpc_error(None, -32600, "Invalid request")
+
+    request_id = message.get("id", 1)
+    if message.get("method") != "tools/call":
+        return rpc_error(request_id, -32601, f"Method not found: {message.get('method')}")
+
+    params = message.get("params") or {}
+    if not isinstance(params, dict):
+        return rpc_error(request_id, -32602, "Invalid params: params must be an object")
+    tool_name = params.get("name")
+    if not isinstance(tool_name, str):
+        return rpc_error(request_id, -32602, "Invalid params: name must be a string")
+    spec = TOOL_REGISTRY.get(tool_name)
+    if spec is None:
+        return rpc_error(request_id, -32602, f"Unknown tool: {tool_name}")
+
+    try:
+        kwargs = spec.bind(params.get("arguments") or {})
+    except ValueError as e:
+        return rpc_error(request_id, -32602, f"Invalid params for {tool_name}: {e}")
+
+    try:
+        result = await spec.func(**kwargs)
+    except Exception as e:
+        return rpc_error(request_id, -32603, str(e))
+
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {
+            "content": [{"type": "text", "text": result}]
+        }
+    }
+
+
+async def dispatch_rpc_batch(messages: List[Any]) -> List[Dict[str, Any]]:
+    """Execute a JSON-RPC batch concurrently; responses keep the request order."""
+    return list(await asyncio.gather(*(dispatch_rpc(message) for message in messages)))
+
+
+async def dispatch_rpc_body(body: Any) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """Execute a parsed request body: one call, or a batch of up to ``MAX_RPC_BATCH_SIZE``."""
+    if not isinstance(body, list):
+        return await dispatch_rpc(body)
+    if not body:
+        return rpc_error(None, -32600, "Empty batch")
+    if len(body) > MAX_RPC_BATCH_SIZE:
+        return rpc_error(None, -32600, f"Batch too large (max {MAX_RPC_BATCH_SIZE} calls)")
+    return await dispatch_rpc_batch(body)
+
 # =============================================================================
 # MAIN EXECUTION
 # =============================================================================
@@ -1501,74 +1915,13 @@ async def main_async():
 
         # Add a simple MCP tool endpoint for debugging
         async def mcp_tool_handler(request):
-            """Handle MCP tool calls directly via HTTP."""
+            """Handle MCP tool calls (single or JSON-RPC batch) directly via HTTP."""
             try:
-                if request.method == "POST":
-                    body = await request.json()
-
-                    # Extract tool name and arguments
-                    if "method" in body and body["method"] == "tools/call":
-                        params = body.get("params", {})
-                        tool_name = params.get("name")
-                        arguments = params.get("arguments", {})
-
-                        # Call the appropriate tool
-                        if tool_name == "ping":
-                            result = ping()
-                        elif tool_name == "debug_agent_info":
-                            result = debug_agent_info()
-                        elif tool_name == "get_my_balances":
-                            result = get_my_balances()
-                        elif tool_name == "get_portfolio_summary":
-                            result = get_portfolio_summary()
-                        elif tool_name == "get_all_asset_positions":
-                            result = get_all_asset_positions()
-                        elif tool_name == "get_market_price":
-                            symbol = arguments.get("symbol", "BTCUSD")
-                            result = get_market_price(symbol)
-                        elif tool_name == "get_available_pairs":
-                            result = get_available_pairs()
-                        elif tool_name == "buy_asset":
-                            symbol = arguments.get("symbol", "BTCUSD")
-                            amount_usd = arguments.get("amount_usd", 0)
-                            result = buy_asset(symbol, amount_usd)
-                        elif tool_name == "sell_asset":
-                            symbol = arguments.get("symbol", "BTCUSD")
-                            amount = arguments.get("amount", 0)
-                            result = sell_asset(symbol, amount)
-                        elif tool_name == "get_my_trades":
-                            result = get_my_trades()
-                        elif tool_name == "execute_smart_trade":
-                            command = arguments.get("command", "")
-                            result = execute_smart_trade(command)
-                        elif tool_name == "get_server_status":
-                            result = get_server_status()
-                        else:
-                            result = f"❌ Unknown tool: {tool_name}"
-
-                        # Return MCP-formatted response
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id", 1),
-                            "result": {
-                                "content": [{"type": "text", "text": result}]
-                            }
-                        })
-                    else:
-                        return JSONResponse({
-                            "jsonrpc": "2.0",
-                            "id": body.get("id", 1),
-                            "error": {"code": -1, "message": "Invalid method"}
-                        })
-                else:
-                    return JSONResponse({"error": "Only POST method supported"})
+                body = await request.json()
+            except Exception:
+                return JSONResponse(rpc_error(None, -32700, "Parse error"))
 
-            except Exception as e:
-                return JSONResponse({
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "error": {"code": -1, "message": str(e)}
-                })
+            return JSONResponse(await dispatch_rpc_body(body))
 
         # Add the MCP tool handler
         routes.append(Route("/mcp", mcp_tool_handler, methods=["POST"]))
@@ -15,8 +15,9 @@ import asyncio
 import sys
 import json
 import time
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 # Import HTTP client
@@ -27,70 +28,191 @@ except ImportError as e:
     print("❌ Missing httpx. Install with: pip install httpx")
     sys.exit(1)
 
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+MAX_CONCURRENT_CALLS = 8  # in-flight requests per client
+LATENCY_SAMPLES = 256  # recent round trips kept per tool
+
+
+class ToolLatency:
+    """Round-trip times for one tool, in milliseconds."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.samples = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, elapsed_ms: float, ok: bool):
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        self.samples.append(elapsed_ms)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        count = len(ordered)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": round(sum(ordered) / count, 1) if count else 0.0,
+            "p50_ms": round(ordered[count // 2], 1) if count else 0.0,
+            "p95_ms": round(ordered[min(count - 1, int(count * 0.95))], 1) if count else 0.0,
+            "max_ms": round(ordered[-1], 1) if count else 0.0,
+        }
+
+
 # Enhanced MCP client for agent_1
 class Agent1MCPClient:
-    """MCP client specifically designed for agent_1 trading."""
+    """
+    MCP client specifically designed for agent_1 trading.
 
-    def __init__(self, server_url: str):
+    One pooled HTTP client is reused for every call (keep-alive, and HTTP/2
+    when available), so calls do not pay connection setup. ``call_tool``
+    may be awaited concurrently; at most ``max_concurrent`` requests are in
+    flight. ``call_tools`` sends several calls as one JSON-RPC batch.
+    """
+
+    def __init__(self, server_url: str, max_concurrent: int = MAX_CONCURRENT_CALLS):
         self.server_url = server_url
-        self.http_client = httpx.AsyncClient(timeout=60.0)
+        self.http_client = httpx.AsyncClient(
+            timeout=60.0,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_concurrent,
+                max_keepalive_connections=max_concurrent,
+                keepalive_expiry=30.0
+            ),
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json"
+            }
+        )
         self.request_id = 1
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.latency: Dict[str, ToolLatency] = {}
+
+    def _build_request(self, tool_name: str, arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create a proper MCP JSON-RPC request."""
+        request_data = {
+            "jsonrpc": "2.0",
+            "id": self.request_id,
+            "method": "tools/call",
+            "params": {
+                "name": tool_name,
+                "arguments": arguments or {}
+            }
+        }
+        self.request_id += 1
+        return request_data
+
+    @staticmethod
+    def _parse_result(result: Any) -> str:
+        """Extract the text from a JSON-RPC response."""
+        if not isinstance(result, dict):
+            return str(result)
+
+        # Handle MCP response format
+        if "result" in result:
+            tool_result = result["result"]
+
+            # Handle MCP content format
+            if isinstance(tool_result, dict) and "content" in tool_result:
+                content = tool_result["content"]
+                if isinstance(content, list) and len(content) > 0:
+                    return content[0].get("text", str(tool_result))
+                else:
+                    return str(content)
+            else:
+                return str(tool_result)
+        elif "error" in result:
+            return f"❌ MCP Error: {result['error']['message']}"
+        else:
+            return str(result)
+
+    def _record(self, tool_name: str, started: float, result: str):
+        stats = self.latency.get(tool_name)
+        if stats is None:
+            stats = self.latency[tool_name] = ToolLatency()
+        stats.record((time.perf_counter() - started) * 1000, not result.startswith("❌"))
+
+    async def _post(self, payload: Any) -> httpx.Response:
+        async with self.semaphore:
+            return await self.http_client.post(f"{self.server_url}/mcp", json=payload)
 
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any] = None) -> str:
         """Call an MCP tool via the direct MCP endpoint."""
+        started = time.perf_counter()
         try:
-            # Create proper MCP JSON-RPC request
-            request_data = {
-                "jsonrpc": "2.0",
-                "id": self.request_id,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments or {}
-                }
-            }
-            self.request_id += 1
-
-            # Try the direct MCP endpoint first
-            response = await self.http_client.post(
-                f"{self.server_url}/mcp",
-                json=request_data,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json"
-                }
-            )
+            response = await self._post(self._build_request(tool_name, arguments))
 
             if response.status_code == 200:
                 try:
-                    result = response.json()
-
-                    # Handle MCP response format
-                    if "result" in result:
-                        tool_result = result["result"]
-
-                        # Handle MCP content format
-                        if isinstance(tool_result, dict) and "content" in tool_result:
-                            content = tool_result["content"]
-                            if isinstance(content, list) and len(content) > 0:
-                                return content[0].get("text", str(tool_result))
-                            else:
-                                return str(content)
-                        else:
-                            return str(tool_result)
-                    elif "error" in result:
-                        return f"❌ MCP Error: {result['error']['message']}"
-                    else:
-                        return str(result)
-
+                    result = self._parse_result(response.json())
                 except json.JSONDecodeError:
                     # If JSON parsing fails, return the raw text
-                    return response.text
+                    result = response.text
             else:
-                return f"❌ HTTP Error {response.status_code}: {response.text[:200]}"
+                result = f"❌ HTTP Error {response.status_code}: {response.text[:200]}"
+
+        except Exception as e:
+            result = f"❌ Tool call error: {str(e)}"
 
+        self._record(tool_name, started, result)
+        return result
+
+    async def call_tools(self, calls: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[str]:
+        """
+        Call several tools in one JSON-RPC batch request.
+
+        Results are returned in the order of ``calls``. If the server
+        answers the batch with a single JSON object it rejected the batch
+        format without running anything, so the calls are made concurrently
+        instead. Any other failure is reported for each call and nothing is
+        re-sent, since the server may already have executed some calls.
+        """
+        if not calls:
+            return []
+        requests = [self._build_request(name, arguments) for name, arguments in calls]
+        started = time.perf_counter()
+        body = None
+        try:
+            response = await self._post(requests)
+            if response.status_code == 200:
+                try:
+                    body = response.json()
+                    error = f"❌ MCP Error: unexpected batch response: {response.text[:200]}"
+                except json.JSONDecodeError:
+                    error = f"❌ MCP Error: invalid batch response: {response.text[:200]}"
+            else:
+                error = f"❌ HTTP Error {response.status_code}: {response.text[:200]}"
         except Exception as e:
-            return f"❌ Tool call error: {str(e)}"
+            error = f"❌ Tool call error: {str(e)}"
+
+        if isinstance(body, dict):
+            return list(await asyncio.gather(*(self.call_tool(name, arguments) for name, arguments in calls)))
+
+        if not isinstance(body, list):
+            for name, _ in calls:
+                self._record(name, started, error)
+            return [error] * len(calls)
+
+        by_id = {item.get("id"): item for item in body if isinstance(item, dict)}
+        results = []
+        for (name, _), request in zip(calls, requests):
+            item = by_id.get(request["id"])
+            result = self._parse_result(item) if item else "❌ MCP Error: missing batch response"
+            self._record(name, started, result)
+            results.append(result)
+        return results
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-tool call counts and round-trip latency percentiles."""
+        return {name: stats.summary() for name, stats in sorted(self.latency.items())}
 
     async def health_check(self) -> bool:
         """Check server health."""
@@ -205,6 +327,8 @@ class Agent1TradingBot:
         result = await self.mcp_client.call_tool("debug_agent_info")
         print(f"🔍 Debug result: {result[:200]}...")
         return result
+
+    async def get_my_trades(self) -> str:
         """Get trading history."""
         print("📋 Getting my trading history...")
         result = await self.mcp_client.call_tool("get_my_trades")
@@ -220,16 +344,15 @@ class Agent1TradingBot:
         print("📊 PORTFOLIO CHECK")
         print("=" * 30)
 
-        # Check balances
-        await self.check_my_balances()
-        await asyncio.sleep(1)
-
-        # Get portfolio summary
-        await self.get_portfolio_summary()
-        await asyncio.sleep(1)
-
-        # Check recent trades
-        await self.get_my_trades()
+        # Balances, summary and trades in one batch request
+        balances, portfolio, trades = await self.mcp_client.call_tools([
+            ("get_my_balances", None),
+            ("get_portfolio_summary", None),
+            ("get_my_trades", None),
+        ])
+        print(f"📊 Balance result: {balances[:150]}...")
+        print(f"📈 Portfolio: {portfolio[:150]}...")
+        print(f"📈 Trade history: {trades[:100]}...")
 
         print("✅ Portfolio check complete!")
 
@@ -240,9 +363,11 @@ class Agent1TradingBot:
 
         symbols = ['BTCUSD', 'ETHUSD', 'SOLUSD', 'ADAUSD']
 
-        for symbol in symbols:
-            await self.get_market_price(symbol)
-            await asyncio.sleep(0.5)
+        results = await self.mcp_client.call_tools([
+            ("get_market_price", {"symbol": symbol}) for symbol in symbols
+        ])
+        for symbol, result in zip(symbols, results):
+            print(f"💹 {symbol}: {result[:100]}...")
 
         print("✅ Market analysis complete!")
 
@@ -437,20 +562,20 @@ class Agent1TradingBot:
         print("🚀 FULL TRADING WORKFLOW")
         print("=" * 35)
 
+        # Read-only steps fan out together; trading steps run in order
         workflows = [
-            ("Initial Portfolio Assessment", self.run_portfolio_check),
-            ("Market Analysis", self.run_market_analysis),
-            ("Conservative Trading", self.run_conservative_trading_demo),
-            ("Smart Trading Commands", self.run_smart_trading_demo),
-            ("Final Portfolio Review", self.run_portfolio_check)
+            ("Initial Assessment & Market Analysis", [self.run_portfolio_check, self.run_market_analysis]),
+            ("Conservative Trading", [self.run_conservative_trading_demo]),
+            ("Smart Trading Commands", [self.run_smart_trading_demo]),
+            ("Final Portfolio Review", [self.run_portfolio_check])
         ]
 
-        for i, (name, workflow_func) in enumerate(workflows, 1):
+        for i, (name, workflow_funcs) in enumerate(workflows, 1):
             print(f"\n{'='*50}")
             print(f"WORKFLOW {i}/{len(workflows)}: {name.upper()}")
             print(f"{'='*50}")
 
-            await workflow_func()
+            await asyncio.gather(*(workflow_func() for workflow_func in workflow_funcs))
 
             if i < len(workflows):
                 print(f"\n⏸️ Workflow {i} complete. Continuing in 3 seconds...")
@@ -465,6 +590,12 @@ class Agent1TradingBot:
         print(f"🧹 Cleaning up {self.agent_name} Trading Bot...")
 
         if self.mcp_client:
+            stats = self.mcp_client.latency_stats()
+            if stats:
+                print("⏱️ Tool latency:")
+                for tool_name, summary in stats.items():
+                    print(f"   {tool_name:<24} {summary['calls']:>4} calls  "
+                          f"p50 {summary['p50_ms']:>7.1f} ms  p95 {summary['p95_ms']:>7.1f} ms")
             await self.mcp_client.close()
             print("✅ MCP client closed")
 
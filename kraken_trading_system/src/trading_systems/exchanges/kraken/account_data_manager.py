@@ -6,8 +6,11 @@ Integrates with the WebSocket client to provide structured account data access.
 """
 
 import asyncio
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 from collections import defaultdict, deque
 
 from ...utils.logger import LoggerMixin
@@ -20,6 +23,31 @@ from .account_models import (
     parse_open_orders_message,
     parse_own_trades_message
 )
+from .trade_aggregates import RollingTradeAggregates
+from .trade_store import ColumnarTradeStore
+
+
+@lru_cache(maxsize=1024)
+def get_pair_currencies(pair: str) -> Tuple[str, str]:
+    """
+    Split a trading pair symbol into (base, quote) currencies.
+    
+    Handles both "XBT/USD" and compact "XBTUSD" forms. Results are cached,
+    so each distinct pair string is parsed once.
+    """
+    if '/' in pair:
+        base, quote = pair.split('/', 1)
+        return base, quote
+    return pair[:3], pair[3:]
+
+
+@dataclass
+class CurrencyExposure:
+    """Pending open-order volume and counts for one currency."""
+    buy_orders: int = 0
+    sell_orders: int = 0
+    buy_volume: Decimal = Decimal('0')
+    sell_volume: Decimal = Decimal('0')
 
 
 class AccountDataManager(LoggerMixin):
@@ -33,7 +61,13 @@ class AccountDataManager(LoggerMixin):
     - Tracks order and trade history
     """
     
-    def __init__(self, max_trade_history: int = 1000, max_order_history: int = 500):
+    def __init__(
+        self,
+        max_trade_history: int = 1000,
+        max_order_history: int = 500,
+        aggregate_retention_hours: int = 168,
+        trade_store_capacity: Optional[int] = None
+    ):
         super().__init__()
         
         # Current account state
@@ -48,6 +82,20 @@ class AccountDataManager(LoggerMixin):
         self._trades_by_pair: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
         self._orders_by_pair: Dict[str, Set[str]] = defaultdict(set)
         
+        # Columnar copy of trade history for vectorized analytics
+        self._trade_store = ColumnarTradeStore(trade_store_capacity or max_trade_history)
+        
+        # Open-order exposure by base currency, plus each order's contribution
+        self._exposure: Dict[str, CurrencyExposure] = defaultdict(CurrencyExposure)
+        self._order_exposure: Dict[str, Tuple[str, str, Decimal]] = {}
+        
+        # Minute-bucketed trade aggregates for summaries (independent of history caps)
+        aggregate_retention_minutes = aggregate_retention_hours * 60
+        self._trade_aggregates = RollingTradeAggregates(aggregate_retention_minutes)
+        self._trade_aggregates_by_pair: Dict[str, RollingTradeAggregates] = defaultdict(
+            lambda: RollingTradeAggregates(aggregate_retention_minutes)
+        )
+        
         # State tracking
         self._last_update = datetime.now()
         self._update_count = 0
@@ -84,6 +132,9 @@ class AccountDataManager(LoggerMixin):
                 # Add to trade history
                 self._trade_history.append(trade)
                 self._trades_by_pair[trade.pair].append(trade)
+                self._trade_store.append(trade)
+                self._trade_aggregates.add_trade(trade)
+                self._trade_aggregates_by_pair[trade.pair].add_trade(trade)
                 
                 # Update statistics
                 self._stats['total_trades_processed'] += 1
@@ -127,6 +178,7 @@ class AccountDataManager(LoggerMixin):
                 # Update order state
                 self._open_orders[order.order_id] = order
                 self._orders_by_pair[order.pair].add(order.order_id)
+                self._update_order_exposure(order)
                 
                 # Track order changes
                 if old_order:
@@ -165,6 +217,7 @@ class AccountDataManager(LoggerMixin):
                         self._order_history.append(order)
                         del self._open_orders[order.order_id]
                         self._orders_by_pair[order.pair].discard(order.order_id)
+                        self._remove_order_exposure(order.order_id)
                         
                         self.log_info(
                             "Order moved to history",
@@ -185,6 +238,45 @@ class AccountDataManager(LoggerMixin):
         except Exception as e:
             self.log_error("Failed to process openOrders update", error=e)
     
+    def _update_order_exposure(self, order: KrakenOrder) -> None:
+        """Replace an order's contribution to the currency exposure index."""
+        self._remove_order_exposure(order.order_id)
+        
+        if order.type not in ('buy', 'sell'):
+            return
+        
+        base_currency, _ = get_pair_currencies(order.pair)
+        remaining = order.volume_remaining
+        exposure = self._exposure[base_currency]
+        
+        if order.type == 'buy':
+            exposure.buy_orders += 1
+            exposure.buy_volume += remaining
+        else:
+            exposure.sell_orders += 1
+            exposure.sell_volume += remaining
+        
+        self._order_exposure[order.order_id] = (base_currency, order.type, remaining)
+    
+    def _remove_order_exposure(self, order_id: str) -> None:
+        """Remove an order's contribution from the currency exposure index."""
+        contribution = self._order_exposure.pop(order_id, None)
+        if contribution is None:
+            return
+        
+        base_currency, side, remaining = contribution
+        exposure = self._exposure[base_currency]
+        
+        if side == 'buy':
+            exposure.buy_orders -= 1
+            exposure.buy_volume -= remaining
+        else:
+            exposure.sell_orders -= 1
+            exposure.sell_volume -= remaining
+        
+        if exposure.buy_orders == 0 and exposure.sell_orders == 0:
+            del self._exposure[base_currency]
+    
     async def process_balance_update(self, balance_data: Dict[str, Any]) -> None:
         """
         Process account balance update.
@@ -285,13 +377,14 @@ class AccountDataManager(LoggerMixin):
         """
         cutoff_time = datetime.now() - timedelta(hours=hours)
         
-        # Filter trades by time and pair
+        # Sum minute buckets covering the window (edges aligned to whole minutes)
         if pair:
-            recent_trades = [t for t in self._trades_by_pair.get(pair, []) if t.time >= cutoff_time]
+            aggregates = self._trade_aggregates_by_pair.get(pair)
+            summary = aggregates.summarize(cutoff_time) if aggregates else None
         else:
-            recent_trades = [t for t in self._trade_history if t.time >= cutoff_time]
+            summary = self._trade_aggregates.summarize(cutoff_time)
         
-        if not recent_trades:
+        if summary is None or summary.trade_count == 0:
             return {
                 'pair': pair or 'ALL',
                 'period_hours': hours,
@@ -305,29 +398,58 @@ class AccountDataManager(LoggerMixin):
                 'last_trade_time': None
             }
         
-        # Calculate statistics
-        from decimal import Decimal
-        total_volume = sum(t.volume for t in recent_trades)
-        total_fees = sum(t.fee for t in recent_trades)
-        buy_trades = len([t for t in recent_trades if t.type == 'buy'])
-        sell_trades = len([t for t in recent_trades if t.type == 'sell'])
-        
         # Volume-weighted average price
-        volume_price_sum = sum(t.volume * t.price for t in recent_trades)
-        avg_price = volume_price_sum / total_volume if total_volume > 0 else Decimal('0')
+        avg_price = summary.notional / summary.volume if summary.volume > 0 else Decimal('0')
         
         return {
             'pair': pair or 'ALL',
             'period_hours': hours,
-            'total_trades': len(recent_trades),
-            'total_volume': str(total_volume),
-            'total_fees': str(total_fees),
-            'buy_trades': buy_trades,
-            'sell_trades': sell_trades,
+            'total_trades': summary.trade_count,
+            'total_volume': str(summary.volume),
+            'total_fees': str(summary.fees),
+            'buy_trades': summary.buy_count,
+            'sell_trades': summary.sell_count,
             'avg_price': str(avg_price),
-            'first_trade_time': min(t.time for t in recent_trades),
-            'last_trade_time': max(t.time for t in recent_trades)
+            'first_trade_time': summary.first_time,
+            'last_trade_time': summary.last_time
+        }
+    
+    def get_trade_analytics(
+        self,
+        pair: Optional[str] = None,
+        hours: int = 24,
+        profile_bins: int = 20,
+        interval_seconds: int = 3600
+    ) -> Dict[str, Any]:
+        """
+        Get vectorized trade analytics from the columnar trade store.
+        
+        Args:
+            pair: Trading pair to filter by (None for all pairs)
+            hours: Number of hours to look back
+            profile_bins: Price bins for the volume profile (pair only)
+            interval_seconds: Bar size for per-interval aggregates
+            
+        Returns:
+            Dictionary with summary, VWAP, volume profile, realized spread
+            and per-interval aggregates (float precision)
+        """
+        since = datetime.now() - timedelta(hours=hours)
+        store = self._trade_store
+        
+        analytics = {
+            'pair': pair or 'ALL',
+            'period_hours': hours,
+            'summary': store.summary(pair, since),
+            'vwap': store.vwap(pair, since),
+            'intervals': store.interval_aggregates(interval_seconds, pair, since)
         }
+        
+        if pair:
+            analytics['volume_profile'] = store.volume_profile(pair, since, profile_bins)
+            analytics['realized_spread'] = store.realized_spread(pair, since)
+        
+        return analytics
     
     def get_position_summary(self) -> Dict[str, Any]:
         """
@@ -337,36 +459,21 @@ class AccountDataManager(LoggerMixin):
             Dictionary with position information
         """
         positions = {}
+        empty = CurrencyExposure()
         
         for currency, balance in self._current_balances.items():
             if balance.balance > 0 or balance.hold > 0:
-                # Count open orders for this currency
-                buy_orders = 0
-                sell_orders = 0
-                total_buy_volume = Decimal('0')
-                total_sell_volume = Decimal('0')
-                
-                for order in self._open_orders.values():
-                    # Check if this order involves the currency
-                    base_currency = order.pair.split('/')[0] if '/' in order.pair else order.pair[:3]
-                    quote_currency = order.pair.split('/')[1] if '/' in order.pair else order.pair[3:]
-                    
-                    if base_currency == currency:
-                        if order.type == 'sell':
-                            sell_orders += 1
-                            total_sell_volume += order.volume_remaining
-                        elif order.type == 'buy':
-                            buy_orders += 1
-                            total_buy_volume += order.volume_remaining
+                # Pending open-order exposure is maintained incrementally
+                exposure = self._exposure.get(currency, empty)
                 
                 positions[currency] = {
                     'balance': str(balance.balance),
                     'available': str(balance.available_balance),
                     'hold': str(balance.hold),
-                    'open_buy_orders': buy_orders,
-                    'open_sell_orders': sell_orders,
-                    'buy_volume_pending': str(total_buy_volume),
-                    'sell_volume_pending': str(total_sell_volume)
+                    'open_buy_orders': exposure.buy_orders,
+                    'open_sell_orders': exposure.sell_orders,
+                    'buy_volume_pending': str(exposure.buy_volume),
+                    'sell_volume_pending': str(exposure.sell_volume)
                 }
         
         return positions
@@ -382,7 +489,8 @@ class AccountDataManager(LoggerMixin):
             'last_update': self._last_update.isoformat(),
             'update_count': self._update_count,
             'initialization_complete': self._initialization_complete,
-            'tracked_pairs': list(self._trades_by_pair.keys())
+            'tracked_pairs': list(self._trades_by_pair.keys()),
+            'trade_aggregate_buckets': len(self._trade_aggregates)
         }
     
     def mark_initialization_complete(self) -> None:
@@ -405,6 +513,11 @@ class AccountDataManager(LoggerMixin):
         self._order_history.clear()
         self._trades_by_pair.clear()
         self._orders_by_pair.clear()
+        self._trade_store.clear()
+        self._trade_aggregates.clear()
+        self._trade_aggregates_by_pair.clear()
+        self._exposure.clear()
+        self._order_exposure.clear()
         
         self._last_update = datetime.now()
         self._update_count = 0
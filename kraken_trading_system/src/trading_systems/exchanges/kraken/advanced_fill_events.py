@@ -14,17 +14,26 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
 from typing import Dict, List, Optional, Any, Callable, Set, Tuple, Union
-from collections import deque, defaultdict
+from collections import deque, defaultdict, OrderedDict
+import inspect
 import statistics
+import tracemalloc
 import uuid
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 import threading
+import time
 
 # Imports for integration
 try:
     from .fill_processor import TradeFill, FillAnalytics, FillQuality, FillType
     from .realtime_analytics import RealTimeAnalyticsEngine, RiskAlert, AlertLevel
     from .order_models import EnhancedKrakenOrder, OrderState
+    from .fill_event_archive import FillEventArchive
+    from .fill_event_index import FillEventIndex, PairWindow, EventWindow
+    from .fill_pattern_detection import (
+        SUPPORTED_PATTERNS, ColumnBuffer, DetectedCorrelation, DetectedPattern, DetectionConfig, detect_batch
+    )
+    from ...utils.latency import STAGE_EVENT_SYSTEM, LatencyHistogram, fill_pipeline_latency
     from ...utils.logger import get_logger
 except ImportError:
     # Fallback for testing
@@ -34,6 +43,18 @@ except ImportError:
         def error(self, msg, **kwargs): print(f"ERROR: {msg} {kwargs}")
         def debug(self, msg, **kwargs): print(f"DEBUG: {msg} {kwargs}")
     def get_logger(name): return MockLogger()
+    from trading_systems.utils.latency import STAGE_EVENT_SYSTEM, LatencyHistogram, fill_pipeline_latency
+    from fill_event_archive import FillEventArchive
+    from fill_event_index import FillEventIndex, PairWindow, EventWindow
+    from fill_pattern_detection import (
+        SUPPORTED_PATTERNS, ColumnBuffer, DetectedCorrelation, DetectedPattern, DetectionConfig, detect_batch
+    )
+
+
+# Sub-windows used inside detectors, capped by the pattern's own window
+MOMENTUM_BURST_WINDOW = timedelta(minutes=2)
+ARBITRAGE_WINDOW = timedelta(seconds=30)
+CORRELATION_WINDOW = timedelta(minutes=10)
 
 
 class EventType(Enum):
@@ -152,16 +173,23 @@ class AdvancedFillEventSystem:
     def __init__(self, 
                  logger_name: str = "AdvancedFillEventSystem",
                  max_events: int = 50000,
-                 max_patterns: int = 10000):
+                 max_patterns: int = 10000,
+                 max_correlations: int = 10000,
+                 correlation_ttl: timedelta = timedelta(hours=1),
+                 offload_detection: bool = False,
+                 detection_workers: Optional[int] = None,
+                 archive: Optional[FillEventArchive] = None):
         """Initialize the advanced fill event system."""
         self.logger = get_logger(logger_name)
         
-        # Event storage
+        # Event storage; indices are evicted together with their deques
         self.events: deque[FillEvent] = deque(maxlen=max_events)
         self.event_index: Dict[str, FillEvent] = {}  # event_id -> event
         self.patterns: deque[TradingPattern] = deque(maxlen=max_patterns)
         self.pattern_index: Dict[str, TradingPattern] = {}
-        self.correlations: Dict[str, EventCorrelation] = {}
+        self.correlations: OrderedDict[str, EventCorrelation] = OrderedDict()  # oldest first
+        self.max_correlations = max_correlations
+        self.correlation_ttl = correlation_ttl
         
         # Event processing
         self.event_handlers: Dict[EventType, List[Callable]] = defaultdict(list)
@@ -176,12 +204,27 @@ class AdvancedFillEventSystem:
         self.correlation_threshold = 0.6
         
         # Performance optimization
-        self.thread_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="FillEvent")
         self.processing_lock = threading.RLock()
+        self.processing_latency = LatencyHistogram()  # event creation to processed, in ns
+        
+        # Detection offload: fills are queued for a background dispatcher that runs
+        # pattern/correlation detection in a process pool over compact arrays
+        self.offload_detection = offload_detection
+        self.detection_workers = detection_workers
+        self.detection_pool: Optional[ProcessPoolExecutor] = None
+        self._pending_detection: deque[FillEvent] = deque()
+        self._detection_task: Optional[asyncio.Task] = None
+        self._detection_wakeup = asyncio.Event()
+        self._detection_idle = asyncio.Event()
+        self._detection_idle.set()
+        self._detection_columns: Dict[str, ColumnBuffer] = {}  # pair -> rows for batch detection
         
         # Analytics integration
         self.analytics_engine: Optional[RealTimeAnalyticsEngine] = None
         
+        # Columnar on-disk archive for historical replay
+        self.archive = archive
+        
         # Pattern detection windows
         self.pattern_windows = {
             PatternType.ACCUMULATION: timedelta(minutes=30),
@@ -194,6 +237,9 @@ class AdvancedFillEventSystem:
             PatternType.ARBITRAGE: timedelta(minutes=2),
         }
         
+        # Per-pair time windows over the event stream
+        self.event_windows = FillEventIndex(self._required_windows())
+        
         self.logger.info("AdvancedFillEventSystem initialized",
                         max_events=max_events,
                         max_patterns=max_patterns,
@@ -202,27 +248,19 @@ class AdvancedFillEventSystem:
 
     async def process_fill_event(self, fill: TradeFill, event_type: EventType = EventType.FILL_RECEIVED) -> FillEvent:
         """Process a new fill event through the advanced event system."""
+        stage_start = time.perf_counter_ns()
         
         # Create event
-        event = FillEvent(
-            event_type=event_type,
-            fill=fill,
-            metadata={
-                'pair': getattr(fill, 'pair', 'unknown'),
-                'side': getattr(fill, 'side', 'unknown'),
-                'volume': str(fill.volume),
-                'price': str(fill.price),
-                'cost': str(fill.cost),
-            }
-        )
+        event = self._create_event(fill, event_type)
         
         # Add tags based on fill characteristics
         await self._tag_event(event)
         
         # Store event
-        with self.processing_lock:
-            self.events.append(event)
-            self.event_index[event.event_id] = event
+        self._store_event(event, hold=self.offload_detection)
+        
+        if self.offload_detection:
+            self._queue_detection(event)
         
         # Process event asynchronously
         await self._process_event_async(event)
@@ -234,7 +272,8 @@ class AdvancedFillEventSystem:
             except Exception as e:
                 self.logger.error("Error updating analytics", error=str(e))
         
-        event.mark_processed()
+        self._complete_event(event)
+        fill_pipeline_latency.record_since(STAGE_EVENT_SYSTEM, stage_start)
         
         self.logger.debug("Fill event processed",
                          event_id=event.event_id,
@@ -243,6 +282,291 @@ class AdvancedFillEventSystem:
         
         return event
 
+    async def process_fill_events_batch(self, 
+                                        fills: List[TradeFill], 
+                                        event_type: EventType = EventType.FILL_RECEIVED) -> List[FillEvent]:
+        """
+        Process a batch of fills as a unit.
+        
+        Events are tagged and stored under a single lock acquisition, and
+        pattern/correlation detection runs once per pair over the whole batch
+        with the array detectors (or is queued for the process pool when
+        detection is offloaded). Each event is evaluated against the history
+        it had when it was stored. Handlers and analytics still see each fill.
+        """
+        
+        if not fills:
+            return []
+        
+        stage_start = time.perf_counter_ns()
+        events = [self._create_event(fill, event_type) for fill in fills]
+        for event in events:
+            await self._tag_event(event)
+        
+        detect = self.offload_detection or self.enable_pattern_detection or self.enable_correlation_analysis
+        with self.processing_lock:
+            for event in events:
+                self._append_event(event, hold=detect)
+        
+        if self.offload_detection:
+            for event in events:
+                self._queue_detection(event)
+        elif self.enable_pattern_detection or self.enable_correlation_analysis:
+            try:
+                await self._run_batch_detection(events)
+            except Exception as e:
+                self.logger.error("Error in batch detection", error=str(e), batch_size=len(events))
+        
+        await asyncio.gather(*(self._notify_event_handlers(event) for event in events), return_exceptions=True)
+        
+        if self.analytics_engine:
+            for fill in fills:
+                try:
+                    await self.analytics_engine.process_fill(fill)
+                except Exception as e:
+                    self.logger.error("Error updating analytics", error=str(e))
+        
+        for event in events:
+            self._complete_event(event)
+            # Each fill waited for the whole batch
+            fill_pipeline_latency.record_since(STAGE_EVENT_SYSTEM, stage_start)
+        
+        self.logger.debug("Fill event batch processed", batch_size=len(events))
+        
+        return events
+
+    def _complete_event(self, event: FillEvent) -> None:
+        """Mark an event processed and record its processing latency."""
+        event.mark_processed()
+        if event.processing_duration is not None:
+            self.processing_latency.record(event.processing_duration // timedelta(microseconds=1) * 1000)
+
+    def _create_event(self, fill: TradeFill, event_type: EventType) -> FillEvent:
+        """Create the event for a fill."""
+        return FillEvent(
+            event_type=event_type,
+            fill=fill,
+            metadata={
+                'pair': getattr(fill, 'pair', 'unknown'),
+                'side': getattr(fill, 'side', 'unknown'),
+                'volume': str(fill.volume),
+                'price': str(fill.price),
+                'cost': str(fill.cost),
+            }
+        )
+
+    def _store_event(self, event: FillEvent, hold: bool = False) -> None:
+        """Store an event and add it to the per-pair windows."""
+        with self.processing_lock:
+            self._append_event(event, hold)
+
+    def _append_event(self, event: FillEvent, hold: bool = False) -> None:
+        """
+        Append an event to the deque, index, windows and detection columns.
+
+        ``hold`` keeps the event's history in the detection columns until
+        batch detection takes it. The caller holds the lock.
+        """
+        if len(self.events) == self.events.maxlen:
+            self._evict_oldest_event()
+        self.events.append(event)
+        self.event_index[event.event_id] = event
+        self.event_windows.add(event)
+        if event.fill is not None:
+            pair = getattr(event.fill, 'pair', 'unknown')
+            columns = self._detection_columns.get(pair)
+            if columns is None:
+                columns = self._detection_columns[pair] = ColumnBuffer()
+            columns.append(event, hold)
+            columns.trim(self._detection_horizon().total_seconds())
+        if self.archive is not None:
+            self.archive.append(event)
+
+    def _evict_oldest_event(self) -> FillEvent:
+        """Remove the oldest event from the deque, index, windows and detection columns."""
+        evicted = self.events.popleft()
+        self.event_index.pop(evicted.event_id, None)
+        self.event_windows.evict(evicted)
+        if evicted.fill is not None:
+            pair = getattr(evicted.fill, 'pair', 'unknown')
+            columns = self._detection_columns.get(pair)
+            if columns is not None and columns.discard_oldest(evicted) and not len(columns):
+                del self._detection_columns[pair]
+        return evicted
+
+    def _prune_correlations(self, now: datetime) -> None:
+        """Drop correlations past their TTL or beyond the size cap, oldest first."""
+        cutoff = now - self.correlation_ttl
+        correlations = self.correlations
+        while correlations:
+            oldest = next(iter(correlations.values()))
+            if len(correlations) <= self.max_correlations and oldest.detected_at >= cutoff:
+                break
+            correlations.popitem(last=False)
+
+    # Offloaded Detection
+    def _queue_detection(self, event: FillEvent) -> None:
+        """Queue an event for offloaded detection and wake the dispatcher."""
+        self._pending_detection.append(event)
+        self._detection_idle.clear()
+        self._detection_wakeup.set()
+        
+        if self._detection_task is None or self._detection_task.done():
+            self._detection_task = asyncio.create_task(self._detection_loop())
+
+    async def _detection_loop(self) -> None:
+        """Drain queued events in batches and dispatch them to the process pool."""
+        while True:
+            await self._detection_wakeup.wait()
+            self._detection_wakeup.clear()
+            
+            while self._pending_detection:
+                batch = list(self._pending_detection)
+                self._pending_detection.clear()
+                try:
+                    await self._run_batch_detection(batch)
+                except Exception as e:
+                    self.logger.error("Error in offloaded detection", error=str(e), batch_size=len(batch))
+            
+            self._detection_idle.set()
+
+    async def flush_detection(self) -> None:
+        """Wait until all queued events have been through offloaded detection."""
+        if self._pending_detection or not self._detection_idle.is_set():
+            await self._detection_idle.wait()
+
+    def _get_detection_pool(self) -> ProcessPoolExecutor:
+        """Create the detection process pool on first use."""
+        if self.detection_pool is None:
+            self.detection_pool = ProcessPoolExecutor(max_workers=self.detection_workers)
+            self.logger.info("Detection process pool started", workers=self.detection_pool._max_workers)
+        return self.detection_pool
+
+    def _detection_config(self) -> DetectionConfig:
+        """Snapshot of current windows and thresholds for the array detectors."""
+        pattern_windows = {}
+        if self.enable_pattern_detection:
+            pattern_windows = {
+                pattern_type.value: window.total_seconds()
+                for pattern_type, window in self.pattern_windows.items()
+                if pattern_type.value in SUPPORTED_PATTERNS
+            }
+        
+        return DetectionConfig(
+            pattern_windows=pattern_windows,
+            pattern_threshold=self.pattern_detection_threshold,
+            correlation_threshold=self.correlation_threshold,
+            momentum_window=MOMENTUM_BURST_WINDOW.total_seconds(),
+            arbitrage_window=ARBITRAGE_WINDOW.total_seconds(),
+            correlation_window=CORRELATION_WINDOW.total_seconds(),
+            detect_correlations=self.enable_correlation_analysis
+        )
+
+    def _detection_horizon(self) -> timedelta:
+        """Longest history any array detector reads."""
+        windows = [CORRELATION_WINDOW]
+        if self.enable_pattern_detection:
+            windows.extend(
+                window for pattern_type, window in self.pattern_windows.items()
+                if pattern_type.value in SUPPORTED_PATTERNS
+            )
+        return max(windows)
+
+    async def _run_batch_detection(self, batch: List[FillEvent]) -> None:
+        """Run array detection for a batch of events, one task per pair."""
+        
+        by_pair: Dict[str, List[FillEvent]] = defaultdict(list)
+        for event in batch:
+            if event.fill:
+                by_pair[getattr(event.fill, 'pair', 'unknown')].append(event)
+        
+        config = self._detection_config()
+        horizon = self._detection_horizon()
+        
+        await asyncio.gather(*(
+            self._detect_pair_batch(pair, events, config, horizon)
+            for pair, events in by_pair.items()
+        ))
+
+    async def _detect_pair_batch(self, 
+                                 pair: str, 
+                                 events: List[FillEvent], 
+                                 config: DetectionConfig,
+                                 horizon: timedelta) -> None:
+        """Detect patterns and correlations for one pair's batched events."""
+        
+        # Rows were converted on arrival and kept while the events were held
+        with self.processing_lock:
+            buffer = self._detection_columns.get(pair)
+            if buffer is None:
+                return
+            columns, snapshot, positions = buffer.take(events, horizon.total_seconds())
+            buffer.trim(horizon.total_seconds())
+        
+        if not positions:
+            return
+        
+        if self.offload_detection:
+            loop = asyncio.get_running_loop()
+            patterns, correlations = await loop.run_in_executor(
+                self._get_detection_pool(), detect_batch, columns, positions, config
+            )
+        else:
+            patterns, correlations = detect_batch(columns, positions, config)
+        
+        for detected in patterns:
+            await self._register_pattern(self._pattern_from_detection(detected, snapshot, pair))
+        for detected in correlations:
+            await self._register_correlation(self._correlation_from_detection(detected, snapshot))
+
+    @staticmethod
+    def _pattern_from_detection(detected: DetectedPattern, 
+                                snapshot: List[FillEvent], 
+                                pair: str) -> TradingPattern:
+        """Build a TradingPattern from an array detector result."""
+        return TradingPattern(
+            pattern_type=PatternType(detected.pattern_type),
+            events=[snapshot[i].event_id for i in detected.indices],
+            confidence=detected.confidence,
+            strength=detected.strength,
+            total_volume=Decimal(str(detected.total_volume)),
+            average_price=Decimal(str(detected.average_price)),
+            price_range=(Decimal(str(detected.price_low)), Decimal(str(detected.price_high))),
+            duration=timedelta(seconds=detected.duration),
+            pair=pair,
+            side=detected.side
+        )
+
+    @staticmethod
+    def _correlation_from_detection(detected: DetectedCorrelation, 
+                                    snapshot: List[FillEvent]) -> EventCorrelation:
+        """Build an EventCorrelation from an array detector result."""
+        return EventCorrelation(
+            event_ids=[snapshot[i].event_id for i in detected.indices],
+            correlation_type=detected.correlation_type,
+            strength=detected.strength,
+            time_window=timedelta(seconds=detected.time_window),
+            metadata=detected.metadata or {}
+        )
+
+    def _required_windows(self) -> Set[timedelta]:
+        """Window durations read by the pattern and correlation detectors."""
+        windows = set(self.pattern_windows.values())
+        windows.add(min(self.pattern_windows[PatternType.MOMENTUM_BURST], MOMENTUM_BURST_WINDOW))
+        windows.add(min(self.pattern_windows[PatternType.ARBITRAGE], ARBITRAGE_WINDOW))
+        windows.add(CORRELATION_WINDOW)
+        return windows
+
+    def _get_window(self, 
+                    pair: str, 
+                    duration: timedelta, 
+                    index: Optional[FillEventIndex] = None) -> Optional[PairWindow]:
+        """Get a pair's window, backfilling durations not yet indexed."""
+        index = index if index is not None else self.event_windows
+        if not index.has_window(duration):
+            index.add_window(duration, self.events)
+        return index.window(pair, duration)
+
     async def _tag_event(self, event: FillEvent) -> None:
         """Add intelligent tags to an event based on its characteristics."""
         if not event.fill:
@@ -257,7 +581,7 @@ class AdvancedFillEventSystem:
             event.tags.add('small_volume')
         
         # Price-based tags
-        if hasattr(fill, 'price_improvement') and fill.price_improvement > Decimal('0'):
+        if getattr(fill, 'price_improvement', None) is not None and fill.price_improvement > Decimal('0'):
             event.tags.add('price_improvement')
         
         # Quality-based tags
@@ -280,13 +604,13 @@ class AdvancedFillEventSystem:
         
         tasks = []
         
-        # Pattern detection
-        if self.enable_pattern_detection:
-            tasks.append(self._detect_patterns(event))
-        
-        # Correlation analysis  
-        if self.enable_correlation_analysis:
-            tasks.append(self._analyze_correlations(event))
+        # Pattern detection and correlation analysis run inline unless offloaded
+        if not self.offload_detection:
+            if self.enable_pattern_detection:
+                tasks.append(self._detect_patterns(event))
+            
+            if self.enable_correlation_analysis:
+                tasks.append(self._analyze_correlations(event))
         
         # Event handler notification
         tasks.append(self._notify_event_handlers(event))
@@ -295,25 +619,25 @@ class AdvancedFillEventSystem:
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
 
-    async def _detect_patterns(self, event: FillEvent) -> None:
+    async def _detect_patterns(self, event: FillEvent, index: Optional[FillEventIndex] = None) -> None:
         """Detect trading patterns involving this event."""
         
+        if not event.fill:
+            return
+        
         try:
-            current_time = event.timestamp
+            pair = getattr(event.fill, 'pair', 'unknown')
             
             # Check each pattern type
             for pattern_type, window in self.pattern_windows.items():
-                # Get recent events in window
-                recent_events = [
-                    e for e in self.events 
-                    if current_time - e.timestamp <= window
-                ]
+                # Recent events for this pair in window
+                recent = self._get_window(pair, window, index)
                 
-                if len(recent_events) < 3:  # Need minimum events for pattern
+                if recent is None or len(recent) < 3:  # Need minimum events for pattern
                     continue
                 
                 # Pattern-specific detection logic
-                pattern = await self._detect_specific_pattern(pattern_type, recent_events, event)
+                pattern = await self._detect_specific_pattern(pattern_type, recent, event, index)
                 
                 if pattern and pattern.confidence >= self.pattern_detection_threshold:
                     await self._register_pattern(pattern)
@@ -323,55 +647,46 @@ class AdvancedFillEventSystem:
 
     async def _detect_specific_pattern(self, 
                                      pattern_type: PatternType, 
-                                     events: List[FillEvent], 
-                                     current_event: FillEvent) -> Optional[TradingPattern]:
+                                     window: PairWindow, 
+                                     current_event: FillEvent,
+                                     index: Optional[FillEventIndex] = None) -> Optional[TradingPattern]:
         """Detect a specific type of trading pattern."""
         
         if pattern_type == PatternType.ACCUMULATION:
-            return await self._detect_accumulation_pattern(events, current_event)
+            return await self._detect_accumulation_pattern(window, current_event)
         elif pattern_type == PatternType.MOMENTUM_BURST:
-            return await self._detect_momentum_burst(events, current_event)
+            return await self._detect_momentum_burst(window, current_event, index)
         elif pattern_type == PatternType.ICEBERG_DETECTED:
-            return await self._detect_iceberg_pattern(events, current_event)
+            return await self._detect_iceberg_pattern(window, current_event)
         elif pattern_type == PatternType.PRICE_IMPROVEMENT:
-            return await self._detect_price_improvement_pattern(events, current_event)
+            return await self._detect_price_improvement_pattern(window, current_event)
         elif pattern_type == PatternType.DISTRIBUTION:
-            return await self._detect_distribution_pattern(events, current_event)
+            return await self._detect_distribution_pattern(window, current_event)
         elif pattern_type == PatternType.ARBITRAGE:
-            return await self._detect_arbitrage_pattern(events, current_event)
+            return await self._detect_arbitrage_pattern(window, current_event, index)
         
         return None
 
     async def _detect_accumulation_pattern(self, 
-                                         events: List[FillEvent], 
+                                         window: PairWindow, 
                                          current_event: FillEvent) -> Optional[TradingPattern]:
         """Detect accumulation pattern (gradual position building)."""
         
         if not current_event.fill:
             return None
             
-        same_side_events = [
-            e for e in events 
-            if e.fill and hasattr(e.fill, 'side') and 
-            e.fill.side == current_event.fill.side
-        ]
+        same_side = window.side(getattr(current_event.fill, 'side', None))
         
-        if len(same_side_events) < 5:  # Need multiple fills in same direction
+        if same_side is None or len(same_side) < 5:  # Need multiple fills in same direction
             return None
         
         # Check for consistent volume and gradual price movement
-        volumes = [e.fill.volume for e in same_side_events if e.fill]
-        prices = [e.fill.price for e in same_side_events if e.fill]
-        
-        if not volumes or not prices:
-            return None
-        
-        # Calculate metrics
-        avg_volume = sum(volumes) / len(volumes)
-        volume_consistency = 1.0 - (statistics.stdev(volumes) / avg_volume if avg_volume > 0 else 1.0)
+        avg_volume = same_side.volumes.mean
+        volume_consistency = 1.0 - (same_side.volumes.stdev / avg_volume if avg_volume > 0 else 1.0)
         
         # Price trend analysis
-        price_trend = (prices[-1] - prices[0]) / prices[0] if prices[0] > 0 else 0
+        first_price = same_side.first.fill.price
+        price_trend = (same_side.last.fill.price - first_price) / first_price if first_price > 0 else 0
         
         # Confidence calculation
         confidence = min(1.0, volume_consistency * 0.7 + abs(float(price_trend)) * 0.3)
@@ -379,13 +694,13 @@ class AdvancedFillEventSystem:
         if confidence >= 0.6:  # Threshold for accumulation detection
             return TradingPattern(
                 pattern_type=PatternType.ACCUMULATION,
-                events=[e.event_id for e in same_side_events],
+                events=same_side.event_ids(),
                 confidence=confidence,
                 strength=float(price_trend),
-                total_volume=sum(volumes),
-                average_price=sum(prices) / len(prices),
-                price_range=(min(prices), max(prices)),
-                duration=same_side_events[-1].timestamp - same_side_events[0].timestamp,
+                total_volume=same_side.volume,
+                average_price=same_side.average_price,
+                price_range=(same_side.min_price, same_side.max_price),
+                duration=same_side.duration,
                 pair=getattr(current_event.fill, 'pair', 'unknown'),
                 side=getattr(current_event.fill, 'side', 'unknown')
             )
@@ -393,60 +708,61 @@ class AdvancedFillEventSystem:
         return None
 
     async def _detect_momentum_burst(self, 
-                                   events: List[FillEvent], 
-                                   current_event: FillEvent) -> Optional[TradingPattern]:
+                                   window: PairWindow, 
+                                   current_event: FillEvent,
+                                   index: Optional[FillEventIndex] = None) -> Optional[TradingPattern]:
         """Detect momentum burst pattern (rapid execution cluster)."""
         
         # Look for rapid succession of fills in short time window
-        recent_window = timedelta(minutes=2)
-        burst_events = [
-            e for e in events 
-            if current_event.timestamp - e.timestamp <= recent_window
-        ]
+        pair = getattr(current_event.fill, 'pair', 'unknown')
+        burst_window = self._get_window(pair, min(window.duration, MOMENTUM_BURST_WINDOW), index)
+        if burst_window is None:
+            return None
+        burst = burst_window.all
         
-        if len(burst_events) < 4:  # Need multiple rapid fills
+        if len(burst) < 4:  # Need multiple rapid fills
             return None
         
         # Check execution frequency
-        time_span = burst_events[-1].timestamp - burst_events[0].timestamp
+        time_span = burst.duration
         if time_span.total_seconds() == 0:
             return None
             
-        execution_rate = len(burst_events) / time_span.total_seconds() * 60  # fills per minute
+        execution_rate = len(burst) / time_span.total_seconds() * 60  # fills per minute
         
         # Calculate total volume and price impact
-        total_volume = sum(e.fill.volume for e in burst_events if e.fill)
+        total_volume = burst.volume
         
         if execution_rate > 5.0 and total_volume > Decimal('2.0'):  # High frequency + volume
             confidence = min(1.0, execution_rate / 20.0 + float(total_volume) / 10.0)
             
             return TradingPattern(
                 pattern_type=PatternType.MOMENTUM_BURST,
-                events=[e.event_id for e in burst_events],
+                events=burst.event_ids(),
                 confidence=confidence,
                 strength=execution_rate,
                 total_volume=total_volume,
                 duration=time_span,
-                pair=getattr(current_event.fill, 'pair', 'unknown') if current_event.fill else 'unknown'
+                pair=pair
             )
         
         return None
 
     async def _detect_iceberg_pattern(self, 
-                                    events: List[FillEvent], 
+                                    window: PairWindow, 
                                     current_event: FillEvent) -> Optional[TradingPattern]:
         """Detect iceberg order pattern (large hidden order)."""
         
         # Look for consistent small fills at similar price levels
-        if not current_event.fill:
+        if not current_event.fill or len(window) < 6:
             return None
             
         current_price = current_event.fill.price
         price_tolerance = current_price * Decimal('0.001')  # 0.1% tolerance
         
         similar_price_events = [
-            e for e in events 
-            if e.fill and abs(e.fill.price - current_price) <= price_tolerance
+            e for e in window.all 
+            if abs(e.fill.price - current_price) <= price_tolerance
         ]
         
         if len(similar_price_events) < 6:  # Need multiple fills at similar price
@@ -455,7 +771,7 @@ class AdvancedFillEventSystem:
         # Check for consistent small volumes (iceberg characteristic)
         volumes = [e.fill.volume for e in similar_price_events]
         avg_volume = sum(volumes) / len(volumes)
-        volume_consistency = 1.0 - (statistics.stdev(volumes) / avg_volume if avg_volume > 0 else 1.0)
+        volume_consistency = 1.0 - (float(statistics.stdev(volumes) / avg_volume) if avg_volume > 0 else 1.0)
         
         total_volume = sum(volumes)
         
@@ -477,24 +793,24 @@ class AdvancedFillEventSystem:
         return None
 
     async def _detect_price_improvement_pattern(self, 
-                                              events: List[FillEvent], 
+                                              window: PairWindow, 
                                               current_event: FillEvent) -> Optional[TradingPattern]:
         """Detect consistent price improvement pattern."""
         
-        # Look for events with price improvement
+        # Improved fills are counted incrementally; only walk the window when enough exist
+        if window.all.improved_count < 3:
+            return None
+        
         improvement_events = [
-            e for e in events 
-            if e.fill and hasattr(e.fill, 'price_improvement') and 
+            e for e in window.all 
+            if getattr(e.fill, 'price_improvement', None) is not None and 
             e.fill.price_improvement > Decimal('0')
         ]
         
-        if len(improvement_events) < 3:
-            return None
-        
         # Calculate average improvement and consistency
         improvements = [e.fill.price_improvement for e in improvement_events]
         avg_improvement = sum(improvements) / len(improvements)
-        improvement_consistency = 1.0 - (statistics.stdev(improvements) / avg_improvement if avg_improvement > 0 else 1.0)
+        improvement_consistency = 1.0 - (float(statistics.stdev(improvements) / avg_improvement) if avg_improvement > 0 else 1.0)
         
         if improvement_consistency > 0.7 and avg_improvement > Decimal('0.01'):
             confidence = min(1.0, improvement_consistency * 0.8 + min(1.0, float(avg_improvement) * 100) * 0.2)
@@ -512,7 +828,7 @@ class AdvancedFillEventSystem:
         return None
 
     async def _detect_distribution_pattern(self, 
-                                         events: List[FillEvent], 
+                                         window: PairWindow, 
                                          current_event: FillEvent) -> Optional[TradingPattern]:
         """Detect distribution pattern (gradual position unwinding)."""
         
@@ -520,39 +836,30 @@ class AdvancedFillEventSystem:
             return None
             
         # Similar to accumulation but for selling
-        same_side_events = [
-            e for e in events 
-            if e.fill and hasattr(e.fill, 'side') and 
-            e.fill.side == 'sell'  # Focus on sell orders for distribution
-        ]
+        sells = window.sell  # Focus on sell orders for distribution
         
-        if len(same_side_events) < 5:
-            return None
-        
-        volumes = [e.fill.volume for e in same_side_events if e.fill]
-        prices = [e.fill.price for e in same_side_events if e.fill]
-        
-        if not volumes or not prices:
+        if len(sells) < 5:
             return None
         
         # Check for consistent selling with gradual price decrease
-        avg_volume = sum(volumes) / len(volumes)
-        volume_consistency = 1.0 - (statistics.stdev(volumes) / avg_volume if avg_volume > 0 else 1.0)
+        avg_volume = sells.volumes.mean
+        volume_consistency = 1.0 - (sells.volumes.stdev / avg_volume if avg_volume > 0 else 1.0)
         
         # Negative price trend indicates distribution
-        price_trend = (prices[-1] - prices[0]) / prices[0] if prices[0] > 0 else 0
+        first_price = sells.first.fill.price
+        price_trend = (sells.last.fill.price - first_price) / first_price if first_price > 0 else 0
         
         confidence = min(1.0, volume_consistency * 0.7 + abs(float(price_trend)) * 0.3)
         
         if confidence >= 0.6 and price_trend < 0:  # Downward price movement
             return TradingPattern(
                 pattern_type=PatternType.DISTRIBUTION,
-                events=[e.event_id for e in same_side_events],
+                events=sells.event_ids(),
                 confidence=confidence,
                 strength=abs(float(price_trend)),
-                total_volume=sum(volumes),
-                average_price=sum(prices) / len(prices),
-                duration=same_side_events[-1].timestamp - same_side_events[0].timestamp,
+                total_volume=sells.volume,
+                average_price=sells.average_price,
+                duration=sells.duration,
                 pair=getattr(current_event.fill, 'pair', 'unknown'),
                 side='sell'
             )
@@ -560,31 +867,25 @@ class AdvancedFillEventSystem:
         return None
 
     async def _detect_arbitrage_pattern(self, 
-                                      events: List[FillEvent], 
-                                      current_event: FillEvent) -> Optional[TradingPattern]:
+                                      window: PairWindow, 
+                                      current_event: FillEvent,
+                                      index: Optional[FillEventIndex] = None) -> Optional[TradingPattern]:
         """Detect arbitrage pattern (rapid buy-sell sequences)."""
         
         # Look for rapid buy-sell pairs in very short time window
-        arb_window = timedelta(seconds=30)
-        recent_events = [
-            e for e in events 
-            if current_event.timestamp - e.timestamp <= arb_window and e.fill
-        ]
+        pair = getattr(current_event.fill, 'pair', 'unknown')
+        recent = self._get_window(pair, min(window.duration, ARBITRAGE_WINDOW), index)
         
-        if len(recent_events) < 4:
+        if recent is None or len(recent) < 4:
             return None
         
         # Check for alternating buy/sell pattern
-        buy_events = [e for e in recent_events if getattr(e.fill, 'side', '') == 'buy']
-        sell_events = [e for e in recent_events if getattr(e.fill, 'side', '') == 'sell']
+        buys, sells = recent.buy, recent.sell
         
-        if len(buy_events) >= 2 and len(sell_events) >= 2:
+        if len(buys) >= 2 and len(sells) >= 2:
             # Calculate profit potential
-            buy_prices = [e.fill.price for e in buy_events]
-            sell_prices = [e.fill.price for e in sell_events]
-            
-            avg_buy_price = sum(buy_prices) / len(buy_prices)
-            avg_sell_price = sum(sell_prices) / len(sell_prices)
+            avg_buy_price = buys.average_price
+            avg_sell_price = sells.average_price
             
             profit_margin = (avg_sell_price - avg_buy_price) / avg_buy_price if avg_buy_price > 0 else 0
             
@@ -593,12 +894,12 @@ class AdvancedFillEventSystem:
                 
                 return TradingPattern(
                     pattern_type=PatternType.ARBITRAGE,
-                    events=[e.event_id for e in recent_events],
+                    events=recent.all.event_ids(),
                     confidence=confidence,
                     strength=float(profit_margin),
-                    total_volume=sum(e.fill.volume for e in recent_events),
-                    duration=recent_events[-1].timestamp - recent_events[0].timestamp,
-                    pair=getattr(current_event.fill, 'pair', 'unknown')
+                    total_volume=recent.all.volume,
+                    duration=recent.all.duration,
+                    pair=pair
                 )
         
         return None
@@ -607,6 +908,9 @@ class AdvancedFillEventSystem:
         """Register a detected pattern and notify handlers."""
         
         with self.processing_lock:
+            if len(self.patterns) == self.patterns.maxlen:
+                evicted = self.patterns.popleft()
+                self.pattern_index.pop(evicted.pattern_id, None)
             self.patterns.append(pattern)
             self.pattern_index[pattern.pattern_id] = pattern
         
@@ -627,53 +931,51 @@ class AdvancedFillEventSystem:
                         events=len(pattern.events),
                         volume=str(pattern.total_volume))
 
-    async def _analyze_correlations(self, event: FillEvent) -> None:
-        """Analyze correlations between this event and recent events."""
+    async def _analyze_correlations(self, event: FillEvent, index: Optional[FillEventIndex] = None) -> None:
+        """Analyze correlations between this event and recent events for the same pair."""
+        
+        if not event.fill:
+            return
         
         try:
-            correlation_window = timedelta(minutes=10)
-            recent_events = [
-                e for e in self.events 
-                if event.timestamp - e.timestamp <= correlation_window and e.event_id != event.event_id
-            ]
+            window = self._get_window(getattr(event.fill, 'pair', 'unknown'), CORRELATION_WINDOW, index)
             
-            if len(recent_events) < 2:
+            # Recent events exclude the current one, which is the newest in the window
+            if window is None or window.all.last is not event or len(window) - 1 < 2:
                 return
             
             # Temporal correlation analysis
-            await self._analyze_temporal_correlation(event, recent_events)
+            await self._analyze_temporal_correlation(event, window.all)
             
             # Price correlation analysis
-            await self._analyze_price_correlation(event, recent_events)
+            await self._analyze_price_correlation(event, window.all)
             
             # Volume correlation analysis
-            await self._analyze_volume_correlation(event, recent_events)
+            await self._analyze_volume_correlation(event, window.all)
             
         except Exception as e:
             self.logger.error("Error in correlation analysis", error=str(e))
 
-    async def _analyze_temporal_correlation(self, event: FillEvent, recent_events: List[FillEvent]) -> None:
+    async def _analyze_temporal_correlation(self, event: FillEvent, window: EventWindow) -> None:
         """Analyze temporal correlations between events."""
         
-        # Look for events that occurred at regular intervals
-        time_diffs = []
-        for i in range(1, len(recent_events)):
-            diff = recent_events[i].timestamp - recent_events[i-1].timestamp
-            time_diffs.append(diff.total_seconds())
+        # Intervals between the recent events, i.e. without the gap to this event
+        time_diffs = window.intervals.copy()
+        time_diffs.remove((event.timestamp - window.events[-2].timestamp).total_seconds())
         
-        if len(time_diffs) < 3:
+        if time_diffs.count < 3:
             return
         
         # Calculate temporal regularity
-        avg_interval = statistics.mean(time_diffs)
-        interval_stdev = statistics.stdev(time_diffs) if len(time_diffs) > 1 else 0
+        avg_interval = time_diffs.mean
+        interval_stdev = time_diffs.stdev
         
         if avg_interval > 0:
             regularity = 1.0 - (interval_stdev / avg_interval)
             
             if regularity > self.correlation_threshold:
                 correlation = EventCorrelation(
-                    event_ids=[e.event_id for e in recent_events] + [event.event_id],
+                    event_ids=window.event_ids(),
                     correlation_type="temporal",
                     strength=regularity,
                     time_window=timedelta(seconds=avg_interval),
@@ -682,24 +984,19 @@ class AdvancedFillEventSystem:
                 
                 await self._register_correlation(correlation)
 
-    async def _analyze_price_correlation(self, event: FillEvent, recent_events: List[FillEvent]) -> None:
+    async def _analyze_price_correlation(self, event: FillEvent, window: EventWindow) -> None:
         """Analyze price correlations between events."""
         
-        if not event.fill:
-            return
-        
-        # Get events with price data
-        price_events = [e for e in recent_events if e.fill and hasattr(e.fill, 'price')]
+        current_price = float(event.fill.price)
+        prices = window.prices.copy()
+        prices.remove(current_price)
         
-        if len(price_events) < 3:
+        if prices.count < 3:
             return
         
-        prices = [float(e.fill.price) for e in price_events]
-        current_price = float(event.fill.price)
-        
         # Calculate price correlation strength
-        price_variance = statistics.variance(prices) if len(prices) > 1 else 0
-        price_mean = statistics.mean(prices)
+        price_variance = prices.variance
+        price_mean = prices.mean
         
         if price_variance > 0:
             price_deviation = abs(current_price - price_mean) / (price_variance ** 0.5)
@@ -707,7 +1004,7 @@ class AdvancedFillEventSystem:
             
             if correlation_strength > self.correlation_threshold:
                 correlation = EventCorrelation(
-                    event_ids=[e.event_id for e in price_events] + [event.event_id],
+                    event_ids=window.event_ids(),
                     correlation_type="price",
                     strength=correlation_strength,
                     metadata={'price_mean': price_mean, 'price_variance': price_variance}
@@ -715,24 +1012,19 @@ class AdvancedFillEventSystem:
                 
                 await self._register_correlation(correlation)
 
-    async def _analyze_volume_correlation(self, event: FillEvent, recent_events: List[FillEvent]) -> None:
+    async def _analyze_volume_correlation(self, event: FillEvent, window: EventWindow) -> None:
         """Analyze volume correlations between events."""
         
-        if not event.fill:
-            return
-        
-        # Get events with volume data
-        volume_events = [e for e in recent_events if e.fill and hasattr(e.fill, 'volume')]
+        current_volume = float(event.fill.volume)
+        volumes = window.volumes.copy()
+        volumes.remove(current_volume)
         
-        if len(volume_events) < 3:
+        if volumes.count < 3:
             return
         
-        volumes = [float(e.fill.volume) for e in volume_events]
-        current_volume = float(event.fill.volume)
-        
         # Calculate volume correlation
-        volume_variance = statistics.variance(volumes) if len(volumes) > 1 else 0
-        volume_mean = statistics.mean(volumes)
+        volume_variance = volumes.variance
+        volume_mean = volumes.mean
         
         if volume_variance > 0:
             volume_deviation = abs(current_volume - volume_mean) / (volume_variance ** 0.5)
@@ -740,7 +1032,7 @@ class AdvancedFillEventSystem:
             
             if correlation_strength > self.correlation_threshold:
                 correlation = EventCorrelation(
-                    event_ids=[e.event_id for e in volume_events] + [event.event_id],
+                    event_ids=window.event_ids(),
                     correlation_type="volume",
                     strength=correlation_strength,
                     metadata={'volume_mean': volume_mean, 'volume_variance': volume_variance}
@@ -753,6 +1045,7 @@ class AdvancedFillEventSystem:
         
         with self.processing_lock:
             self.correlations[correlation.correlation_id] = correlation
+            self._prune_correlations(correlation.detected_at)
         
         # Notify correlation handlers
         for handler in self.correlation_handlers:
@@ -851,6 +1144,9 @@ class AdvancedFillEventSystem:
                                since: Optional[datetime] = None) -> Dict[str, Any]:
         """Get comprehensive correlation analysis."""
         
+        with self.processing_lock:
+            self._prune_correlations(datetime.now())
+        
         relevant_correlations = [
             c for c in self.correlations.values()
             if (correlation_type is None or c.correlation_type == correlation_type) and
@@ -908,14 +1204,17 @@ class AdvancedFillEventSystem:
         replay_correlations = []
         
         try:
-            # Process events in chronological order
+            # Process events in chronological order against a fresh window index,
+            # so each event only sees the events that preceded it
             sorted_events = sorted(historical_events, key=lambda e: e.timestamp)
+            replay_index = FillEventIndex(self._required_windows())
             
             for event in sorted_events:
                 if event.fill:
                     # Reprocess the event
-                    await self._detect_patterns(event)
-                    await self._analyze_correlations(event)
+                    replay_index.add(event)
+                    await self._detect_patterns(event, replay_index)
+                    await self._analyze_correlations(event, replay_index)
             
             # Collect replay results
             replay_patterns = [p for p in self.patterns if start_time <= p.detected_at <= end_time]
@@ -942,24 +1241,57 @@ class AdvancedFillEventSystem:
         self.logger.info("Historical event replay completed", **replay_results)
         return replay_results
 
+    async def replay_archived_events(self, 
+                                     start_time: datetime, 
+                                     end_time: datetime,
+                                     pairs: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Replay archived events with vectorized detection.
+        
+        Unlike replay_historical_events this covers everything written to the
+        archive, not just the in-memory deque, and does not register patterns
+        or correlations in the live system. Detection runs in a worker thread.
+        """
+        
+        if self.archive is None:
+            self.logger.warning("No event archive configured for replay")
+            return {'events_replayed': 0, 'patterns_detected': 0}
+        
+        self.logger.info("Starting archived event replay",
+                        start_time=start_time.isoformat(),
+                        end_time=end_time.isoformat())
+        
+        await self.archive.aflush()
+        config = self._detection_config()
+        loop = asyncio.get_running_loop()
+        replay_results = await loop.run_in_executor(
+            None, self.archive.replay, start_time, end_time, config, pairs
+        )
+        
+        self.logger.info("Archived event replay completed",
+                        events_replayed=replay_results['events_replayed'],
+                        patterns_detected=replay_results['patterns_detected'],
+                        correlations_found=replay_results['correlations_found'],
+                        replay_seconds=replay_results['replay_seconds'])
+        return replay_results
+
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get system performance metrics for high-frequency optimization."""
         
         if not self.events:
             return {'status': 'no_events'}
         
-        # Processing latency analysis
-        processed_events = [e for e in self.events if e.processed and e.processing_duration]
-        
-        if processed_events:
-            processing_times = [e.processing_duration.total_seconds() * 1000 for e in processed_events]  # milliseconds
-            
+        # Processing latency analysis, from the histogram (bucket precision)
+        histogram = self.processing_latency
+        if histogram.count:
             latency_stats = {
-                'average_latency_ms': statistics.mean(processing_times),
-                'median_latency_ms': statistics.median(processing_times),
-                'max_latency_ms': max(processing_times),
-                'min_latency_ms': min(processing_times),
-                'p99_latency_ms': sorted(processing_times)[int(0.99 * len(processing_times))] if len(processing_times) > 10 else max(processing_times)
+                'average_latency_ms': histogram.mean / 1e6,
+                'median_latency_ms': histogram.percentile(0.50) / 1e6,
+                'max_latency_ms': histogram.max / 1e6,
+                'min_latency_ms': histogram.min / 1e6,
+                'p90_latency_ms': histogram.percentile(0.90) / 1e6,
+                'p99_latency_ms': histogram.percentile(0.99) / 1e6,
+                'samples': histogram.count
             }
         else:
             latency_stats = {'status': 'no_processed_events'}
@@ -979,16 +1311,22 @@ class AdvancedFillEventSystem:
             'total_correlations_found': len(self.correlations)
         }
         
-        # Memory usage approximation
+        with self.processing_lock:
+            self._prune_correlations(datetime.now())
+        
         memory_stats = {
             'events_in_memory': len(self.events),
+            'event_index_size': len(self.event_index),
             'patterns_in_memory': len(self.patterns),
+            'pattern_index_size': len(self.pattern_index),
             'correlations_in_memory': len(self.correlations),
-            'memory_usage_estimate_mb': (len(self.events) * 2 + len(self.patterns) + len(self.correlations)) / 1000  # Rough estimate
+            'indexed_pairs': len(self.event_windows.pairs()),
+            **self._get_memory_usage()
         }
         
         return {
             'latency': latency_stats,
+            'pipeline_latency': fill_pipeline_latency.export(),
             'throughput': throughput_stats,
             'memory': memory_stats,
             'configuration': {
@@ -999,6 +1337,39 @@ class AdvancedFillEventSystem:
             }
         }
 
+    def enable_memory_tracing(self, frames: int = 25) -> None:
+        """
+        Start tracemalloc so get_performance_metrics reports measured memory.
+
+        Tracing slows down allocation-heavy code; enable it for diagnostics
+        rather than in latency-sensitive deployments.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self.logger.info("Memory tracing enabled", frames=frames)
+
+    def _get_memory_usage(self) -> Dict[str, Any]:
+        """Measured memory usage from tracemalloc, if tracing is active."""
+        
+        if not tracemalloc.is_tracing():
+            return {'memory_tracing': False}
+        
+        current, peak = tracemalloc.get_traced_memory()
+        
+        # Attribute live allocations made anywhere below the event system's modules
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(True, __file__, all_frames=True),
+            tracemalloc.Filter(True, inspect.getfile(FillEventIndex), all_frames=True)
+        ])
+        event_system_bytes = sum(stat.size for stat in snapshot.statistics('filename'))
+        
+        return {
+            'memory_tracing': True,
+            'event_system_memory_mb': event_system_bytes / (1024 * 1024),
+            'traced_memory_mb': current / (1024 * 1024),
+            'traced_peak_memory_mb': peak / (1024 * 1024)
+        }
+
     def integrate_with_analytics_engine(self, analytics_engine: RealTimeAnalyticsEngine) -> None:
         """Integrate with the real-time analytics engine."""
         self.analytics_engine = analytics_engine
@@ -1025,15 +1396,15 @@ class AdvancedFillEventSystem:
         self.pattern_detection_threshold = 0.8
         self.correlation_threshold = 0.7
         
-        # Optimize memory usage
-        if len(self.events) > 25000:
-            # Keep only most recent events
-            recent_events = list(self.events)[-20000:]
-            self.events.clear()
-            self.events.extend(recent_events)
+        with self.processing_lock:
+            # Optimize memory usage
+            if len(self.events) > 25000:
+                # Keep only most recent events
+                while len(self.events) > 20000:
+                    self._evict_oldest_event()
             
-            # Rebuild index
-            self.event_index = {e.event_id: e for e in self.events}
+            # Re-index windows for the new durations
+            self.event_windows.rebuild(self.events, self._required_windows())
         
         self.logger.info("System optimized for high-frequency trading",
                         pattern_threshold=self.pattern_detection_threshold,
@@ -1063,7 +1434,9 @@ class AdvancedFillEventSystem:
             },
             'integration': {
                 'analytics_engine_connected': self.analytics_engine is not None,
-                'thread_pool_active': not self.thread_pool._shutdown
+                'detection_offloaded': self.offload_detection,
+                'detection_pool_active': self.detection_pool is not None,
+                'pending_detection': len(self._pending_detection)
             }
         }
 
@@ -1072,8 +1445,21 @@ class AdvancedFillEventSystem:
         
         self.logger.info("Shutting down AdvancedFillEventSystem")
         
-        # Shutdown thread pool
-        self.thread_pool.shutdown(wait=True)
+        # Persist buffered archive events
+        if self.archive is not None:
+            await self.archive.aflush()
+        
+        # Stop offloaded detection and its process pool
+        if self._detection_task and not self._detection_task.done():
+            self._detection_task.cancel()
+            try:
+                await self._detection_task
+            except asyncio.CancelledError:
+                pass
+        
+        if self.detection_pool is not None:
+            self.detection_pool.shutdown(wait=True)
+            self.detection_pool = None
         
         # Clear handlers to prevent memory leaks
         self.event_handlers.clear()
@@ -1107,15 +1493,38 @@ async def integrate_advanced_events_with_system(
 
 # Performance-optimized event processing for high-frequency scenarios
 class HighFrequencyEventProcessor:
-    """Specialized processor for high-frequency trading scenarios."""
+    """
+    Specialized processor for high-frequency trading scenarios.
+    
+    Fills are queued and handed to the event system in micro-batches via
+    process_fill_events_batch. The batch size adapts to queue depth: it
+    doubles while a backlog builds and halves when the queue runs dry.
+    """
     
-    def __init__(self, event_system: AdvancedFillEventSystem):
+    def __init__(self, 
+                 event_system: AdvancedFillEventSystem,
+                 batch_size: int = 100,
+                 min_batch_size: int = 10,
+                 max_batch_size: int = 1000,
+                 max_queue_size: int = 10000):
         self.event_system = event_system
-        self.batch_size = 100
+        self.logger = event_system.logger
+        self.batch_size = batch_size
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
         self.batch_timeout = timedelta(milliseconds=50)
-        self.event_queue = asyncio.Queue(maxsize=10000)
+        self.event_queue = asyncio.Queue(maxsize=max_queue_size)
         self.processing_task = None
         self.running = False
+        
+        # Metrics
+        self.fills_queued = 0
+        self.fills_dropped = 0
+        self.fills_processed = 0
+        self.batches_processed = 0
+        self.last_batch_size = 0
+        self.max_queue_depth = 0
+        self.batch_errors = 0
     
     async def start(self):
         """Start high-frequency processing."""
@@ -1123,10 +1532,16 @@ class HighFrequencyEventProcessor:
         self.processing_task = asyncio.create_task(self._process_batch_events())
     
     async def stop(self):
-        """Stop high-frequency processing."""
+        """Stop high-frequency processing, processing fills already queued."""
         self.running = False
         if self.processing_task:
             await self.processing_task
+        
+        remaining = []
+        while not self.event_queue.empty():
+            remaining.append(self.event_queue.get_nowait())
+        for i in range(0, len(remaining), self.batch_size):
+            await self._process_batch(remaining[i:i + self.batch_size])
     
     async def queue_fill(self, fill):
         """Queue a fill for batch processing."""
@@ -1134,45 +1549,88 @@ class HighFrequencyEventProcessor:
             await asyncio.wait_for(self.event_queue.put(fill), timeout=0.001)
         except asyncio.TimeoutError:
             # Drop events if queue is full (backpressure)
-            pass
+            self.fills_dropped += 1
+            if self.fills_dropped == 1 or self.fills_dropped % 1000 == 0:
+                self.logger.warning("Fill queue full, dropping fills",
+                                    dropped=self.fills_dropped,
+                                    queue_size=self.event_queue.qsize())
+            return
+        
+        self.fills_queued += 1
+        depth = self.event_queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
     
     async def _process_batch_events(self):
-        """Process events in optimized batches."""
-        batch = []
-        last_batch_time = datetime.now()
+        """Collect fills into batches of up to batch_size or batch_timeout."""
+        loop = asyncio.get_running_loop()
+        timeout = self.batch_timeout.total_seconds()
         
         while self.running:
             try:
-                # Try to get an event with timeout
                 fill = await asyncio.wait_for(self.event_queue.get(), timeout=0.01)
-                batch.append(fill)
-                
-                # Process batch if size limit reached or timeout exceeded
-                should_process = (
-                    len(batch) >= self.batch_size or
-                    datetime.now() - last_batch_time >= self.batch_timeout
-                )
-                
-                if should_process and batch:
-                    await self._process_batch(batch)
-                    batch = []
-                    last_batch_time = datetime.now()
-                    
             except asyncio.TimeoutError:
-                # Process any remaining events in batch
-                if batch:
-                    await self._process_batch(batch)
-                    batch = []
-                    last_batch_time = datetime.now()
+                continue
+            
+            batch = [fill]
+            deadline = loop.time() + timeout
+            
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.event_queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.event_queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            await self._process_batch(batch)
+            self._adapt_batch_size()
     
     async def _process_batch(self, fills):
-        """Process a batch of fills efficiently."""
-        # Process fills concurrently
-        tasks = [
-            self.event_system.process_fill_event(fill)
-            for fill in fills
-        ]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        """Process a batch of fills through the event system."""
+        if not fills:
+            return
+        
+        try:
+            await self.event_system.process_fill_events_batch(fills)
+        except Exception as e:
+            self.batch_errors += 1
+            self.logger.error("Error processing fill batch", error=str(e), batch_size=len(fills))
+        
+        self.fills_processed += len(fills)
+        self.batches_processed += 1
+        self.last_batch_size = len(fills)
+    
+    def _adapt_batch_size(self) -> None:
+        """Grow the batch size while a backlog remains, shrink it when idle."""
+        depth = self.event_queue.qsize()
+        if depth > self.batch_size:
+            self.batch_size = min(self.max_batch_size, self.batch_size * 2)
+        elif depth < self.batch_size // 4:
+            self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queueing and batching metrics."""
+        return {
+            'running': self.running,
+            'queue_depth': self.event_queue.qsize(),
+            'max_queue_depth': self.max_queue_depth,
+            'fills_queued': self.fills_queued,
+            'fills_dropped': self.fills_dropped,
+            'fills_processed': self.fills_processed,
+            'batches_processed': self.batches_processed,
+            'batch_errors': self.batch_errors,
+            'batch_size': self.batch_size,
+            'last_batch_size': self.last_batch_size,
+            'average_batch_size': self.fills_processed / self.batches_processed if self.batches_processed else 0.0
+        }
 
 
 # Example usage and testing
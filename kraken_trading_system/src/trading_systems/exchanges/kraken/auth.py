@@ -12,12 +12,94 @@ import hashlib
 import hmac
 import time
 import urllib.parse
-from typing import Dict, Any, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, Union
 
 from ...utils.exceptions import AuthenticationError, InvalidCredentialsError
 from ...utils.logger import LoggerMixin
 
 
+class KrakenSigner:
+    """
+    Reusable HMAC-SHA512 signing context for a single Kraken API secret.
+
+    The secret is base64-decoded once and keyed into an HMAC template;
+    each signature starts from ``hmac.copy()`` of that template instead of
+    re-deriving the inner/outer key pads on every request.
+    """
+
+    __slots__ = ("_template",)
+
+    def __init__(self, api_secret: Union[str, bytes], decoded: bool = False):
+        """
+        Initialize the signer.
+
+        Args:
+            api_secret: Kraken API secret (base64 encoded unless ``decoded``)
+            decoded: True if ``api_secret`` is already the raw key bytes
+
+        Raises:
+            InvalidCredentialsError: If the secret is not valid base64
+        """
+        if decoded:
+            secret_bytes = api_secret
+        else:
+            try:
+                secret_bytes = base64.b64decode(api_secret)
+            except Exception as e:
+                raise InvalidCredentialsError(f"Invalid API secret format: {e}")
+
+        self._template = hmac.new(secret_bytes, digestmod=hashlib.sha512)
+
+    @staticmethod
+    def encode_body(data: Dict[str, Any]) -> str:
+        """URL-encode a request body exactly as it will be signed and sent."""
+        return urllib.parse.urlencode(data)
+
+    def sign(self, uri_path: str, nonce: str, postdata: str) -> str:
+        """
+        Sign an already URL-encoded request body.
+
+        Args:
+            uri_path: API endpoint path (e.g., "/0/private/Balance")
+            nonce: Nonce included in ``postdata``
+            postdata: URL-encoded POST body
+
+        Returns:
+            Base64 encoded API-Sign value
+        """
+        mac = self._template.copy()
+        mac.update(uri_path.encode('utf-8'))
+        mac.update(hashlib.sha256((nonce + postdata).encode('utf-8')).digest())
+        return base64.b64encode(mac.digest()).decode('utf-8')
+
+    def sign_data(self, uri_path: str, data: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Encode ``data`` once and sign it.
+
+        Args:
+            uri_path: API endpoint path
+            data: POST parameters, which must already contain ``nonce``
+
+        Returns:
+            Tuple of (postdata, signature) so the caller can send the exact
+            body that was signed
+        """
+        postdata = urllib.parse.urlencode(data)
+        return postdata, self.sign(uri_path, str(data['nonce']), postdata)
+
+
+@lru_cache(maxsize=8)
+def get_signer(api_secret: str) -> KrakenSigner:
+    """
+    Return a cached KrakenSigner for a base64-encoded secret.
+
+    Used by call sites that receive the secret per request (token refresh,
+    the reference signature helper) so they still decode it only once.
+    """
+    return KrakenSigner(api_secret)
+
+
 class KrakenAuthenticator(LoggerMixin):
     """
     Handles Kraken API authentication including signature generation.
@@ -52,6 +134,8 @@ class KrakenAuthenticator(LoggerMixin):
         except Exception as e:
             raise InvalidCredentialsError(f"Invalid API secret format: {e}")
         
+        self.signer = KrakenSigner(self.api_secret_decoded, decoded=True)
+        
         self.log_info("Kraken authenticator initialized", api_key_length=len(api_key))
     
     def generate_nonce(self) -> str:
@@ -85,6 +169,32 @@ class KrakenAuthenticator(LoggerMixin):
         Returns:
             Tuple of (nonce, signature) where signature is base64 encoded
             
+        Raises:
+            AuthenticationError: If signature generation fails
+        """
+        nonce, _, signature = self.sign_request(uri_path, data, nonce)
+        return nonce, signature
+    
+    def sign_request(
+        self, 
+        uri_path: str, 
+        data: Dict[str, Any], 
+        nonce: Optional[str] = None
+    ) -> Tuple[str, str, str]:
+        """
+        Encode and sign a Kraken API request body in a single pass.
+        
+        The returned ``postdata`` is the exact body that was signed and
+        should be sent as-is rather than re-encoding ``data``.
+        
+        Args:
+            uri_path: API endpoint path (e.g., "/0/private/Balance")
+            data: Dictionary of POST data parameters
+            nonce: Optional nonce (will be generated if not provided)
+            
+        Returns:
+            Tuple of (nonce, postdata, signature)
+            
         Raises:
             AuthenticationError: If signature generation fails
         """
@@ -93,38 +203,14 @@ class KrakenAuthenticator(LoggerMixin):
             if nonce is None:
                 nonce = self.generate_nonce()
             
-            # Add nonce to data
+            # Nonce goes first in the body, overriding any caller-supplied value
             data_with_nonce = {"nonce": nonce}
             data_with_nonce.update(data)
             data_with_nonce['nonce'] = nonce
             
-            # Create URL-encoded POST data string
-            postdata = urllib.parse.urlencode(data_with_nonce)
-            
-            # FIXED: Create the encoded string correctly: nonce + postdata (not nonce + postdata)
-            # This is the key fix - the string to hash is: str(nonce) + postdata
-            encoded = (str(data_with_nonce['nonce']) + postdata).encode('utf-8')
-            
-            # Calculate SHA256 hash of the encoded string
-            sha256_hash = hashlib.sha256(encoded).digest()
+            postdata, signature = self.signer.sign_data(uri_path, data_with_nonce)
             
-            # Create message for HMAC: URI path + SHA256 hash (both as bytes)
-            message = uri_path.encode('utf-8') + sha256_hash
-            
-            # Calculate HMAC-SHA512 using the decoded secret key
-            mac = hmac.new(self.api_secret_decoded, message, hashlib.sha512)
-            
-            # Encode signature to base64
-            signature = base64.b64encode(mac.digest()).decode('utf-8')
-            
-            self.log_info(
-                "Generated API signature",
-                uri_path=uri_path,
-                nonce=nonce,
-                postdata_length=len(postdata)
-            )
-            
-            return nonce, signature
+            return nonce, postdata, signature
             
         except Exception as e:
             self.log_error("Failed to generate API signature", error=e)
@@ -149,6 +235,31 @@ class KrakenAuthenticator(LoggerMixin):
         """
         nonce, signature = self.create_signature(uri_path, data, nonce)
         
+        return self._build_headers(signature)
+    
+    def create_signed_request(
+        self, 
+        uri_path: str, 
+        data: Dict[str, Any], 
+        nonce: Optional[str] = None
+    ) -> Tuple[str, Dict[str, str]]:
+        """
+        Create the signed body and authentication headers for a request.
+        
+        Args:
+            uri_path: API endpoint path
+            data: POST data parameters
+            nonce: Optional nonce
+            
+        Returns:
+            Tuple of (postdata, headers); postdata is the URL-encoded body
+            the signature was computed over
+        """
+        _, postdata, signature = self.sign_request(uri_path, data, nonce)
+        return postdata, self._build_headers(signature)
+    
+    def _build_headers(self, signature: str) -> Dict[str, str]:
+        """Build the Kraken authentication headers for a signature."""
         return {
             'API-Key': self.api_key,
             'API-Sign': signature,
@@ -204,14 +315,11 @@ def get_kraken_signature(urlpath: str, data: Dict[str, Any], secret: str) -> str
     """
     Official Kraken signature function from their documentation.
     
-    This is the reference implementation from Kraken's API docs.
+    This is the reference implementation from Kraken's API docs, backed by
+    a cached KrakenSigner so the secret is decoded once per process.
     """
-    postdata = urllib.parse.urlencode(data)
-    encoded = (str(data['nonce']) + postdata).encode()
-    message = urlpath.encode() + hashlib.sha256(encoded).digest()
-    mac = hmac.new(base64.b64decode(secret), message, hashlib.sha512)
-    sigdigest = base64.b64encode(mac.digest())
-    return sigdigest.decode()
+    _, signature = get_signer(secret).sign_data(urlpath, data)
+    return signature
 
 
 def test_signature_generation():
@@ -0,0 +1,217 @@
+"""
+Materialized, versioned analytics dashboard with rate-limited push updates.
+
+Producers mark sections dirty as fills and price ticks arrive, which is
+O(1). Dirty sections are rebuilt only when the dashboard is read or
+published, so a burst of fills costs one rebuild. Each rebuild that
+changes anything bumps the version and replaces the snapshot dict, which
+readers get without copying. Subscribers receive only the changed keys,
+at most once per ``min_publish_interval``.
+
+Sections whose values depend on the clock (trailing windows, counts over
+the last hour) and the metadata are also rebuilt on read once they are
+older than ``clock_ttl`` seconds, so an idle dashboard does not freeze.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+SectionBuilder = Callable[[], Dict[str, Any]]
+
+
+@dataclass
+class DashboardUpdate:
+    """Changes published between two dashboard versions."""
+    version: int
+    previous_version: int
+    timestamp: datetime
+    changes: Dict[str, Dict[str, Any]]  # section -> changed keys and new values
+
+
+class MaterializedDashboard:
+    """
+    Dashboard assembled from named section builders.
+
+    Args:
+        builders: Section name -> function returning the section's values
+        metadata: Function returning top-level keys refreshed on each new version
+        min_publish_interval: Minimum seconds between pushes to subscribers
+        logger: Logger for subscriber errors
+        clock_sections: Sections that change with time alone
+        clock_ttl: Seconds before clock sections and metadata are rebuilt on read
+        clock: Monotonic time source
+    """
+
+    def __init__(self,
+                 builders: Dict[str, SectionBuilder],
+                 metadata: Optional[SectionBuilder] = None,
+                 min_publish_interval: float = 0.25,
+                 logger: Any = None,
+                 clock_sections: Iterable[str] = (),
+                 clock_ttl: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.builders = builders
+        self.metadata = metadata
+        self.min_publish_interval = min_publish_interval
+        self.logger = logger
+        self.clock_sections = tuple(clock_sections)
+        self.clock_ttl = clock_ttl
+        self.clock = clock
+        self._clock_built_at = clock()
+
+        self.version = 0
+        self._published_version = 0
+        self._snapshot: Dict[str, Any] = {}
+        self._json: Optional[str] = None
+        self._dirty = set(builders)
+        self._pending: Dict[str, Dict[str, Any]] = {}  # changes not yet pushed
+
+        self.subscribers: List[Callable[[DashboardUpdate], Any]] = []
+        self._publish_handle: Optional[asyncio.TimerHandle] = None
+        self._last_publish = 0.0
+        self.rebuilds = 0
+        self.publishes = 0
+
+    # PRODUCERS
+
+    def mark_dirty(self, sections: Iterable[str]) -> None:
+        """Flag sections as stale and schedule a push if anyone is listening."""
+        self._dirty.update(sections)
+        if self.subscribers and self._publish_handle is None:
+            self._schedule_publish()
+
+    def mark_all_dirty(self) -> None:
+        """Flag every section as stale."""
+        self.mark_dirty(self.builders)
+
+    # READERS
+
+    @property
+    def snapshot(self) -> Dict[str, Any]:
+        """Current dashboard; treat as read-only."""
+        if self._dirty or self._clock_expired():
+            self.materialize()
+        return self._snapshot
+
+    def to_json(self) -> str:
+        """Current dashboard serialized as JSON, cached per version."""
+        snapshot = self.snapshot
+        if self._json is None:
+            self._json = json.dumps(snapshot, default=str)
+        return self._json
+
+    def materialize(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Rebuild dirty sections and bump the version if anything changed.
+
+        Returns:
+            Changed keys per section
+        """
+        now = self.clock()
+        refresh_clock = now - self._clock_built_at >= self.clock_ttl
+        if refresh_clock:
+            self._dirty.update(self.clock_sections)
+            self._clock_built_at = now
+        dirty = [name for name in self.builders if name in self._dirty]
+        self._dirty.clear()
+
+        changes: Dict[str, Dict[str, Any]] = {}
+        rebuilt: Dict[str, Dict[str, Any]] = {}
+        for name in dirty:
+            section = self.builders[name]()
+            previous = self._snapshot.get(name, {})
+            changed = {key: value for key, value in section.items() if previous.get(key) != value}
+            if changed or len(section) != len(previous):
+                changes[name] = changed
+                rebuilt[name] = section
+        self.rebuilds += 1
+
+        if changes or (refresh_clock and self.metadata is not None):
+            # Replace rather than mutate so earlier snapshots stay consistent
+            snapshot = dict(self._snapshot)
+            snapshot.update(rebuilt)
+            self.version += 1
+            if self.metadata is not None:
+                snapshot.update(self.metadata())
+            snapshot['version'] = self.version
+            self._snapshot = snapshot
+            self._json = None
+
+            for name, changed in changes.items():
+                self._pending.setdefault(name, {}).update(changed)
+
+        return changes
+
+    def _clock_expired(self) -> bool:
+        return self.clock() - self._clock_built_at >= self.clock_ttl
+
+    # SUBSCRIBERS
+
+    def subscribe(self, handler: Callable[[DashboardUpdate], Any]) -> Dict[str, Any]:
+        """
+        Register a handler for dashboard diffs.
+
+        Returns:
+            The current snapshot, which later diffs apply to
+        """
+        snapshot = self.snapshot
+        self._pending.clear()
+        self._published_version = self.version
+        self.subscribers.append(handler)
+        return snapshot
+
+    def unsubscribe(self, handler: Callable[[DashboardUpdate], Any]) -> None:
+        """Remove a diff handler."""
+        if handler in self.subscribers:
+            self.subscribers.remove(handler)
+
+    def _schedule_publish(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to push from; readers still see fresh data
+            return
+        delay = max(0.0, self._last_publish + self.min_publish_interval - time.monotonic())
+        self._publish_handle = loop.call_later(delay, self.publish)
+
+    def publish(self) -> Optional[DashboardUpdate]:
+        """Push pending changes to subscribers now."""
+        self._publish_handle = None
+        self._last_publish = time.monotonic()
+
+        if self._dirty:
+            self.materialize()
+        if not self._pending:
+            return None
+
+        update = DashboardUpdate(
+            version=self.version,
+            previous_version=self._published_version,
+            timestamp=datetime.now(),
+            changes=self._pending
+        )
+        self._pending = {}
+        self._published_version = self.version
+        self.publishes += 1
+
+        for handler in list(self.subscribers):
+            try:
+                result = handler(update)
+                if asyncio.iscoroutine(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                if self.logger is not None:
+                    self.logger.error("Dashboard subscriber error",
+                                      handler=getattr(handler, '__name__', repr(handler)),
+                                      error=str(e))
+        return update
+
+    def close(self) -> None:
+        """Cancel any scheduled push."""
+        if self._publish_handle is not None:
+            self._publish_handle.cancel()
+            self._publish_handle = None
@@ -0,0 +1,323 @@
+"""
+Columnar on-disk archive of fill events with vectorized replay.
+
+Events are buffered per (day, pair) and written as segments of NumPy
+``.npy`` column files, laid out as::
+
+    <root>/<YYYY-MM-DD>/<quoted pair>/seg-000001/{timestamp,price,...}.npy
+
+Segments are memory-mapped on load, so a replay only pages in the days
+and pairs it covers, and detection runs over whole windows with the
+vectorized detectors instead of re-running per-event async handlers.
+
+When a buffer fills while an event loop is running, its segment is written
+by a single background thread so fill ingestion never waits on disk I/O;
+``aflush`` awaits those writes and ``flush`` blocks until they finish.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from .fill_pattern_detection import DetectionConfig, build_columns, detect_vectorized
+
+COLUMNS = ('timestamp', 'price', 'volume', 'side', 'improvement', 'event_id')
+EVENT_ID_DTYPE = '<U36'
+
+
+class FillEventArchive:
+    """
+    Day/pair partitioned columnar archive of fill events.
+
+    Events must be appended in time order per pair. Buffered events are
+    written when a buffer reaches ``segment_size`` or on ``flush()``; only
+    flushed events are visible to ``load`` and ``replay``. Full buffers
+    appended from a running event loop are written in the background.
+    """
+
+    def __init__(self, root: Union[str, Path], segment_size: int = 10_000):
+        if segment_size <= 0:
+            raise ValueError("segment_size must be positive")
+
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+
+        self._buffers: Dict[Tuple[date, str], List[Any]] = defaultdict(list)
+        self.events_written = 0
+        self.segments_written = 0
+
+        # One writer thread keeps segment numbering per partition sequential
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: Set[Future] = set()
+        self._next_segment: Dict[Tuple[date, str], int] = {}  # seeded from disk once per partition
+
+    # WRITING
+
+    def append(self, event: Any) -> None:
+        """Buffer an event, writing a segment when its buffer is full."""
+        if event.fill is None:
+            return
+
+        key = (event.timestamp.date(), getattr(event.fill, 'pair', 'unknown'))
+        buffer = self._buffers[key]
+        buffer.append(event)
+        if len(buffer) >= self.segment_size:
+            del self._buffers[key]
+            self._hand_off(key, buffer)
+
+    def extend(self, events: Iterable[Any]) -> None:
+        """Buffer several events."""
+        for event in events:
+            self.append(event)
+
+    def flush(self) -> None:
+        """Write all buffered events, waiting for background writes first."""
+        self._wait_pending()
+        for key, buffer in list(self._buffers.items()):
+            if buffer:
+                self._write_segment(key, buffer)
+        self._buffers.clear()
+
+    async def aflush(self) -> None:
+        """Write all buffered events without blocking the event loop."""
+        buffers = [(key, buffer) for key, buffer in self._buffers.items() if buffer]
+        self._buffers.clear()
+        for key, buffer in buffers:
+            self._submit(key, buffer)
+        pending = list(self._pending_writes)
+        if pending:
+            await asyncio.gather(*(asyncio.wrap_future(future) for future in pending))
+
+    def close(self) -> None:
+        """Flush and stop the background writer."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+
+    @property
+    def pending_writes(self) -> int:
+        """Segments handed to the background writer and not yet written."""
+        return len(self._pending_writes)
+
+    def _hand_off(self, key: Tuple[date, str], events: List[Any]) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to protect; write inline
+            self._write_segment(key, events)
+            return
+        self._submit(key, events)
+
+    def _submit(self, key: Tuple[date, str], events: List[Any]) -> None:
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fill-archive")
+        future = self._writer.submit(self._write_segment, key, events)
+        self._pending_writes.add(future)
+        future.add_done_callback(self._pending_writes.discard)
+
+    def _wait_pending(self) -> None:
+        for future in list(self._pending_writes):
+            future.result()
+
+    @property
+    def buffered_events(self) -> int:
+        """Events not yet written to disk."""
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def _partition_dir(self, day: date, pair: str) -> Path:
+        return self.root / day.isoformat() / quote(pair, safe='')
+
+    def _write_segment(self, key: Tuple[date, str], events: List[Any]) -> None:
+        """
+        Write one segment of column files.
+
+        Segment numbers come from a per-partition counter. Another archive
+        writing to the same root can take a number first, so staging and
+        publishing both skip to the next number when theirs is in use.
+        """
+        partition = self._partition_dir(*key)
+        index = self._next_segment.get(key)
+        if index is None:
+            partition.mkdir(parents=True, exist_ok=True)
+            index = _last_segment(partition) + 1
+
+        while True:
+            staging = partition / f"seg-{index:06d}.tmp"
+            try:
+                staging.mkdir()
+                break
+            except FileExistsError:  # staged by another writer, or left by a crash
+                index += 1
+
+        columns = build_columns(events)
+        columns['event_id'] = np.array([e.event_id for e in events], dtype=EVENT_ID_DTYPE)
+        for name in COLUMNS:
+            np.save(staging / f"{name}.npy", columns[name])
+
+        # Readers only see complete segments
+        while True:
+            segment = partition / f"seg-{index:06d}"
+            try:
+                staging.rename(segment)
+                break
+            except OSError:
+                if not segment.exists():
+                    raise
+                index += 1
+        self._next_segment[key] = index + 1
+
+        self.events_written += len(events)
+        self.segments_written += 1
+
+    # READING
+
+    def days(self) -> List[date]:
+        """Days with archived events."""
+        return sorted(
+            date.fromisoformat(path.name) for path in self.root.iterdir()
+            if path.is_dir() and not path.name.startswith('.')
+        )
+
+    def pairs(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[str]:
+        """Pairs with archived events in the given range of days."""
+        found = set()
+        for day_dir in self._day_dirs(start, end):
+            found.update(unquote(path.name) for path in day_dir.iterdir() if path.is_dir())
+        return sorted(found)
+
+    def _day_dirs(self, start: Optional[datetime], end: Optional[datetime]) -> Iterator[Path]:
+        for day in self.days():
+            if start is not None and day < start.date():
+                continue
+            if end is not None and day > end.date():
+                continue
+            yield self.root / day.isoformat()
+
+    def _segments(self, pair: str, start: Optional[datetime], end: Optional[datetime]) -> Iterator[Path]:
+        quoted = quote(pair, safe='')
+        for day_dir in self._day_dirs(start, end):
+            partition = day_dir / quoted
+            if partition.is_dir():
+                yield from sorted(p for p in partition.glob('seg-*') if not p.name.endswith('.tmp'))
+
+    def load(self,
+             pair: str,
+             start: Optional[datetime] = None,
+             end: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """
+        Load one pair's columns for a time range.
+
+        Segments are memory-mapped and only the rows inside the range are
+        copied out.
+
+        Returns:
+            Time-ordered columns; empty arrays if nothing is archived
+        """
+        parts: Dict[str, List[np.ndarray]] = {name: [] for name in COLUMNS}
+        lower = start.timestamp() if start is not None else -np.inf
+        upper = end.timestamp() if end is not None else np.inf
+
+        for segment in self._segments(pair, start, end):
+            timestamp = np.load(segment / "timestamp.npy", mmap_mode='r')
+            lo = int(np.searchsorted(timestamp, lower, side='left'))
+            hi = int(np.searchsorted(timestamp, upper, side='right'))
+            if lo >= hi:
+                continue
+            for name in COLUMNS:
+                column = np.load(segment / f"{name}.npy", mmap_mode='r')
+                parts[name].append(np.array(column[lo:hi]))
+
+        if not parts['timestamp']:
+            return _empty_columns()
+
+        columns = {name: np.concatenate(chunks) for name, chunks in parts.items()}
+        order = np.argsort(columns['timestamp'], kind='stable')
+        if np.any(order != np.arange(order.size)):
+            columns = {name: column[order] for name, column in columns.items()}
+        return columns
+
+    # REPLAY
+
+    def replay(self,
+               start: datetime,
+               end: datetime,
+               config: DetectionConfig,
+               pairs: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Run vectorized pattern and correlation detection over a time range.
+
+        Each pair is loaded with enough look-back for the widest window, so
+        events near ``start`` see the same history as they did live.
+
+        Returns:
+            Replay summary with per-type detection counts
+        """
+        started = time.perf_counter()
+        lookback = timedelta(seconds=max(list(config.pattern_windows.values()) + [config.correlation_window]))
+
+        pattern_counts: Dict[str, int] = defaultdict(int)
+        correlation_counts: Dict[str, int] = defaultdict(int)
+        pattern_confidence: Dict[str, float] = defaultdict(float)
+        events_replayed = 0
+        replayed_pairs = []
+
+        for pair in (pairs if pairs is not None else self.pairs(start - lookback, end)):
+            columns = self.load(pair, start - lookback, end)
+            first = int(np.searchsorted(columns['timestamp'], start.timestamp(), side='left'))
+            if first >= columns['timestamp'].size:
+                continue
+
+            replayed_pairs.append(pair)
+            events_replayed += columns['timestamp'].size - first
+
+            patterns, correlations = detect_vectorized(columns, config, first_position=first)
+            for pattern_type, found in patterns.items():
+                pattern_counts[pattern_type] += int(found['positions'].size)
+                pattern_confidence[pattern_type] += float(found['confidence'].sum())
+            for correlation_type, found in correlations.items():
+                correlation_counts[correlation_type] += int(found['positions'].size)
+
+        hours = max(1, (end - start).total_seconds() / 3600)
+        return {
+            'events_replayed': events_replayed,
+            'patterns_detected': sum(pattern_counts.values()),
+            'correlations_found': sum(correlation_counts.values()),
+            'pattern_counts': {k: v for k, v in pattern_counts.items() if v},
+            'correlation_counts': {k: v for k, v in correlation_counts.items() if v},
+            'average_pattern_confidence': {
+                k: pattern_confidence[k] / v for k, v in pattern_counts.items() if v
+            },
+            'pairs': replayed_pairs,
+            'time_span': str(end - start),
+            'average_events_per_hour': events_replayed / hours,
+            'replay_seconds': time.perf_counter() - started
+        }
+
+
+def _last_segment(partition: Path) -> int:
+    """Highest complete segment number in a partition, 0 if none."""
+    numbers = [
+        int(path.name[4:]) for path in partition.glob('seg-*')
+        if not path.name.endswith('.tmp') and path.name[4:].isdigit()
+    ]
+    return max(numbers, default=0)
+
+
+def _empty_columns() -> Dict[str, np.ndarray]:
+    return {
+        'timestamp': np.empty(0, dtype=np.float64),
+        'price': np.empty(0, dtype=np.float64),
+        'volume': np.empty(0, dtype=np.float64),
+        'side': np.empty(0, dtype=np.int8),
+        'improvement': np.empty(0, dtype=np.float64),
+        'event_id': np.empty(0, dtype=EVENT_ID_DTYPE)
+    }
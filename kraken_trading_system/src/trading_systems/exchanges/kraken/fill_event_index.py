@@ -0,0 +1,353 @@
+"""
+Time-windowed per-pair index of fill events.
+
+Each (pair, window) keeps a time-ordered deque of events that is trimmed
+from the left as new events arrive, together with running aggregates
+(volume, notional, side counts, price/volume/interval moments and
+monotonic min/max price deques). Pattern and correlation detectors read
+window statistics in O(1) and only walk the window when they need the
+individual events of a detected pattern.
+"""
+
+import math
+from collections import deque
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set
+
+
+class RunningMoments:
+    """
+    Count, mean and sample variance of a stream that supports removal.
+
+    Values are shifted by the first value seen so that sums of squares stay
+    small and the variance does not suffer from cancellation when the
+    values are large relative to their spread (e.g. prices).
+    """
+
+    __slots__ = ("count", "_shift", "_sum", "_sum_sq")
+
+    def __init__(self):
+        self.count = 0
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a value to the stream."""
+        if self.count == 0:
+            self._shift = value
+            self._sum = 0.0
+            self._sum_sq = 0.0
+        d = value - self._shift
+        self.count += 1
+        self._sum += d
+        self._sum_sq += d * d
+
+    def remove(self, value: float) -> None:
+        """Remove a value previously added."""
+        self.count -= 1
+        if self.count <= 0:
+            self.count = 0
+            self._sum = 0.0
+            self._sum_sq = 0.0
+            return
+        d = value - self._shift
+        self._sum -= d
+        self._sum_sq -= d * d
+
+    def copy(self) -> "RunningMoments":
+        """Return an independent copy."""
+        other = RunningMoments()
+        other.count = self.count
+        other._shift = self._shift
+        other._sum = self._sum
+        other._sum_sq = self._sum_sq
+        return other
+
+    @property
+    def mean(self) -> float:
+        """Mean of the values, or 0.0 when empty."""
+        if self.count == 0:
+            return 0.0
+        return self._shift + self._sum / self.count
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (matches ``statistics.variance``), 0.0 below two values."""
+        if self.count < 2:
+            return 0.0
+        var = (self._sum_sq - self._sum * self._sum / self.count) / (self.count - 1)
+        return var if var > 0.0 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+
+class EventWindow:
+    """Events inside a trailing time window, with running aggregates."""
+
+    def __init__(self):
+        self.events: Deque[Any] = deque()
+
+        # Exact totals for pattern reporting
+        self.volume = Decimal('0')
+        self.notional = Decimal('0')
+        self.price_total = Decimal('0')
+
+        # Float moments for dispersion statistics
+        self.prices = RunningMoments()
+        self.volumes = RunningMoments()
+        self.intervals = RunningMoments()  # seconds between consecutive events
+
+        self.improved_count = 0  # events with positive price improvement
+
+        # Monotonic deques: front is the current min/max event
+        self._min_price: Deque[Any] = deque()
+        self._max_price: Deque[Any] = deque()
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.events)
+
+    @property
+    def first(self) -> Optional[Any]:
+        """Oldest event in the window."""
+        return self.events[0] if self.events else None
+
+    @property
+    def last(self) -> Optional[Any]:
+        """Newest event in the window."""
+        return self.events[-1] if self.events else None
+
+    @property
+    def min_price(self) -> Optional[Decimal]:
+        """Lowest fill price in the window."""
+        return self._min_price[0].fill.price if self._min_price else None
+
+    @property
+    def max_price(self) -> Optional[Decimal]:
+        """Highest fill price in the window."""
+        return self._max_price[0].fill.price if self._max_price else None
+
+    @property
+    def average_price(self) -> Decimal:
+        """Unweighted mean fill price."""
+        return self.price_total / len(self.events) if self.events else Decimal('0')
+
+    @property
+    def duration(self) -> timedelta:
+        """Time between the oldest and newest event."""
+        if not self.events:
+            return timedelta(0)
+        return self.events[-1].timestamp - self.events[0].timestamp
+
+    def event_ids(self) -> List[str]:
+        """Event ids in time order."""
+        return [e.event_id for e in self.events]
+
+    def append(self, event: Any) -> None:
+        """Add the newest event and fold it into the aggregates."""
+        fill = event.fill
+        price = fill.price
+
+        if self.events:
+            self.intervals.add((event.timestamp - self.events[-1].timestamp).total_seconds())
+        self.events.append(event)
+
+        self.volume += fill.volume
+        self.notional += fill.volume * price
+        self.price_total += price
+        self.prices.add(float(price))
+        self.volumes.add(float(fill.volume))
+        if _has_price_improvement(fill):
+            self.improved_count += 1
+
+        while self._min_price and self._min_price[-1].fill.price >= price:
+            self._min_price.pop()
+        self._min_price.append(event)
+        while self._max_price and self._max_price[-1].fill.price <= price:
+            self._max_price.pop()
+        self._max_price.append(event)
+
+    def popleft(self) -> Any:
+        """Remove the oldest event and take it out of the aggregates."""
+        event = self.events.popleft()
+        fill = event.fill
+
+        if self.events:
+            self.intervals.remove((self.events[0].timestamp - event.timestamp).total_seconds())
+
+        self.volume -= fill.volume
+        self.notional -= fill.volume * fill.price
+        self.price_total -= fill.price
+        self.prices.remove(float(fill.price))
+        self.volumes.remove(float(fill.volume))
+        if _has_price_improvement(fill):
+            self.improved_count -= 1
+
+        if self._min_price and self._min_price[0] is event:
+            self._min_price.popleft()
+        if self._max_price and self._max_price[0] is event:
+            self._max_price.popleft()
+
+        return event
+
+    def trim(self, cutoff: datetime) -> None:
+        """Drop events older than ``cutoff``."""
+        events = self.events
+        while events and events[0].timestamp < cutoff:
+            self.popleft()
+
+    def discard_oldest(self, event: Any) -> bool:
+        """Remove ``event`` if it is the oldest in the window."""
+        if self.events and self.events[0] is event:
+            self.popleft()
+            return True
+        return False
+
+
+class PairWindow:
+    """One pair's events in a window, overall and split by side."""
+
+    def __init__(self, duration: timedelta):
+        self.duration = duration
+        self.all = EventWindow()
+        self.buy = EventWindow()
+        self.sell = EventWindow()
+
+    def __len__(self) -> int:
+        return len(self.all)
+
+    def side(self, side: str) -> Optional[EventWindow]:
+        """Window restricted to one side, or None for an unknown side."""
+        if side == 'buy':
+            return self.buy
+        if side == 'sell':
+            return self.sell
+        return None
+
+    def append(self, event: Any) -> None:
+        """Add an event and trim everything older than the window."""
+        cutoff = event.timestamp - self.duration
+        self.all.append(event)
+        side = self.side(getattr(event.fill, 'side', None))
+        if side is not None:
+            side.append(event)
+
+        self.all.trim(cutoff)
+        self.buy.trim(cutoff)
+        self.sell.trim(cutoff)
+
+    def discard_oldest(self, event: Any) -> None:
+        """Remove ``event`` if it is the oldest in the window."""
+        if self.all.discard_oldest(event):
+            self.buy.discard_oldest(event)
+            self.sell.discard_oldest(event)
+
+
+class FillEventIndex:
+    """
+    Per-pair, per-window index of fill events.
+
+    Events must be added in time order. A window only trims when an event
+    for its pair arrives, which is also the only time detectors read it.
+    """
+
+    def __init__(self, durations: Iterable[timedelta] = ()):
+        self._durations: Set[timedelta] = set(durations)
+        self._pairs: Dict[str, Dict[timedelta, PairWindow]] = {}
+
+    @property
+    def durations(self) -> Set[timedelta]:
+        """Window durations currently maintained."""
+        return set(self._durations)
+
+    def has_window(self, duration: timedelta) -> bool:
+        """Whether ``duration`` is maintained by the index."""
+        return duration in self._durations
+
+    def pairs(self) -> List[str]:
+        """Pairs with indexed events."""
+        return list(self._pairs)
+
+    def add(self, event: Any) -> None:
+        """Index a new event under its fill's pair."""
+        if event.fill is None:
+            return
+        pair = getattr(event.fill, 'pair', 'unknown')
+        windows = self._pairs.get(pair)
+        if windows is None:
+            windows = {d: PairWindow(d) for d in self._durations}
+            self._pairs[pair] = windows
+        for window in windows.values():
+            window.append(event)
+
+    def evict(self, event: Any) -> None:
+        """
+        Drop an event evicted from the backing store.
+
+        Events are evicted oldest first, so the event can only be at the
+        front of its pair's windows. Pairs left with no events are removed.
+        """
+        if event.fill is None:
+            return
+        pair = getattr(event.fill, 'pair', 'unknown')
+        windows = self._pairs.get(pair)
+        if windows is None:
+            return
+        for window in windows.values():
+            window.discard_oldest(event)
+        if not any(len(window) for window in windows.values()):
+            del self._pairs[pair]
+
+    def add_window(self, duration: timedelta, events: Iterable[Any] = ()) -> None:
+        """Start maintaining a new window, backfilled from ``events``."""
+        if duration in self._durations:
+            return
+        self._durations.add(duration)
+        for windows in self._pairs.values():
+            windows[duration] = PairWindow(duration)
+        for event in events:
+            if event.fill is None:
+                continue
+            pair = getattr(event.fill, 'pair', 'unknown')
+            windows = self._pairs.setdefault(pair, {d: PairWindow(d) for d in self._durations})
+            windows[duration].append(event)
+
+    def rebuild(self, events: Iterable[Any], durations: Optional[Iterable[timedelta]] = None) -> None:
+        """Rebuild all windows from ``events`` (in time order)."""
+        if durations is not None:
+            self._durations = set(durations)
+        self._pairs.clear()
+        for event in events:
+            self.add(event)
+
+    def window(self, pair: str, duration: timedelta) -> Optional[PairWindow]:
+        """
+        Events for ``pair`` within ``duration`` of its newest event.
+
+        Returns:
+            PairWindow, or None if the pair has no events
+
+        Raises:
+            KeyError: If ``duration`` is not maintained by the index
+        """
+        if duration not in self._durations:
+            raise KeyError(duration)
+        windows = self._pairs.get(pair)
+        return windows[duration] if windows is not None else None
+
+    def clear(self) -> None:
+        """Drop all indexed events."""
+        self._pairs.clear()
+
+
+def _has_price_improvement(fill: Any) -> bool:
+    """Whether a fill reports positive price improvement."""
+    improvement = getattr(fill, 'price_improvement', None)
+    return improvement is not None and improvement > 0
@@ -0,0 +1,724 @@
+"""
+Array-based pattern and correlation detection for fill events.
+
+The functions here mirror the detectors of AdvancedFillEventSystem but
+operate on compact NumPy columns of one pair's recent events instead of
+FillEvent/TradeFill objects. They have no dependency on the event system,
+so batches can be evaluated in a worker process and only small result
+tuples travel back to the event loop.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+SIDE_BUY = 1
+SIDE_SELL = -1
+SIDE_UNKNOWN = 0
+
+Indices = Union[range, List[int]]
+
+
+@dataclass
+class DetectionConfig:
+    """Windows (in seconds) and thresholds used by the array detectors."""
+    pattern_windows: Dict[str, float] = field(default_factory=dict)  # pattern type value -> seconds
+    pattern_threshold: float = 0.7
+    correlation_threshold: float = 0.6
+    momentum_window: float = 120.0
+    arbitrage_window: float = 30.0
+    correlation_window: float = 600.0
+    detect_correlations: bool = True
+
+
+class DetectedPattern(NamedTuple):
+    """A pattern found for the event at ``position``."""
+    position: int
+    pattern_type: str
+    indices: Indices
+    confidence: float
+    strength: float
+    total_volume: float
+    average_price: float = 0.0
+    price_low: float = 0.0
+    price_high: float = 0.0
+    duration: float = 0.0
+    side: Optional[str] = None
+
+
+class DetectedCorrelation(NamedTuple):
+    """A correlation found for the event at ``position``."""
+    position: int
+    correlation_type: str
+    indices: Indices
+    strength: float
+    time_window: float = 0.0
+    metadata: Optional[Dict[str, Any]] = None
+
+
+COLUMN_DTYPES = {
+    'timestamp': np.float64,
+    'price': np.float64,
+    'volume': np.float64,
+    'side': np.int8,
+    'improvement': np.float64,
+}
+
+
+def _empty_columns(n: int) -> Dict[str, np.ndarray]:
+    return {name: np.empty(n, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+
+
+def _write_row(columns: Dict[str, np.ndarray], i: int, event: Any) -> None:
+    """Store one event's detection values at row ``i``."""
+    fill = event.fill
+    columns['timestamp'][i] = event.timestamp.timestamp()
+    columns['price'][i] = fill.price
+    columns['volume'][i] = fill.volume
+    fill_side = getattr(fill, 'side', None)
+    columns['side'][i] = SIDE_BUY if fill_side == 'buy' else SIDE_SELL if fill_side == 'sell' else SIDE_UNKNOWN
+    value = getattr(fill, 'price_improvement', None)
+    columns['improvement'][i] = value if value is not None else np.nan
+
+
+def build_columns(events: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """
+    Convert time-ordered fill events into detection columns.
+
+    Returns:
+        Dictionary of float64 ``timestamp``, ``price``, ``volume`` and
+        ``improvement`` (NaN when not reported) columns and an int8 ``side``
+    """
+    columns = _empty_columns(len(events))
+    for i, event in enumerate(events):
+        _write_row(columns, i, event)
+    return columns
+
+
+class ColumnBuffer:
+    """
+    Detection columns for one pair, appended one event at a time.
+
+    Rows are converted once, when their event arrives. Events can be held
+    while they wait for batch detection: ``trim`` never drops rows an
+    unreleased event still needs, so every event in a batch is evaluated
+    against the history it had when it arrived, however late the batch
+    runs. Storage doubles when full and is compacted once trimmed rows take
+    up half of it.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self._columns = _empty_columns(capacity)
+        self._events: List[Any] = [None] * capacity
+        self._start = 0
+        self._end = 0
+        self._base = 0  # rows dropped from the front so far
+        self._rows: Dict[str, int] = {}  # event_id -> absolute row
+        self._held: "OrderedDict[str, float]" = OrderedDict()  # event_id -> timestamp, oldest first
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def held(self) -> int:
+        """Events waiting for batch detection."""
+        return len(self._held)
+
+    def append(self, event: Any, hold: bool = False) -> None:
+        """Add the newest event, optionally holding it for batch detection."""
+        if self._end == len(self._events):
+            self._grow()
+        _write_row(self._columns, self._end, event)
+        self._events[self._end] = event
+        self._rows[event.event_id] = self._base + self._end - self._start
+        self._end += 1
+        if hold:
+            self._held[event.event_id] = self._columns['timestamp'][self._end - 1]
+
+    def _grow(self) -> None:
+        size = len(self)
+        capacity = len(self._events)
+        if size > capacity // 2:
+            capacity *= 2
+        columns = _empty_columns(capacity)
+        for name, column in self._columns.items():
+            columns[name][:size] = column[self._start:self._end]
+        events = self._events[self._start:self._end]
+        self._columns = columns
+        self._events = events + [None] * (capacity - size)
+        self._start, self._end = 0, size
+
+    def trim(self, lookback: float) -> None:
+        """Drop rows older than ``lookback`` seconds before the oldest held (or newest) event."""
+        if self._start == self._end:
+            return
+        anchor = next(iter(self._held.values())) if self._held else self._columns['timestamp'][self._end - 1]
+        timestamp = self._columns['timestamp'][self._start:self._end]
+        self._drop(int(np.searchsorted(timestamp, anchor - lookback, side='left')))
+
+    def discard_oldest(self, event: Any) -> bool:
+        """Remove ``event`` if it is the oldest row."""
+        if self._start < self._end and self._events[self._start] is event:
+            self._held.pop(event.event_id, None)
+            self._drop(1)
+            return True
+        return False
+
+    def _drop(self, count: int) -> None:
+        for i in range(self._start, self._start + count):
+            del self._rows[self._events[i].event_id]
+            self._events[i] = None
+        self._start += count
+        self._base += count
+
+    def take(self, events: Sequence[Any], lookback: float) -> Tuple[Dict[str, np.ndarray], List[Any], List[int]]:
+        """
+        Copy the rows needed to evaluate ``events`` and release them.
+
+        Args:
+            events: Events of this pair to evaluate
+            lookback: Seconds of history each event needs
+
+        Returns:
+            ``(columns, snapshot, positions)``: columns and events from
+            ``lookback`` before the first event up to the last one, and the
+            positions of ``events`` in them. Events no longer buffered are
+            skipped.
+        """
+        rows = []
+        for event in events:
+            self._held.pop(event.event_id, None)
+            row = self._rows.get(event.event_id)
+            if row is not None:
+                rows.append(row - self._base + self._start)
+        if not rows:
+            return _empty_columns(0), [], []
+
+        first, last = min(rows), max(rows)
+        timestamp = self._columns['timestamp']
+        lo = self._start + int(np.searchsorted(
+            timestamp[self._start:first + 1], timestamp[first] - lookback, side='left'
+        ))
+        columns = {name: column[lo:last + 1].copy() for name, column in self._columns.items()}
+        return columns, self._events[lo:last + 1], sorted(row - lo for row in rows)
+
+
+def detect_batch(
+    columns: Dict[str, np.ndarray],
+    positions: Sequence[int],
+    config: DetectionConfig
+) -> Tuple[List[DetectedPattern], List[DetectedCorrelation]]:
+    """
+    Run pattern and correlation detection for several events of one pair.
+
+    Args:
+        columns: Time-ordered columns from ``build_columns``
+        positions: Positions of the events to evaluate; each only sees
+            itself and the events before it
+        config: Windows and thresholds
+
+    Returns:
+        Patterns above the pattern threshold and correlations above the
+        correlation threshold
+    """
+    patterns: List[DetectedPattern] = []
+    correlations: List[DetectedCorrelation] = []
+    timestamp = columns['timestamp']
+
+    for p in positions:
+        now = timestamp[p]
+        for pattern_type, window in config.pattern_windows.items():
+            lo = _window_start(timestamp, now, window, p)
+            if p - lo + 1 < 3:  # Need minimum events for pattern
+                continue
+            detector = _PATTERN_DETECTORS.get(pattern_type)
+            if detector is None:
+                continue
+            pattern = detector(columns, lo, p, window, config)
+            if pattern is not None and pattern.confidence >= config.pattern_threshold:
+                patterns.append(pattern)
+
+        if not config.detect_correlations:
+            continue
+        lo = _window_start(timestamp, now, config.correlation_window, p)
+        if p - lo >= 2:
+            correlations.extend(_detect_correlations(columns, lo, p, config))
+
+    return patterns, correlations
+
+
+def _window_start(timestamp: np.ndarray, now: float, window: float, p: int) -> int:
+    """First position within ``window`` seconds before ``now``."""
+    return int(np.searchsorted(timestamp[:p + 1], now - window, side='left'))
+
+
+def _consistency(values: np.ndarray) -> Tuple[float, float]:
+    """Mean and 1 - coefficient of variation (sample stdev)."""
+    mean = float(values.mean())
+    if mean <= 0:
+        return mean, 0.0
+    return mean, 1.0 - float(values.std(ddof=1)) / mean
+
+
+def _side_name(side: int) -> Optional[str]:
+    return 'buy' if side == SIDE_BUY else 'sell' if side == SIDE_SELL else None
+
+
+def _trend_pattern(pattern_type, columns, lo, p, side) -> Optional[DetectedPattern]:
+    """Shared accumulation/distribution logic over one side's fills."""
+    idx = lo + np.flatnonzero(columns['side'][lo:p + 1] == side)
+    if idx.size < 5:
+        return None
+
+    volumes = columns['volume'][idx]
+    prices = columns['price'][idx]
+    _, volume_consistency = _consistency(volumes)
+    price_trend = (prices[-1] - prices[0]) / prices[0] if prices[0] > 0 else 0.0
+    confidence = min(1.0, volume_consistency * 0.7 + abs(price_trend) * 0.3)
+
+    if confidence < 0.6:
+        return None
+    if pattern_type == 'distribution' and price_trend >= 0:
+        return None
+
+    timestamp = columns['timestamp']
+    return DetectedPattern(
+        position=p,
+        pattern_type=pattern_type,
+        indices=idx.tolist(),
+        confidence=confidence,
+        strength=float(price_trend) if pattern_type == 'accumulation' else abs(float(price_trend)),
+        total_volume=float(volumes.sum()),
+        average_price=float(prices.mean()),
+        price_low=float(prices.min()),
+        price_high=float(prices.max()),
+        duration=float(timestamp[idx[-1]] - timestamp[idx[0]]),
+        side=_side_name(side)
+    )
+
+
+def _detect_accumulation(columns, lo, p, window, config) -> Optional[DetectedPattern]:
+    side = int(columns['side'][p])
+    if side == SIDE_UNKNOWN:
+        return None
+    return _trend_pattern('accumulation', columns, lo, p, side)
+
+
+def _detect_distribution(columns, lo, p, window, config) -> Optional[DetectedPattern]:
+    return _trend_pattern('distribution', columns, lo, p, SIDE_SELL)
+
+
+def _detect_momentum_burst(columns, lo, p, window, config) -> Optional[DetectedPattern]:
+    timestamp = columns['timestamp']
+    lo = _window_start(timestamp, timestamp[p], min(window, config.momentum_window), p)
+    count = p - lo + 1
+    if count < 4:
+        return None
+
+    time_span = float(timestamp[p] - timestamp[lo])
+    if time_span == 0:
+        return None
+
+    execution_rate = count / time_span * 60  # fills per minute
+    total_volume = float(columns['volume'][lo:p + 1].sum())
+    if execution_rate > 5.0 and total_volume > 2.0:
+        return DetectedPattern(
+            position=p,
+            pattern_type='momentum_burst',
+            indices=range(lo, p + 1),
+            confidence=min(1.0, execution_rate / 20.0 + total_volume / 10.0),
+            strength=execution_rate,
+            total_volume=total_volume,
+            duration=time_span
+        )
+    return None
+
+
+def _detect_iceberg(columns, lo, p, window, config) -> Optional[DetectedPattern]:
+    if p - lo + 1 < 6:
+        return None
+
+    price = columns['price']
+    current_price = price[p]
+    idx = lo + np.flatnonzero(np.abs(price[lo:p + 1] - current_price) <= current_price * 0.001)
+    if idx.size < 6:
+        return None
+
+    volumes = columns['volume'][idx]
+    avg_volume, volume_consistency = _consistency(volumes)
+    total_volume = float(volumes.sum())
+
+    # total_volume > avg_volume * 10, i.e. more than ten fills, without float rounding at the edge
+    if volume_consistency > 0.8 and idx.size > 10:
+        timestamp = columns['timestamp']
+        return DetectedPattern(
+            position=p,
+            pattern_type='iceberg_detected',
+            indices=idx.tolist(),
+            confidence=min(1.0, volume_consistency * 0.6 + min(1.0, total_volume / 50.0) * 0.4),
+            strength=total_volume / avg_volume,
+            total_volume=total_volume,
+            average_price=float(current_price),
+            duration=float(timestamp[idx[-1]] - timestamp[idx[0]])
+        )
+    return None
+
+
+def _detect_price_improvement(columns, lo, p, window, config) -> Optional[DetectedPattern]:
+    improvement = columns['improvement'][lo:p + 1]
+    idx = lo + np.flatnonzero(improvement > 0)  # NaN compares False
+    if idx.size < 3:
+        return None
+
+    improvements = columns['improvement'][idx]
+    avg_improvement, improvement_consistency = _consistency(improvements)
+
+    if improvement_consistency > 0.7 and avg_improvement > 0.01:
+        timestamp = columns['timestamp']
+        return DetectedPattern(
+            position=p,
+            pattern_type='price_improvement',
+            indices=idx.tolist(),
+            confidence=min(1.0, improvement_consistency * 0.8 + min(1.0, avg_improvement * 100) * 0.2),
+            strength=avg_improvement,
+            total_volume=float(columns['volume'][idx].sum()),
+            duration=float(timestamp[idx[-1]] - timestamp[idx[0]])
+        )
+    return None
+
+
+def _detect_arbitrage(columns, lo, p, window, config) -> Optional[DetectedPattern]:
+    timestamp = columns['timestamp']
+    lo = _window_start(timestamp, timestamp[p], min(window, config.arbitrage_window), p)
+    if p - lo + 1 < 4:
+        return None
+
+    side = columns['side'][lo:p + 1]
+    price = columns['price'][lo:p + 1]
+    is_buy = side == SIDE_BUY
+    is_sell = side == SIDE_SELL
+    if is_buy.sum() < 2 or is_sell.sum() < 2:
+        return None
+
+    avg_buy_price = float(price[is_buy].mean())
+    avg_sell_price = float(price[is_sell].mean())
+    profit_margin = (avg_sell_price - avg_buy_price) / avg_buy_price if avg_buy_price > 0 else 0.0
+
+    if profit_margin > 0.001:  # At least 0.1% profit margin
+        return DetectedPattern(
+            position=p,
+            pattern_type='arbitrage',
+            indices=range(lo, p + 1),
+            confidence=min(1.0, profit_margin * 100),
+            strength=profit_margin,
+            total_volume=float(columns['volume'][lo:p + 1].sum()),
+            duration=float(timestamp[p] - timestamp[lo])
+        )
+    return None
+
+
+_PATTERN_DETECTORS = {
+    'accumulation': _detect_accumulation,
+    'distribution': _detect_distribution,
+    'momentum_burst': _detect_momentum_burst,
+    'iceberg_detected': _detect_iceberg,
+    'price_improvement': _detect_price_improvement,
+    'arbitrage': _detect_arbitrage,
+}
+
+# Pattern type values with an array detector
+SUPPORTED_PATTERNS = frozenset(_PATTERN_DETECTORS)
+
+
+def _deviation_strength(recent: np.ndarray, current: float) -> Optional[Tuple[float, float, float]]:
+    """Strength of ``current`` relative to the spread of ``recent``."""
+    variance = float(recent.var(ddof=1))
+    if variance <= 0:
+        return None
+    mean = float(recent.mean())
+    deviation = abs(current - mean) / variance ** 0.5
+    return max(0.0, 1.0 - deviation / 3.0), mean, variance
+
+
+def _detect_correlations(columns, lo, p, config) -> List[DetectedCorrelation]:
+    """Temporal, price and volume correlations of event ``p`` with its recent events."""
+    found = []
+    indices = range(lo, p + 1)
+    threshold = config.correlation_threshold
+
+    # Temporal regularity of the recent events
+    time_diffs = np.diff(columns['timestamp'][lo:p])
+    if time_diffs.size >= 3:
+        avg_interval = float(time_diffs.mean())
+        if avg_interval > 0:
+            regularity = 1.0 - float(time_diffs.std(ddof=1)) / avg_interval
+            if regularity > threshold:
+                found.append(DetectedCorrelation(
+                    position=p,
+                    correlation_type='temporal',
+                    indices=indices,
+                    strength=regularity,
+                    time_window=avg_interval,
+                    metadata={'average_interval': avg_interval, 'regularity': regularity}
+                ))
+
+    if p - lo >= 3:
+        for name, column in (('price', columns['price']), ('volume', columns['volume'])):
+            result = _deviation_strength(column[lo:p], float(column[p]))
+            if result is not None and result[0] > threshold:
+                strength, mean, variance = result
+                found.append(DetectedCorrelation(
+                    position=p,
+                    correlation_type=name,
+                    indices=indices,
+                    strength=strength,
+                    metadata={f'{name}_mean': mean, f'{name}_variance': variance}
+                ))
+
+    return found
+
+
+# Vectorized detection over every position of a column set
+
+def detect_vectorized(
+    columns: Dict[str, np.ndarray],
+    config: DetectionConfig,
+    first_position: int = 0
+) -> Tuple[Dict[str, Dict[str, np.ndarray]], Dict[str, Dict[str, np.ndarray]]]:
+    """
+    Evaluate every position from ``first_position`` on at once.
+
+    Equivalent to ``detect_batch`` over all those positions, but window
+    statistics come from prefix sums instead of per-position slices. The
+    iceberg check (a price-band filter inside each window) is evaluated as
+    chunked position-by-offset matrices.
+
+    Returns:
+        ``(patterns, correlations)``, each mapping a type to arrays of
+        ``positions`` and ``confidence``/``strength``
+    """
+    timestamp = columns['timestamp']
+    positions = np.arange(first_position, timestamp.size)
+    patterns: Dict[str, Dict[str, np.ndarray]] = {}
+    correlations: Dict[str, Dict[str, np.ndarray]] = {}
+
+    if positions.size == 0:
+        return patterns, correlations
+
+    for pattern_type, window in config.pattern_windows.items():
+        detector = _VECTOR_DETECTORS.get(pattern_type)
+        if detector is None:
+            continue
+        lo = np.searchsorted(timestamp, timestamp[positions] - window, side='left')
+        confidence = detector(columns, lo, positions, window, config)
+        hit = ((positions - lo + 1) >= 3) & (confidence >= config.pattern_threshold)
+        patterns[pattern_type] = {'positions': positions[hit], 'confidence': confidence[hit]}
+
+    if config.detect_correlations:
+        lo = np.searchsorted(timestamp, timestamp[positions] - config.correlation_window, side='left')
+        for correlation_type, strength in _vector_correlations(columns, lo, positions).items():
+            hit = strength > config.correlation_threshold
+            correlations[correlation_type] = {'positions': positions[hit], 'strength': strength[hit]}
+
+    return patterns, correlations
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    """Prefix sums with a leading zero: sum(values[a:b]) == out[b] - out[a]."""
+    out = np.zeros(values.size + 1, dtype=np.float64)
+    np.cumsum(values, out=out[1:])
+    return out
+
+
+def _range_moments(values: np.ndarray, a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count, mean and sample variance of ``values[a:b]`` for each (a, b).
+
+    Values are shifted by their median before squaring to limit
+    cancellation in the variance.
+    """
+    count = (b - a).astype(np.float64)
+    if values.size == 0:
+        zeros = np.zeros(a.size)
+        return count, zeros, zeros
+
+    shift = float(np.median(values))
+    shifted = values - shift
+    s1 = _prefix(shifted)
+    s2 = _prefix(shifted * shifted)
+    a_c = np.clip(a, 0, values.size)
+    b_c = np.clip(b, 0, values.size)
+    total = s1[b_c] - s1[a_c]
+    total_sq = s2[b_c] - s2[a_c]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = shift + total / count
+        variance = (total_sq - total * total / count) / (count - 1)
+    return count, mean, np.maximum(np.nan_to_num(variance), 0.0)
+
+
+def _consistency_vector(mean: np.ndarray, variance: np.ndarray) -> np.ndarray:
+    """Vector form of ``_consistency``."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(mean > 0, 1.0 - np.sqrt(variance) / mean, 0.0)
+
+
+def _vector_trend(columns, lo, p, sides, distribution) -> np.ndarray:
+    """Accumulation/distribution confidence, evaluated on each side's fills."""
+    side, volume, price = columns['side'], columns['volume'], columns['price']
+    confidence = np.full(p.size, np.nan)
+
+    for s in (SIDE_BUY, SIDE_SELL):
+        selected = np.flatnonzero(sides == s)
+        side_positions = np.flatnonzero(side == s)
+        if selected.size == 0 or side_positions.size == 0:
+            continue
+
+        # Side fills inside [lo, p] are side_positions[k_lo:k_hi]
+        k_lo = np.searchsorted(side_positions, lo[selected], side='left')
+        k_hi = np.searchsorted(side_positions, p[selected], side='right')
+        count, mean, variance = _range_moments(volume[side_positions], k_lo, k_hi)
+
+        side_prices = price[side_positions]
+        last = np.clip(k_hi - 1, 0, side_positions.size - 1)
+        first_price = side_prices[np.clip(k_lo, 0, side_positions.size - 1)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            trend = np.where(first_price > 0, (side_prices[last] - first_price) / first_price, 0.0)
+
+        c = np.minimum(1.0, _consistency_vector(mean, variance) * 0.7 + np.abs(trend) * 0.3)
+        valid = (count >= 5) & (c >= 0.6)
+        if distribution:
+            valid &= trend < 0
+        confidence[selected[valid]] = c[valid]
+
+    return confidence
+
+
+def _vector_accumulation(columns, lo, p, window, config) -> np.ndarray:
+    return _vector_trend(columns, lo, p, columns['side'][p], distribution=False)
+
+
+def _vector_distribution(columns, lo, p, window, config) -> np.ndarray:
+    return _vector_trend(columns, lo, p, np.full(p.size, SIDE_SELL), distribution=True)
+
+
+def _vector_momentum_burst(columns, lo, p, window, config) -> np.ndarray:
+    timestamp = columns['timestamp']
+    lo = np.searchsorted(timestamp, timestamp[p] - min(window, config.momentum_window), side='left')
+    count = p - lo + 1
+    span = timestamp[p] - timestamp[lo]
+    volume = _prefix(columns['volume'])
+    total_volume = volume[p + 1] - volume[lo]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = count / span * 60
+    valid = (count >= 4) & (span > 0) & (rate > 5.0) & (total_volume > 2.0)
+    return np.where(valid, np.minimum(1.0, rate / 20.0 + total_volume / 10.0), np.nan)
+
+
+def _vector_arbitrage(columns, lo, p, window, config) -> np.ndarray:
+    timestamp, side, price = columns['timestamp'], columns['side'], columns['price']
+    lo = np.searchsorted(timestamp, timestamp[p] - min(window, config.arbitrage_window), side='left')
+
+    is_buy = (side == SIDE_BUY).astype(np.float64)
+    is_sell = (side == SIDE_SELL).astype(np.float64)
+    buys, sells = _prefix(is_buy), _prefix(is_sell)
+    buy_notional, sell_notional = _prefix(price * is_buy), _prefix(price * is_sell)
+
+    n_buy = buys[p + 1] - buys[lo]
+    n_sell = sells[p + 1] - sells[lo]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_buy = (buy_notional[p + 1] - buy_notional[lo]) / n_buy
+        avg_sell = (sell_notional[p + 1] - sell_notional[lo]) / n_sell
+        margin = np.where(avg_buy > 0, (avg_sell - avg_buy) / avg_buy, 0.0)
+
+    valid = ((p - lo + 1) >= 4) & (n_buy >= 2) & (n_sell >= 2) & (margin > 0.001)
+    return np.where(valid, np.minimum(1.0, margin * 100), np.nan)
+
+
+def _vector_price_improvement(columns, lo, p, window, config) -> np.ndarray:
+    improvement = columns['improvement']
+    improved = np.flatnonzero(improvement > 0)  # NaN compares False
+    k_lo = np.searchsorted(improved, lo, side='left')
+    k_hi = np.searchsorted(improved, p, side='right')
+    count, mean, variance = _range_moments(improvement[improved], k_lo, k_hi)
+
+    consistency = _consistency_vector(mean, variance)
+    valid = (count >= 3) & (consistency > 0.7) & (mean > 0.01)
+    confidence = np.minimum(1.0, consistency * 0.8 + np.minimum(1.0, mean * 100) * 0.2)
+    return np.where(valid, confidence, np.nan)
+
+
+def _vector_iceberg(columns, lo, p, window, config) -> np.ndarray:
+    price, volume = columns['price'], columns['volume']
+    confidence = np.full(p.size, np.nan)
+
+    # total_volume > avg_volume * 10 needs more than ten similar-price fills
+    candidates = np.flatnonzero((p - lo + 1) > 10)
+    if candidates.size == 0:
+        return confidence
+
+    # Evaluate candidates in chunks as (positions x window offsets) matrices
+    width = int((p - lo + 1)[candidates].max())
+    offsets = np.arange(width)
+    chunk = max(1, 2_000_000 // width)
+
+    for start in range(0, candidates.size, chunk):
+        c = candidates[start:start + chunk]
+        current_position = p[c][:, None]
+        idx = lo[c][:, None] + offsets
+        in_window = idx <= current_position
+        idx = np.minimum(idx, current_position)
+
+        current_price = price[current_position]
+        similar = in_window & (np.abs(price[idx] - current_price) <= current_price * 0.001)
+        count = similar.sum(axis=1)
+        volumes = volume[idx]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total = np.where(similar, volumes, 0.0).sum(axis=1)
+            mean = total / count
+            variance = np.where(similar, (volumes - mean[:, None]) ** 2, 0.0).sum(axis=1) / (count - 1)
+            consistency = np.where(mean > 0, 1.0 - np.sqrt(variance) / mean, 0.0)
+
+        valid = (count > 10) & (consistency > 0.8)
+        c_confidence = np.minimum(1.0, consistency * 0.6 + np.minimum(1.0, total / 50.0) * 0.4)
+        confidence[c[valid]] = c_confidence[valid]
+
+    return confidence
+
+
+_VECTOR_DETECTORS = {
+    'accumulation': _vector_accumulation,
+    'distribution': _vector_distribution,
+    'momentum_burst': _vector_momentum_burst,
+    'iceberg_detected': _vector_iceberg,
+    'price_improvement': _vector_price_improvement,
+    'arbitrage': _vector_arbitrage,
+}
+
+
+def _vector_correlations(columns, lo, p) -> Dict[str, np.ndarray]:
+    """Temporal, price and volume correlation strengths for every position."""
+    timestamp = columns['timestamp']
+    recent = p - lo
+    strengths = {}
+
+    # Intervals between the recent events lo..p-1 are diffs[lo:p-1]
+    diffs = np.diff(timestamp)
+    count, mean, variance = _range_moments(diffs, lo, np.maximum(p - 1, lo))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        regularity = 1.0 - np.sqrt(variance) / mean
+    strengths['temporal'] = np.where((recent >= 2) & (count >= 3) & (mean > 0), regularity, np.nan)
+
+    for name in ('price', 'volume'):
+        values = columns[name]
+        count, mean, variance = _range_moments(values, lo, p)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            deviation = np.abs(values[p] - mean) / np.sqrt(variance)
+        strength = np.maximum(0.0, 1.0 - deviation / 3.0)
+        strengths[name] = np.where((recent >= 3) & (variance > 0), strength, np.nan)
+
+    return strengths
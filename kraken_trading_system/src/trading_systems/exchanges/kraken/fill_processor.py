@@ -9,22 +9,24 @@ File: src/trading_systems/exchanges/kraken/fill_processor.py
 """
 
 import asyncio
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 from enum import Enum
 from typing import Dict, List, Optional, Any, Callable, Tuple
 from pydantic import BaseModel, Field, validator
-import statistics
 from collections import defaultdict
 
 # Imports for integration
 try:
     from .order_models import EnhancedKrakenOrder, OrderState, OrderEvent
+    from ...utils.latency import STAGE_FILL_PROCESSOR, fill_pipeline_latency
     from ...utils.logger import get_logger
 except ImportError:
     # Fallback for testing
     try:
+        from trading_systems.utils.latency import STAGE_FILL_PROCESSOR, fill_pipeline_latency
         from trading_systems.utils.logger import get_logger
     except ImportError:
         # Mock logger for testing
@@ -92,7 +94,13 @@ class TradeFill(BaseModel):
 
 @dataclass
 class FillAnalytics:
-    """Comprehensive fill analytics and metrics."""
+    """
+    Comprehensive fill analytics and metrics.
+
+    Price and interval statistics are maintained with streaming (Welford)
+    accumulators, so each fill updates the analytics in O(1). Individual
+    fill sizes and prices are only retained when ``keep_fill_history`` is set.
+    """
 
     # Basic execution metrics
     total_fills: int = 0
@@ -105,6 +113,12 @@ class FillAnalytics:
     best_fill_price: Optional[Decimal] = None
     worst_fill_price: Optional[Decimal] = None
     price_variance: Optional[Decimal] = None
+    min_fill_price: Optional[Decimal] = None
+    max_fill_price: Optional[Decimal] = None
+
+    # Size metrics
+    largest_fill_size: Optional[Decimal] = None
+    smallest_fill_size: Optional[Decimal] = None
 
     # Quality metrics
     total_price_improvement: Decimal = Decimal('0')
@@ -116,14 +130,74 @@ class FillAnalytics:
     last_fill_time: Optional[datetime] = None
     fill_duration: Optional[timedelta] = None
     average_fill_interval: Optional[timedelta] = None
+    min_fill_interval: Optional[timedelta] = None
+    max_fill_interval: Optional[timedelta] = None
 
     # Fill distribution
     fill_sizes: List[Decimal] = field(default_factory=list)
     fill_prices: List[Decimal] = field(default_factory=list)
     fill_types_distribution: Dict[FillType, int] = field(default_factory=lambda: defaultdict(int))
 
+    # Opt-in retention of per-fill sizes/prices
+    keep_fill_history: bool = False
+
+    # Streaming accumulators (Welford mean / sum of squared deviations)
+    _price_count: int = field(default=0, repr=False)
+    _price_mean: float = field(default=0.0, repr=False)
+    _price_m2: float = field(default=0.0, repr=False)
+
+    def add_fill(self, volume: Decimal, price: Decimal, timestamp: datetime) -> None:
+        """
+        Fold a fill's size, price and time into the streaming accumulators.
+
+        Args:
+            volume: Volume filled
+            price: Fill price
+            timestamp: Fill timestamp
+        """
+        # Welford update for price mean/variance
+        self._price_count += 1
+        n = self._price_count
+        price_float = float(price)
+        delta = price_float - self._price_mean
+        self._price_mean += delta / n
+        self._price_m2 += delta * (price_float - self._price_mean)
+
+        if self.min_fill_price is None or price < self.min_fill_price:
+            self.min_fill_price = price
+        if self.max_fill_price is None or price > self.max_fill_price:
+            self.max_fill_price = price
+
+        if self.largest_fill_size is None or volume > self.largest_fill_size:
+            self.largest_fill_size = volume
+        if self.smallest_fill_size is None or volume < self.smallest_fill_size:
+            self.smallest_fill_size = volume
+
+        # Inter-fill interval extremes
+        if self.last_fill_time is not None:
+            interval = timestamp - self.last_fill_time
+            if self.min_fill_interval is None or interval < self.min_fill_interval:
+                self.min_fill_interval = interval
+            if self.max_fill_interval is None or interval > self.max_fill_interval:
+                self.max_fill_interval = interval
+
+        if self.first_fill_time is None:
+            self.first_fill_time = timestamp
+        self.last_fill_time = timestamp
+
+        if self.keep_fill_history:
+            self.fill_sizes.append(volume)
+            self.fill_prices.append(price)
+
+    @property
+    def mean_fill_price(self) -> Optional[Decimal]:
+        """Unweighted mean fill price."""
+        if self._price_count == 0:
+            return None
+        return Decimal(str(self._price_mean))
+
     def calculate_metrics(self) -> None:
-        """Calculate derived metrics from fill data."""
+        """Calculate derived metrics from the running accumulators in O(1)."""
         if self.total_fills == 0:
             return
 
@@ -138,17 +212,22 @@ class FillAnalytics:
                 total_seconds = self.fill_duration.total_seconds()
                 self.average_fill_interval = timedelta(seconds=total_seconds / (self.total_fills - 1))
 
-        # Calculate price variance
-        if len(self.fill_prices) > 1:
-            prices_float = [float(p) for p in self.fill_prices]
-            self.price_variance = Decimal(str(statistics.variance(prices_float)))
+        # Sample variance of fill prices
+        if self._price_count > 1:
+            self.price_variance = Decimal(str(self._price_m2 / (self._price_count - 1)))
 
 
 class FillProcessor:
     """Enhanced fill processing system with advanced analytics."""
 
-    def __init__(self, logger_name: str = "FillProcessor"):
-        """Initialize the fill processor."""
+    def __init__(self, logger_name: str = "FillProcessor", keep_fill_history: bool = False):
+        """
+        Initialize the fill processor.
+
+        Args:
+            logger_name: Logger name
+            keep_fill_history: Retain every fill size/price in FillAnalytics
+        """
         self.logger = get_logger(logger_name)
 
         # Fill storage and tracking
@@ -166,6 +245,7 @@ class FillProcessor:
         self.enable_quality_analysis = True
         self.enable_market_context = True
         self.price_precision = Decimal('0.01')
+        self.keep_fill_history = keep_fill_history
 
         self.logger.info("FillProcessor initialized",
                         quality_analysis=self.enable_quality_analysis,
@@ -194,6 +274,7 @@ class FillProcessor:
         Returns:
             Processed TradeFill object
         """
+        stage_start = time.perf_counter_ns()
         try:
             # Create basic fill object
             fill = TradeFill(
@@ -232,6 +313,7 @@ class FillProcessor:
                            price=str(price),
                            quality=fill.fill_quality.value)
 
+            fill_pipeline_latency.record_since(STAGE_FILL_PROCESSOR, stage_start)
             return fill
 
         except Exception as e:
@@ -326,10 +408,10 @@ class FillProcessor:
     async def _update_order_analytics(self, order_id: str, fill: TradeFill) -> None:
         """Update comprehensive analytics for an order."""
         try:
-            if order_id not in self._order_analytics:
-                self._order_analytics[order_id] = FillAnalytics()
-
-            analytics = self._order_analytics[order_id]
+            analytics = self._order_analytics.get(order_id)
+            if analytics is None:
+                analytics = FillAnalytics(keep_fill_history=self.keep_fill_history)
+                self._order_analytics[order_id] = analytics
 
             # Update basic metrics
             analytics.total_fills += 1
@@ -337,9 +419,8 @@ class FillProcessor:
             analytics.total_cost += fill.cost
             analytics.total_fees += fill.fee
 
-            # Update price tracking
-            analytics.fill_sizes.append(fill.volume)
-            analytics.fill_prices.append(fill.price)
+            # Update streaming price, size and timing accumulators
+            analytics.add_fill(fill.volume, fill.price, fill.timestamp)
 
             if analytics.best_fill_price is None or \
                (fill.side == 'buy' and fill.price < analytics.best_fill_price) or \
@@ -357,11 +438,6 @@ class FillProcessor:
             if fill.slippage:
                 analytics.total_slippage += fill.slippage
 
-            # Update timing
-            if analytics.first_fill_time is None:
-                analytics.first_fill_time = fill.timestamp
-            analytics.last_fill_time = fill.timestamp
-
             # Update distribution
             analytics.fill_types_distribution[fill.fill_type] += 1
 
@@ -480,8 +556,8 @@ class FillProcessor:
             "fill_distribution": {
                 "total_fills": analytics.total_fills,
                 "average_fill_size": str(analytics.total_volume / analytics.total_fills) if analytics.total_fills > 0 else "0",
-                "largest_fill": str(max(analytics.fill_sizes)) if analytics.fill_sizes else "0",
-                "smallest_fill": str(min(analytics.fill_sizes)) if analytics.fill_sizes else "0"
+                "largest_fill": str(analytics.largest_fill_size) if analytics.largest_fill_size is not None else "0",
+                "smallest_fill": str(analytics.smallest_fill_size) if analytics.smallest_fill_size is not None else "0"
             }
         }
 
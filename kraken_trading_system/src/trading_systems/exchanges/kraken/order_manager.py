@@ -8,6 +8,7 @@ File Location: src/trading_system/exchanges/kraken/order_manager.py
 """
 
 import asyncio
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Set, Callable
 from collections import defaultdict, deque
@@ -16,6 +17,7 @@ from decimal import Decimal
 # FIXED IMPORTS - Try both possible import paths
 try:
     # Try trading_system (singular) first
+    from ...utils.latency import STAGE_ORDER_MANAGER, fill_pipeline_latency
     from ...utils.logger import LoggerMixin
     from ...utils.exceptions import (
         OrderError,
@@ -43,6 +45,7 @@ except ImportError:
     sys.path.insert(0, str(src_path))
 
     try:
+        from trading_system.utils.latency import STAGE_ORDER_MANAGER, fill_pipeline_latency
         from trading_system.utils.logger import LoggerMixin
         from trading_system.utils.exceptions import (
             OrderError,
@@ -62,6 +65,7 @@ except ImportError:
         from trading_system.exchanges.kraken.account_data_manager import AccountDataManager
     except ImportError:
         try:
+            from trading_systems.utils.latency import STAGE_ORDER_MANAGER, fill_pipeline_latency
             from trading_systems.utils.logger import LoggerMixin
             from trading_systems.utils.exceptions import (
                 OrderError,
@@ -995,6 +999,7 @@ class OrderManager(LoggerMixin):
             trade_id: The trade ID
             trade_info: Trade information from WebSocket
         """
+        stage_start = time.perf_counter_ns()
         try:
             order_id = trade_info.get('ordertxid')
             if not order_id or order_id not in self._orders:
@@ -1019,6 +1024,7 @@ class OrderManager(LoggerMixin):
                 price=str(fill_price),
                 fee=str(fill_fee)
             )
+            fill_pipeline_latency.record_since(STAGE_ORDER_MANAGER, stage_start)
 
         except Exception as e:
             self.log_error(
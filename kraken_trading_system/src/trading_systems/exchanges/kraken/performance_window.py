@@ -0,0 +1,266 @@
+"""
+Bounded snapshot storage and rolling performance accumulators.
+
+SnapshotRing keeps a fixed number of time-ordered performance snapshots
+with O(1) access to the latest one. RollingPerformance folds PnL updates
+into trailing-window accumulators (gross profit/loss, peak and drawdown,
+snapshot-to-snapshot return moments) as they arrive, so Sharpe, profit
+factor and drawdown queries do not rescan history. FillBuckets keeps
+per-minute fill totals so period reports sum buckets instead of fills.
+"""
+
+import math
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .fill_event_index import RunningMoments
+
+Snapshot = Tuple[datetime, Dict[str, Any]]
+
+
+class SnapshotRing:
+    """
+    Fixed-capacity ring of (timestamp, snapshot) entries.
+
+    Entries must be appended in time order. When full, appending
+    overwrites the oldest entry.
+    """
+
+    def __init__(self, capacity: int = 1440):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self._entries: List[Optional[Snapshot]] = [None] * capacity
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Snapshot]:
+        """Iterate entries from oldest to newest."""
+        for i in range(self._count):
+            yield self._entries[(self._start + i) % self.capacity]
+
+    def _at(self, i: int) -> Snapshot:
+        return self._entries[(self._start + i) % self.capacity]
+
+    def append(self, timestamp: datetime, snapshot: Dict[str, Any]) -> None:
+        """Add a snapshot, overwriting the oldest one when full."""
+        if self._count < self.capacity:
+            self._entries[(self._start + self._count) % self.capacity] = (timestamp, snapshot)
+            self._count += 1
+        else:
+            self._entries[self._start] = (timestamp, snapshot)
+            self._start = (self._start + 1) % self.capacity
+
+    @property
+    def latest(self) -> Optional[Snapshot]:
+        """Most recent entry, or None when empty."""
+        if self._count == 0:
+            return None
+        return self._at(self._count - 1)
+
+    @property
+    def latest_time(self) -> Optional[datetime]:
+        """Timestamp of the most recent entry."""
+        latest = self.latest
+        return latest[0] if latest is not None else None
+
+    def since(self, cutoff: datetime) -> List[Snapshot]:
+        """Entries at or after ``cutoff``, oldest first."""
+        # Binary search over logical positions; bisect's key= needs Python 3.10
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._at(mid)[0] < cutoff:
+                lo = mid + 1
+            else:
+                hi = mid
+        return [self._at(i) for i in range(lo, self._count)]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries = [None] * self.capacity
+        self._start = 0
+        self._count = 0
+
+
+class RollingPerformance:
+    """
+    Trailing-window PnL accumulators.
+
+    ``add_pnl`` is called on every fill with the current total PnL and
+    keeps gross profit/loss of the PnL changes and the window peak (via a
+    monotonic deque). ``add_snapshot`` is called on each periodic
+    snapshot and keeps the moments of snapshot-to-snapshot returns used for
+    the Sharpe ratio. ``trim`` drops entries older than the window.
+    """
+
+    def __init__(self, window: timedelta = timedelta(minutes=60)):
+        self.window = window
+
+        # Per-fill PnL changes
+        self._last_pnl: Optional[Decimal] = None
+        self._changes: Deque[Tuple[datetime, Decimal]] = deque()
+        self.gross_profit = Decimal('0')
+        self.gross_loss = Decimal('0')
+        self.current_pnl = Decimal('0')
+
+        # Front is the highest PnL in the window
+        self._peaks: Deque[Tuple[datetime, Decimal]] = deque()
+
+        # Snapshot returns, keyed by the earlier snapshot's timestamp
+        self._last_snapshot: Optional[Tuple[datetime, float]] = None
+        self._returns: Deque[Tuple[datetime, float]] = deque()
+        self.returns = RunningMoments()
+
+    def add_pnl(self, timestamp: datetime, pnl: Decimal) -> None:
+        """Fold a PnL update into the window."""
+        if self._last_pnl is not None:
+            change = pnl - self._last_pnl
+            if change:
+                self._changes.append((timestamp, change))
+                if change > 0:
+                    self.gross_profit += change
+                else:
+                    self.gross_loss += change
+        self._last_pnl = pnl
+        self.current_pnl = pnl
+
+        while self._peaks and self._peaks[-1][1] <= pnl:
+            self._peaks.pop()
+        self._peaks.append((timestamp, pnl))
+
+        self.trim(timestamp - self.window)
+
+    def add_snapshot(self, timestamp: datetime, pnl: Decimal) -> None:
+        """Record the return since the previous snapshot."""
+        value = float(pnl)
+        if self._last_snapshot is not None:
+            prev_time, prev_value = self._last_snapshot
+            # Same convention as the full-history calculation: skip zero bases
+            if prev_value != 0:
+                ret = (value - prev_value) / abs(prev_value)
+                self._returns.append((prev_time, ret))
+                self.returns.add(ret)
+        self._last_snapshot = (timestamp, value)
+
+        self.trim(timestamp - self.window)
+
+    def trim(self, cutoff: datetime) -> None:
+        """Drop everything recorded before ``cutoff``."""
+        changes = self._changes
+        while changes and changes[0][0] < cutoff:
+            _, change = changes.popleft()
+            if change > 0:
+                self.gross_profit -= change
+            else:
+                self.gross_loss -= change
+
+        # Keep the latest PnL as the peak floor even when it is old
+        peaks = self._peaks
+        while len(peaks) > 1 and peaks[0][0] < cutoff:
+            peaks.popleft()
+
+        returns = self._returns
+        while returns and returns[0][0] < cutoff:
+            self.returns.remove(returns.popleft()[1])
+
+    @property
+    def peak_pnl(self) -> Decimal:
+        """Highest total PnL seen in the window."""
+        return self._peaks[0][1] if self._peaks else Decimal('0')
+
+    @property
+    def drawdown(self) -> Decimal:
+        """Distance of the current PnL below the window peak."""
+        return self.peak_pnl - self.current_pnl
+
+    @property
+    def profit_factor(self) -> Optional[float]:
+        """Gross profit over gross loss in the window."""
+        if self.gross_loss == 0:
+            return None
+        return float(self.gross_profit / abs(self.gross_loss))
+
+    def sharpe_ratio(self, periods_per_year: float) -> Optional[float]:
+        """Annualized Sharpe ratio of the window's snapshot returns."""
+        if self.returns.count < 2:
+            return None
+        std_return = self.returns.stdev
+        if std_return == 0:
+            return None
+        return (self.returns.mean / std_return) * math.sqrt(periods_per_year)
+
+    def clear(self) -> None:
+        """Reset all accumulators."""
+        self.__init__(self.window)
+
+
+class FillBucket:
+    """Fill totals for one minute."""
+
+    __slots__ = ('start', 'count', 'volume', 'fees', 'quality')
+
+    def __init__(self, start: datetime):
+        self.start = start
+        self.count = 0
+        self.volume = Decimal('0')
+        self.fees = Decimal('0')
+        self.quality: Dict[str, int] = defaultdict(int)
+
+
+class FillBuckets:
+    """
+    Per-minute fill aggregates for the most recent ``capacity`` minutes.
+
+    Fills are folded into the bucket of the minute they happened in, so a
+    period query costs one step per minute rather than one per fill. The
+    oldest minute of a period is counted whole. A fill older than the
+    newest bucket goes into the closest bucket at or before its minute.
+    """
+
+    def __init__(self, capacity: int = 1440):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self._buckets: Deque[FillBucket] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _bucket_for(self, timestamp: datetime) -> FillBucket:
+        start = timestamp.replace(second=0, microsecond=0)
+        buckets = self._buckets
+        if not buckets or start > buckets[-1].start:
+            buckets.append(FillBucket(start))
+            return buckets[-1]
+        for bucket in reversed(buckets):
+            if bucket.start <= start:
+                return bucket
+        return buckets[0]
+
+    def add(self, timestamp: datetime, volume: Decimal, fee: Decimal, quality: str) -> None:
+        """Fold one fill into its minute."""
+        bucket = self._bucket_for(timestamp)
+        bucket.count += 1
+        bucket.volume += volume
+        bucket.fees += fee
+        bucket.quality[quality] += 1
+
+    def since(self, cutoff: datetime) -> Iterator[FillBucket]:
+        """Buckets whose minute ends after ``cutoff``, newest first."""
+        first_minute = cutoff.replace(second=0, microsecond=0)
+        for bucket in reversed(self._buckets):
+            if bucket.start < first_minute:
+                break
+            yield bucket
+
+    def clear(self) -> None:
+        """Remove all buckets."""
+        self._buckets.clear()
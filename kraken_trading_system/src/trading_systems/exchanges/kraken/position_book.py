@@ -0,0 +1,218 @@
+"""
+Per-pair position book with lot-based cost accounting.
+
+Each pair keeps its open lots (FIFO or a single average-cost lot) and the
+realized PnL of reducing fills in Decimal. Signed quantity, signed cost
+and the latest mark price of every pair are mirrored in float64 NumPy
+columns, so mark-to-market for a batch of price updates is one array pass
+over all open positions. Fills adjust the unrealized total for their own
+pair only, keeping each fill O(1) amortized.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from decimal import Decimal
+from enum import Enum
+from typing import Deque, Dict, List, Mapping, Optional
+
+import numpy as np
+
+
+class CostBasisMethod(Enum):
+    """How reducing fills are matched against open lots."""
+    FIFO = "fifo"
+    AVERAGE = "average"
+
+
+@dataclass
+class Lot:
+    """An open lot; ``volume`` is always positive."""
+    volume: Decimal
+    price: Decimal
+
+
+@dataclass
+class PairPosition:
+    """Open lots and realized PnL for one pair."""
+    pair: str
+    method: CostBasisMethod = CostBasisMethod.FIFO
+    quantity: Decimal = Decimal('0')  # signed: positive long, negative short
+    cost: Decimal = Decimal('0')  # signed cost of the open lots
+    realized_pnl: Decimal = Decimal('0')
+    lots: Deque[Lot] = field(default_factory=deque)
+
+    @property
+    def average_price(self) -> Optional[Decimal]:
+        """Average entry price of the open position."""
+        if self.quantity == 0:
+            return None
+        return self.cost / self.quantity
+
+    def apply_fill(self, side: str, volume: Decimal, price: Decimal) -> Optional[Decimal]:
+        """
+        Apply a fill to the position.
+
+        Args:
+            side: 'buy' or 'sell'
+            volume: Filled volume
+            price: Fill price
+
+        Returns:
+            Realized PnL if the fill reduced the position, otherwise None
+        """
+        direction = 1 if side == 'buy' else -1
+
+        if self.quantity == 0 or (self.quantity > 0) == (direction > 0):
+            self._open(direction, volume, price)
+            return None
+
+        # Reducing fill: close against the oldest lots first
+        position_direction = -direction
+        remaining = volume
+        realized = Decimal('0')
+        lots = self.lots
+        while remaining > 0 and lots:
+            lot = lots[0]
+            take = min(remaining, lot.volume)
+            realized += take * (price - lot.price) * position_direction
+            self.quantity -= take * position_direction
+            self.cost -= take * lot.price * position_direction
+            remaining -= take
+            if take == lot.volume:
+                lots.popleft()
+            else:
+                lot.volume -= take
+
+        if not lots:
+            # Clear rounding residue once flat
+            self.quantity = Decimal('0')
+            self.cost = Decimal('0')
+
+        if remaining > 0:
+            # Position flipped; the excess opens a new lot
+            self._open(direction, remaining, price)
+
+        self.realized_pnl += realized
+        return realized
+
+    def _open(self, direction: int, volume: Decimal, price: Decimal) -> None:
+        self.quantity += volume * direction
+        self.cost += volume * price * direction
+        if self.method == CostBasisMethod.AVERAGE and self.lots:
+            lot = self.lots[0]
+            lot.volume += volume
+            lot.price = self.cost / self.quantity
+        else:
+            self.lots.append(Lot(volume=volume, price=price))
+
+
+class PositionBook:
+    """
+    Positions for all pairs with vectorized mark-to-market.
+
+    Pairs are assigned a slot in the float columns on first fill. A pair's
+    mark price is its last price update, or its first fill price until a
+    price update arrives.
+    """
+
+    def __init__(self, method: CostBasisMethod = CostBasisMethod.FIFO, capacity: int = 16):
+        self.method = method
+        self.positions: Dict[str, PairPosition] = {}
+        self.realized_pnl = Decimal('0')
+
+        self._slots: Dict[str, int] = {}
+        self._quantity = np.zeros(capacity, dtype=np.float64)
+        self._cost = np.zeros(capacity, dtype=np.float64)
+        self._mark = np.full(capacity, np.nan, dtype=np.float64)
+        self._unrealized = 0.0
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def _slot(self, pair: str) -> int:
+        slot = self._slots.get(pair)
+        if slot is None:
+            slot = len(self._slots)
+            if slot == self._quantity.size:
+                grow = self._quantity.size
+                self._quantity = np.concatenate([self._quantity, np.zeros(grow)])
+                self._cost = np.concatenate([self._cost, np.zeros(grow)])
+                self._mark = np.concatenate([self._mark, np.full(grow, np.nan)])
+            self._slots[pair] = slot
+            self.positions[pair] = PairPosition(pair=pair, method=self.method)
+        return slot
+
+    def _slot_unrealized(self, slot: int) -> float:
+        mark = self._mark[slot]
+        if np.isnan(mark):
+            return 0.0
+        return float(self._quantity[slot] * mark - self._cost[slot])
+
+    def apply_fill(self, pair: str, side: str, volume: Decimal, price: Decimal) -> Optional[Decimal]:
+        """
+        Apply a fill to its pair's position.
+
+        Returns:
+            Realized PnL if the fill reduced the position, otherwise None
+        """
+        slot = self._slot(pair)
+        position = self.positions[pair]
+        before = self._slot_unrealized(slot)
+
+        realized = position.apply_fill(side, volume, price)
+        if realized is not None:
+            self.realized_pnl += realized
+
+        self._quantity[slot] = float(position.quantity)
+        self._cost[slot] = float(position.cost)
+        if np.isnan(self._mark[slot]):
+            self._mark[slot] = float(price)
+        self._unrealized += self._slot_unrealized(slot) - before
+        return realized
+
+    def mark(self, pair: str, price: Decimal) -> None:
+        """Update one pair's mark price."""
+        slot = self._slots.get(pair)
+        if slot is None:
+            return
+        before = self._slot_unrealized(slot)
+        self._mark[slot] = float(price)
+        self._unrealized += self._slot_unrealized(slot) - before
+
+    def mark_to_market(self, prices: Mapping[str, Decimal]) -> float:
+        """
+        Apply a batch of price updates and revalue all positions.
+
+        Args:
+            prices: Mark price per pair; unknown pairs are ignored
+
+        Returns:
+            Total unrealized PnL
+        """
+        slots = self._slots
+        for pair, price in prices.items():
+            slot = slots.get(pair)
+            if slot is not None:
+                self._mark[slot] = float(price)
+        self._unrealized = float(self._unrealized_by_slot().sum())
+        return self._unrealized
+
+    def _unrealized_by_slot(self) -> np.ndarray:
+        n = len(self._slots)
+        mark = self._mark[:n]
+        values = self._quantity[:n] * mark - self._cost[:n]
+        return np.where(np.isnan(mark), 0.0, values)
+
+    @property
+    def unrealized_pnl(self) -> float:
+        """Total unrealized PnL at the current marks."""
+        return self._unrealized
+
+    def unrealized_by_pair(self) -> Dict[str, float]:
+        """Unrealized PnL per pair at the current marks."""
+        values = self._unrealized_by_slot()
+        return {pair: float(values[slot]) for pair, slot in self._slots.items()}
+
+    def open_positions(self) -> List[PairPosition]:
+        """Positions with non-zero quantity."""
+        return [p for p in self.positions.values() if p.quantity != 0]
@@ -10,6 +10,8 @@ File: src/trading_systems/exchanges/kraken/realtime_analytics.py
 """
 
 import asyncio
+import itertools
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
@@ -23,11 +25,19 @@ import math
 try:
     from .fill_processor import TradeFill, FillAnalytics, FillQuality, FillType
     from .order_models import EnhancedKrakenOrder, OrderState
+    from .dashboard import DashboardUpdate, MaterializedDashboard
+    from .performance_window import FillBuckets, RollingPerformance, SnapshotRing
+    from .position_book import CostBasisMethod, PositionBook
+    from ...utils.latency import STAGE_ANALYTICS, fill_pipeline_latency
     from ...utils.logger import get_logger
 except ImportError:
     # Fallback for testing
     try:
         from trading_systems.exchanges.kraken.fill_processor import TradeFill, FillAnalytics, FillQuality, FillType
+        from trading_systems.exchanges.kraken.dashboard import DashboardUpdate, MaterializedDashboard
+        from trading_systems.exchanges.kraken.performance_window import FillBuckets, RollingPerformance, SnapshotRing
+        from trading_systems.exchanges.kraken.position_book import CostBasisMethod, PositionBook
+        from trading_systems.utils.latency import STAGE_ANALYTICS, fill_pipeline_latency
         from trading_systems.utils.logger import get_logger
     except ImportError:
         # Mock for testing
@@ -89,36 +99,55 @@ class RealTimePnL:
     current_exposure: Decimal = Decimal('0')
     average_trade_size: Decimal = Decimal('0')
     
+    # Per-pair lots backing realized and unrealized PnL
+    positions: PositionBook = field(default_factory=PositionBook, repr=False)
+    
     def update_from_fill(self, fill: TradeFill, current_price: Optional[Decimal] = None) -> None:
         """Update PnL from a new fill."""
         # Update volume
         self.total_volume_traded += fill.volume
         self.total_fees += fill.fee
         
-        # Update exposure (simplified - assumes directional trading)
+        # Net volume across pairs; per-pair positions live in the position book
         if fill.side == 'buy':
             self.current_exposure += fill.volume
         else:
             self.current_exposure -= fill.volume
         
-        # Calculate unrealized PnL if current price available
-        if current_price and self.current_exposure != 0:
-            # This is a simplified calculation - real implementation would need position tracking
-            avg_entry_price = fill.price  # Simplified
-            price_diff = current_price - avg_entry_price
-            self.unrealized_pnl = self.current_exposure * price_diff
+        # Realize PnL on fills that reduce a position
+        realized = self.positions.apply_fill(fill.pair, fill.side, fill.volume, fill.price)
+        if realized is not None:
+            self.realized_pnl += realized
+            if realized > 0:
+                self.winning_trades += 1
+                self.gross_profit += realized
+            elif realized < 0:
+                self.losing_trades += 1
+                self.gross_loss += realized
         
-        # Update total PnL
-        self.total_pnl = self.realized_pnl + self.unrealized_pnl - self.total_fees
-        self.net_profit = self.total_pnl
+        if current_price:
+            self.positions.mark(fill.pair, current_price)
         
         # Update trade statistics
         self.total_trades += 1
-        if self.total_trades > 0:
-            self.average_trade_size = self.total_volume_traded / self.total_trades
-            self.win_rate = self.winning_trades / self.total_trades
+        self.average_trade_size = self.total_volume_traded / self.total_trades
+        closed_trades = self.winning_trades + self.losing_trades
+        if closed_trades:
+            self.win_rate = self.winning_trades / closed_trades
+        
+        self._update_totals()
+    
+    def mark_to_market(self, prices: Dict[str, Decimal]) -> None:
+        """Revalue all open positions at new mark prices."""
+        self.positions.mark_to_market(prices)
+        self._update_totals()
+    
+    def _update_totals(self) -> None:
+        """Refresh total PnL and drawdown from realized and unrealized PnL."""
+        self.unrealized_pnl = Decimal(f"{self.positions.unrealized_pnl:.8f}")
+        self.total_pnl = self.realized_pnl + self.unrealized_pnl - self.total_fees
+        self.net_profit = self.total_pnl
         
-        # Update drawdown tracking
         if self.total_pnl > self.max_profit:
             self.max_profit = self.total_pnl
             self.current_drawdown = Decimal('0')
@@ -188,18 +217,48 @@ class RiskAlert:
 class RealTimeAnalyticsEngine:
     """Comprehensive real-time analytics engine for trading operations."""
     
-    def __init__(self, logger_name: str = "RealTimeAnalyticsEngine"):
-        """Initialize the analytics engine."""
+    SNAPSHOT_INTERVAL = timedelta(minutes=1)
+    SHARPE_PERIODS_PER_YEAR = 252 * 24 * 60  # Assuming minute intervals
+
+    # Dashboard sections affected by each kind of update
+    FILL_SECTIONS = ('pnl_summary', 'trading_stats', 'execution_quality', 'performance_metrics',
+                     'rolling_window', 'risk_status', 'recent_activity')
+    PRICE_SECTIONS = ('pnl_summary', 'performance_metrics', 'rolling_window', 'risk_status')
+    ALERT_SECTIONS = ('risk_status', 'recent_activity')
+    CLOCK_SECTIONS = ('performance_metrics', 'rolling_window', 'recent_activity')
+
+    def __init__(self,
+                 logger_name: str = "RealTimeAnalyticsEngine",
+                 max_snapshots: int = 1440,
+                 performance_window: timedelta = timedelta(minutes=60),
+                 cost_basis: CostBasisMethod = CostBasisMethod.FIFO,
+                 dashboard_publish_interval: float = 0.25,
+                 dashboard_clock_ttl: float = 1.0):
+        """
+        Initialize the analytics engine.
+
+        Args:
+            logger_name: Logger name
+            max_snapshots: Performance snapshots and fill buckets retained (minute intervals)
+            performance_window: Trailing window of the rolling risk metrics
+            cost_basis: Lot matching method for realized PnL
+            dashboard_publish_interval: Minimum seconds between dashboard pushes
+            dashboard_clock_ttl: Seconds before time-dependent dashboard values are recomputed
+        """
         self.logger = get_logger(logger_name)
+        self.cost_basis = cost_basis
         
         # Core analytics components
-        self.pnl = RealTimePnL()
+        self.pnl = RealTimePnL(positions=PositionBook(cost_basis))
         self.execution_metrics = ExecutionMetrics()
         
         # Data storage
         self.fill_history: deque[TradeFill] = deque(maxlen=10000)  # Last 10k fills
-        self.pnl_history: deque[Tuple[datetime, Decimal]] = deque(maxlen=1440)  # 24 hours at 1min intervals
-        self.performance_snapshots: Dict[datetime, Dict[str, Any]] = {}
+        self.pnl_history: deque[Tuple[datetime, Decimal]] = deque(maxlen=max_snapshots)  # 24 hours at 1min intervals
+        self.performance_snapshots = SnapshotRing(max_snapshots)
+        self.rolling_performance = RollingPerformance(performance_window)
+        self.fill_buckets = FillBuckets(max_snapshots)  # per-minute fill totals for reports
+        self._recent_fill_times: deque[datetime] = deque()  # fill timestamps in the last hour
         
         # Real-time tracking
         self.active_positions: Dict[str, Decimal] = defaultdict(Decimal)  # pair -> net_position
@@ -208,6 +267,7 @@ class RealTimeAnalyticsEngine:
         
         # Alert system
         self.alerts: deque[RiskAlert] = deque(maxlen=1000)
+        self.alert_counts: Dict[AlertLevel, int] = defaultdict(int)  # levels of alerts in self.alerts
         self.alert_handlers: List[Callable[[RiskAlert], None]] = []
         
         # Risk thresholds
@@ -231,16 +291,40 @@ class RealTimeAnalyticsEngine:
         self.enable_performance_tracking = True
         self.update_interval = timedelta(seconds=1)
         
+        # Materialized dashboard, rebuilt per dirty section and pushed as diffs
+        self.dashboard = MaterializedDashboard(
+            builders={
+                'pnl_summary': self._build_pnl_summary,
+                'trading_stats': self._build_trading_stats,
+                'execution_quality': self._build_execution_quality,
+                'performance_metrics': self._build_performance_metrics,
+                'rolling_window': self._build_rolling_window,
+                'risk_status': self._build_risk_status,
+                'recent_activity': self._build_recent_activity,
+            },
+            metadata=self._dashboard_metadata,
+            min_publish_interval=dashboard_publish_interval,
+            logger=self.logger,
+            clock_sections=self.CLOCK_SECTIONS,
+            clock_ttl=dashboard_clock_ttl
+        )
+        self._data_version = 0  # bumped by fills, price updates, alerts and resets
+        self._report_cache: Dict[timedelta, Tuple[int, float, Dict[str, Any]]] = {}
+        
         self.logger.info("RealTimeAnalyticsEngine initialized",
                         risk_thresholds=len(self.risk_thresholds),
                         benchmarks=len(self.benchmarks))
 
     async def process_fill(self, fill: TradeFill, market_data: Optional[Dict[str, Any]] = None) -> None:
         """Process a new fill and update all analytics."""
+        stage_start = time.perf_counter_ns()
         try:
             # Store fill
             self.fill_history.append(fill)
+            self.fill_buckets.add(fill.timestamp, fill.volume, fill.fee, fill.fill_quality.value)
             self.last_update = datetime.now()
+            self._recent_fill_times.append(fill.timestamp)
+            self._trim_recent_fill_times(self.last_update)
             
             # Update core metrics
             current_price = market_data.get('current_price') if market_data else None
@@ -248,6 +332,7 @@ class RealTimeAnalyticsEngine:
             
             self.pnl.update_from_fill(fill, current_price)
             self.execution_metrics.update_from_fill(fill, benchmark_price)
+            self.rolling_performance.add_pnl(self.last_update, self.pnl.total_pnl)
             
             # Update positions
             pair = fill.pair
@@ -264,18 +349,37 @@ class RealTimeAnalyticsEngine:
             if self.enable_performance_tracking:
                 await self._update_performance_snapshot()
             
+            self._data_version += 1
+            self.dashboard.mark_dirty(self.FILL_SECTIONS)
+            
             self.logger.info("Fill processed in analytics engine",
                            trade_id=fill.trade_id,
                            order_id=fill.order_id,
                            total_pnl=str(self.pnl.total_pnl),
                            current_drawdown=str(self.pnl.current_drawdown))
             
+            fill_pipeline_latency.record_since(STAGE_ANALYTICS, stage_start)
+            fill_pipeline_latency.finish(fill.trade_id)
+            
         except Exception as e:
             self.logger.error("Error processing fill in analytics engine",
                             trade_id=fill.trade_id,
                             error=str(e))
             raise
 
+    async def update_market_prices(self, prices: Dict[str, Decimal]) -> None:
+        """
+        Revalue open positions for a batch of price updates.
+
+        Args:
+            prices: Mark price per pair
+        """
+        self.pnl.mark_to_market(prices)
+        self.last_update = datetime.now()
+        self.rolling_performance.add_pnl(self.last_update, self.pnl.total_pnl)
+        self._data_version += 1
+        self.dashboard.mark_dirty(self.PRICE_SECTIONS)
+
     async def _check_risk_alerts(self, fill: TradeFill) -> None:
         """Check for risk threshold breaches and generate alerts."""
         alerts_generated = []
@@ -352,9 +456,18 @@ class RealTimeAnalyticsEngine:
         
         # Store and trigger alerts
         for alert in alerts_generated:
-            self.alerts.append(alert)
+            self._record_alert(alert)
             await self._trigger_alert_handlers(alert)
 
+    def _record_alert(self, alert: RiskAlert) -> None:
+        """Store an alert, keeping per-level counts in step with the bounded deque."""
+        if len(self.alerts) == self.alerts.maxlen:
+            self.alert_counts[self.alerts[0].level] -= 1
+        self.alerts.append(alert)
+        self.alert_counts[alert.level] += 1
+        self._data_version += 1
+        self.dashboard.mark_dirty(self.ALERT_SECTIONS)
+
     async def _trigger_alert_handlers(self, alert: RiskAlert) -> None:
         """Trigger all registered alert handlers."""
         for handler in self.alert_handlers:
@@ -374,8 +487,8 @@ class RealTimeAnalyticsEngine:
         now = datetime.now()
         
         # Take snapshot every minute
-        if not self.performance_snapshots or \
-           (now - max(self.performance_snapshots.keys())).total_seconds() >= 60:
+        last_snapshot = self.performance_snapshots.latest_time
+        if last_snapshot is None or now - last_snapshot >= self.SNAPSHOT_INTERVAL:
             
             snapshot = {
                 'timestamp': now.isoformat(),
@@ -392,11 +505,23 @@ class RealTimeAnalyticsEngine:
                 'session_duration': str(now - self.session_start)
             }
             
-            self.performance_snapshots[now] = snapshot
+            self.performance_snapshots.append(now, snapshot)
             self.pnl_history.append((now, self.pnl.total_pnl))
+            self.rolling_performance.add_snapshot(now, self.pnl.total_pnl)
 
     def calculate_sharpe_ratio(self, lookback_minutes: int = 60) -> Optional[float]:
-        """Calculate Sharpe ratio over specified lookback period."""
+        """
+        Calculate Sharpe ratio over specified lookback period.
+
+        A lookback equal to the rolling performance window is answered from
+        the running return moments. Any other lookback falls back to an
+        O(n) scan of ``pnl_history`` (up to ``max_snapshots`` entries).
+        """
+        rolling = self.rolling_performance
+        if timedelta(minutes=lookback_minutes) == rolling.window:
+            rolling.trim(datetime.now() - rolling.window)
+            return rolling.sharpe_ratio(self.SHARPE_PERIODS_PER_YEAR)
+
         if len(self.pnl_history) < 2:
             return None
         
@@ -426,7 +551,7 @@ class RealTimeAnalyticsEngine:
             return None
         
         # Annualized Sharpe ratio (approximate)
-        sharpe = (mean_return / std_return) * math.sqrt(252 * 24 * 60)  # Assuming minute intervals
+        sharpe = (mean_return / std_return) * math.sqrt(self.SHARPE_PERIODS_PER_YEAR)
         return sharpe
 
     def calculate_profit_factor(self) -> Optional[float]:
@@ -435,16 +560,123 @@ class RealTimeAnalyticsEngine:
             return None
         return float(self.pnl.gross_profit / abs(self.pnl.gross_loss))
 
+    def fills_in_last_hour(self) -> int:
+        """Number of fills timestamped within the last hour."""
+        self._trim_recent_fill_times(datetime.now())
+        return len(self._recent_fill_times)
+
+    def _trim_recent_fill_times(self, now: datetime) -> None:
+        cutoff = now - timedelta(hours=1)
+        recent = self._recent_fill_times
+        while recent and recent[0] < cutoff:
+            recent.popleft()
+
     def get_real_time_dashboard(self) -> Dict[str, Any]:
-        """Get comprehensive real-time analytics dashboard."""
-        # Calculate derived metrics
-        sharpe_ratio = self.calculate_sharpe_ratio()
+        """
+        Get comprehensive real-time analytics dashboard.
+
+        Returns the materialized snapshot; only sections changed since the
+        last read are rebuilt. Treat the result as read-only.
+        """
+        return self.dashboard.snapshot
+
+    def get_real_time_dashboard_json(self) -> str:
+        """Get the dashboard pre-serialized as JSON."""
+        return self.dashboard.to_json()
+
+    def subscribe_dashboard(self, handler: Callable[[DashboardUpdate], Any]) -> Dict[str, Any]:
+        """
+        Subscribe to dashboard diffs, pushed at most once per publish interval.
+
+        Returns:
+            The current snapshot that subsequent diffs apply to
+        """
+        return self.dashboard.subscribe(handler)
+
+    def unsubscribe_dashboard(self, handler: Callable[[DashboardUpdate], Any]) -> None:
+        """Stop receiving dashboard diffs."""
+        self.dashboard.unsubscribe(handler)
+
+    # Dashboard sections
+
+    def _dashboard_metadata(self) -> Dict[str, Any]:
+        now = datetime.now()
+        return {
+            'timestamp': now.isoformat(),
+            'session_duration': str(now - self.session_start),
+        }
+
+    def _build_pnl_summary(self) -> Dict[str, Any]:
+        return {
+            'total_pnl': str(self.pnl.total_pnl),
+            'realized_pnl': str(self.pnl.realized_pnl),
+            'unrealized_pnl': str(self.pnl.unrealized_pnl),
+            'net_profit': str(self.pnl.net_profit),
+            'total_fees': str(self.pnl.total_fees),
+            'max_drawdown': str(self.pnl.max_drawdown),
+            'current_drawdown': str(self.pnl.current_drawdown),
+        }
+
+    def _build_trading_stats(self) -> Dict[str, Any]:
+        return {
+            'total_trades': self.pnl.total_trades,
+            'winning_trades': self.pnl.winning_trades,
+            'losing_trades': self.pnl.losing_trades,
+            'win_rate': f"{self.pnl.win_rate:.1%}",
+            'total_volume': str(self.pnl.total_volume_traded),
+            'average_trade_size': str(self.pnl.average_trade_size),
+        }
+
+    def _build_execution_quality(self) -> Dict[str, Any]:
+        return {
+            'average_slippage': str(self.execution_metrics.average_slippage),
+            'average_price_improvement': str(self.execution_metrics.average_price_improvement),
+            'vwap_outperformance': str(self.execution_metrics.vwap_outperformance),
+            'maker_ratio': f"{self.execution_metrics.maker_ratio:.1%}",
+            'taker_ratio': f"{self.execution_metrics.taker_ratio:.1%}",
+        }
+
+    def _build_performance_metrics(self) -> Dict[str, Any]:
+        sharpe_ratio = self.calculate_sharpe_ratio(int(self.rolling_performance.window.total_seconds() // 60))
         profit_factor = self.calculate_profit_factor()
-        
-        # Session duration
-        session_duration = datetime.now() - self.session_start
-        
-        # Recent alerts
+        return {
+            'sharpe_ratio': f"{sharpe_ratio:.2f}" if sharpe_ratio else "N/A",
+            'profit_factor': f"{profit_factor:.2f}" if profit_factor else "N/A",
+            'total_fills_processed': len(self.fill_history),
+        }
+
+    def _build_rolling_window(self) -> Dict[str, Any]:
+        rolling = self.rolling_performance
+        rolling.trim(datetime.now() - rolling.window)
+        rolling_profit_factor = rolling.profit_factor
+        return {
+            'window': str(rolling.window),
+            'gross_profit': str(rolling.gross_profit),
+            'gross_loss': str(rolling.gross_loss),
+            'profit_factor': f"{rolling_profit_factor:.2f}" if rolling_profit_factor else "N/A",
+            'peak_pnl': str(rolling.peak_pnl),
+            'drawdown': str(rolling.drawdown),
+        }
+
+    def _build_risk_status(self) -> Dict[str, Any]:
+        unrealized_by_pair = self.pnl.positions.unrealized_by_pair()
+        return {
+            'active_positions': {k: str(v) for k, v in self.active_positions.items()},
+            'open_positions': {
+                p.pair: {
+                    'quantity': str(p.quantity),
+                    'average_price': str(p.average_price),
+                    'realized_pnl': str(p.realized_pnl),
+                    'unrealized_pnl': f"{unrealized_by_pair[p.pair]:.8f}",
+                }
+                for p in self.pnl.positions.open_positions()
+            },
+            'total_alerts': len(self.alerts),
+            'critical_alerts': self.alert_counts[AlertLevel.CRITICAL],
+            'urgent_alerts': self.alert_counts[AlertLevel.URGENT],
+        }
+
+    def _build_recent_activity(self) -> Dict[str, Any]:
         recent_alerts = [
             {
                 'timestamp': alert.timestamp.isoformat(),
@@ -452,94 +684,55 @@ class RealTimeAnalyticsEngine:
                 'metric': alert.metric,
                 'message': alert.message
             }
-            for alert in list(self.alerts)[-10:]  # Last 10 alerts
-        ]
-        
-        dashboard = {
-            'timestamp': datetime.now().isoformat(),
-            'session_duration': str(session_duration),
-            
-            # PnL Summary
-            'pnl_summary': {
-                'total_pnl': str(self.pnl.total_pnl),
-                'realized_pnl': str(self.pnl.realized_pnl),
-                'unrealized_pnl': str(self.pnl.unrealized_pnl),
-                'net_profit': str(self.pnl.net_profit),
-                'total_fees': str(self.pnl.total_fees),
-                'max_drawdown': str(self.pnl.max_drawdown),
-                'current_drawdown': str(self.pnl.current_drawdown),
-            },
-            
-            # Trading Statistics
-            'trading_stats': {
-                'total_trades': self.pnl.total_trades,
-                'winning_trades': self.pnl.winning_trades,
-                'losing_trades': self.pnl.losing_trades,
-                'win_rate': f"{self.pnl.win_rate:.1%}",
-                'total_volume': str(self.pnl.total_volume_traded),
-                'average_trade_size': str(self.pnl.average_trade_size),
-            },
-            
-            # Execution Quality
-            'execution_quality': {
-                'average_slippage': str(self.execution_metrics.average_slippage),
-                'average_price_improvement': str(self.execution_metrics.average_price_improvement),
-                'vwap_outperformance': str(self.execution_metrics.vwap_outperformance),
-                'maker_ratio': f"{self.execution_metrics.maker_ratio:.1%}",
-                'taker_ratio': f"{self.execution_metrics.taker_ratio:.1%}",
-            },
-            
-            # Performance Metrics
-            'performance_metrics': {
-                'sharpe_ratio': f"{sharpe_ratio:.2f}" if sharpe_ratio else "N/A",
-                'profit_factor': f"{profit_factor:.2f}" if profit_factor else "N/A",
-                'total_fills_processed': len(self.fill_history),
-            },
-            
-            # Risk Status
-            'risk_status': {
-                'active_positions': {k: str(v) for k, v in self.active_positions.items()},
-                'total_alerts': len(self.alerts),
-                'critical_alerts': len([a for a in self.alerts if a.level == AlertLevel.CRITICAL]),
-                'urgent_alerts': len([a for a in self.alerts if a.level == AlertLevel.URGENT]),
-            },
-            
-            # Recent Activity
-            'recent_activity': {
-                'recent_alerts': recent_alerts,
-                'last_fill_time': self.fill_history[-1].timestamp.isoformat() if self.fill_history else None,
-                'fills_last_hour': len([f for f in self.fill_history 
-                                      if f.timestamp >= datetime.now() - timedelta(hours=1)]),
-            }
+            for alert in itertools.islice(reversed(self.alerts), 10)  # Last 10 alerts
+        ][::-1]
+        return {
+            'recent_alerts': recent_alerts,
+            'last_fill_time': self.fill_history[-1].timestamp.isoformat() if self.fill_history else None,
+            'fills_last_hour': self.fills_in_last_hour(),
         }
-        
-        return dashboard
 
     def get_performance_report(self, time_period: timedelta = timedelta(hours=24)) -> Dict[str, Any]:
-        """Generate comprehensive performance report for specified period."""
+        """
+        Generate comprehensive performance report for specified period.
+
+        Period totals come from per-minute fill buckets, so the oldest
+        minute of the period is counted whole and periods longer than the
+        bucket retention only cover the retained minutes. Reports are cached
+        per period until the next fill, price update or alert, for at most
+        one dashboard publish interval.
+        """
+        cached = self._report_cache.get(time_period)
+        if cached is not None:
+            version, built_at, report = cached
+            if version == self._data_version and \
+               time.monotonic() - built_at < self.dashboard.min_publish_interval:
+                return report
+        
+        report = self._build_performance_report(time_period)
+        self._report_cache[time_period] = (self._data_version, time.monotonic(), report)
+        return report
+
+    def _build_performance_report(self, time_period: timedelta) -> Dict[str, Any]:
+        """Build the performance report for a period."""
         cutoff_time = datetime.now() - time_period
         
-        # Filter data by time period
-        period_fills = [f for f in self.fill_history if f.timestamp >= cutoff_time]
-        period_snapshots = {k: v for k, v in self.performance_snapshots.items() if k >= cutoff_time}
-        
-        if not period_fills:
-            return {"error": "No data available for specified time period"}
-        
-        # Calculate period statistics
-        period_volume = sum(f.volume for f in period_fills)
-        period_fees = sum(f.fee for f in period_fills)
-        
-        # Quality distribution
+        # Sum the minute buckets in the period
+        period_count = 0
+        period_volume = Decimal('0')
+        period_fees = Decimal('0')
         quality_dist = defaultdict(int)
-        for fill in period_fills:
-            quality_dist[fill.fill_quality.value] += 1
-        
-        # Time-based analysis
         hourly_volume = defaultdict(Decimal)
-        for fill in period_fills:
-            hour = fill.timestamp.replace(minute=0, second=0, microsecond=0)
-            hourly_volume[hour] += fill.volume
+        for bucket in self.fill_buckets.since(cutoff_time):
+            period_count += bucket.count
+            period_volume += bucket.volume
+            period_fees += bucket.fees
+            for quality, count in bucket.quality.items():
+                quality_dist[quality] += count
+            hourly_volume[bucket.start.replace(minute=0)] += bucket.volume
+        
+        if not period_count:
+            return {"error": "No data available for specified time period"}
         
         report = {
             'report_period': {
@@ -549,17 +742,17 @@ class RealTimeAnalyticsEngine:
             },
             
             'summary_statistics': {
-                'total_fills': len(period_fills),
+                'total_fills': period_count,
                 'total_volume': str(period_volume),
                 'total_fees': str(period_fees),
-                'average_fill_size': str(period_volume / len(period_fills)) if period_fills else "0",
-                'fills_per_hour': len(period_fills) / (time_period.total_seconds() / 3600),
+                'average_fill_size': str(period_volume / period_count),
+                'fills_per_hour': period_count / (time_period.total_seconds() / 3600),
             },
             
             'quality_analysis': {
                 'fill_quality_distribution': dict(quality_dist),
-                'excellent_fills_pct': (quality_dist['excellent'] / len(period_fills) * 100) if period_fills else 0,
-                'poor_bad_fills_pct': ((quality_dist['poor'] + quality_dist['bad']) / len(period_fills) * 100) if period_fills else 0,
+                'excellent_fills_pct': quality_dist['excellent'] / period_count * 100,
+                'poor_bad_fills_pct': (quality_dist['poor'] + quality_dist['bad']) / period_count * 100,
             },
             
             'execution_performance': {
@@ -569,7 +762,7 @@ class RealTimeAnalyticsEngine:
             },
             
             'time_analysis': {
-                'hourly_volume_distribution': {k.isoformat(): str(v) for k, v in hourly_volume.items()},
+                'hourly_volume_distribution': {k.isoformat(): str(v) for k, v in sorted(hourly_volume.items())},
                 'peak_activity_hour': max(hourly_volume.items(), key=lambda x: x[1])[0].isoformat() if hourly_volume else None,
             },
             
@@ -597,11 +790,17 @@ class RealTimeAnalyticsEngine:
     def reset_session_metrics(self) -> None:
         """Reset session-based metrics (e.g., for new trading day)."""
         self.session_start = datetime.now()
-        self.pnl = RealTimePnL()
+        self.pnl = RealTimePnL(positions=PositionBook(self.cost_basis))
         self.execution_metrics = ExecutionMetrics()
         self.alerts.clear()
+        self.alert_counts.clear()
         self.performance_snapshots.clear()
         self.pnl_history.clear()
+        self.rolling_performance.clear()
+        self._recent_fill_times.clear()
+        self._data_version += 1
+        self._report_cache.clear()
+        self.dashboard.mark_all_dirty()
         self.active_positions.clear()
         
         self.logger.info("Session metrics reset")
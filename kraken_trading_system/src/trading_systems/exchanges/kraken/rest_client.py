@@ -191,20 +191,19 @@ class EnhancedKrakenRestClient(LoggerMixin):
 
         url = urljoin(self.base_url, endpoint)
         headers = {}
+        postdata: Optional[str] = None
 
         if data is None:
             data = {}
 
         try:
             if authenticated:
-                # Create authentication headers
-                auth_headers = self.authenticator.create_headers(endpoint, data)
+                # Encode the body once; the signed string is what gets sent
+                postdata, auth_headers = self.authenticator.create_signed_request(
+                    endpoint, data, data.get('nonce')
+                )
                 headers.update(auth_headers)
 
-                # Add nonce for POST requests
-                if 'nonce' not in data:
-                    data['nonce'] = self.authenticator.generate_nonce()
-
             self.log_info(
                 "Making API request",
                 method=method,
@@ -215,7 +214,9 @@ class EnhancedKrakenRestClient(LoggerMixin):
             # Make the request
             if method.upper() == "GET":
                 response = await self.client.get(url, headers=headers, params=data)
-            else:  # POST
+            elif postdata is not None:
+                response = await self.client.post(url, headers=headers, content=postdata)
+            else:  # Unauthenticated POST
                 response = await self.client.post(url, headers=headers, data=data)
 
             # Check HTTP status
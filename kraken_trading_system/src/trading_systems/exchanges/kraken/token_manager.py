@@ -5,15 +5,13 @@ This module handles:
 1. Retrieving WebSocket authentication tokens from Kraken's REST API
 2. Token lifecycle management (15-minute validity)
 3. Automatic token refresh when needed
-4. Secure credential handling
+4. Proactive background refresh with a warm spare token
+5. Secure credential handling
 """
 
 import asyncio
-import base64
-import hashlib
-import hmac
 import time
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
@@ -22,6 +20,7 @@ import httpx
 from ...config.settings import settings
 from ...utils.exceptions import AuthenticationError, InvalidCredentialsError
 from ...utils.logger import LoggerMixin
+from .auth import get_signer
 
 
 @dataclass
@@ -54,14 +53,44 @@ class KrakenTokenManager(LoggerMixin):
     
     Handles token retrieval, caching, and automatic refresh to ensure
     continuous WebSocket authentication capability.
+    
+    When the background refresher is running, tokens are renewed ahead of
+    ``should_refresh`` and a spare token is kept warm, so
+    ``get_websocket_token`` is served without the lock or a REST round trip.
     """
     
-    def __init__(self):
+    def __init__(self, refresh_ahead_seconds: float = 240.0, keep_spare: bool = True):
+        """
+        Initialize the token manager.
+        
+        Args:
+            refresh_ahead_seconds: Background refresh lead time before expiry;
+                should exceed the 2-minute ``should_refresh`` window
+            keep_spare: Keep a second token warm for instant failover
+        """
         super().__init__()
         self._current_token: Optional[WebSocketToken] = None
+        self._spare_token: Optional[WebSocketToken] = None
         self._token_lock = asyncio.Lock()
         self._http_client: Optional[httpx.AsyncClient] = None
         
+        # Background refresh configuration
+        self.refresh_ahead_seconds = refresh_ahead_seconds
+        self.keep_spare = keep_spare
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_wakeup = asyncio.Event()
+        
+        # Refresh metrics
+        self._refresh_count = 0
+        self._refresh_failures = 0
+        self._consecutive_failures = 0
+        self._last_refresh_latency: Optional[float] = None
+        self._max_refresh_latency = 0.0
+        self._total_refresh_latency = 0.0
+        self._fast_path_hits = 0
+        self._spare_promotions = 0
+        self._blocking_refreshes = 0
+        
         # Kraken REST API configuration
         self.rest_api_base = "https://api.kraken.com"
         self.token_endpoint = "/0/private/GetWebSocketsToken"
@@ -102,11 +131,22 @@ class KrakenTokenManager(LoggerMixin):
             AuthenticationError: If token retrieval fails
             InvalidCredentialsError: If API credentials are invalid
         """
+        if not force_refresh:
+            # Fast path: no lock, no await while a usable token is cached
+            token = self._current_token
+            if token is not None and token.is_valid and not token.should_refresh:
+                self._fast_path_hits += 1
+                return token.token
+            
+            if self._promote_spare():
+                return self._current_token.token
+        
         async with self._token_lock:
-            # Check if we need a new token
+            # Check if we need a new token (another waiter may have refreshed it)
             if (self._current_token is None or 
                 self._current_token.is_expired or 
                 self._current_token.should_refresh or 
+                not self._current_token.is_valid or
                 force_refresh):
                 
                 self.log_info(
@@ -116,6 +156,7 @@ class KrakenTokenManager(LoggerMixin):
                     current_expired=self._current_token.is_expired if self._current_token else None
                 )
                 
+                self._blocking_refreshes += 1
                 await self._refresh_token()
             
             if self._current_token is None:
@@ -123,8 +164,35 @@ class KrakenTokenManager(LoggerMixin):
             
             return self._current_token.token
     
+    def _promote_spare(self) -> bool:
+        """
+        Replace an unusable current token with the warm spare.
+        
+        Returns:
+            True if the spare was promoted
+        """
+        spare = self._spare_token
+        if spare is None or not spare.is_valid or spare.should_refresh:
+            return False
+        
+        self._current_token = spare
+        self._spare_token = None
+        self._spare_promotions += 1
+        self._refresh_wakeup.set()
+        return True
+    
     async def _refresh_token(self):
         """Refresh the WebSocket authentication token."""
+        self._current_token = await self._fetch_token()
+    
+    async def _fetch_token(self) -> WebSocketToken:
+        """
+        Request a new WebSocket token from the Kraken REST API.
+        
+        Returns:
+            Newly issued token
+        """
+        started = time.perf_counter()
         try:
             # Get API credentials
             api_key, api_secret = settings.get_api_credentials()
@@ -194,26 +262,159 @@ class KrakenTokenManager(LoggerMixin):
             
             # Create token object with metadata
             now = datetime.now()
-            self._current_token = WebSocketToken(
+            new_token = WebSocketToken(
                 token=token_string,
                 created_at=now,
                 expires_at=now + timedelta(minutes=15)  # 15-minute validity
             )
             
+            latency = time.perf_counter() - started
+            self._refresh_count += 1
+            self._consecutive_failures = 0
+            self._last_refresh_latency = latency
+            self._total_refresh_latency += latency
+            self._max_refresh_latency = max(self._max_refresh_latency, latency)
+            
             self.log_info(
                 "WebSocket token obtained successfully",
                 token_length=len(token_string),
-                expires_at=self._current_token.expires_at.isoformat()
+                expires_at=new_token.expires_at.isoformat(),
+                latency_ms=round(latency * 1000, 2)
             )
             
+            return new_token
+            
         except (httpx.RequestError, httpx.HTTPStatusError) as e:
+            self._record_refresh_failure()
             self.log_error("HTTP error during token request", error=e)
             raise AuthenticationError(f"Network error during token request: {e}")
         
         except Exception as e:
+            self._record_refresh_failure()
             self.log_error("Unexpected error during token refresh", error=e)
             raise AuthenticationError(f"Token refresh failed: {e}")
     
+    def _record_refresh_failure(self):
+        """Count a failed token request."""
+        self._refresh_failures += 1
+        self._consecutive_failures += 1
+    
+    # BACKGROUND REFRESH
+    
+    def _is_warm(self, token: Optional[WebSocketToken]) -> bool:
+        """Check if a token has more than the refresh lead time left."""
+        return (
+            token is not None and
+            token.is_valid and
+            token.time_until_expiry.total_seconds() > self.refresh_ahead_seconds
+        )
+    
+    async def _top_up_tokens(self):
+        """Ensure the current (and optionally spare) token are warm."""
+        if not self._is_warm(self._current_token):
+            if self._is_warm(self._spare_token):
+                self._current_token, self._spare_token = self._spare_token, None
+                self._spare_promotions += 1
+            else:
+                new_token = await self._fetch_token()
+                async with self._token_lock:
+                    self._current_token = new_token
+        
+        if self.keep_spare and not self._is_warm(self._spare_token):
+            self._spare_token = await self._fetch_token()
+    
+    def _seconds_until_next_refresh(self) -> float:
+        """Time until the earliest held token enters the refresh lead window."""
+        remaining = [
+            token.time_until_expiry.total_seconds() - self.refresh_ahead_seconds
+            for token in (self._current_token, self._spare_token if self.keep_spare else None)
+            if token is not None
+        ]
+        if not remaining:
+            return 0.0
+        return max(min(remaining), 1.0)
+    
+    async def _background_refresh_loop(self):
+        """Renew tokens ahead of expiry until stopped."""
+        while True:
+            try:
+                await self._top_up_tokens()
+                delay = self._seconds_until_next_refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Exponential backoff capped at one minute
+                delay = min(2 ** self._consecutive_failures, 60)
+                self.log_warning(
+                    "Background token refresh failed",
+                    error=str(e),
+                    consecutive_failures=self._consecutive_failures,
+                    retry_in=delay
+                )
+            
+            self._refresh_wakeup.clear()
+            try:
+                await asyncio.wait_for(self._refresh_wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+    
+    def start_background_refresh(self):
+        """Start proactively refreshing tokens in the background."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        
+        self._refresh_task = asyncio.create_task(self._background_refresh_loop())
+        self.log_info(
+            "Background token refresh started",
+            refresh_ahead_seconds=self.refresh_ahead_seconds,
+            keep_spare=self.keep_spare
+        )
+    
+    async def stop_background_refresh(self):
+        """Stop the background refresher if it is running."""
+        if self._refresh_task is None:
+            return
+        
+        self._refresh_task.cancel()
+        try:
+            await self._refresh_task
+        except asyncio.CancelledError:
+            pass
+        self._refresh_task = None
+        self.log_info("Background token refresh stopped")
+    
+    @property
+    def is_background_refresh_running(self) -> bool:
+        """Check if the background refresher is active."""
+        return self._refresh_task is not None and not self._refresh_task.done()
+    
+    def get_refresh_metrics(self) -> Dict[str, Any]:
+        """
+        Get token refresh latency and failure statistics.
+        
+        Returns:
+            Dictionary with refresh metrics
+        """
+        return {
+            "background_refresh_running": self.is_background_refresh_running,
+            "has_spare_token": self._spare_token is not None,
+            "refresh_count": self._refresh_count,
+            "refresh_failures": self._refresh_failures,
+            "consecutive_failures": self._consecutive_failures,
+            "last_refresh_latency_ms": (
+                self._last_refresh_latency * 1000
+                if self._last_refresh_latency is not None else None
+            ),
+            "avg_refresh_latency_ms": (
+                self._total_refresh_latency / self._refresh_count * 1000
+                if self._refresh_count else None
+            ),
+            "max_refresh_latency_ms": self._max_refresh_latency * 1000,
+            "fast_path_hits": self._fast_path_hits,
+            "spare_promotions": self._spare_promotions,
+            "blocking_refreshes": self._blocking_refreshes
+        }
+    
     def _create_signature(self, api_secret: str, api_path: str, nonce: str, post_data: str) -> str:
         """
         Create HMAC-SHA512 signature for Kraken API authentication.
@@ -228,21 +429,8 @@ class KrakenTokenManager(LoggerMixin):
             Base64-encoded signature string
         """
         try:
-            # Decode the API secret
-            api_secret_decoded = base64.b64decode(api_secret)
-            
-            # Create SHA256 hash of nonce and post data
-            sha256_hash = hashlib.sha256((nonce + post_data).encode('utf-8'))
-            
-            # Create HMAC-SHA512 signature
-            hmac_signature = hmac.new(
-                api_secret_decoded,
-                api_path.encode('utf-8') + sha256_hash.digest(),
-                hashlib.sha512
-            )
-            
-            # Return base64-encoded signature
-            return base64.b64encode(hmac_signature.digest()).decode('utf-8')
+            # Signer is cached per secret, so the secret is decoded only once
+            return get_signer(api_secret).sign(api_path, nonce, post_data)
             
         except Exception as e:
             self.log_error("Error creating API signature", error=e)
@@ -253,6 +441,7 @@ class KrakenTokenManager(LoggerMixin):
         async with self._token_lock:
             if self._current_token:
                 self._current_token.is_valid = False
+                self._refresh_wakeup.set()
                 self.log_info("WebSocket token invalidated")
     
     def get_token_status(self) -> dict:
@@ -306,5 +495,6 @@ async def cleanup_token_manager():
     global _token_manager
     
     if _token_manager:
+        await _token_manager.stop_background_refresh()
         await _token_manager._close_http_client()
         _token_manager = None
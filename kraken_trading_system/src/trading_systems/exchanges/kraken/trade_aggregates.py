@@ -0,0 +1,136 @@
+"""
+Time-bucketed rolling trade aggregates for Kraken account data.
+
+Trades are folded into one-minute buckets as they arrive, so trading
+summaries over any look-back window are answered by summing buckets
+instead of rescanning trade history. Buckets are retained independently of
+the trade history deque, so summaries stay accurate beyond its cap.
+"""
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from .account_models import KrakenTrade
+
+BUCKET_SECONDS = 60
+
+
+@dataclass
+class TradeBucket:
+    """Aggregated trade statistics for one time bucket."""
+    volume: Decimal = Decimal('0')
+    notional: Decimal = Decimal('0')
+    fees: Decimal = Decimal('0')
+    buy_count: int = 0
+    sell_count: int = 0
+    first_time: Optional[datetime] = None
+    last_time: Optional[datetime] = None
+
+    @property
+    def trade_count(self) -> int:
+        """Total number of trades in the bucket."""
+        return self.buy_count + self.sell_count
+
+    def add_trade(self, trade: KrakenTrade) -> None:
+        """Fold a single trade into the bucket."""
+        self.volume += trade.volume
+        self.notional += trade.volume * trade.price
+        self.fees += trade.fee
+
+        if trade.type == 'buy':
+            self.buy_count += 1
+        else:
+            self.sell_count += 1
+
+        if self.first_time is None or trade.time < self.first_time:
+            self.first_time = trade.time
+        if self.last_time is None or trade.time > self.last_time:
+            self.last_time = trade.time
+
+    def merge(self, other: "TradeBucket") -> None:
+        """Accumulate another bucket into this one."""
+        self.volume += other.volume
+        self.notional += other.notional
+        self.fees += other.fees
+        self.buy_count += other.buy_count
+        self.sell_count += other.sell_count
+
+        if other.first_time is not None and (self.first_time is None or other.first_time < self.first_time):
+            self.first_time = other.first_time
+        if other.last_time is not None and (self.last_time is None or other.last_time > self.last_time):
+            self.last_time = other.last_time
+
+
+class RollingTradeAggregates:
+    """
+    Minute-bucketed trade aggregates with bounded retention.
+
+    Buckets are keyed by minute index (epoch seconds // 60) and kept in a
+    sorted key list, so a window query is a bisect plus a sum over the
+    non-empty buckets it covers. Window edges are aligned to whole minutes.
+    """
+
+    def __init__(self, retention_minutes: int = 7 * 24 * 60):
+        self.retention_minutes = retention_minutes
+        self._buckets: Dict[int, TradeBucket] = {}
+        self._keys: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def minute_index(timestamp: datetime) -> int:
+        """Map a timestamp to its bucket index."""
+        return int(timestamp.timestamp()) // BUCKET_SECONDS
+
+    def add_trade(self, trade: KrakenTrade) -> None:
+        """Add a trade to its minute bucket."""
+        minute = self.minute_index(trade.time)
+        bucket = self._buckets.get(minute)
+
+        if bucket is None:
+            if self._keys and minute < self._keys[-1] - self.retention_minutes:
+                # Older than the retention window; nothing to keep
+                return
+            bucket = TradeBucket()
+            self._buckets[minute] = bucket
+            if not self._keys or minute > self._keys[-1]:
+                self._keys.append(minute)
+            else:
+                insort(self._keys, minute)
+            self._evict(self._keys[-1] - self.retention_minutes)
+
+        bucket.add_trade(trade)
+
+    def _evict(self, oldest_minute: int) -> None:
+        """Drop buckets older than ``oldest_minute``."""
+        cut = bisect_left(self._keys, oldest_minute)
+        if cut:
+            for minute in self._keys[:cut]:
+                del self._buckets[minute]
+            del self._keys[:cut]
+
+    def summarize(self, since: datetime) -> TradeBucket:
+        """
+        Sum all buckets at or after the minute containing ``since``.
+
+        Args:
+            since: Start of the look-back window
+
+        Returns:
+            Combined TradeBucket for the window
+        """
+        total = TradeBucket()
+        start = bisect_left(self._keys, self.minute_index(since))
+        buckets = self._buckets
+        for minute in self._keys[start:]:
+            total.merge(buckets[minute])
+        return total
+
+    def clear(self) -> None:
+        """Remove all buckets."""
+        self._buckets.clear()
+        self._keys.clear()
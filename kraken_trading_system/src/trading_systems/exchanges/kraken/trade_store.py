@@ -0,0 +1,295 @@
+"""
+Columnar ring-buffer trade store with vectorized analytics.
+
+Keeps own-trade executions in fixed-size NumPy columns (time, price,
+volume, fee, side, pair id) alongside the Pydantic trade history, so
+analytics run as array operations instead of walking KrakenTrade objects
+and Decimals. Values are stored as float64; use the Decimal-based trade
+history or aggregates where exact accounting is required.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .account_models import KrakenTrade
+
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+
+class ColumnarTradeStore:
+    """
+    Fixed-capacity columnar store of trades.
+
+    Writes go to a ring position in O(1); once full, the oldest trade is
+    overwritten. Queries build boolean masks over the filled region, so
+    storage order does not matter to any of the analytics.
+    """
+
+    def __init__(self, capacity: int = 100_000):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self._time = np.zeros(capacity, dtype=np.float64)
+        self._price = np.zeros(capacity, dtype=np.float64)
+        self._volume = np.zeros(capacity, dtype=np.float64)
+        self._fee = np.zeros(capacity, dtype=np.float64)
+        self._side = np.zeros(capacity, dtype=np.int8)
+        self._pair_id = np.zeros(capacity, dtype=np.int32)
+
+        self._head = 0
+        self._size = 0
+
+        self._pair_ids: Dict[str, int] = {}
+        self._pair_names: List[str] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _get_pair_id(self, pair: str) -> int:
+        """Intern a pair symbol as a small integer id."""
+        pair_id = self._pair_ids.get(pair)
+        if pair_id is None:
+            pair_id = len(self._pair_names)
+            self._pair_ids[pair] = pair_id
+            self._pair_names.append(pair)
+        return pair_id
+
+    def append(self, trade: KrakenTrade) -> None:
+        """Append a single trade, overwriting the oldest when full."""
+        self.append_values(
+            trade.time.timestamp(),
+            float(trade.price),
+            float(trade.volume),
+            float(trade.fee),
+            SIDE_BUY if trade.type == 'buy' else SIDE_SELL,
+            trade.pair
+        )
+
+    def append_values(
+        self,
+        timestamp: float,
+        price: float,
+        volume: float,
+        fee: float,
+        side: int,
+        pair: str
+    ) -> None:
+        """Append a trade from raw column values."""
+        i = self._head
+        self._time[i] = timestamp
+        self._price[i] = price
+        self._volume[i] = volume
+        self._fee[i] = fee
+        self._side[i] = side
+        self._pair_id[i] = self._get_pair_id(pair)
+
+        self._head = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def clear(self) -> None:
+        """Drop all stored trades."""
+        self._head = 0
+        self._size = 0
+        self._pair_ids.clear()
+        self._pair_names.clear()
+
+    # QUERY HELPERS
+
+    def _mask(self, pair: Optional[str], since: Optional[datetime]) -> Optional[np.ndarray]:
+        """
+        Build a selection mask over the filled region.
+
+        Returns:
+            Boolean mask, or None if ``pair`` has never been seen
+        """
+        n = self._size
+        mask = np.ones(n, dtype=bool)
+
+        if since is not None:
+            mask &= self._time[:n] >= since.timestamp()
+
+        if pair is not None:
+            pair_id = self._pair_ids.get(pair)
+            if pair_id is None:
+                return None
+            mask &= self._pair_id[:n] == pair_id
+
+        return mask
+
+    def _columns(self, pair: Optional[str], since: Optional[datetime]) -> Optional[Dict[str, np.ndarray]]:
+        """Select the columns for a pair/time window."""
+        mask = self._mask(pair, since)
+        if mask is None or not mask.any():
+            return None
+
+        n = self._size
+        return {
+            'time': self._time[:n][mask],
+            'price': self._price[:n][mask],
+            'volume': self._volume[:n][mask],
+            'fee': self._fee[:n][mask],
+            'side': self._side[:n][mask]
+        }
+
+    # ANALYTICS
+
+    def summary(self, pair: Optional[str] = None, since: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Vectorized trade summary for a window.
+
+        Returns:
+            Dictionary with counts, volume, notional, fees, VWAP and time range
+        """
+        cols = self._columns(pair, since)
+        if cols is None:
+            return {
+                'total_trades': 0,
+                'total_volume': 0.0,
+                'total_notional': 0.0,
+                'total_fees': 0.0,
+                'buy_trades': 0,
+                'sell_trades': 0,
+                'vwap': None,
+                'first_trade_time': None,
+                'last_trade_time': None
+            }
+
+        volume = cols['volume'].sum()
+        notional = np.dot(cols['price'], cols['volume'])
+        buys = int(np.count_nonzero(cols['side'] == SIDE_BUY))
+
+        return {
+            'total_trades': int(cols['time'].size),
+            'total_volume': float(volume),
+            'total_notional': float(notional),
+            'total_fees': float(cols['fee'].sum()),
+            'buy_trades': buys,
+            'sell_trades': int(cols['time'].size) - buys,
+            'vwap': float(notional / volume) if volume > 0 else None,
+            'first_trade_time': datetime.fromtimestamp(cols['time'].min()),
+            'last_trade_time': datetime.fromtimestamp(cols['time'].max())
+        }
+
+    def vwap(self, pair: Optional[str] = None, since: Optional[datetime] = None) -> Optional[float]:
+        """Volume-weighted average price for a window."""
+        cols = self._columns(pair, since)
+        if cols is None:
+            return None
+
+        volume = cols['volume'].sum()
+        if volume <= 0:
+            return None
+        return float(np.dot(cols['price'], cols['volume']) / volume)
+
+    def volume_profile(
+        self,
+        pair: str,
+        since: Optional[datetime] = None,
+        bins: int = 20
+    ) -> List[Dict[str, float]]:
+        """
+        Traded volume by price level.
+
+        Args:
+            pair: Trading pair
+            since: Start of window
+            bins: Number of equal-width price bins
+
+        Returns:
+            List of bins with price range and total/buy/sell volume
+        """
+        cols = self._columns(pair, since)
+        if cols is None:
+            return []
+
+        price, volume, side = cols['price'], cols['volume'], cols['side']
+        total, edges = np.histogram(price, bins=bins, weights=volume)
+        buy, _ = np.histogram(price, bins=edges, weights=np.where(side == SIDE_BUY, volume, 0.0))
+
+        return [
+            {
+                'price_low': float(edges[i]),
+                'price_high': float(edges[i + 1]),
+                'volume': float(total[i]),
+                'buy_volume': float(buy[i]),
+                'sell_volume': float(total[i] - buy[i])
+            }
+            for i in range(len(total))
+        ]
+
+    def realized_spread(self, pair: str, since: Optional[datetime] = None) -> Dict[str, Optional[float]]:
+        """
+        Spread captured between own sells and buys.
+
+        Computed as sell VWAP minus buy VWAP over the window; positive
+        values mean sells executed above buys.
+        """
+        cols = self._columns(pair, since)
+        result = {'buy_vwap': None, 'sell_vwap': None, 'spread': None, 'spread_bps': None}
+        if cols is None:
+            return result
+
+        is_buy = cols['side'] == SIDE_BUY
+        price, volume = cols['price'], cols['volume']
+
+        buy_volume = volume[is_buy].sum()
+        sell_volume = volume[~is_buy].sum()
+        if buy_volume > 0:
+            result['buy_vwap'] = float(np.dot(price[is_buy], volume[is_buy]) / buy_volume)
+        if sell_volume > 0:
+            result['sell_vwap'] = float(np.dot(price[~is_buy], volume[~is_buy]) / sell_volume)
+
+        if result['buy_vwap'] is not None and result['sell_vwap'] is not None:
+            spread = result['sell_vwap'] - result['buy_vwap']
+            mid = (result['sell_vwap'] + result['buy_vwap']) / 2
+            result['spread'] = spread
+            result['spread_bps'] = spread / mid * 10_000 if mid > 0 else None
+
+        return result
+
+    def interval_aggregates(
+        self,
+        interval_seconds: int = 3600,
+        pair: Optional[str] = None,
+        since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-interval trade aggregates (OHLC-free bars of own trades).
+
+        Returns:
+            Chronological list of intervals with trade count, volume,
+            notional, VWAP, fees and buy/sell volume
+        """
+        cols = self._columns(pair, since)
+        if cols is None:
+            return []
+
+        buckets = np.floor_divide(cols['time'], interval_seconds).astype(np.int64)
+        starts, inverse = np.unique(buckets, return_inverse=True)
+        k = starts.size
+
+        volume, price, side = cols['volume'], cols['price'], cols['side']
+        counts = np.bincount(inverse, minlength=k)
+        vol = np.bincount(inverse, weights=volume, minlength=k)
+        notional = np.bincount(inverse, weights=price * volume, minlength=k)
+        fees = np.bincount(inverse, weights=cols['fee'], minlength=k)
+        buy_vol = np.bincount(inverse, weights=np.where(side == SIDE_BUY, volume, 0.0), minlength=k)
+
+        return [
+            {
+                'start': datetime.fromtimestamp(int(starts[i]) * interval_seconds),
+                'trades': int(counts[i]),
+                'volume': float(vol[i]),
+                'notional': float(notional[i]),
+                'vwap': float(notional[i] / vol[i]) if vol[i] > 0 else None,
+                'fees': float(fees[i]),
+                'buy_volume': float(buy_vol[i]),
+                'sell_volume': float(vol[i] - buy_vol[i])
+            }
+            for i in range(k)
+        ]
@@ -23,6 +23,7 @@ from ...utils.exceptions import (
     AuthenticationError,
     handle_kraken_error,
 )
+from ...utils.latency import STAGE_WEBSOCKET, fill_pipeline_latency
 from ...utils.logger import LoggerMixin, log_websocket_event
 from .token_manager import KrakenTokenManager, get_token_manager
 
@@ -291,17 +292,27 @@ class KrakenWebSocketClient(LoggerMixin):
                     if order_id:
                         # Check if this is a fill for an order we're tracking
                         if self.order_manager.has_order(order_id):
-                            await self.order_manager.process_fill_update(trade_id, trade_info)
-
-                            # Trigger fill event
-                            await self._trigger_order_event_handlers(
-                                "fill",
-                                {
-                                    "trade_id": trade_id,
-                                    "order_id": order_id,
-                                    "trade_info": trade_info
-                                }
-                            )
+                            stage_start = time.perf_counter_ns()
+                            fill_pipeline_latency.begin(trade_id)
+                            try:
+                                await self.order_manager.process_fill_update(trade_id, trade_info)
+
+                                # Trigger fill event
+                                await self._trigger_order_event_handlers(
+                                    "fill",
+                                    {
+                                        "trade_id": trade_id,
+                                        "order_id": order_id,
+                                        "trade_info": trade_info
+                                    }
+                                )
+                            except Exception:
+                                fill_pipeline_latency.abandon(trade_id)
+                                raise
+                            fill_pipeline_latency.record_since(STAGE_WEBSOCKET, stage_start)
+                            # The fill is done once OrderManager and the fill handlers have
+                            # run; a no-op if a handler already finished it in analytics
+                            fill_pipeline_latency.finish(trade_id)
 
         except Exception as e:
             self.log_error("Error processing trade fills for OrderManager", error=e)
@@ -392,6 +403,7 @@ class KrakenWebSocketClient(LoggerMixin):
             "private_subscriptions": list(self.private_subscriptions),
             "has_token": self.current_token is not None,
             "token_manager_initialized": self.token_manager is not None,
+            "token_refresh": self.token_manager.get_refresh_metrics() if self.token_manager else None,
             "last_heartbeat": self.last_heartbeat,
             "reconnect_attempts": self.reconnect_attempts,
             "ssl_verify_mode": self.ssl_context.verify_mode.name if hasattr(self.ssl_context.verify_mode, 'name') else str(self.ssl_context.verify_mode),
@@ -463,6 +475,9 @@ class KrakenWebSocketClient(LoggerMixin):
                 "WebSocket token obtained for private connection",
                 token_length=len(self.current_token)
             )
+
+            # Keep tokens warm so reconnects never wait on a REST round trip
+            self.token_manager.start_background_refresh()
         except Exception as e:
             self.log_error("Failed to obtain WebSocket token", error=e)
             raise AuthenticationError(f"Token acquisition failed: {e}")
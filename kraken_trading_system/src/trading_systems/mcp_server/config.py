@@ -26,6 +26,7 @@ class MCPSecurityConfig(BaseModel):
     # Rate limiting
     max_requests_per_minute: int = Field(default=60, description="Maximum requests per minute per client")
     max_trading_operations_per_hour: int = Field(default=10, description="Maximum trading operations per hour")
+    max_rate_limited_clients: int = Field(default=10000, description="Clients tracked by the rate limiter before the least recently seen is evicted")
     
     # Operation restrictions
     allowed_trading_pairs: Set[str] = Field(default_factory=lambda: {"XBT/USD", "ETH/USD"}, description="Allowed trading pairs")
@@ -43,6 +44,7 @@ class MCPPerformanceConfig(BaseModel):
     # Connection settings
     max_concurrent_connections: int = Field(default=5, description="Maximum concurrent MCP connections")
     connection_timeout_seconds: int = Field(default=30, description="Connection timeout in seconds")
+    startup_probe_deadline_seconds: float = Field(default=10.0, description="Time allowed for startup readiness probes before the adapter reports degraded")
     
     # Resource caching
     cache_market_data_seconds: int = Field(default=5, description="Cache market data for N seconds")
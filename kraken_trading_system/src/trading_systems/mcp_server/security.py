@@ -12,7 +12,7 @@ import asyncio
 import hashlib
 import hmac
 import time
-from collections import defaultdict, deque
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set, Callable, Any
@@ -20,6 +20,7 @@ from functools import wraps
 import json
 
 from ..utils.logger import LoggerMixin
+from ..utils.rate_limit import GCRA, ClientTable
 from ..config.settings import settings
 from .config import MCPServerConfig
 
@@ -36,13 +37,28 @@ class SecurityEvent:
     ip_address: Optional[str] = None
 
 
-@dataclass
+# Operations counted against the hourly trading limit
+RATE_LIMITED_TRADING_OPERATIONS = frozenset({"place_order", "cancel_order", "modify_order"})
+
+
 class RateLimitState:
-    """Rate limiting state for a client."""
-    requests: deque = field(default_factory=deque)
-    trading_operations: deque = field(default_factory=deque)
-    last_violation: Optional[datetime] = None
-    violation_count: int = 0
+    """
+    Rate limiting state for a client.
+
+    Each limit is one GCRA theoretical arrival time on the monotonic clock.
+    """
+
+    __slots__ = ('request_tat', 'trading_tat', 'last_violation', 'violation_count')
+
+    def __init__(self):
+        self.request_tat = 0.0
+        self.trading_tat = 0.0
+        self.last_violation: Optional[datetime] = None
+        self.violation_count = 0
+
+    def is_idle(self, now: float) -> bool:
+        """True once both limits have fully recovered."""
+        return self.request_tat <= now and self.trading_tat <= now
 
 
 class SecurityManager(LoggerMixin):
@@ -63,7 +79,13 @@ class SecurityManager(LoggerMixin):
         
         # Security state
         self.authorized_clients: Set[str] = set()
-        self.rate_limit_state: Dict[str, RateLimitState] = defaultdict(RateLimitState)
+        self.request_limit = GCRA(config.security.max_requests_per_minute, 60.0)
+        self.trading_limit = GCRA(config.security.max_trading_operations_per_hour, 3600.0)
+        self.rate_limit_state: ClientTable[RateLimitState] = ClientTable(
+            RateLimitState, RateLimitState.is_idle,
+            max_clients=config.security.max_rate_limited_clients
+        )
+        self._clock = time.monotonic
         self.security_events: List[SecurityEvent] = []
         self.blocked_clients: Set[str] = set()
         
@@ -193,6 +215,10 @@ class SecurityManager(LoggerMixin):
         """
         Check if client is within rate limits.
         
+        Requests are limited per minute and trading operations per hour,
+        each allowing a burst up to the full limit. A rejected call does
+        not count against either limit.
+        
         Args:
             client_id: Client identifier
             operation: Operation being attempted
@@ -200,47 +226,37 @@ class SecurityManager(LoggerMixin):
         Returns:
             True if within limits, False if rate limited
         """
-        now = datetime.now()
-        state = self.rate_limit_state[client_id]
-        
-        # Clean old requests (older than 1 minute)
-        minute_ago = now - timedelta(minutes=1)
-        while state.requests and state.requests[0] < minute_ago:
-            state.requests.popleft()
-        
-        # Clean old trading operations (older than 1 hour)
-        hour_ago = now - timedelta(hours=1)
-        while state.trading_operations and state.trading_operations[0] < hour_ago:
-            state.trading_operations.popleft()
+        now = self._clock()
+        table = self.rate_limit_state
+        state = table.touch(client_id)
+        table.tick(now)
         
         # Check general rate limit
-        if len(state.requests) >= self.config.security.max_requests_per_minute:
-            state.last_violation = now
-            state.violation_count += 1
-            self._log_security_event("rate_limit", client_id, operation, False,
-                                   reason="general_rate_limit",
-                                   requests_per_minute=len(state.requests))
+        request_tat = self.request_limit.admit(state.request_tat, now)
+        if request_tat is None:
+            self._record_violation(state, client_id, operation, "general_rate_limit",
+                                   retry_after=round(self.request_limit.retry_after(state.request_tat, now), 3))
             return False
         
         # Check trading operation rate limit
-        trading_operations = {"place_order", "cancel_order", "modify_order"}
-        if operation in trading_operations:
-            if len(state.trading_operations) >= self.config.security.max_trading_operations_per_hour:
-                state.last_violation = now
-                state.violation_count += 1
-                self._log_security_event("rate_limit", client_id, operation, False,
-                                       reason="trading_rate_limit",
-                                       trading_operations_per_hour=len(state.trading_operations))
+        if operation in RATE_LIMITED_TRADING_OPERATIONS:
+            trading_tat = self.trading_limit.admit(state.trading_tat, now)
+            if trading_tat is None:
+                self._record_violation(state, client_id, operation, "trading_rate_limit",
+                                       retry_after=round(self.trading_limit.retry_after(state.trading_tat, now), 3))
                 return False
-            
-            # Record trading operation
-            state.trading_operations.append(now)
-        
-        # Record general request
-        state.requests.append(now)
+            state.trading_tat = trading_tat
         
+        state.request_tat = request_tat
         return True
     
+    def _record_violation(self, state: RateLimitState, client_id: str, operation: str,
+                          reason: str, **details):
+        state.last_violation = datetime.now()
+        state.violation_count += 1
+        self._log_security_event("rate_limit", client_id, operation, False,
+                               reason=reason, **details)
+    
     def validate_operation_parameters(self, operation: str, parameters: Dict[str, Any]) -> tuple[bool, str]:
         """
         Validate operation parameters for security.
@@ -297,6 +313,8 @@ class SecurityManager(LoggerMixin):
             "recent_events_count": len(recent_events),
             "event_breakdown": dict(event_counts),
             "rate_limiting_active": True,
+            "rate_limited_clients": len(self.rate_limit_state),
+            "rate_limit_evictions": self.rate_limit_state.evictions,
             "authentication_required": self.config.security.require_authentication,
             "audit_logging": self.config.security.audit_all_operations,
             "max_order_value_usd": self.config.security.max_order_value_usd,
@@ -8,9 +8,11 @@ File Location: src/trading_systems/mcp_server/trading_adapter.py
 """
 
 import asyncio
+import time
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from datetime import datetime
+from enum import Enum
 import json
 
 from ..utils.logger import LoggerMixin
@@ -19,6 +21,29 @@ from ..config.settings import settings
 from .config import MCPServerConfig
 
 
+class ReadinessState(str, Enum):
+    """Startup readiness of the trading system adapter."""
+    NOT_STARTED = "not_started"
+    STARTING = "starting"  # probes running; tools may still use components
+    READY = "ready"  # every probe passed
+    DEGRADED = "degraded"  # some probes failed or missed the startup deadline
+    FAILED = "failed"
+
+
+# Components built on first use: attribute name -> builder method
+COMPONENT_BUILDERS = {
+    "rest_client": "_build_rest_client",
+    "websocket_client": "_build_websocket_client",
+    "account_manager": "_build_account_manager",
+    "order_manager": "_build_order_manager",
+}
+
+# Components that must be built before another one
+COMPONENT_DEPENDENCIES = {
+    "order_manager": ("account_manager",),
+}
+
+
 @dataclass
 class TradingSystemStatus:
     """Status information for the trading system."""
@@ -38,21 +63,31 @@ class TradingSystemAdapter(LoggerMixin):
     2. Provides a simplified interface for MCP operations
     3. Handles error translation and logging
     4. Manages connection lifecycle
+    
+    Components are imported and constructed on first use in a worker
+    thread, and readiness probes run concurrently in the background, so
+    neither ``initialize`` nor a tool call waits on the exchange on the
+    event loop. ``get_component`` awaits a build; the component properties
+    never block and return None until the component is built. Tools can
+    check ``readiness`` or await ``wait_until_ready``.
     """
     
     def __init__(self, config: MCPServerConfig):
         super().__init__()
         self.config = config
         
-        # Trading system components (will be initialized)
-        self.websocket_client = None
-        self.order_manager = None
-        self.account_manager = None
-        self.rest_client = None
+        # Trading system components, built on first access
+        self._components: Dict[str, Any] = {}
+        self._build_tasks: Dict[str, asyncio.Task] = {}  # builds running in worker threads
         
         # Connection state
         self.is_initialized = False
         self.last_status_update = None
+        self.readiness = ReadinessState.NOT_STARTED
+        self.component_health: Dict[str, Dict[str, Any]] = {}
+        self.startup_deadline = config.performance.startup_probe_deadline_seconds
+        self._ready_event: Optional[asyncio.Event] = None  # created in the running loop
+        self._startup_task: Optional[asyncio.Task] = None
         
         # Mock/Demo mode data
         self.demo_mode = not config.enable_real_trading
@@ -60,6 +95,104 @@ class TradingSystemAdapter(LoggerMixin):
         
         self.log_info("Trading system adapter created", demo_mode=self.demo_mode)
     
+    # LAZY COMPONENTS
+    
+    def _component(self, name: str) -> Any:
+        """Built component, or None; a missing one starts building in the background."""
+        component = self._components.get(name)
+        if component is None and not self.demo_mode:
+            self._start_build(name)
+        return component
+    
+    def _start_build(self, name: str) -> Optional[asyncio.Task]:
+        task = self._build_tasks.get(name)
+        if task is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return None
+            task = self._build_tasks[name] = loop.create_task(self._build_component(name))
+            task.add_done_callback(lambda done: self._build_finished(name, done))
+        return task
+    
+    async def _build_component(self, name: str) -> Any:
+        for dependency in COMPONENT_DEPENDENCIES.get(name, ()):
+            await self.get_component(dependency)
+        # Imports and constructors may take hundreds of ms; keep them off the loop
+        component = await asyncio.to_thread(getattr(self, COMPONENT_BUILDERS[name]))
+        self._components[name] = component
+        self.log_info("✅ Component initialized", component=name)
+        return component
+    
+    def _build_finished(self, name: str, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is not None:
+            # Forget the failed build so the next access retries
+            if self._build_tasks.get(name) is task:
+                del self._build_tasks[name]
+            if not task.cancelled():
+                self.log_warning("Component build failed", component=name, error=str(task.exception()))
+    
+    async def get_component(self, name: str) -> Any:
+        """Component by name, built in a worker thread on first use."""
+        component = self._components.get(name)
+        if component is not None:
+            return component
+        task = self._start_build(name)
+        # Shielded so a cancelled caller (e.g. a probe at its deadline) leaves the build running
+        return await asyncio.shield(task)
+    
+    def has_component(self, name: str) -> bool:
+        """Whether a component has been built (never triggers construction)."""
+        return self._components.get(name) is not None
+    
+    @property
+    def rest_client(self):
+        return self._component("rest_client")
+    
+    @rest_client.setter
+    def rest_client(self, value):
+        self._components["rest_client"] = value
+    
+    @property
+    def websocket_client(self):
+        return self._component("websocket_client")
+    
+    @websocket_client.setter
+    def websocket_client(self, value):
+        self._components["websocket_client"] = value
+    
+    @property
+    def account_manager(self):
+        return self._component("account_manager")
+    
+    @account_manager.setter
+    def account_manager(self, value):
+        self._components["account_manager"] = value
+    
+    @property
+    def order_manager(self):
+        return self._component("order_manager")
+    
+    @order_manager.setter
+    def order_manager(self, value):
+        self._components["order_manager"] = value
+    
+    def _build_rest_client(self):
+        from ..exchanges.kraken.rest_client import EnhancedKrakenRestClient
+        return EnhancedKrakenRestClient()
+    
+    def _build_websocket_client(self):
+        from ..exchanges.kraken.websocket_client import KrakenWebSocketClient
+        return KrakenWebSocketClient()
+    
+    def _build_account_manager(self):
+        from ..exchanges.kraken.account_data_manager import AccountDataManager
+        return AccountDataManager()
+    
+    def _build_order_manager(self):
+        from ..exchanges.kraken.order_manager import OrderManager
+        return OrderManager(account_manager=self._components["account_manager"])
+    
     def _initialize_mock_data(self) -> Dict[str, Any]:
         """Initialize mock data for demo mode."""
         return {
@@ -78,7 +211,12 @@ class TradingSystemAdapter(LoggerMixin):
         }
     
     async def initialize(self) -> None:
-        """Initialize the trading system adapter and connections."""
+        """
+        Initialize the trading system adapter.
+        
+        Returns once the adapter can serve requests; in real trading mode
+        readiness probes continue in the background.
+        """
         try:
             self.log_info("Initializing trading system adapter...")
             
@@ -90,9 +228,12 @@ class TradingSystemAdapter(LoggerMixin):
             self.is_initialized = True
             self.last_status_update = datetime.now()
             
-            self.log_info("✅ Trading system adapter initialized successfully")
+            self.log_info("✅ Trading system adapter initialized successfully",
+                          readiness=self.readiness.value)
             
         except Exception as e:
+            self.readiness = ReadinessState.FAILED
+            self._readiness_event().set()
             self.log_error("❌ Failed to initialize trading system adapter", error=e)
             raise TradingSystemError(f"Adapter initialization failed: {e}")
     
@@ -100,71 +241,113 @@ class TradingSystemAdapter(LoggerMixin):
         """Initialize adapter in demo mode with mock components."""
         self.log_info("🎭 Initializing in demo mode (no real trading)")
         
-        # Simulate initialization delay
-        await asyncio.sleep(0.5)
-        
         # Mock successful initialization
         self.websocket_client = "mock_websocket"
         self.order_manager = "mock_order_manager"
         self.account_manager = "mock_account_manager"
         self.rest_client = "mock_rest_client"
         
+        self.readiness = ReadinessState.READY
+        self._readiness_event().set()
         self.log_info("✅ Demo mode initialization complete")
     
     async def _initialize_real_trading(self) -> None:
-        """Initialize adapter with real trading system components."""
-        self.log_info("💰 Initializing real trading system components")
+        """Start readiness probes for the real trading system components."""
+        self.log_info("💰 Real trading components will be initialized on first use")
+        
+        self.readiness = ReadinessState.STARTING
+        self._readiness_event().clear()
+        self._startup_task = asyncio.create_task(self._probe_readiness())
+    
+    async def _probe_readiness(self) -> None:
+        """Probe all components concurrently, bounded by the startup deadline."""
+        self.log_info("🔍 Testing trading system connections...", deadline=self.startup_deadline)
+        
+        probes = {
+            "rest_client": self._probe_rest_client,
+            "websocket_client": self._probe_websocket_client,
+            "account_manager": self._probe_construct("account_manager"),
+            "order_manager": self._probe_construct("order_manager"),
+        }
+        tasks = {asyncio.create_task(self._run_probe(name, probe)): name for name, probe in probes.items()}
         
         try:
-            # Import real trading system components
-            from ..exchanges.kraken.websocket_client import KrakenWebSocketClient
-            from ..exchanges.kraken.rest_client import EnhancedKrakenRestClient
-            from ..exchanges.kraken.account_data_manager import AccountDataManager
-            from ..exchanges.kraken.order_manager import OrderManager
-            
-            # Initialize REST client
-            self.rest_client = EnhancedKrakenRestClient()
-            self.log_info("✅ REST client initialized")
-            
-            # Initialize WebSocket client
-            self.websocket_client = KrakenWebSocketClient()
-            self.log_info("✅ WebSocket client initialized")
-            
-            # Initialize account data manager
-            self.account_manager = AccountDataManager()
-            self.log_info("✅ Account data manager initialized")
-            
-            # Initialize order manager
-            self.order_manager = OrderManager(account_manager=self.account_manager)
-            self.log_info("✅ Order manager initialized")
+            done, pending = await asyncio.wait(tasks, timeout=self.startup_deadline)
+            for task in pending:
+                task.cancel()
+                self.component_health[tasks[task]] = {
+                    "ok": False,
+                    "error": f"no response within {self.startup_deadline}s startup deadline"
+                }
             
-            # Test connections
-            await self._test_connections()
+            if all(health.get("ok") for health in self.component_health.values()):
+                self.readiness = ReadinessState.READY
+                self.log_info("✅ Trading system ready", components=list(self.component_health))
+            else:
+                self.readiness = ReadinessState.DEGRADED
+                failed = [name for name, health in self.component_health.items() if not health.get("ok")]
+                self.log_warning("⚠️ Connection test failed (continuing in limited mode)", failed=failed)
             
-        except ImportError as e:
-            self.log_error("❌ Failed to import trading system components", error=e)
-            raise TradingSystemError(f"Component import failed: {e}")
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
         except Exception as e:
-            self.log_error("❌ Failed to initialize real trading components", error=e)
-            raise TradingSystemError(f"Real trading initialization failed: {e}")
+            self.readiness = ReadinessState.FAILED
+            self.log_error("❌ Readiness probes failed", error=e)
+        finally:
+            self.last_status_update = datetime.now()
+            self._readiness_event().set()
     
-    async def _test_connections(self) -> None:
-        """Test connections to trading system components."""
-        self.log_info("🔍 Testing trading system connections...")
-        
+    async def _run_probe(self, name: str, probe) -> None:
+        started = time.perf_counter()
         try:
-            # Test REST client connection
-            if hasattr(self.rest_client, 'get_system_status'):
-                status = await self.rest_client.get_system_status()
-                self.log_info("✅ REST API connection successful")
-            
-            # Test WebSocket client (if implemented)
-            if hasattr(self.websocket_client, 'get_connection_status'):
-                ws_status = self.websocket_client.get_connection_status()
-                self.log_info("✅ WebSocket client status checked")
-            
+            await probe()
+            self.component_health[name] = {"ok": True}
         except Exception as e:
-            self.log_warning("⚠️ Connection test failed (continuing in limited mode)", error=e)
+            self.component_health[name] = {"ok": False, "error": str(e)}
+        self.component_health[name]["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    
+    async def _probe_rest_client(self) -> None:
+        rest_client = await self.get_component("rest_client")
+        if hasattr(rest_client, 'get_system_status'):
+            await rest_client.get_system_status()
+    
+    async def _probe_websocket_client(self) -> None:
+        websocket_client = await self.get_component("websocket_client")
+        if hasattr(websocket_client, 'get_connection_status'):
+            websocket_client.get_connection_status()
+    
+    def _probe_construct(self, name: str):
+        async def probe() -> None:
+            await self.get_component(name)
+        return probe
+    
+    def _readiness_event(self) -> asyncio.Event:
+        if self._ready_event is None:
+            self._ready_event = asyncio.Event()
+        return self._ready_event
+    
+    @property
+    def is_ready(self) -> bool:
+        """Whether startup probes finished and the adapter can serve trading requests."""
+        return self.readiness in (ReadinessState.READY, ReadinessState.DEGRADED)
+    
+    async def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for startup probes to finish. Returns ``is_ready``."""
+        try:
+            await asyncio.wait_for(self._readiness_event().wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.is_ready
+    
+    def get_readiness(self) -> Dict[str, Any]:
+        """Readiness state and per-component probe results."""
+        return {
+            "state": self.readiness.value,
+            "components": {name: dict(health) for name, health in self.component_health.items()},
+            "initialized": sorted(name for name in COMPONENT_BUILDERS if self.has_component(name)),
+        }
     
     def get_status(self) -> TradingSystemStatus:
         """Get current status of the trading system."""
@@ -182,11 +365,11 @@ class TradingSystemAdapter(LoggerMixin):
                 }
             )
         
-        # Real trading status
+        # Real trading status (reports built components without building them)
         try:
-            ws_connected = self.websocket_client is not None
-            order_mgr_active = self.order_manager is not None
-            account_available = self.account_manager is not None
+            ws_connected = self.has_component("websocket_client")
+            order_mgr_active = self.has_component("order_manager")
+            account_available = self.has_component("account_manager")
             
             return TradingSystemStatus(
                 websocket_connected=ws_connected,
@@ -196,7 +379,8 @@ class TradingSystemAdapter(LoggerMixin):
                 connection_details={
                     "mode": "real",
                     "components": "live",
-                    "trading_enabled": self.config.enable_real_trading
+                    "trading_enabled": self.config.enable_real_trading,
+                    "readiness": self.get_readiness()
                 }
             )
             
@@ -217,12 +401,14 @@ class TradingSystemAdapter(LoggerMixin):
                 return self.mock_data["account_balance"]
             
             # Real trading implementation would call actual account manager
-            if self.account_manager and hasattr(self.account_manager, 'get_balance'):
-                return await self.account_manager.get_balance()
+            account_manager = await self.get_component("account_manager")
+            if account_manager and hasattr(account_manager, 'get_balance'):
+                return await account_manager.get_balance()
             else:
                 # Fallback to REST API
-                if self.rest_client:
-                    balance = await self.rest_client.get_account_balance()
+                rest_client = await self.get_component("rest_client")
+                if rest_client:
+                    balance = await rest_client.get_account_balance()
                     return balance
                 
             raise TradingSystemError("No account data source available")
@@ -242,7 +428,8 @@ class TradingSystemAdapter(LoggerMixin):
             # Real trading implementation would get actual market status
             # For now, return basic status
             return {
-                "status": "connected" if self.websocket_client else "disconnected",
+                "status": "connected" if self.has_component("websocket_client") else "disconnected",
+                "readiness": self.readiness.value,
                 "timestamp": datetime.now().isoformat(),
                 "trading_pairs": list(self.config.get_allowed_trading_pairs())
             }
@@ -260,13 +447,27 @@ class TradingSystemAdapter(LoggerMixin):
         try:
             self.log_info("🔄 Shutting down trading system adapter...")
             
+            if self._startup_task and not self._startup_task.done():
+                self._startup_task.cancel()
+                try:
+                    await self._startup_task
+                except asyncio.CancelledError:
+                    pass
+            
+            # Builds still in worker threads finish there; drop their results
+            for task in self._build_tasks.values():
+                task.cancel()
+            self._build_tasks.clear()
+            
             if not self.demo_mode:
-                # Cleanup real trading system components
-                if self.websocket_client and hasattr(self.websocket_client, 'disconnect'):
-                    await self.websocket_client.disconnect()
+                # Cleanup real trading system components that were built
+                websocket_client = self._components.get("websocket_client")
+                if websocket_client and hasattr(websocket_client, 'disconnect'):
+                    await websocket_client.disconnect()
                 
-                if self.order_manager and hasattr(self.order_manager, 'shutdown'):
-                    await self.order_manager.shutdown()
+                order_manager = self._components.get("order_manager")
+                if order_manager and hasattr(order_manager, 'shutdown'):
+                    await order_manager.shutdown()
             
             self.is_initialized = False
             self.log_info("✅ Trading system adapter shutdown complete")
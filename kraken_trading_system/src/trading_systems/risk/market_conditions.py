@@ -0,0 +1,182 @@
+"""
+Streaming per-pair market condition estimators.
+
+Each pair keeps, updated in O(1) amortized per tick:
+
+- EWMA variance of log returns per second, with a time-based decay so
+  irregular tick spacing is handled (reported as volatility over a
+  horizon, one minute by default)
+- realized range (high - low) / low over a rolling window, from
+  monotonic max/min deques
+- bid/ask spread in basis points
+- quote age since the last update
+
+Ages are measured on the local monotonic clock at ingestion, so exchange
+clock skew does not affect staleness.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+class PairMarketStats:
+    """
+    Market estimators for one pair.
+
+    Args:
+        halflife: Seconds for an observation's weight in the EWMA to halve
+        range_window: Seconds covered by the realized range
+    """
+
+    __slots__ = (
+        'halflife', 'range_window', 'last_price', 'last_trade_at', 'variance',
+        'bid', 'ask', 'last_update', 'ticks', '_maxima', '_minima'
+    )
+
+    def __init__(self, halflife: float = 60.0, range_window: float = 300.0):
+        self.halflife = halflife
+        self.range_window = range_window
+        self.last_price: Optional[float] = None
+        self.last_trade_at: Optional[float] = None
+        self.variance = 0.0  # per second
+        self.bid: Optional[float] = None
+        self.ask: Optional[float] = None
+        self.last_update: Optional[float] = None
+        self.ticks = 0
+        self._maxima: Deque[Tuple[float, float]] = deque()
+        self._minima: Deque[Tuple[float, float]] = deque()
+
+    def on_price(self, price: float, now: float) -> None:
+        """Update volatility and range with a traded or mark price."""
+        if price <= 0:
+            return
+        last = self.last_price
+        if last is not None:
+            dt = max(now - self.last_trade_at, 1e-3)
+            r = math.log(price / last)
+            # Weight grows with elapsed time, so alpha * r^2 / dt ~ r^2 / tau
+            alpha = 1.0 - math.exp(-dt * math.log(2) / self.halflife)
+            self.variance += alpha * (r * r / dt - self.variance)
+        self.last_price = price
+        self.last_trade_at = now
+        self.last_update = now
+        self.ticks += 1
+
+        maxima = self._maxima
+        while maxima and maxima[-1][1] <= price:
+            maxima.pop()
+        maxima.append((now, price))
+        minima = self._minima
+        while minima and minima[-1][1] >= price:
+            minima.pop()
+        minima.append((now, price))
+        self._expire(now)
+
+    def on_quote(self, bid: float, ask: float, now: float) -> None:
+        """Update best bid and ask."""
+        self.bid = bid
+        self.ask = ask
+        self.last_update = now
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.range_window
+        for window in (self._maxima, self._minima):
+            # Keep the newest entry so the range never empties
+            while len(window) > 1 and window[0][0] < cutoff:
+                window.popleft()
+
+    def volatility(self, horizon: float = 60.0) -> float:
+        """EWMA volatility of log returns over ``horizon`` seconds."""
+        return math.sqrt(self.variance * horizon)
+
+    def realized_range(self, now: Optional[float] = None) -> float:
+        """(high - low) / low over the range window."""
+        if not self._maxima:
+            return 0.0
+        if now is not None:
+            self._expire(now)
+        low = self._minima[0][1]
+        return (self._maxima[0][1] - low) / low
+
+    @property
+    def mid(self) -> Optional[float]:
+        """Mid price from the last quote."""
+        if self.bid is None or self.ask is None:
+            return None
+        return (self.bid + self.ask) / 2
+
+    @property
+    def spread_bps(self) -> Optional[float]:
+        """Bid/ask spread in basis points of the mid."""
+        mid = self.mid
+        if not mid:
+            return None
+        return (self.ask - self.bid) / mid * 10_000
+
+    def age(self, now: float) -> Optional[float]:
+        """Seconds since the last price or quote update."""
+        return None if self.last_update is None else now - self.last_update
+
+
+class MarketConditionMonitor:
+    """
+    Market condition estimators for all pairs.
+
+    Args:
+        halflife: EWMA half-life in seconds
+        range_window: Realized range window in seconds
+        clock: Monotonic time source in seconds
+    """
+
+    def __init__(self, halflife: float = 60.0, range_window: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.halflife = halflife
+        self.range_window = range_window
+        self.clock = clock
+        self.pairs: Dict[str, PairMarketStats] = {}
+
+    def _pair(self, pair: str) -> PairMarketStats:
+        stats = self.pairs.get(pair)
+        if stats is None:
+            stats = self.pairs[pair] = PairMarketStats(self.halflife, self.range_window)
+        return stats
+
+    def get(self, pair: str) -> Optional[PairMarketStats]:
+        """Estimators for a pair, if it has received updates."""
+        return self.pairs.get(pair)
+
+    def on_price(self, pair: str, price: Any, now: Optional[float] = None) -> None:
+        """Feed a trade or mark price."""
+        self._pair(pair).on_price(float(price), self.clock() if now is None else now)
+
+    def on_quote(self, pair: str, bid: Any, ask: Any, now: Optional[float] = None) -> None:
+        """Feed a best bid/ask update."""
+        self._pair(pair).on_quote(float(bid), float(ask), self.clock() if now is None else now)
+
+    def on_ticker(self, pair: str, ticker: Dict[str, Any], now: Optional[float] = None) -> None:
+        """
+        Feed a Kraken ticker payload ('a' ask, 'b' bid, 'c' last trade;
+        each a list whose first element is the price).
+        """
+        now = self.clock() if now is None else now
+        if 'b' in ticker and 'a' in ticker:
+            self.on_quote(pair, ticker['b'][0], ticker['a'][0], now)
+        if 'c' in ticker:
+            self.on_price(pair, ticker['c'][0], now)
+
+    def summary(self, pair: str) -> Dict[str, Any]:
+        """Current estimates for a pair."""
+        stats = self.pairs.get(pair)
+        if stats is None:
+            return {}
+        now = self.clock()
+        return {
+            'last_price': stats.last_price,
+            'volatility_1m': stats.volatility(),
+            'realized_range': stats.realized_range(now),
+            'spread_bps': stats.spread_bps,
+            'age_seconds': stats.age(now),
+            'ticks': stats.ticks,
+        }
@@ -0,0 +1,168 @@
+"""
+Sliding-window order and message rate counters.
+
+Counts are kept in fixed-size rings of time buckets with a running total,
+so recording and reading a window are O(1) amortized: advancing the ring
+clears only the buckets that expired since the last access. The window
+slides in steps of one bucket (100 ms for per-second windows, 1 s for
+per-minute windows).
+"""
+
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+class BucketRing:
+    """
+    Event count over a sliding window.
+
+    Args:
+        window: Window length in seconds
+        buckets: Number of buckets the window is divided into
+    """
+
+    __slots__ = ('bucket_seconds', 'counts', 'total', '_head')
+
+    def __init__(self, window: float, buckets: int):
+        self.bucket_seconds = window / buckets
+        self.counts = [0] * buckets
+        self.total = 0
+        self._head: Optional[int] = None  # absolute index of the newest bucket
+
+    def _advance(self, now: float) -> int:
+        index = int(now / self.bucket_seconds)
+        head = self._head
+        if head is None or index - head >= len(self.counts):
+            self.counts = [0] * len(self.counts)
+            self.total = 0
+            self._head = index
+        elif index > head:
+            counts = self.counts
+            size = len(counts)
+            for i in range(head + 1, index + 1):
+                slot = i % size
+                self.total -= counts[slot]
+                counts[slot] = 0
+            self._head = index
+        # Late events count towards the newest bucket
+        return self._head
+
+    def add(self, now: float, count: int = 1) -> None:
+        """Record ``count`` events at ``now``."""
+        head = self._advance(now)
+        self.counts[head % len(self.counts)] += count
+        self.total += count
+
+    def count(self, now: float) -> int:
+        """Events within the window ending at ``now``."""
+        self._advance(now)
+        return self.total
+
+
+class RateCounters:
+    """Order, cancel, fill and message windows for one account or pair."""
+
+    __slots__ = ('orders_per_second', 'orders_per_minute', 'cancels', 'fills', 'messages_per_second')
+
+    def __init__(self, ratio_window: float):
+        self.orders_per_second = BucketRing(1.0, 10)
+        self.orders_per_minute = BucketRing(60.0, 60)
+        self.cancels = BucketRing(ratio_window, 60)
+        self.fills = BucketRing(ratio_window, 60)
+        self.messages_per_second = BucketRing(1.0, 10)
+
+
+class OrderRateTracker:
+    """
+    Per-account and per-pair order activity over sliding windows.
+
+    Args:
+        ratio_window: Seconds the cancel-to-fill ratio is measured over
+        clock: Monotonic time source in seconds
+    """
+
+    def __init__(self, ratio_window: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.ratio_window = ratio_window
+        self.clock = clock
+        self.account = RateCounters(ratio_window)
+        self.pairs: Dict[str, RateCounters] = {}
+
+    def _pair(self, pair: str) -> RateCounters:
+        counters = self.pairs.get(pair)
+        if counters is None:
+            counters = self.pairs[pair] = RateCounters(self.ratio_window)
+        return counters
+
+    def scope(self, pair: Optional[str] = None) -> Optional[RateCounters]:
+        """Counters for a pair, or for the account when ``pair`` is None."""
+        return self.account if pair is None else self.pairs.get(pair)
+
+    # RECORDING
+
+    def record_order(self, pair: str, now: Optional[float] = None) -> None:
+        """Record an order submission (also counted as a message)."""
+        now = self.clock() if now is None else now
+        for counters in (self.account, self._pair(pair)):
+            counters.orders_per_second.add(now)
+            counters.orders_per_minute.add(now)
+            counters.messages_per_second.add(now)
+
+    def record_cancel(self, pair: str, now: Optional[float] = None) -> None:
+        """Record a cancellation (also counted as a message)."""
+        now = self.clock() if now is None else now
+        for counters in (self.account, self._pair(pair)):
+            counters.cancels.add(now)
+            counters.messages_per_second.add(now)
+
+    def record_fill(self, pair: str, now: Optional[float] = None) -> None:
+        """Record a fill."""
+        now = self.clock() if now is None else now
+        self.account.fills.add(now)
+        self._pair(pair).fills.add(now)
+
+    def record_message(self, pair: Optional[str] = None, count: int = 1, now: Optional[float] = None) -> None:
+        """Record other messages sent to the exchange (amends, status queries)."""
+        now = self.clock() if now is None else now
+        self.account.messages_per_second.add(now, count)
+        if pair is not None:
+            self._pair(pair).messages_per_second.add(now, count)
+
+    # READERS
+
+    def orders_per_second(self, pair: Optional[str] = None, now: Optional[float] = None) -> int:
+        """Orders in the last second."""
+        counters = self.scope(pair)
+        return counters.orders_per_second.count(self.clock() if now is None else now) if counters else 0
+
+    def orders_per_minute(self, pair: Optional[str] = None, now: Optional[float] = None) -> int:
+        """Orders in the last minute."""
+        counters = self.scope(pair)
+        return counters.orders_per_minute.count(self.clock() if now is None else now) if counters else 0
+
+    def messages_per_second(self, pair: Optional[str] = None, now: Optional[float] = None) -> int:
+        """Messages in the last second."""
+        counters = self.scope(pair)
+        return counters.messages_per_second.count(self.clock() if now is None else now) if counters else 0
+
+    def cancels_and_fills(self, pair: Optional[str] = None, now: Optional[float] = None) -> Tuple[int, int]:
+        """Cancels and fills within the ratio window."""
+        counters = self.scope(pair)
+        if counters is None:
+            return 0, 0
+        now = self.clock() if now is None else now
+        return counters.cancels.count(now), counters.fills.count(now)
+
+    def cancel_fill_ratio(self, pair: Optional[str] = None, now: Optional[float] = None) -> float:
+        """Cancels per fill within the ratio window (cancels if there were no fills)."""
+        cancels, fills = self.cancels_and_fills(pair, now)
+        return cancels / max(fills, 1)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Current account-level rates."""
+        now = self.clock()
+        return {
+            'orders_per_second': self.orders_per_second(now=now),
+            'orders_per_minute': self.orders_per_minute(now=now),
+            'messages_per_second': self.messages_per_second(now=now),
+            'cancel_fill_ratio': self.cancel_fill_ratio(now=now),
+        }
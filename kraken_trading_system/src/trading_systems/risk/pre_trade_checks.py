@@ -10,7 +10,7 @@ File Location: src/trading_systems/risk/pre_trade_checks.py
 """
 
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union, Callable
 from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass
@@ -20,6 +20,11 @@ from pydantic import BaseModel, Field
 # Import order models
 from ..exchanges.kraken.order_requests import BaseOrderRequest
 from ..exchanges.kraken.account_models import OrderSide, OrderType
+from .market_conditions import MarketConditionMonitor
+from .order_rate import BucketRing, OrderRateTracker
+
+if TYPE_CHECKING:
+    from .risk_state import LiveRiskState
 
 
 class RiskLevel(str, Enum):
@@ -109,145 +114,388 @@ class RiskLimits(BaseModel):
     # Risk ratios
     max_leverage: float = Field(1.0, description="Maximum leverage allowed")
     max_drawdown: float = Field(0.20, description="Maximum drawdown allowed (20%)")
+    
+    # Order rate limits (sliding windows)
+    max_orders_per_second: int = Field(10, description="Maximum orders per second (account)")
+    max_orders_per_minute: int = Field(200, description="Maximum orders per minute (account)")
+    max_pair_orders_per_second: int = Field(5, description="Maximum orders per second in one pair")
+    max_pair_orders_per_minute: int = Field(100, description="Maximum orders per minute in one pair")
+    max_messages_per_second: int = Field(20, description="Maximum order messages per second")
+    max_cancel_fill_ratio: float = Field(20.0, description="Maximum cancels per fill")
+    min_cancels_for_ratio: int = Field(20, description="Cancels required before the ratio is enforced")
+    
+    # Market condition limits
+    max_volatility: float = Field(0.02, description="1-minute volatility that blocks orders (2%)")
+    volatility_warning: float = Field(0.01, description="1-minute volatility that warns (1%)")
+    max_spread_bps: float = Field(100.0, description="Bid/ask spread that blocks orders, in bps")
+    spread_warning_bps: float = Field(25.0, description="Bid/ask spread that warns, in bps")
+    max_realized_range: float = Field(0.05, description="Realized high-low range that warns (5%)")
+    max_quote_age_seconds: float = Field(30.0, description="Market data age that blocks orders")
 
 
 class TradingStatistics(BaseModel):
     """Trading statistics for risk assessment."""
     daily_trade_count: int = Field(0, description="Number of trades today")
     daily_volume_usd: Decimal = Field(0, description="Total volume traded today")
+    daily_pnl: Decimal = Field(0, description="Realized P&L today")
     weekly_pnl: Decimal = Field(0, description="P&L for the week")
     current_drawdown: float = Field(0.0, description="Current drawdown percentage")
     consecutive_losses: int = Field(0, description="Consecutive losing trades")
 
 
+BALANCE_FEE_BUFFER = Decimal('1.01')  # 1% buffer for fees
+DEFAULT_ESTIMATE_PRICE = Decimal('50000')  # Default BTC price for estimation
+
+
+class RiskSnapshot:
+    """
+    Precomputed account state shared by the checks of one or more orders.
+
+    Balances, positions and statistics are reduced once to the handful of
+    values the checks read (USD availability, total balance, per-pair
+    position value, daily counters). ``validate_orders`` applies each
+    accepted order to its working copy, so later orders in a basket see
+    the balance, volume and exposure consumed by earlier ones.
+    """
+
+    __slots__ = (
+        'usd_balance', 'available_usd', 'utilization', 'total_balance',
+        'position_values', 'total_portfolio_value', 'daily_trade_count',
+        'daily_volume_usd', 'current_drawdown', 'consecutive_losses', 'market_prices',
+        'order_rates', 'pending_orders', 'pending_pair_orders', 'market_conditions'
+    )
+
+    def __init__(
+        self,
+        account_balances: List[AccountBalance],
+        current_positions: List[PositionInfo],
+        trading_stats: TradingStatistics,
+        market_prices: Optional[Dict[str, Decimal]] = None,
+        order_rates: Optional[OrderRateTracker] = None,
+        market_conditions: Optional[MarketConditionMonitor] = None
+    ):
+        self.usd_balance: Optional[AccountBalance] = None
+        for balance in account_balances:
+            if balance.currency.upper() in ['USD', 'ZUSD']:
+                self.usd_balance = balance
+                break
+        self.available_usd = self.usd_balance.available_balance if self.usd_balance else Decimal('0')
+        self.utilization = self.usd_balance.utilization_percentage if self.usd_balance else 0.0
+        self.total_balance = sum((balance.total_balance for balance in account_balances), Decimal('0'))
+
+        self.position_values: Dict[str, Decimal] = {}
+        for position in current_positions:
+            self.position_values.setdefault(
+                position.pair, abs(position.size) * (position.current_price or Decimal('1'))
+            )
+        self.total_portfolio_value = sum(
+            (abs(pos.size * (pos.current_price or Decimal('1'))) for pos in current_positions), Decimal('0')
+        )
+
+        self.daily_trade_count = trading_stats.daily_trade_count
+        self.daily_volume_usd = trading_stats.daily_volume_usd
+        self.current_drawdown = trading_stats.current_drawdown
+        self.consecutive_losses = trading_stats.consecutive_losses
+        self.market_prices = market_prices or {}
+        self.market_conditions = market_conditions
+
+        # Recent order activity; basket orders not yet sent count as pending
+        self.order_rates = order_rates
+        self.pending_orders = 0
+        self.pending_pair_orders: Dict[str, int] = {}
+
+    def copy(self) -> "RiskSnapshot":
+        """Return a working copy that orders can be applied to."""
+        other = RiskSnapshot.__new__(RiskSnapshot)
+        for name in RiskSnapshot.__slots__:
+            setattr(other, name, getattr(self, name))
+        other.position_values = dict(self.position_values)
+        other.pending_pair_orders = dict(self.pending_pair_orders)
+        return other
+
+    def apply_order(self, order_request: BaseOrderRequest, estimated_value: Decimal) -> None:
+        """Account for an accepted order in later checks."""
+        self.daily_trade_count += 1
+        self.daily_volume_usd += estimated_value
+        self.pending_orders += 1
+        self.pending_pair_orders[order_request.pair] = self.pending_pair_orders.get(order_request.pair, 0) + 1
+
+        current = self.position_values.get(order_request.pair, Decimal('0'))
+        if order_request.side == OrderSide.BUY:
+            self.available_usd -= estimated_value * BALANCE_FEE_BUFFER
+            self.position_values[order_request.pair] = current + estimated_value
+        else:
+            self.position_values[order_request.pair] = max(Decimal('0'), current - estimated_value)
+
+
+@dataclass
+class RiskCheck:
+    """A registered check and its place in the compiled pipeline."""
+    name: str
+    func: Callable[[BaseOrderRequest, Decimal, RiskSnapshot], RiskCheckResponse]
+    can_block: bool = False
+    cost: int = 1  # relative cost; cheaper checks run first
+
+
+# Shared pass responses; checks return these instead of allocating
+PASS_BALANCE = RiskCheckResponse(RiskCheckResult.PASS, "Balance check passed", RiskLevel.LOW)
+PASS_ORDER_SIZE = RiskCheckResponse(RiskCheckResult.PASS, "Order size check passed", RiskLevel.LOW)
+PASS_CONCENTRATION = RiskCheckResponse(RiskCheckResult.PASS, "Position concentration check passed", RiskLevel.LOW)
+PASS_DAILY_LIMITS = RiskCheckResponse(RiskCheckResult.PASS, "Daily limits check passed", RiskLevel.LOW)
+PASS_LEVERAGE = RiskCheckResponse(RiskCheckResult.PASS, "Leverage check passed (spot trading)", RiskLevel.LOW)
+PASS_MARKET_CONDITIONS = RiskCheckResponse(RiskCheckResult.PASS, "Market conditions check passed", RiskLevel.LOW)
+PASS_ORDER_FREQUENCY = RiskCheckResponse(RiskCheckResult.PASS, "Order frequency check passed", RiskLevel.LOW)
+PASS_DRAWDOWN = RiskCheckResponse(RiskCheckResult.PASS, "Drawdown limits check passed", RiskLevel.LOW)
+
+NO_USD_BALANCE = RiskCheckResponse(
+    RiskCheckResult.WARNING, "No USD balance found for validation", RiskLevel.MEDIUM,
+    suggested_action="Verify account balances"
+)
+NO_MARKET_PRICE = RiskCheckResponse(
+    RiskCheckResult.WARNING, "No market price available for validation", RiskLevel.MEDIUM,
+    suggested_action="Verify market data connectivity"
+)
+
+
 class PreTradeRiskValidator:
-    """Comprehensive pre-trade risk validation system."""
+    """
+    Comprehensive pre-trade risk validation system.
+
+    Checks are compiled once into an ordered pipeline: checks that can
+    block run first, cheapest first, and evaluation stops at the first
+    BLOCK. Passing checks return shared response objects. Limits derived
+    from ``risk_limits`` are captured at compile time; call
+    ``compile_pipeline()`` after changing them in place.
+    
+    With a ``risk_state``, ``validate`` and ``validate_batch`` read its
+    live snapshot instead of taking balances, positions and statistics.
+    """
     
-    def __init__(self, risk_limits: Optional[RiskLimits] = None):
+    def __init__(self, risk_limits: Optional[RiskLimits] = None,
+                 risk_state: Optional["LiveRiskState"] = None):
         """
         Initialize the risk validator.
         
         Args:
             risk_limits: Risk limits configuration
+            risk_state: Live account state to validate against
         """
         self.risk_limits = risk_limits or RiskLimits()
+        self.risk_state = risk_state
+        self.registered_checks: List[RiskCheck] = []
         self.risk_checks: List[Callable] = []
         self._register_default_checks()
+        self.compile_pipeline()
     
     def _register_default_checks(self):
         """Register default risk checks."""
-        self.risk_checks = [
-            self._check_balance_availability,
-            self._check_order_size_limits,
-            self._check_position_concentration,
-            self._check_daily_limits,
-            self._check_leverage_limits,
-            self._check_market_conditions,
-            self._check_order_frequency,
-            self._check_drawdown_limits
+        self.registered_checks = [
+            RiskCheck('balance_availability', self._check_balance_availability, can_block=True, cost=2),
+            RiskCheck('order_size_limits', self._check_order_size_limits, can_block=True, cost=1),
+            RiskCheck('position_concentration', self._check_position_concentration, cost=2),
+            RiskCheck('daily_limits', self._check_daily_limits, can_block=True, cost=1),
+            RiskCheck('leverage_limits', self._check_leverage_limits, cost=0),
+            RiskCheck('market_conditions', self._check_market_conditions, can_block=True, cost=2),
+            RiskCheck('order_frequency', self._check_order_frequency, can_block=True, cost=2),
+            RiskCheck('drawdown_limits', self._check_drawdown_limits, cost=1)
         ]
     
+    def add_risk_check(self, check: RiskCheck) -> None:
+        """Register an additional check and recompile the pipeline."""
+        self.registered_checks.append(check)
+        self.compile_pipeline()
+    
+    def compile_pipeline(self) -> None:
+        """Order the checks and capture derived limits."""
+        ordered = sorted(
+            enumerate(self.registered_checks),
+            key=lambda item: (not item[1].can_block, item[1].cost, item[0])
+        )
+        self.risk_checks = [check.func for _, check in ordered]
+        self._pipeline = tuple(self.risk_checks)
+        
+        limits = self.risk_limits
+        self._max_order_fraction = Decimal(str(limits.max_order_percentage))
+        self._max_concentration = Decimal(str(limits.max_concentration))
+        self._max_utilization_pct = limits.max_balance_utilization * 100
+    
+    def validate(self, order_request: BaseOrderRequest) -> List[RiskCheckResponse]:
+        """Validate an order against the live risk state."""
+        if self.risk_state is None:
+            raise ValueError("validate() requires a risk_state; use validate_order() instead")
+        return self.validate_with_snapshot(order_request, self.risk_state.snapshot)
+    
+    def validate_batch(self, orders: List[BaseOrderRequest]) -> List[List[RiskCheckResponse]]:
+        """Validate a basket of orders against the live risk state."""
+        if self.risk_state is None:
+            raise ValueError("validate_batch() requires a risk_state; use validate_orders() instead")
+        return self.validate_batch_with_snapshot(orders, self.risk_state.snapshot)
+    
     def validate_order(
         self,
         order_request: BaseOrderRequest,
         account_balances: List[AccountBalance],
         current_positions: List[PositionInfo],
         trading_stats: TradingStatistics,
-        market_price: Optional[Decimal] = None
+        market_price: Optional[Decimal] = None,
+        order_rates: Optional[OrderRateTracker] = None,
+        market_conditions: Optional[MarketConditionMonitor] = None
     ) -> List[RiskCheckResponse]:
         """
         Validate an order against all risk checks.
         
+        Builds a fresh RiskSnapshot from the lists on every call, so its
+        cost grows with the number of balances and positions. The
+        microsecond latency target applies only to the snapshot APIs
+        (``validate`` and ``validate_with_snapshot``); hot paths should
+        keep a LiveRiskState or reuse one RiskSnapshot instead.
+        
         Args:
             order_request: Order to validate
             account_balances: Current account balances
             current_positions: Current positions
             trading_stats: Trading statistics
             market_price: Current market price for the pair
+            order_rates: Recent order activity for rate limits
+            market_conditions: Streaming volatility and spread estimators
             
         Returns:
-            List of risk check responses
+            List of risk check responses, ending at the first BLOCK
         """
-        responses = []
+        snapshot = RiskSnapshot(
+            account_balances,
+            current_positions,
+            trading_stats,
+            {order_request.pair: market_price} if market_price else None,
+            order_rates,
+            market_conditions
+        )
+        return self.validate_with_snapshot(order_request, snapshot)
+    
+    def validate_orders(
+        self,
+        orders: List[BaseOrderRequest],
+        account_balances: List[AccountBalance],
+        current_positions: List[PositionInfo],
+        trading_stats: TradingStatistics,
+        market_prices: Optional[Dict[str, Decimal]] = None,
+        order_rates: Optional[OrderRateTracker] = None,
+        market_conditions: Optional[MarketConditionMonitor] = None
+    ) -> List[List[RiskCheckResponse]]:
+        """
+        Validate a basket of orders (e.g. a rebalance) against one snapshot.
         
-        context = {
-            'order_request': order_request,
-            'account_balances': account_balances,
-            'current_positions': current_positions,
-            'trading_stats': trading_stats,
-            'market_price': market_price,
-            'estimated_order_value': self._estimate_order_value(order_request, market_price)
-        }
+        Balances, positions and statistics are reduced once. Orders are
+        checked in sequence, and each order that is not blocked is applied
+        to the working snapshot before the next one is checked.
         
-        for check_func in self.risk_checks:
+        Args:
+            orders: Orders to validate, in submission order
+            account_balances: Current account balances
+            current_positions: Current positions
+            trading_stats: Trading statistics
+            market_prices: Current market price per pair
+            order_rates: Recent order activity for rate limits
+            market_conditions: Streaming volatility and spread estimators
+            
+        Returns:
+            Risk check responses for each order
+        """
+        snapshot = RiskSnapshot(
+            account_balances, current_positions, trading_stats, market_prices, order_rates, market_conditions
+        )
+        return self.validate_batch_with_snapshot(orders, snapshot)
+    
+    def validate_batch_with_snapshot(
+        self,
+        orders: List[BaseOrderRequest],
+        snapshot: RiskSnapshot
+    ) -> List[List[RiskCheckResponse]]:
+        """Validate a basket against a working copy of ``snapshot``."""
+        working = snapshot.copy()
+        results = []
+        for order_request in orders:
+            estimated_value = self._estimate_order_value(
+                order_request, working.market_prices.get(order_request.pair)
+            )
+            responses = self._run_pipeline(order_request, estimated_value, working)
+            if responses[-1].result != RiskCheckResult.BLOCK:
+                working.apply_order(order_request, estimated_value)
+            results.append(responses)
+        return results
+    
+    def validate_with_snapshot(
+        self,
+        order_request: BaseOrderRequest,
+        snapshot: RiskSnapshot
+    ) -> List[RiskCheckResponse]:
+        """Validate one order against a precomputed snapshot."""
+        estimated_value = self._estimate_order_value(
+            order_request, snapshot.market_prices.get(order_request.pair)
+        )
+        return self._run_pipeline(order_request, estimated_value, snapshot)
+    
+    def _run_pipeline(
+        self,
+        order_request: BaseOrderRequest,
+        estimated_value: Decimal,
+        snapshot: RiskSnapshot
+    ) -> List[RiskCheckResponse]:
+        """Run the compiled checks, stopping at the first BLOCK."""
+        responses = []
+        block = RiskCheckResult.BLOCK
+        for check_func in self._pipeline:
             try:
-                response = check_func(context)
-                responses.append(response)
+                response = check_func(order_request, estimated_value, snapshot)
             except Exception as e:
-                responses.append(RiskCheckResponse(
+                response = RiskCheckResponse(
                     result=RiskCheckResult.FAIL,
                     message=f"Risk check error: {str(e)}",
                     risk_level=RiskLevel.HIGH,
                     details={'error': str(e)}
-                ))
-        
+                )
+            responses.append(response)
+            if response.result is block:
+                break
         return responses
     
     def _estimate_order_value(self, order_request: BaseOrderRequest, market_price: Optional[Decimal]) -> Decimal:
         """Estimate the USD value of an order."""
-        if hasattr(order_request, 'price') and order_request.price:
-            # Limit order - use limit price
-            price = order_request.price
-        elif market_price:
-            # Market order - use current market price
-            price = market_price
-        else:
-            # No price available - use conservative estimate
-            price = Decimal('50000')  # Default BTC price for estimation
+        price = getattr(order_request, 'price', None)
+        if not price:
+            # Market order - use current market price, or a conservative estimate
+            price = market_price or DEFAULT_ESTIMATE_PRICE
         
         return order_request.volume * price
     
-    def _check_balance_availability(self, context: Dict[str, Any]) -> RiskCheckResponse:
+    def _check_balance_availability(
+        self, order_request: BaseOrderRequest, estimated_value: Decimal, snapshot: RiskSnapshot
+    ) -> RiskCheckResponse:
         """Check if sufficient balance is available for the order."""
-        order_request = context['order_request']
-        account_balances = context['account_balances']
-        estimated_value = context['estimated_order_value']
-        
-        # Find relevant balance (assume USD for simplicity)
-        usd_balance = None
-        for balance in account_balances:
-            if balance.currency.upper() in ['USD', 'ZUSD']:
-                usd_balance = balance
-                break
-        
-        if not usd_balance:
-            return RiskCheckResponse(
-                result=RiskCheckResult.WARNING,
-                message="No USD balance found for validation",
-                risk_level=RiskLevel.MEDIUM,
-                suggested_action="Verify account balances"
-            )
+        if snapshot.usd_balance is None:
+            return NO_USD_BALANCE
         
         # Check if sufficient balance for buy orders
         if order_request.side == OrderSide.BUY:
-            required_balance = estimated_value * Decimal('1.01')  # Add 1% buffer for fees
+            required_balance = estimated_value * BALANCE_FEE_BUFFER
+            available = snapshot.available_usd
             
-            if usd_balance.available_balance < required_balance:
+            if available < required_balance:
                 return RiskCheckResponse(
                     result=RiskCheckResult.BLOCK,
-                    message=f"Insufficient balance: need ${required_balance}, have ${usd_balance.available_balance}",
+                    message=f"Insufficient balance: need ${required_balance}, have ${available}",
                     risk_level=RiskLevel.CRITICAL,
                     details={
                         'required': str(required_balance),
-                        'available': str(usd_balance.available_balance),
-                        'shortfall': str(required_balance - usd_balance.available_balance)
+                        'available': str(available),
+                        'shortfall': str(required_balance - available)
                     },
                     suggested_action="Reduce order size or add funds"
                 )
         
         # Check balance utilization
-        utilization = usd_balance.utilization_percentage
-        if utilization > self.risk_limits.max_balance_utilization * 100:
+        utilization = snapshot.utilization
+        if utilization > self._max_utilization_pct:
             return RiskCheckResponse(
                 result=RiskCheckResult.WARNING,
                 message=f"High balance utilization: {utilization:.1f}%",
@@ -256,18 +504,12 @@ class PreTradeRiskValidator:
                 suggested_action="Consider reducing position sizes"
             )
         
-        return RiskCheckResponse(
-            result=RiskCheckResult.PASS,
-            message="Balance check passed",
-            risk_level=RiskLevel.LOW
-        )
+        return PASS_BALANCE
     
-    def _check_order_size_limits(self, context: Dict[str, Any]) -> RiskCheckResponse:
+    def _check_order_size_limits(
+        self, order_request: BaseOrderRequest, estimated_value: Decimal, snapshot: RiskSnapshot
+    ) -> RiskCheckResponse:
         """Check if order size is within limits."""
-        order_request = context['order_request']
-        estimated_value = context['estimated_order_value']
-        account_balances = context['account_balances']
-        
         # Check absolute size limit
         if estimated_value > self.risk_limits.max_order_size_usd:
             return RiskCheckResponse(
@@ -282,104 +524,84 @@ class PreTradeRiskValidator:
             )
         
         # Check percentage of balance
-        total_balance = sum(balance.total_balance for balance in account_balances)
-        if total_balance > 0:
+        total_balance = snapshot.total_balance
+        if total_balance > 0 and estimated_value > total_balance * self._max_order_fraction:
             percentage = float(estimated_value / total_balance)
-            if percentage > self.risk_limits.max_order_percentage:
-                return RiskCheckResponse(
-                    result=RiskCheckResult.WARNING,
-                    message=f"Order is {percentage:.1%} of total balance (limit: {self.risk_limits.max_order_percentage:.1%})",
-                    risk_level=RiskLevel.MEDIUM,
-                    details={
-                        'order_percentage': percentage,
-                        'limit_percentage': self.risk_limits.max_order_percentage
-                    },
-                    suggested_action="Consider reducing order size"
-                )
+            return RiskCheckResponse(
+                result=RiskCheckResult.WARNING,
+                message=f"Order is {percentage:.1%} of total balance (limit: {self.risk_limits.max_order_percentage:.1%})",
+                risk_level=RiskLevel.MEDIUM,
+                details={
+                    'order_percentage': percentage,
+                    'limit_percentage': self.risk_limits.max_order_percentage
+                },
+                suggested_action="Consider reducing order size"
+            )
         
-        return RiskCheckResponse(
-            result=RiskCheckResult.PASS,
-            message="Order size check passed",
-            risk_level=RiskLevel.LOW
-        )
+        return PASS_ORDER_SIZE
     
-    def _check_position_concentration(self, context: Dict[str, Any]) -> RiskCheckResponse:
+    def _check_position_concentration(
+        self, order_request: BaseOrderRequest, estimated_value: Decimal, snapshot: RiskSnapshot
+    ) -> RiskCheckResponse:
         """Check position concentration risk."""
-        order_request = context['order_request']
-        current_positions = context['current_positions']
-        estimated_value = context['estimated_order_value']
-        
-        # Find existing position in the same pair
-        existing_position = None
-        for position in current_positions:
-            if position.pair == order_request.pair:
-                existing_position = position
-                break
-        
-        # Calculate total portfolio value
-        total_portfolio_value = sum(
-            abs(pos.size * (pos.current_price or Decimal('1'))) 
-            for pos in current_positions
-        )
+        total_portfolio_value = snapshot.total_portfolio_value
+        if total_portfolio_value <= 0:
+            return PASS_CONCENTRATION
         
         # Calculate concentration after this order
-        if existing_position:
-            new_position_value = abs(existing_position.size) * (existing_position.current_price or Decimal('1'))
+        existing_value = snapshot.position_values.get(order_request.pair)
+        if existing_value is not None:
             if order_request.side == OrderSide.BUY:
-                new_position_value += estimated_value
+                new_position_value = existing_value + estimated_value
             else:
-                new_position_value = max(0, new_position_value - estimated_value)
+                new_position_value = max(0, existing_value - estimated_value)
         else:
             new_position_value = estimated_value
         
-        if total_portfolio_value > 0:
+        if new_position_value > total_portfolio_value * self._max_concentration:
             concentration = float(new_position_value / total_portfolio_value)
-            if concentration > self.risk_limits.max_concentration:
-                return RiskCheckResponse(
-                    result=RiskCheckResult.WARNING,
-                    message=f"High concentration in {order_request.pair}: {concentration:.1%}",
-                    risk_level=RiskLevel.MEDIUM,
-                    details={
-                        'concentration': concentration,
-                        'limit': self.risk_limits.max_concentration,
-                        'pair': order_request.pair
-                    },
-                    suggested_action="Diversify portfolio or reduce position size"
-                )
+            return RiskCheckResponse(
+                result=RiskCheckResult.WARNING,
+                message=f"High concentration in {order_request.pair}: {concentration:.1%}",
+                risk_level=RiskLevel.MEDIUM,
+                details={
+                    'concentration': concentration,
+                    'limit': self.risk_limits.max_concentration,
+                    'pair': order_request.pair
+                },
+                suggested_action="Diversify portfolio or reduce position size"
+            )
         
-        return RiskCheckResponse(
-            result=RiskCheckResult.PASS,
-            message="Position concentration check passed",
-            risk_level=RiskLevel.LOW
-        )
+        return PASS_CONCENTRATION
     
-    def _check_daily_limits(self, context: Dict[str, Any]) -> RiskCheckResponse:
+    def _check_daily_limits(
+        self, order_request: BaseOrderRequest, estimated_value: Decimal, snapshot: RiskSnapshot
+    ) -> RiskCheckResponse:
         """Check daily trading limits."""
-        trading_stats = context['trading_stats']
-        estimated_value = context['estimated_order_value']
+        daily_trade_count = snapshot.daily_trade_count
         
         # Check daily trade count
-        if trading_stats.daily_trade_count >= self.risk_limits.max_daily_trades:
+        if daily_trade_count >= self.risk_limits.max_daily_trades:
             return RiskCheckResponse(
                 result=RiskCheckResult.BLOCK,
-                message=f"Daily trade limit reached: {trading_stats.daily_trade_count}/{self.risk_limits.max_daily_trades}",
+                message=f"Daily trade limit reached: {daily_trade_count}/{self.risk_limits.max_daily_trades}",
                 risk_level=RiskLevel.HIGH,
                 details={
-                    'current_count': trading_stats.daily_trade_count,
+                    'current_count': daily_trade_count,
                     'limit': self.risk_limits.max_daily_trades
                 },
                 suggested_action="Wait until next trading day"
             )
         
         # Check daily volume
-        projected_volume = trading_stats.daily_volume_usd + estimated_value
+        projected_volume = snapshot.daily_volume_usd + estimated_value
         if projected_volume > self.risk_limits.max_daily_volume_usd:
             return RiskCheckResponse(
                 result=RiskCheckResult.WARNING,
                 message=f"Daily volume limit will be exceeded: ${projected_volume} > ${self.risk_limits.max_daily_volume_usd}",
                 risk_level=RiskLevel.MEDIUM,
                 details={
-                    'current_volume': str(trading_stats.daily_volume_usd),
+                    'current_volume': str(snapshot.daily_volume_usd),
                     'order_value': str(estimated_value),
                     'projected_volume': str(projected_volume),
                     'limit': str(self.risk_limits.max_daily_volume_usd)
@@ -387,93 +609,189 @@ class PreTradeRiskValidator:
                 suggested_action="Reduce order size or wait until next day"
             )
         
-        return RiskCheckResponse(
-            result=RiskCheckResult.PASS,
-            message="Daily limits check passed",
-            risk_level=RiskLevel.LOW
-        )
+        return PASS_DAILY_LIMITS
     
-    def _check_leverage_limits(self, context: Dict[str, Any]) -> RiskCheckResponse:
+    def _check_leverage_limits(
+        self, order_request: BaseOrderRequest, estimated_value: Decimal, snapshot: RiskSnapshot
+    ) -> RiskCheckResponse:
         """Check leverage limits."""
         # For spot trading, leverage should be 1.0
         # This is a placeholder for future margin trading support
-        return RiskCheckResponse(
-            result=RiskCheckResult.PASS,
-            message="Leverage check passed (spot trading)",
-            risk_level=RiskLevel.LOW
-        )
+        return PASS_LEVERAGE
     
-    def _check_market_conditions(self, context: Dict[str, Any]) -> RiskCheckResponse:
-        """Check market conditions for risk assessment."""
-        market_price = context.get('market_price')
+    def _check_market_conditions(
+        self, order_request: BaseOrderRequest, estimated_value: Decimal, snapshot: RiskSnapshot
+    ) -> RiskCheckResponse:
+        """Check volatility, spread and data staleness from the streaming estimators."""
+        monitor = snapshot.market_conditions
+        stats = monitor.pairs.get(order_request.pair) if monitor is not None else None
+        if stats is None:
+            if not snapshot.market_prices.get(order_request.pair):
+                return NO_MARKET_PRICE
+            return PASS_MARKET_CONDITIONS
+        
+        limits = self.risk_limits
+        now = monitor.clock()
+        pair = order_request.pair
+        
+        age = stats.age(now)
+        if age > limits.max_quote_age_seconds:
+            return RiskCheckResponse(
+                result=RiskCheckResult.BLOCK,
+                message=f"Stale market data for {pair}: last update {age:.1f}s ago",
+                risk_level=RiskLevel.HIGH,
+                details={'pair': pair, 'age_seconds': age, 'limit': limits.max_quote_age_seconds},
+                suggested_action="Verify market data connectivity"
+            )
+        
+        spread = stats.spread_bps
+        volatility = stats.volatility()
+        if spread is not None and spread > limits.max_spread_bps:
+            return RiskCheckResponse(
+                result=RiskCheckResult.BLOCK,
+                message=f"Spread too wide for {pair}: {spread:.1f} bps (limit: {limits.max_spread_bps:.1f})",
+                risk_level=RiskLevel.HIGH,
+                details={'pair': pair, 'spread_bps': spread, 'limit': limits.max_spread_bps},
+                suggested_action="Wait for liquidity to return or use a limit order"
+            )
+        if volatility > limits.max_volatility:
+            return RiskCheckResponse(
+                result=RiskCheckResult.BLOCK,
+                message=f"Volatility too high for {pair}: {volatility:.2%} per minute (limit: {limits.max_volatility:.2%})",
+                risk_level=RiskLevel.HIGH,
+                details={'pair': pair, 'volatility_1m': volatility, 'limit': limits.max_volatility},
+                suggested_action="Wait for the market to settle"
+            )
         
-        if not market_price:
+        if spread is not None and spread > limits.spread_warning_bps:
             return RiskCheckResponse(
                 result=RiskCheckResult.WARNING,
-                message="No market price available for validation",
+                message=f"Wide spread for {pair}: {spread:.1f} bps",
                 risk_level=RiskLevel.MEDIUM,
-                suggested_action="Verify market data connectivity"
+                details={'pair': pair, 'spread_bps': spread, 'limit': limits.spread_warning_bps},
+                suggested_action="Consider a limit order"
+            )
+        if volatility > limits.volatility_warning:
+            return RiskCheckResponse(
+                result=RiskCheckResult.WARNING,
+                message=f"Elevated volatility for {pair}: {volatility:.2%} per minute",
+                risk_level=RiskLevel.MEDIUM,
+                details={'pair': pair, 'volatility_1m': volatility, 'limit': limits.volatility_warning},
+                suggested_action="Consider reducing order size"
+            )
+        realized_range = stats.realized_range(now)
+        if realized_range > limits.max_realized_range:
+            return RiskCheckResponse(
+                result=RiskCheckResult.WARNING,
+                message=f"Large price range for {pair}: {realized_range:.2%}",
+                risk_level=RiskLevel.MEDIUM,
+                details={'pair': pair, 'realized_range': realized_range, 'limit': limits.max_realized_range},
+                suggested_action="Consider reducing order size"
             )
         
-        # Placeholder for market condition checks
-        # Could include volatility, spread, volume analysis
-        
-        return RiskCheckResponse(
-            result=RiskCheckResult.PASS,
-            message="Market conditions check passed",
-            risk_level=RiskLevel.LOW
-        )
+        return PASS_MARKET_CONDITIONS
     
-    def _check_order_frequency(self, context: Dict[str, Any]) -> RiskCheckResponse:
-        """Check for excessive order frequency."""
-        trading_stats = context['trading_stats']
-        
-        # Simple check - more sophisticated logic could track timing
-        if trading_stats.daily_trade_count > 50:
+    def _check_order_frequency(
+        self, order_request: BaseOrderRequest, estimated_value: Decimal, snapshot: RiskSnapshot
+    ) -> RiskCheckResponse:
+        """Check order and message rates over sliding windows."""
+        rates = snapshot.order_rates
+        if rates is not None:
+            limits = self.risk_limits
+            now = rates.clock()
+            # Orders already counted plus pending basket orders plus this one
+            pending = snapshot.pending_orders + 1
+            account = rates.account
+            
+            block = (
+                self._rate_limit(account.orders_per_second, now, pending,
+                                 limits.max_orders_per_second, "orders per second", "account")
+                or self._rate_limit(account.orders_per_minute, now, pending,
+                                    limits.max_orders_per_minute, "orders per minute", "account")
+                or self._rate_limit(account.messages_per_second, now, pending,
+                                    limits.max_messages_per_second, "messages per second", "account")
+            )
+            pair_counters = rates.pairs.get(order_request.pair)
+            pair_pending = snapshot.pending_pair_orders.get(order_request.pair, 0) + 1
+            # A pair with no recorded orders still has pending basket orders to count
+            if block is None and (pair_counters is not None or pair_pending > 1):
+                block = (
+                    self._rate_limit(pair_counters and pair_counters.orders_per_second, now, pair_pending,
+                                     limits.max_pair_orders_per_second, "orders per second", order_request.pair)
+                    or self._rate_limit(pair_counters and pair_counters.orders_per_minute, now, pair_pending,
+                                        limits.max_pair_orders_per_minute, "orders per minute", order_request.pair)
+                )
+            if block is not None:
+                return block
+            
+            for scope, counters in (("account", account), (order_request.pair, pair_counters)):
+                if counters is None:
+                    continue
+                cancels = counters.cancels.count(now)
+                if cancels >= limits.min_cancels_for_ratio:
+                    ratio = cancels / max(counters.fills.count(now), 1)
+                    if ratio > limits.max_cancel_fill_ratio:
+                        return RiskCheckResponse(
+                            result=RiskCheckResult.WARNING,
+                            message=f"High cancel-to-fill ratio ({scope}): {ratio:.1f} (limit: {limits.max_cancel_fill_ratio:.1f})",
+                            risk_level=RiskLevel.MEDIUM,
+                            details={'scope': scope, 'cancels': cancels, 'ratio': ratio,
+                                     'limit': limits.max_cancel_fill_ratio},
+                            suggested_action="Review order placement logic for cancel loops"
+                        )
+        
+        if snapshot.daily_trade_count > 50:
             return RiskCheckResponse(
                 result=RiskCheckResult.WARNING,
-                message=f"High trading frequency: {trading_stats.daily_trade_count} trades today",
+                message=f"High trading frequency: {snapshot.daily_trade_count} trades today",
                 risk_level=RiskLevel.MEDIUM,
                 suggested_action="Consider reducing trading frequency"
             )
         
+        return PASS_ORDER_FREQUENCY
+    
+    @staticmethod
+    def _rate_limit(ring: Optional[BucketRing], now: float, pending: int, limit: int,
+                    label: str, scope: str) -> Optional[RiskCheckResponse]:
+        """BLOCK response if the window count plus pending orders exceeds ``limit``."""
+        count = (ring.count(now) if ring is not None else 0) + pending
+        if count <= limit:
+            return None
         return RiskCheckResponse(
-            result=RiskCheckResult.PASS,
-            message="Order frequency check passed",
-            risk_level=RiskLevel.LOW
+            result=RiskCheckResult.BLOCK,
+            message=f"Order rate limit exceeded ({scope}): {count} {label} > {limit}",
+            risk_level=RiskLevel.HIGH,
+            details={'scope': scope, 'rate': label, 'count': count, 'limit': limit},
+            suggested_action="Throttle order submission"
         )
     
-    def _check_drawdown_limits(self, context: Dict[str, Any]) -> RiskCheckResponse:
+    def _check_drawdown_limits(
+        self, order_request: BaseOrderRequest, estimated_value: Decimal, snapshot: RiskSnapshot
+    ) -> RiskCheckResponse:
         """Check drawdown limits."""
-        trading_stats = context['trading_stats']
-        
-        if trading_stats.current_drawdown > self.risk_limits.max_drawdown:
+        if snapshot.current_drawdown > self.risk_limits.max_drawdown:
             return RiskCheckResponse(
                 result=RiskCheckResult.WARNING,
-                message=f"High drawdown: {trading_stats.current_drawdown:.1%} (limit: {self.risk_limits.max_drawdown:.1%})",
+                message=f"High drawdown: {snapshot.current_drawdown:.1%} (limit: {self.risk_limits.max_drawdown:.1%})",
                 risk_level=RiskLevel.HIGH,
                 details={
-                    'current_drawdown': trading_stats.current_drawdown,
+                    'current_drawdown': snapshot.current_drawdown,
                     'limit': self.risk_limits.max_drawdown
                 },
                 suggested_action="Consider reducing position sizes until drawdown recovers"
             )
         
         # Check consecutive losses
-        if trading_stats.consecutive_losses >= 5:
+        if snapshot.consecutive_losses >= 5:
             return RiskCheckResponse(
                 result=RiskCheckResult.WARNING,
-                message=f"Consecutive losses: {trading_stats.consecutive_losses}",
+                message=f"Consecutive losses: {snapshot.consecutive_losses}",
                 risk_level=RiskLevel.MEDIUM,
-                details={'consecutive_losses': trading_stats.consecutive_losses},
+                details={'consecutive_losses': snapshot.consecutive_losses},
                 suggested_action="Consider taking a break or reviewing strategy"
             )
         
-        return RiskCheckResponse(
-            result=RiskCheckResult.PASS,
-            message="Drawdown limits check passed",
-            risk_level=RiskLevel.LOW
-        )
+        return PASS_DRAWDOWN
 
 
 class RiskAnalyzer:
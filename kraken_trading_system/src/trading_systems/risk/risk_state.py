@@ -0,0 +1,358 @@
+"""
+Live risk state for pre-trade checks.
+
+LiveRiskState subscribes to OrderManager state changes (and optionally to
+fill events) and keeps the inputs of the pre-trade checks current:
+
+- daily trade count, volume and realized PnL, reset at UTC midnight
+- balances reserved by open orders
+- per-pair position value and per-asset exposure at the latest marks
+- drawdown of equity from its high-water mark
+- order, cancel, fill and message rates over sliding windows
+- per-pair volatility, range, spread and staleness estimators
+
+Every event updates a RiskSnapshot in place, so validators read it in
+O(1) instead of rebuilding it from balance, position and statistics
+lists on each order.
+"""
+
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from ..exchanges.kraken.advanced_fill_events import EventType, FillEvent
+from ..exchanges.kraken.order_models import EnhancedKrakenOrder, OrderState
+from ..exchanges.kraken.position_book import CostBasisMethod, PositionBook
+from ..utils.logger import LoggerMixin
+from .market_conditions import MarketConditionMonitor
+from .order_rate import OrderRateTracker
+from .pre_trade_checks import AccountBalance, RiskSnapshot, TradingStatistics
+
+# Orders holding balance on the exchange
+RESERVING_STATES = {OrderState.PENDING_SUBMIT, OrderState.OPEN, OrderState.PARTIALLY_FILLED}
+
+KNOWN_QUOTES = ('ZUSD', 'ZEUR', 'USDT', 'USDC', 'USD', 'EUR', 'GBP', 'XBT', 'ETH')
+
+
+def split_pair(pair: str, default_quote: str = 'USD') -> Tuple[str, str]:
+    """Split a pair such as 'XBT/USD' or 'XBTUSD' into base and quote."""
+    if '/' in pair:
+        base, quote = pair.split('/', 1)
+        return base.upper(), quote.upper()
+    pair = pair.upper()
+    for quote in KNOWN_QUOTES:
+        if pair.endswith(quote) and len(pair) > len(quote):
+            return pair[:-len(quote)], quote
+    return pair, default_quote
+
+
+def _next_utc_midnight(now: float) -> float:
+    day = datetime.fromtimestamp(now, tz=timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (day + timedelta(days=1)).timestamp()
+
+
+class LiveRiskState(LoggerMixin):
+    """
+    Incrementally maintained account state for pre-trade risk checks.
+
+    Fills should reach the state from one source: either the OrderManager
+    (``attach_order_manager``, which derives fills from executed volume) or
+    a fill event system (``attach_fill_events``), not both.
+
+    Args:
+        starting_equity: Equity the drawdown is measured against; defaults to
+            the quote balance of the first ``update_balances`` call
+        quote_currency: Currency balances are checked and valued in
+        cost_basis: Lot matching for realized PnL
+    """
+
+    def __init__(self,
+                 starting_equity: Optional[Decimal] = None,
+                 quote_currency: str = 'USD',
+                 cost_basis: CostBasisMethod = CostBasisMethod.FIFO):
+        super().__init__()
+        self.quote_currency = quote_currency.upper()
+        self.starting_equity = starting_equity
+        self.positions = PositionBook(cost_basis)
+        self.order_rates = OrderRateTracker()
+        self.market_conditions = MarketConditionMonitor()
+
+        self._balances: Dict[str, Decimal] = {}  # total per currency
+        self._reserved: Dict[str, Decimal] = defaultdict(Decimal)
+        # Keyed by id(order): confirm_order replaces order_id with the exchange id
+        self._reservations: Dict[int, Tuple[str, Decimal]] = {}  # -> (currency, amount)
+        self._order_fills: Dict[int, Tuple[Decimal, Decimal, Decimal]] = {}  # -> executed, notional, fees
+        self._marks: Dict[str, Decimal] = {}
+
+        self.daily_trade_count = 0
+        self.daily_volume_usd = Decimal('0')
+        self.daily_realized_pnl = Decimal('0')
+        self.consecutive_losses = 0
+        self.fees_paid = Decimal('0')
+        self.high_water_mark: Optional[Decimal] = None
+        self.current_drawdown = 0.0
+        self._rollover_at = _next_utc_midnight(time.time())
+
+        self._snapshot = RiskSnapshot(
+            [], [], TradingStatistics(),
+            order_rates=self.order_rates, market_conditions=self.market_conditions
+        )
+        self._snapshot.market_prices = self._marks
+        if starting_equity is not None:
+            self._update_drawdown()
+
+    # SUBSCRIPTIONS
+
+    def attach_order_manager(self, order_manager: Any) -> None:
+        """Track reservations and fills from an OrderManager's state changes."""
+        for order in order_manager.get_active_orders():
+            self._order_fills[id(order)] = self._fill_totals(order)
+            self._reserve(order)
+        self._sync_balances()
+        order_manager.add_state_change_handler(self.on_order_state_change)
+
+    def attach_fill_events(self, fill_system: Any) -> None:
+        """Track fills from an AdvancedFillEventSystem."""
+        fill_system.add_event_handler(EventType.FILL_RECEIVED, self.on_fill_event)
+
+    # EVENT HANDLERS
+
+    def on_order_state_change(self, order: EnhancedKrakenOrder,
+                              old_state: OrderState, new_state: OrderState) -> None:
+        """Apply new executions, count order activity and update reserved balance."""
+        if new_state == OrderState.PENDING_SUBMIT and old_state == OrderState.PENDING_NEW:
+            self.order_rates.record_order(order.pair)
+        elif new_state == OrderState.CANCELED:
+            self.order_rates.record_cancel(order.pair)
+
+        key = id(order)
+        previous = self._order_fills.get(key, (Decimal('0'), Decimal('0'), Decimal('0')))
+        current = self._fill_totals(order)
+        fill_volume = current[0] - previous[0]
+        if fill_volume > 0:
+            price = (current[1] - previous[1]) / fill_volume
+            self.on_fill(order.pair, order.side, fill_volume, price, current[2] - previous[2])
+
+        if new_state in RESERVING_STATES:
+            self._order_fills[key] = current
+            self._reserve(order)
+        else:
+            self._order_fills.pop(key, None)
+            self._release(key)
+        self._sync_balances()
+
+    def on_fill_event(self, event: FillEvent) -> None:
+        """Apply the fill carried by a fill system event."""
+        fill = event.fill
+        if fill is not None:
+            self.on_fill(fill.pair, fill.side, fill.volume, fill.price, fill.fee,
+                         timestamp=fill.timestamp.timestamp())
+
+    def on_fill(self, pair: str, side: Any, volume: Decimal, price: Decimal,
+                fee: Decimal = Decimal('0'), timestamp: Optional[float] = None) -> None:
+        """
+        Apply one execution.
+
+        Args:
+            pair: Trading pair
+            side: 'buy'/'sell' or an OrderSide
+            volume: Filled volume
+            price: Fill price
+            fee: Fee in the quote currency
+            timestamp: Epoch seconds of the fill (default: now)
+        """
+        self._roll_day(timestamp if timestamp is not None else time.time())
+        side = getattr(side, 'value', side).lower()
+
+        realized = self.positions.apply_fill(pair, side, volume, price)
+        if pair not in self._marks:
+            self._marks[pair] = price
+
+        self.order_rates.record_fill(pair)
+
+        notional = volume * price
+        self.daily_trade_count += 1
+        self.daily_volume_usd += notional
+        self.fees_paid += fee
+        if realized is not None:
+            self.daily_realized_pnl += realized
+            if realized < 0:
+                self.consecutive_losses += 1
+            elif realized > 0:
+                self.consecutive_losses = 0
+
+        base, quote = split_pair(pair, self.quote_currency)
+        direction = 1 if side == 'buy' else -1
+        self._adjust_balance(base, volume * direction)
+        self._adjust_balance(quote, -notional * direction - fee)
+
+        self._sync_position(pair)
+        self._update_drawdown()
+        self._sync_balances()
+        self._sync_statistics()
+
+    def mark_prices(self, prices: Mapping[str, Decimal]) -> None:
+        """Revalue positions at new market prices and feed the market estimators."""
+        for pair, price in prices.items():
+            self.market_conditions.on_price(pair, price)
+        self._marks.update(prices)
+        self.positions.mark_to_market(prices)
+        for pair in prices:
+            self._sync_position(pair)
+        self._update_drawdown()
+        self._sync_statistics()
+
+    def update_balances(self, balances: Iterable[AccountBalance]) -> None:
+        """
+        Replace balances with exchange-reported totals.
+
+        Available balance is derived from the totals minus reservations
+        for the open orders this state tracks.
+        """
+        self._balances = {balance.currency.upper(): balance.total_balance for balance in balances}
+        if self.starting_equity is None:
+            quote = self._balance_key(self.quote_currency)
+            if quote in self._balances:
+                self.starting_equity = self._balances[quote]
+                self._update_drawdown()
+                self._sync_statistics()
+        self._sync_balances()
+
+    # READERS
+
+    @property
+    def snapshot(self) -> RiskSnapshot:
+        """Current snapshot for PreTradeRiskValidator; treat as read-only."""
+        self._roll_day(time.time())
+        return self._snapshot
+
+    def trading_statistics(self) -> TradingStatistics:
+        """Current statistics as the model validate_order expects."""
+        self._roll_day(time.time())
+        return TradingStatistics(
+            daily_trade_count=self.daily_trade_count,
+            daily_volume_usd=self.daily_volume_usd,
+            daily_pnl=self.daily_realized_pnl,
+            current_drawdown=self.current_drawdown,
+            consecutive_losses=self.consecutive_losses
+        )
+
+    def reserved_balances(self) -> Dict[str, Decimal]:
+        """Balance held by open orders per currency."""
+        return {currency: amount for currency, amount in self._reserved.items() if amount}
+
+    def asset_exposure(self) -> Dict[str, Decimal]:
+        """Signed position value per base asset at the latest marks."""
+        exposure: Dict[str, Decimal] = defaultdict(Decimal)
+        for position in self.positions.open_positions():
+            mark = self._marks.get(position.pair)
+            if mark is not None:
+                base, _ = split_pair(position.pair, self.quote_currency)
+                exposure[base] += position.quantity * mark
+        return dict(exposure)
+
+    @property
+    def equity(self) -> Optional[Decimal]:
+        """Starting equity plus realized and unrealized PnL, net of fees."""
+        if self.starting_equity is None:
+            return None
+        unrealized = Decimal(str(self.positions.unrealized_pnl))
+        return self.starting_equity + self.positions.realized_pnl + unrealized - self.fees_paid
+
+    # INTERNALS
+
+    def _roll_day(self, now: float) -> None:
+        if now < self._rollover_at:
+            return
+        self._rollover_at = _next_utc_midnight(now)
+        self.daily_trade_count = 0
+        self.daily_volume_usd = Decimal('0')
+        self.daily_realized_pnl = Decimal('0')
+        self._sync_statistics()
+        self.log_info("Daily risk counters reset")
+
+    @staticmethod
+    def _fill_totals(order: EnhancedKrakenOrder) -> Tuple[Decimal, Decimal, Decimal]:
+        executed = order.volume_executed
+        notional = executed * order.average_fill_price if order.average_fill_price is not None else Decimal('0')
+        return executed, notional, order.total_fees_paid
+
+    def _balance_key(self, currency: str) -> str:
+        """Map a currency to the key its balance is reported under (e.g. USD -> ZUSD)."""
+        if currency in self._balances:
+            return currency
+        for prefixed in ('Z' + currency, 'X' + currency):
+            if prefixed in self._balances:
+                return prefixed
+        return currency
+
+    def _adjust_balance(self, currency: str, amount: Decimal) -> None:
+        key = self._balance_key(currency)
+        if key in self._balances:
+            self._balances[key] += amount
+
+    def _reserve(self, order: EnhancedKrakenOrder) -> None:
+        remaining = max(Decimal('0'), order.volume - order.volume_executed)
+        base, quote = split_pair(order.pair, self.quote_currency)
+        if order.side.value == 'buy':
+            price = order.price or self._marks.get(order.pair) or Decimal('0')
+            reservation = (self._balance_key(quote), remaining * price)
+        else:
+            reservation = (self._balance_key(base), remaining)
+        self._release(id(order))
+        self._reservations[id(order)] = reservation
+        self._reserved[reservation[0]] += reservation[1]
+
+    def _release(self, key: int) -> None:
+        reservation = self._reservations.pop(key, None)
+        if reservation is not None:
+            self._reserved[reservation[0]] -= reservation[1]
+
+    def _sync_balances(self) -> None:
+        snapshot = self._snapshot
+        quote = self._balance_key(self.quote_currency)
+        total = self._balances.get(quote)
+        if total is None:
+            snapshot.usd_balance = None
+            snapshot.available_usd = Decimal('0')
+            snapshot.utilization = 0.0
+        else:
+            reserved = self._reserved.get(quote, Decimal('0'))
+            balance = AccountBalance.model_construct(
+                currency=quote, total_balance=total,
+                available_balance=total - reserved, reserved_balance=reserved
+            )
+            snapshot.usd_balance = balance
+            snapshot.available_usd = balance.available_balance
+            snapshot.utilization = balance.utilization_percentage
+        snapshot.total_balance = sum(self._balances.values(), Decimal('0'))
+
+    def _sync_position(self, pair: str) -> None:
+        position = self.positions.positions.get(pair)
+        mark = self._marks.get(pair)
+        if position is None or mark is None:
+            return
+        snapshot = self._snapshot
+        previous = snapshot.position_values.pop(pair, Decimal('0'))
+        value = abs(position.quantity) * mark
+        if value:
+            snapshot.position_values[pair] = value
+        snapshot.total_portfolio_value += value - previous
+
+    def _update_drawdown(self) -> None:
+        equity = self.equity
+        if equity is None:
+            return
+        if self.high_water_mark is None or equity > self.high_water_mark:
+            self.high_water_mark = equity
+        if self.high_water_mark > 0:
+            self.current_drawdown = float((self.high_water_mark - equity) / self.high_water_mark)
+
+    def _sync_statistics(self) -> None:
+        snapshot = self._snapshot
+        snapshot.daily_trade_count = self.daily_trade_count
+        snapshot.daily_volume_usd = self.daily_volume_usd
+        snapshot.current_drawdown = self.current_drawdown
+        snapshot.consecutive_losses = self.consecutive_losses
@@ -0,0 +1,224 @@
+"""
+Low-overhead latency histograms for the fill pipeline.
+
+LatencyHistogram is a log-linear (HDR-style) histogram over integer
+nanoseconds: values below 128 ns get exact buckets, larger values are
+bucketed with 64 sub-buckets per power of two (under 1.6% relative
+error). Recording is a bit_length, a shift and a list increment; the
+minimum is read back from the lowest non-empty bucket.
+
+StageLatencyTracker keeps one histogram pair per stage and rotates them
+every ``interval`` seconds, so exported percentiles cover the last one to
+two intervals. Fills are traced end to end by an id (the Kraken trade id)
+from ``begin`` to ``finish``.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS  # 128
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1  # 64
+MAX_SHIFT = 40  # values up to ~2**47 ns (about 39 hours)
+BUCKET_COUNT = (MAX_SHIFT + 1) * SUB_BUCKET_HALF + SUB_BUCKET_COUNT
+
+# Fill pipeline stages, in order
+STAGE_WEBSOCKET = "websocket_trade_fills"
+STAGE_ORDER_MANAGER = "order_manager_fill_update"
+STAGE_FILL_PROCESSOR = "fill_processor"
+STAGE_EVENT_SYSTEM = "fill_event_system"
+STAGE_ANALYTICS = "analytics_engine"
+STAGE_END_TO_END = "end_to_end"
+
+
+def _bucket_lower(index: int) -> int:
+    """Lowest value that maps to ``index``."""
+    if index < SUB_BUCKET_COUNT:
+        return index
+    shift = index // SUB_BUCKET_HALF - 1
+    return (index - shift * SUB_BUCKET_HALF) << shift
+
+
+def _bucket_upper(index: int) -> int:
+    """Highest value that maps to ``index``."""
+    if index < SUB_BUCKET_COUNT:
+        return index
+    shift = index // SUB_BUCKET_HALF - 1
+    sub = index - shift * SUB_BUCKET_HALF
+    return ((sub + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond latencies."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value_ns: int) -> None:
+        """Record one latency in nanoseconds."""
+        shift = value_ns.bit_length() - SUB_BUCKET_BITS
+        if shift <= 0:
+            self.counts[value_ns if value_ns > 0 else 0] += 1
+        elif shift <= MAX_SHIFT:
+            self.counts[shift * SUB_BUCKET_HALF + (value_ns >> shift)] += 1
+        else:
+            self.counts[-1] += 1
+
+        if value_ns > self.max:
+            self.max = value_ns
+        self.count += 1
+        self.total += value_ns
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's counts into this one."""
+        if other.count == 0:
+            return
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, q: float) -> int:
+        """
+        Value at quantile ``q`` (0-1), as the highest value of its bucket.
+
+        Returns 0 for an empty histogram; never exceeds the recorded max.
+        """
+        if self.count == 0:
+            return 0
+        target = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c:
+                seen += c
+                if seen >= target:
+                    return min(_bucket_upper(i), self.max)
+        return self.max
+
+    @property
+    def min(self) -> int:
+        """Lowest recorded bucket's lowest value."""
+        for i, c in enumerate(self.counts):
+            if c:
+                return _bucket_lower(i)
+        return 0
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in nanoseconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Count and p50/p90/p99/max/mean in microseconds."""
+        return {
+            'count': self.count,
+            'p50_us': self.percentile(0.50) / 1000,
+            'p90_us': self.percentile(0.90) / 1000,
+            'p99_us': self.percentile(0.99) / 1000,
+            'max_us': self.max / 1000,
+            'mean_us': self.mean / 1000,
+        }
+
+    def reset(self) -> None:
+        """Clear all counts."""
+        self.__init__()
+
+
+class StageLatencyTracker:
+    """
+    Per-stage latency histograms with rolling reset and fill tracing.
+
+    Args:
+        interval: Seconds between histogram rotations
+        max_traces: In-flight trace ids kept for end-to-end timing
+    """
+
+    def __init__(self, interval: float = 60.0, max_traces: int = 10_000):
+        self.interval_ns = int(interval * 1e9)
+        self.max_traces = max_traces
+        self.enabled = True
+
+        self._current: Dict[str, LatencyHistogram] = {}
+        self._previous: Dict[str, LatencyHistogram] = {}
+        self._rotate_at = time.perf_counter_ns() + self.interval_ns
+        self._traces: "OrderedDict[str, int]" = OrderedDict()
+
+    def record_since(self, stage: str, start_ns: int) -> None:
+        """
+        Record a stage that started at ``start_ns`` (``time.perf_counter_ns()``).
+
+        The end timestamp also drives the rolling reset, so a record costs
+        one clock read.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        if now >= self._rotate_at:
+            self.rotate(now)
+        try:
+            self._current[stage].record(now - start_ns)
+        except KeyError:
+            histogram = self._current[stage] = LatencyHistogram()
+            histogram.record(now - start_ns)
+
+    def rotate(self, now_ns: Optional[int] = None) -> None:
+        """Start a new interval, keeping the one that just ended."""
+        self._previous = self._current
+        self._current = {}
+        self._rotate_at = (now_ns if now_ns is not None else time.perf_counter_ns()) + self.interval_ns
+
+    def begin(self, trace_id: str) -> None:
+        """Mark a fill entering the pipeline."""
+        if not self.enabled or trace_id in self._traces:
+            return
+        self._traces[trace_id] = time.perf_counter_ns()
+        if len(self._traces) > self.max_traces:
+            self._traces.popitem(last=False)
+
+    def finish(self, trace_id: str) -> None:
+        """Record end-to-end latency for a traced fill leaving the pipeline."""
+        started = self._traces.pop(trace_id, None)
+        if started is not None:
+            self.record_since(STAGE_END_TO_END, started)
+
+    def abandon(self, trace_id: str) -> None:
+        """Drop a traced fill that left the pipeline without completing."""
+        self._traces.pop(trace_id, None)
+
+    @property
+    def in_flight(self) -> int:
+        """Traced fills that have not finished."""
+        return len(self._traces)
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        """Merged histogram of the current and previous interval for a stage."""
+        merged = LatencyHistogram()
+        for histograms in (self._previous, self._current):
+            if stage in histograms:
+                merged.merge(histograms[stage])
+        return merged
+
+    def export(self) -> Dict[str, Dict[str, Any]]:
+        """Percentile summary for every stage."""
+        stages = set(self._previous) | set(self._current)
+        return {stage: self.histogram(stage).summary() for stage in sorted(stages)}
+
+    def reset(self) -> None:
+        """Drop all histograms and traces."""
+        self._current.clear()
+        self._previous = {}
+        self._traces.clear()
+        self._rotate_at = time.perf_counter_ns() + self.interval_ns
+
+
+# Shared tracker for the Kraken fill pipeline
+fill_pipeline_latency = StageLatencyTracker()
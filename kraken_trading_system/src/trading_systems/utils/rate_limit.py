@@ -0,0 +1,135 @@
+"""
+Constant-memory rate limiting primitives.
+
+GCRA (the generic cell rate algorithm) enforces ``limit`` events per
+``period`` seconds with a burst of up to ``limit`` using a single float per
+client: the theoretical arrival time (TAT) of the next conforming event.
+It is equivalent to a token bucket refilled continuously at
+``limit / period`` per second, with no per-event history and no timer.
+
+ClientTable bounds per-client state: entries are kept in LRU order and the
+least recently seen client is evicted once ``max_clients`` is reached. A
+sweep every ``sweep_every`` accesses drops idle entries from the cold end,
+so the table shrinks back after a burst of distinct clients.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Generic, Optional, TypeVar
+
+S = TypeVar('S')
+
+
+class GCRA:
+    """
+    ``limit`` events per ``period`` seconds, bursting up to ``limit``.
+
+    Args:
+        limit: Events allowed per period
+        period: Period length in seconds
+    """
+
+    __slots__ = ('limit', 'period', 'interval', 'tolerance')
+
+    def __init__(self, limit: int, period: float):
+        if limit <= 0 or period <= 0:
+            raise ValueError("limit and period must be positive")
+        self.limit = limit
+        self.period = period
+        self.interval = period / limit  # emission interval between events
+        self.tolerance = period - self.interval  # how far the TAT may run ahead
+
+    def admit(self, tat: float, now: float) -> Optional[float]:
+        """Return the new TAT if an event at ``now`` conforms, otherwise None."""
+        if tat < now:
+            tat = now
+        if tat - now > self.tolerance:
+            return None
+        return tat + self.interval
+
+    def retry_after(self, tat: float, now: float) -> float:
+        """Seconds until an event would conform."""
+        return max(0.0, tat - self.tolerance - now)
+
+    def remaining(self, tat: float, now: float) -> int:
+        """Events that would conform if sent at ``now``."""
+        backlog = tat - now if tat > now else 0.0
+        return max(0, int((self.tolerance - backlog) / self.interval) + 1)
+
+
+class ClientTable(Generic[S]):
+    """
+    LRU-bounded map from client id to limiter state.
+
+    Args:
+        factory: Creates the state for a new client
+        is_idle: ``is_idle(state, now)`` is True when dropping the state
+            loses nothing (its limits have fully recovered)
+        max_clients: Maximum clients tracked
+        sweep_every: Accesses between idle sweeps
+        sweep_budget: Maximum entries examined per sweep
+    """
+
+    def __init__(self, factory: Callable[[], S], is_idle: Callable[[S, float], bool],
+                 max_clients: int = 10_000, sweep_every: int = 256, sweep_budget: int = 64):
+        self.factory = factory
+        self.is_idle = is_idle
+        self.max_clients = max_clients
+        self.sweep_every = sweep_every
+        self.sweep_budget = sweep_budget
+        self.evictions = 0
+        self._entries: 'OrderedDict[str, S]' = OrderedDict()
+        self._until_sweep = sweep_every
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self._entries
+
+    def get(self, client_id: str) -> Optional[S]:
+        """State for a client without touching LRU order."""
+        return self._entries.get(client_id)
+
+    def touch(self, client_id: str) -> S:
+        """State for a client, created if needed and marked most recently used."""
+        entries = self._entries
+        state = entries.get(client_id)
+        if state is None:
+            state = entries[client_id] = self.factory()
+            if len(entries) > self.max_clients:
+                entries.popitem(last=False)
+                self.evictions += 1
+        else:
+            entries.move_to_end(client_id)
+        return state
+
+    def tick(self, now: float) -> None:
+        """Count an access and sweep idle clients when due."""
+        self._until_sweep -= 1
+        if self._until_sweep <= 0:
+            self._until_sweep = self.sweep_every
+            self.sweep(now)
+
+    def sweep(self, now: float, budget: Optional[int] = None) -> int:
+        """
+        Drop idle clients from the least recently used end.
+
+        Stops at the first active client or after ``budget`` entries.
+        Returns the number dropped.
+        """
+        entries = self._entries
+        is_idle = self.is_idle
+        dropped = 0
+        for _ in range(self.sweep_budget if budget is None else budget):
+            if not entries:
+                break
+            client_id = next(iter(entries))
+            if not is_idle(entries[client_id], now):
+                break
+            del entries[client_id]
+            dropped += 1
+        return dropped
+
+    def clear(self) -> None:
+        """Forget all clients."""
+        self._entries.clear()
@@ -0,0 +1,202 @@
+"""
+Unit tests for the Kraken AccountDataManager.
+"""
+
+import time
+
+import pytest
+
+from src.trading_systems.exchanges.kraken.account_data_manager import AccountDataManager
+
+
+def own_trades_message(trades):
+    """Build an ownTrades WebSocket message from (id, pair, side, price, vol, fee, time) tuples."""
+    trade_data = {
+        trade_id: {
+            "ordertxid": f"O-{trade_id}",
+            "pair": pair,
+            "time": str(trade_time),
+            "type": side,
+            "ordertype": "limit",
+            "price": price,
+            "vol": vol,
+            "fee": fee
+        }
+        for trade_id, pair, side, price, vol, fee, trade_time in trades
+    }
+    return [0, trade_data, "ownTrades"]
+
+
+class TestTradingSummary:
+    """Test cases for bucketed trading summaries."""
+
+    @pytest.mark.asyncio
+    async def test_summary_totals(self):
+        """Test volume, fees, side counts and VWAP."""
+        manager = AccountDataManager()
+        now = time.time()
+        await manager.process_own_trades_update(own_trades_message([
+            ("T1", "XBT/USD", "buy", "50000", "1", "10", now - 600),
+            ("T2", "XBT/USD", "sell", "52000", "1", "12", now - 300),
+            ("T3", "ETH/USD", "buy", "3000", "2", "1", now - 120)
+        ]))
+
+        summary = manager.get_trading_summary(pair="XBT/USD")
+        assert summary["total_trades"] == 2
+        assert summary["buy_trades"] == 1
+        assert summary["sell_trades"] == 1
+        assert summary["total_volume"] == "2"
+        assert summary["total_fees"] == "22"
+        assert summary["avg_price"] == "51000"
+        assert summary["first_trade_time"] < summary["last_trade_time"]
+
+        overall = manager.get_trading_summary()
+        assert overall["pair"] == "ALL"
+        assert overall["total_trades"] == 3
+
+    @pytest.mark.asyncio
+    async def test_summary_window(self):
+        """Test that trades outside the window are excluded."""
+        manager = AccountDataManager()
+        now = time.time()
+        await manager.process_own_trades_update(own_trades_message([
+            ("OLD", "XBT/USD", "buy", "40000", "5", "1", now - 3 * 3600),
+            ("NEW", "XBT/USD", "buy", "50000", "1", "1", now - 60)
+        ]))
+
+        assert manager.get_trading_summary(hours=1)["total_trades"] == 1
+        assert manager.get_trading_summary(hours=4)["total_trades"] == 2
+        assert manager.get_trading_summary(pair="ETH/USD")["total_trades"] == 0
+
+    @pytest.mark.asyncio
+    async def test_summary_beyond_history_cap(self):
+        """Test that summaries remain accurate past max_trade_history."""
+        manager = AccountDataManager(max_trade_history=10)
+        now = time.time()
+        await manager.process_own_trades_update(own_trades_message([
+            (f"T{i}", "XBT/USD", "buy", "100", "1", "0", now - i)
+            for i in range(50)
+        ]))
+
+        summary = manager.get_trading_summary()
+        assert len(manager.get_recent_trades(100)) == 10
+        assert summary["total_trades"] == 50
+        assert summary["total_volume"] == "50"
+
+    @pytest.mark.asyncio
+    async def test_reset_clears_aggregates(self):
+        """Test that reset_data drops bucketed aggregates."""
+        manager = AccountDataManager()
+        await manager.process_own_trades_update(own_trades_message([
+            ("T1", "XBT/USD", "buy", "100", "1", "0", time.time())
+        ]))
+
+        manager.reset_data()
+        assert manager.get_trading_summary()["total_trades"] == 0
+
+
+def open_orders_message(orders):
+    """Build an openOrders WebSocket message from (id, pair, side, vol, vol_exec, status) tuples."""
+    order_data = {
+        order_id: {
+            "status": status,
+            "vol": vol,
+            "vol_exec": vol_exec,
+            "descr": {"pair": pair, "type": side, "ordertype": "limit", "price": "100"}
+        }
+        for order_id, pair, side, vol, vol_exec, status in orders
+    }
+    return [0, order_data, "openOrders"]
+
+
+class TestPositionSummary:
+    """Test cases for the currency-indexed open-order exposure."""
+
+    @pytest.fixture
+    async def manager(self):
+        """Account data manager holding XBT and ETH balances."""
+        manager = AccountDataManager()
+        await manager.process_balance_update({
+            "XBT": {"balance": "2", "hold": "0"},
+            "ETH": {"balance": "10", "hold": "0"}
+        })
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_exposure_on_add(self, manager):
+        """Test that new orders are reflected per base currency."""
+        await manager.process_open_orders_update(open_orders_message([
+            ("O1", "XBT/USD", "sell", "0.5", "0", "open"),
+            ("O2", "XBT/USD", "buy", "1", "0", "open"),
+            ("O3", "ETHUSD", "sell", "3", "0", "open")
+        ]))
+
+        positions = manager.get_position_summary()
+        assert positions["XBT"]["open_sell_orders"] == 1
+        assert positions["XBT"]["open_buy_orders"] == 1
+        assert positions["XBT"]["sell_volume_pending"] == "0.5"
+        assert positions["XBT"]["buy_volume_pending"] == "1"
+        assert positions["ETH"]["sell_volume_pending"] == "3"
+
+    @pytest.mark.asyncio
+    async def test_exposure_on_change_and_remove(self, manager):
+        """Test that partial fills and closes update the index."""
+        await manager.process_open_orders_update(open_orders_message([
+            ("O1", "XBT/USD", "sell", "1", "0", "open")
+        ]))
+        await manager.process_open_orders_update(open_orders_message([
+            ("O1", "XBT/USD", "sell", "1", "0.25", "open")
+        ]))
+        assert manager.get_position_summary()["XBT"]["sell_volume_pending"] == "0.75"
+
+        await manager.process_open_orders_update(open_orders_message([
+            ("O1", "XBT/USD", "sell", "1", "1", "closed")
+        ]))
+        positions = manager.get_position_summary()
+        assert positions["XBT"]["open_sell_orders"] == 0
+        assert positions["XBT"]["sell_volume_pending"] == "0"
+
+
+class TestTradeAnalytics:
+    """Test cases for vectorized analytics over the columnar trade store."""
+
+    @pytest.mark.asyncio
+    async def test_vwap_and_spread(self):
+        """Test VWAP and realized spread for a pair."""
+        manager = AccountDataManager()
+        now = time.time()
+        await manager.process_own_trades_update(own_trades_message([
+            ("T1", "XBT/USD", "buy", "100", "1", "0.1", now - 30),
+            ("T2", "XBT/USD", "buy", "102", "1", "0.1", now - 20),
+            ("T3", "XBT/USD", "sell", "105", "2", "0.2", now - 10)
+        ]))
+
+        analytics = manager.get_trade_analytics(pair="XBT/USD", hours=1)
+        assert analytics["summary"]["total_trades"] == 3
+        assert analytics["vwap"] == pytest.approx(103.0)
+        assert analytics["realized_spread"]["buy_vwap"] == pytest.approx(101.0)
+        assert analytics["realized_spread"]["sell_vwap"] == pytest.approx(105.0)
+        assert analytics["realized_spread"]["spread"] == pytest.approx(4.0)
+        assert sum(b["volume"] for b in analytics["volume_profile"]) == pytest.approx(4.0)
+        assert sum(i["trades"] for i in analytics["intervals"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_ring_buffer_overwrites_oldest(self):
+        """Test that the store keeps only the newest trades at capacity."""
+        manager = AccountDataManager(trade_store_capacity=5)
+        now = time.time()
+        await manager.process_own_trades_update(own_trades_message([
+            (f"T{i}", "XBT/USD", "buy", str(100 + i), "1", "0", now - 100 + i)
+            for i in range(8)
+        ]))
+
+        summary = manager.get_trade_analytics(hours=1)["summary"]
+        assert summary["total_trades"] == 5
+        assert summary["vwap"] == pytest.approx(105.0)
+
+    def test_unknown_pair(self):
+        """Test analytics for a pair with no trades."""
+        analytics = AccountDataManager().get_trade_analytics(pair="XBT/USD")
+        assert analytics["summary"]["total_trades"] == 0
+        assert analytics["vwap"] is None
+        assert analytics["volume_profile"] == []
@@ -0,0 +1,87 @@
+"""
+Unit tests for Kraken request signing.
+"""
+
+import pytest
+
+from src.trading_systems.exchanges.kraken.auth import (
+    KrakenAuthenticator,
+    KrakenSigner,
+    get_kraken_signature,
+    get_signer
+)
+from src.trading_systems.utils.exceptions import InvalidCredentialsError
+
+# Example values from Kraken's REST authentication documentation
+API_SECRET = "kQH5HW/8p1uGOVjbgWA7FunAmGO8lsSUXNsu3eow76sz84Q18fWxnyRzBHCd3pd5nE9qa99HAZtuZuj6F1huXg=="
+URI_PATH = "/0/private/AddOrder"
+EXPECTED_SIGNATURE = "4/dpxb3iT4tp/ZCVEwSnEsLxx0bqyhLpdfOpc6fn7OR8+UClSV5n9E6aSS8MPtnRfp32bAb0nmbRn6H8ndwLUQ=="
+ORDER_DATA = {
+    "nonce": "1616492376594",
+    "ordertype": "limit",
+    "pair": "XBTUSD",
+    "price": 37500,
+    "type": "buy",
+    "volume": 1.25
+}
+
+
+class TestKrakenSigner:
+    """Test cases for KrakenSigner."""
+
+    def test_matches_documented_signature(self):
+        """Test signer output against Kraken's documented example."""
+        signer = KrakenSigner(API_SECRET)
+        postdata, signature = signer.sign_data(URI_PATH, ORDER_DATA)
+
+        assert postdata == KrakenSigner.encode_body(ORDER_DATA)
+        assert signature == EXPECTED_SIGNATURE
+
+    def test_template_reuse_is_stateless(self):
+        """Test that repeated signatures do not leak HMAC state."""
+        signer = KrakenSigner(API_SECRET)
+        postdata = KrakenSigner.encode_body(ORDER_DATA)
+
+        first = signer.sign(URI_PATH, ORDER_DATA["nonce"], postdata)
+        signer.sign("/0/private/Balance", "1", "nonce=1")
+        second = signer.sign(URI_PATH, ORDER_DATA["nonce"], postdata)
+
+        assert first == second == EXPECTED_SIGNATURE
+
+    def test_invalid_secret(self):
+        """Test that a malformed secret is rejected."""
+        with pytest.raises(InvalidCredentialsError):
+            KrakenSigner("not-base64!")
+
+    def test_get_signer_is_cached(self):
+        """Test that signers are reused per secret."""
+        assert get_signer(API_SECRET) is get_signer(API_SECRET)
+
+    def test_reference_function(self):
+        """Test the reference signature helper."""
+        assert get_kraken_signature(URI_PATH, ORDER_DATA, API_SECRET) == EXPECTED_SIGNATURE
+
+
+class TestKrakenAuthenticator:
+    """Test cases for KrakenAuthenticator signing."""
+
+    def test_create_signature(self):
+        """Test signature generation with an explicit nonce."""
+        auth = KrakenAuthenticator("test_key", API_SECRET)
+        data = {k: v for k, v in ORDER_DATA.items() if k != "nonce"}
+
+        nonce, signature = auth.create_signature(URI_PATH, data, ORDER_DATA["nonce"])
+
+        assert nonce == ORDER_DATA["nonce"]
+        assert signature == EXPECTED_SIGNATURE
+
+    def test_signed_request_body_matches_signature(self):
+        """Test that the returned body is the one that was signed."""
+        auth = KrakenAuthenticator("test_key", API_SECRET)
+        data = {k: v for k, v in ORDER_DATA.items() if k != "nonce"}
+
+        postdata, headers = auth.create_signed_request(URI_PATH, data, ORDER_DATA["nonce"])
+
+        assert postdata == KrakenSigner.encode_body(ORDER_DATA)
+        assert headers["API-Sign"] == EXPECTED_SIGNATURE
+        assert headers["API-Key"] == "test_key"
@@ -0,0 +1,256 @@
+"""
+Unit tests for the consolidated MCP server's database, tool limits and dispatch.
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+pytest.importorskip("mcp.server.fastmcp")
+
+import consolidated_mcp_server as server  # noqa: E402
+
+PRICE = 50000.0
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Connected database with agent_1 holding $1000."""
+    manager = server.DatabaseManager(str(tmp_path / "test.db"), pool_size=2)
+    assert manager.connect()
+    manager.execute_update(
+        "INSERT INTO users (id, username, email, password_hash) VALUES ('agent', 'agent_1', 'a@example.com', 'x')"
+    )
+    manager.execute_update(
+        "INSERT INTO user_balances (user_id, currency_code, total_balance, available_balance) "
+        "VALUES ('agent', 'USD', 1000, 1000)"
+    )
+    monkeypatch.setattr(server, "db_manager", manager)
+    monkeypatch.setattr(server, "agent_user_id", "agent")
+    monkeypatch.setattr(server, "get_market_price_data", lambda symbol, max_age=None: {'price': PRICE})
+    yield manager
+    manager.disconnect()
+
+
+def usd_balance(manager):
+    rows = manager.execute_query(
+        "SELECT available_balance FROM user_balances WHERE user_id = 'agent' AND currency_code = 'USD'"
+    )
+    return float(rows[0]['available_balance'])
+
+
+class TestTradeTransactions:
+    """Test cases for trades run in one database transaction."""
+
+    async def test_concurrent_overspending_buys_are_rejected(self, db):
+        """Test that concurrent buys cannot spend the same USD twice."""
+        results = await asyncio.gather(*(server.buy_asset("BTCUSD", 600) for _ in range(3)))
+
+        assert sum(r.startswith("✅") for r in results) == 1
+        assert sum("Insufficient USD" in r for r in results) == 2
+        assert usd_balance(db) == pytest.approx(1000 - 600 * 1.001)
+
+    async def test_trade_rejected_rolls_back(self, db):
+        """Test that writes made before a TradeRejected are rolled back."""
+        def work(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                "UPDATE user_balances SET available_balance = 0, total_balance = 0 WHERE user_id = 'agent'"
+            )
+            raise server.TradeRejected("rejected")
+
+        with pytest.raises(server.TradeRejected):
+            await db.transaction(work)
+
+        assert usd_balance(db) == 1000
+
+
+class StartingAdapter:
+    """Trading adapter whose startup probes never finish."""
+
+    def __init__(self, readiness):
+        self.readiness = readiness
+
+    async def wait_until_ready(self, timeout=None):
+        return False
+
+
+class TestTradingReadiness:
+    """Test cases for trade tools gated on adapter startup."""
+
+    async def test_trade_waits_for_starting_adapter(self, db, monkeypatch):
+        """Test that trades are refused while the adapter is still starting."""
+        if server.ReadinessState is None:
+            pytest.skip("trading_systems package not installed")
+        monkeypatch.setattr(server, "TRADING_READY_WAIT", 0.01)
+        monkeypatch.setattr(server, "trading_adapter", StartingAdapter(server.ReadinessState.STARTING))
+
+        assert "still starting" in await server.buy_asset("BTCUSD", 100)
+        assert usd_balance(db) == 1000
+
+        server.trading_adapter.readiness = server.ReadinessState.DEGRADED
+        assert (await server.buy_asset("BTCUSD", 100)).startswith("✅")
+
+
+class TestToolLimit:
+    """Test cases for per-tool concurrency limits."""
+
+    async def test_busy_after_queue_timeout(self, monkeypatch):
+        """Test that a call waiting longer than TOOL_QUEUE_TIMEOUT gets the busy message."""
+        monkeypatch.setattr(server, "TOOL_QUEUE_TIMEOUT", 0.05)
+        monkeypatch.setattr(server, "_tool_semaphores", {})
+        release = asyncio.Event()
+
+        @server.tool_limit(1)
+        async def slow_tool() -> str:
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(slow_tool())
+        await asyncio.sleep(0)
+
+        assert await slow_tool() == "❌ Server busy: too many concurrent slow_tool calls, please retry"
+        release.set()
+        assert await first == "done"
+        assert server.tool_in_flight["slow_tool"] == 0
+
+
+def call(name, request_id=1, **arguments):
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": name, "arguments": arguments}}
+
+
+@pytest.fixture
+def echo_tool(monkeypatch):
+    """Register an echo tool with an optional delay."""
+    async def echo(text: str, delay: float = 0.0) -> str:
+        await asyncio.sleep(delay)
+        return text
+
+    monkeypatch.setitem(server.TOOL_REGISTRY, "echo", server.ToolSpec(echo))
+
+
+class TestDispatch:
+    """Test cases for JSON-RPC dispatch through the tool registry."""
+
+    async def test_batch_keeps_request_order(self, echo_tool):
+        """Test that batch responses follow request order, not completion order."""
+        body = [call("echo", i, text=str(i), delay=0.03 - i * 0.01) for i in range(3)]
+
+        responses = await server.dispatch_rpc_body(body)
+
+        assert [r["id"] for r in responses] == [0, 1, 2]
+        assert [r["result"]["content"][0]["text"] for r in responses] == ["0", "1", "2"]
+
+    async def test_bad_argument_type(self, echo_tool):
+        """Test that a wrongly typed argument is rejected with -32602."""
+        response = await server.dispatch_rpc(call("echo", text=5))
+        assert response["error"]["code"] == -32602
+        assert "text must be str" in response["error"]["message"]
+
+    async def test_missing_required_argument(self, echo_tool):
+        """Test that a missing argument is rejected with -32602."""
+        response = await server.dispatch_rpc(call("echo", delay=0.0))
+        assert response["error"]["code"] == -32602
+        assert "missing required argument(s): text" in response["error"]["message"]
+
+    @pytest.mark.parametrize("params", [["echo"], "echo", {"name": ["echo"]}, {"name": {"a": 1}}])
+    async def test_malformed_params(self, echo_tool, params):
+        """Test that non-object params and non-string names are per-item -32602 errors."""
+        body = [{"jsonrpc": "2.0", "id": 7, "method": "tools/call", "params": params}, call("echo", 8, text="ok")]
+
+        responses = await server.dispatch_rpc_body(body)
+
+        assert responses[0]["id"] == 7
+        assert responses[0]["error"]["code"] == -32602
+        assert responses[1]["result"]["content"][0]["text"] == "ok"
+
+    @pytest.mark.parametrize("name", ["read_file", "debug_agent_info"])
+    async def test_local_only_tools_not_dispatched(self, name):
+        """Test that file and debug tools are not reachable over HTTP."""
+        response = await server.dispatch_rpc(call(name, file_path="README.md"))
+        assert response["error"]["code"] == -32602
+        assert response["error"]["message"] == f"Unknown tool: {name}"
+
+    async def test_empty_batch(self):
+        """Test that an empty batch is an invalid request."""
+        response = await server.dispatch_rpc_body([])
+        assert response["error"]["code"] == -32600
+
+    async def test_oversized_batch(self, echo_tool):
+        """Test that batches over MAX_RPC_BATCH_SIZE are refused without running any call."""
+        body = [call("echo", i, text="x") for i in range(server.MAX_RPC_BATCH_SIZE + 1)]
+
+        response = await server.dispatch_rpc_body(body)
+
+        assert response["error"]["code"] == -32600
+        assert str(server.MAX_RPC_BATCH_SIZE) in response["error"]["message"]
+
+
+def ticker(last):
+    return {"a": [str(last + 1), "1", "1"], "b": [str(last - 1), "1", "1"], "c": [str(last), "0.1"],
+            "v": ["10", "100"], "h": [str(last), str(last * 1.1)], "l": [str(last), str(last * 0.9)],
+            "o": str(last)}
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeTickerClient:
+    """Answers Ticker requests from canned results, rejecting unknown pairs like Kraken."""
+
+    def __init__(self, results):
+        self.results = results
+        self.requests = []
+
+    async def get(self, url, params):
+        pairs = params["pair"].split(",")
+        self.requests.append(pairs)
+        if any(pair not in self.results for pair in pairs):
+            return FakeResponse({"error": ["EQuery:Unknown asset pair"], "result": {}})
+        return FakeResponse({"error": [], "result": dict(self.results[pair] for pair in pairs)})
+
+
+class TestPriceService:
+    """Test cases for the batched Kraken ticker cache."""
+
+    async def test_track_and_refresh(self):
+        """Test that aliased symbols, cross pairs and legacy result keys all get prices."""
+        service = server.PriceService()
+        service._client = FakeTickerClient({
+            "XBTUSD": ("XXBTZUSD", ticker(50000)),
+            "ETHXBT": ("XETHXXBT", ticker(0.05)),
+            "ETHUSD": ("XETHZUSD", ticker(2500)),
+            "SOLUSD": ("SOLUSD", ticker(150)),
+        })
+        service.track(["BTCUSD", "XBTUSD", "ETHBTC", "ethusd", "SOLUSD"])
+
+        assert await service.refresh() == 5
+        assert [sorted(pairs) for pairs in service._client.requests] == [["ETHUSD", "ETHXBT", "SOLUSD", "XBTUSD"]]
+        assert service.symbols == ["BTCUSD", "ETHBTC", "ETHUSD", "SOLUSD", "XBTUSD"]
+        assert service.get("BTCUSD")["price"] == service.get("XBTUSD")["price"] == 50000
+        assert service.get("ETHBTC")["price"] == 0.05
+        assert service.get("ETHUSD")["bid"] == 2499
+        assert service.get("ETHUSD", max_age=-1) is None
+
+    async def test_unknown_pair_is_dropped(self):
+        """Test that a pair Kraken rejects is dropped instead of failing every poll."""
+        service = server.PriceService()
+        service._client = FakeTickerClient({"XBTUSD": ("XXBTZUSD", ticker(50000))})
+        service.track(["BTCUSD", "FOOUSD"])
+
+        assert await service.refresh() == 1
+        assert service.rejected_pairs == {"FOOUSD": ["FOOUSD"]}
+        assert service.symbols == ["BTCUSD"]
+        assert service.get_stats()["rejected_pairs"] == ["FOOUSD"]
+
+        await service.refresh()
+        assert service._client.requests[-1] == ["XBTUSD"]
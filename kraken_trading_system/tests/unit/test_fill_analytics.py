@@ -0,0 +1,70 @@
+"""
+Unit tests for streaming FillAnalytics accumulators.
+"""
+
+import statistics
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.trading_systems.exchanges.kraken.fill_processor import FillAnalytics, FillProcessor
+
+PRICES = [Decimal("50000"), Decimal("50100"), Decimal("49950"), Decimal("50020")]
+
+
+async def process_fills(processor, order_id="ORDER_1"):
+    """Feed PRICES through a processor as buy fills with growing intervals."""
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    for i, price in enumerate(PRICES):
+        await processor.process_fill(
+            trade_id=f"TRADE_{i}",
+            order_id=order_id,
+            volume=Decimal("0.1") * (i + 1),
+            price=price,
+            timestamp=start + timedelta(seconds=i * i),
+            trade_info={"pair": "XBT/USD", "type": "buy"}
+        )
+    return processor.get_order_analytics(order_id)
+
+
+class TestFillAnalytics:
+    """Test cases for O(1) fill analytics."""
+
+    @pytest.mark.asyncio
+    async def test_streaming_statistics(self):
+        """Test that streaming statistics match full recomputation."""
+        analytics = await process_fills(FillProcessor())
+
+        expected_variance = statistics.variance([float(p) for p in PRICES])
+        assert float(analytics.price_variance) == pytest.approx(expected_variance)
+        assert float(analytics.mean_fill_price) == pytest.approx(float(sum(PRICES) / len(PRICES)))
+        assert analytics.min_fill_price == Decimal("49950")
+        assert analytics.max_fill_price == Decimal("50100")
+        assert analytics.largest_fill_size == Decimal("0.4")
+        assert analytics.smallest_fill_size == Decimal("0.1")
+        assert analytics.min_fill_interval == timedelta(seconds=1)
+        assert analytics.max_fill_interval == timedelta(seconds=5)
+        assert analytics.average_fill_interval == timedelta(seconds=3)
+
+    @pytest.mark.asyncio
+    async def test_fill_lists_not_retained_by_default(self):
+        """Test that per-fill lists stay empty unless opted in."""
+        analytics = await process_fills(FillProcessor())
+        assert analytics.fill_prices == []
+        assert analytics.fill_sizes == []
+
+    @pytest.mark.asyncio
+    async def test_fill_history_opt_in(self):
+        """Test that keep_fill_history retains per-fill data."""
+        analytics = await process_fills(FillProcessor(keep_fill_history=True))
+        assert analytics.fill_prices == PRICES
+
+    def test_single_fill_has_no_variance(self):
+        """Test that variance needs at least two fills."""
+        analytics = FillAnalytics()
+        analytics.total_fills = 1
+        analytics.add_fill(Decimal("1"), Decimal("100"), datetime.now())
+        analytics.calculate_metrics()
+        assert analytics.price_variance is None
+        assert analytics.min_fill_interval is None
@@ -0,0 +1,162 @@
+"""
+Unit tests for the columnar fill event archive and vectorized replay.
+"""
+
+import shutil
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.trading_systems.exchanges.kraken.advanced_fill_events import AdvancedFillEventSystem, FillEvent
+from src.trading_systems.exchanges.kraken.fill_event_archive import FillEventArchive
+from src.trading_systems.exchanges.kraken.fill_pattern_detection import (
+    DetectionConfig,
+    detect_batch,
+    detect_vectorized,
+)
+from src.trading_systems.exchanges.kraken.fill_processor import TradeFill
+
+START = datetime(2025, 1, 1, 23, 0, 0)
+
+
+def make_event(i, pair="XBT/USD", price="50000", side="buy", seconds=30):
+    """Build an event ``i * seconds`` after START."""
+    fill = TradeFill(
+        trade_id=f"TRADE_{pair}_{i}",
+        order_id="ORDER_1",
+        volume=Decimal("1.0"),
+        price=Decimal(price),
+        cost=Decimal(price),
+        pair=pair,
+        side=side
+    )
+    return FillEvent(fill=fill, timestamp=START + timedelta(seconds=i * seconds))
+
+
+class TestFillEventArchive:
+    """Test cases for archive writes and loads."""
+
+    def test_partitions_by_day_and_pair(self, tmp_path):
+        """Test that events land in day/pair partitions and load back in order."""
+        archive = FillEventArchive(tmp_path, segment_size=50)
+        events = [make_event(i, pair="XBT/USD" if i % 2 else "ETH/USD") for i in range(300)]
+        archive.extend(events)
+        archive.flush()
+
+        assert archive.buffered_events == 0
+        assert archive.events_written == 300
+        assert [d.isoformat() for d in archive.days()] == ["2025-01-01", "2025-01-02"]
+        assert archive.pairs() == ["ETH/USD", "XBT/USD"]
+
+        columns = archive.load("XBT/USD")
+        expected = [e for e in events if e.fill.pair == "XBT/USD"]
+        assert columns['event_id'].tolist() == [e.event_id for e in expected]
+        assert np.all(np.diff(columns['timestamp']) > 0)
+
+    def test_load_time_range(self, tmp_path):
+        """Test that only rows inside the range are loaded."""
+        archive = FillEventArchive(tmp_path, segment_size=7)
+        archive.extend(make_event(i) for i in range(100))
+        archive.flush()
+
+        columns = archive.load("XBT/USD", START + timedelta(minutes=10), START + timedelta(minutes=20))
+
+        assert columns['timestamp'].size == 21
+        assert archive.load("SOL/USD")['timestamp'].size == 0
+
+    def test_segment_numbers_skip_staging_and_other_writers(self, tmp_path):
+        """Test that numbering continues after the highest segment and steps past names in use."""
+        older = FillEventArchive(tmp_path, segment_size=5)
+        older.extend(make_event(i) for i in range(15))
+        partition = older._partition_dir(START.date(), "XBT/USD")
+        shutil.rmtree(partition / "seg-000001")  # pruned by retention
+        shutil.rmtree(partition / "seg-000002")
+        (partition / "seg-000002.tmp").mkdir()  # left by a crashed writer
+
+        newer = FillEventArchive(tmp_path, segment_size=5)
+        newer.extend(make_event(i) for i in range(15, 25))
+        older.extend(make_event(i) for i in range(25, 30))
+
+        assert sorted(path.name for path in partition.iterdir()) == [
+            "seg-000002.tmp", "seg-000003", "seg-000004", "seg-000005", "seg-000006"
+        ]
+        assert newer.load("XBT/USD")['timestamp'].size == 20
+
+    async def test_full_buffers_written_in_background(self, tmp_path):
+        """Test that segments filled on the event loop are written off it and awaited by aflush."""
+        archive = FillEventArchive(tmp_path, segment_size=10)
+        archive.extend(make_event(i) for i in range(35))
+
+        assert archive.buffered_events == 5
+        await archive.aflush()
+
+        assert archive.pending_writes == 0
+        assert archive.buffered_events == 0
+        assert archive.segments_written == 4
+        columns = archive.load("XBT/USD")
+        assert columns['timestamp'].size == 35
+        assert np.all(np.diff(columns['timestamp']) > 0)
+        archive.close()
+
+    def test_vectorized_matches_batch_detection(self):
+        """Test that vectorized detection agrees with per-position detection."""
+        rng = np.random.default_rng(7)
+        n = 400
+        columns = {
+            'timestamp': np.cumsum(rng.uniform(4, 6, n)),
+            'price': 100 + np.cumsum(rng.normal(0, 0.05, n)) + rng.choice([0, 0.5], n),
+            'volume': np.round(rng.uniform(0.9, 1.1, n), 3),
+            'side': rng.choice([1, -1], n).astype(np.int8),
+            'improvement': np.where(rng.random(n) < 0.3, rng.uniform(0.02, 0.025, n), np.nan)
+        }
+        config = DetectionConfig(
+            pattern_windows={
+                'accumulation': 1800, 'distribution': 1800, 'iceberg_detected': 600,
+                'momentum_burst': 300, 'price_improvement': 900, 'arbitrage': 120
+            },
+            pattern_threshold=0.3,
+            correlation_threshold=0.3
+        )
+
+        batch_patterns, batch_correlations = detect_batch(columns, range(50, n), config)
+        patterns, correlations = detect_vectorized(columns, config, first_position=50)
+
+        for pattern_type, found in patterns.items():
+            expected = {p.position: p.confidence for p in batch_patterns if p.pattern_type == pattern_type}
+            assert found['positions'].tolist() == sorted(expected)
+            assert found['confidence'] == pytest.approx([expected[p] for p in sorted(expected)])
+        for correlation_type, found in correlations.items():
+            expected = {c.position: c.strength for c in batch_correlations if c.correlation_type == correlation_type}
+            assert found['positions'].tolist() == sorted(expected)
+            assert found['strength'] == pytest.approx([expected[p] for p in sorted(expected)])
+
+
+class TestArchivedReplay:
+    """Test cases for replaying archived events."""
+
+    @pytest.mark.asyncio
+    async def test_replay_covers_evicted_events(self, tmp_path):
+        """Test replay from the archive beyond the in-memory deque."""
+        system = AdvancedFillEventSystem(max_events=10, archive=FillEventArchive(tmp_path))
+        for i in range(60):
+            system._store_event(make_event(i, price=str(50000 + i)))
+
+        results = await system.replay_archived_events(START, START + timedelta(hours=1))
+
+        assert len(system.events) == 10
+        assert results['events_replayed'] == 60
+        assert results['pairs'] == ["XBT/USD"]
+        assert results['pattern_counts'].get('accumulation', 0) > 0
+        assert len(system.patterns) == 0
+
+        await system.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_replay_without_archive(self):
+        """Test that replay without an archive returns an empty result."""
+        system = AdvancedFillEventSystem()
+        results = await system.replay_archived_events(START, START + timedelta(hours=1))
+        assert results['events_replayed'] == 0
+        await system.shutdown()
@@ -0,0 +1,203 @@
+"""
+Unit tests for the per-pair windowed fill event index.
+"""
+
+import statistics
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.trading_systems.exchanges.kraken.advanced_fill_events import (
+    AdvancedFillEventSystem,
+    EventCorrelation,
+    FillEvent,
+    PatternType,
+    TradingPattern,
+)
+from src.trading_systems.exchanges.kraken.fill_event_index import FillEventIndex, RunningMoments
+from src.trading_systems.exchanges.kraken.fill_processor import TradeFill
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def make_event(i, price, volume="1.0", side="buy", pair="XBT/USD", seconds=None):
+    """Build a FillEvent for a synthetic fill ``i`` seconds after START."""
+    fill = TradeFill(
+        trade_id=f"TRADE_{pair}_{i}",
+        order_id="ORDER_1",
+        volume=Decimal(volume),
+        price=Decimal(price),
+        cost=Decimal(volume) * Decimal(price),
+        pair=pair,
+        side=side
+    )
+    return FillEvent(fill=fill, timestamp=START + timedelta(seconds=i if seconds is None else seconds))
+
+
+class TestRunningMoments:
+    """Test cases for removable running moments."""
+
+    def test_matches_statistics_after_removal(self):
+        """Test mean and variance track the remaining values."""
+        values = [50000.5, 50010.25, 49990.0, 50002.75, 50020.0]
+        moments = RunningMoments()
+        for value in values:
+            moments.add(value)
+        moments.remove(values[0])
+
+        assert moments.count == 4
+        assert moments.mean == pytest.approx(statistics.mean(values[1:]))
+        assert moments.variance == pytest.approx(statistics.variance(values[1:]))
+
+
+class TestFillEventIndex:
+    """Test cases for window trimming and aggregates."""
+
+    def test_window_trims_and_tracks_aggregates(self):
+        """Test that events fall out of the window with their aggregates."""
+        index = FillEventIndex([timedelta(seconds=10)])
+        prices = ["100", "90", "110", "105", "95"]
+        for i, price in enumerate(prices):
+            index.add(make_event(i, price, side="buy" if i % 2 == 0 else "sell", seconds=i * 5))
+
+        window = index.window("XBT/USD", timedelta(seconds=10))
+
+        # Events at 10s, 15s and 20s remain
+        assert len(window) == 3
+        assert window.all.volume == Decimal("3.0")
+        assert window.all.min_price == Decimal("95")
+        assert window.all.max_price == Decimal("110")
+        assert len(window.buy) == 2
+        assert len(window.sell) == 1
+        assert window.all.prices.variance == pytest.approx(statistics.variance([110, 105, 95]))
+        assert window.all.intervals.mean == pytest.approx(5.0)
+
+    def test_pairs_are_indexed_separately(self):
+        """Test that each pair has its own window."""
+        index = FillEventIndex([timedelta(minutes=1)])
+        index.add(make_event(0, "100", pair="XBT/USD"))
+        index.add(make_event(1, "10", pair="ETH/USD"))
+
+        assert len(index.window("XBT/USD", timedelta(minutes=1))) == 1
+        assert len(index.window("ETH/USD", timedelta(minutes=1))) == 1
+        assert index.window("SOL/USD", timedelta(minutes=1)) is None
+
+    def test_unknown_window_raises(self):
+        """Test that reading an unindexed duration raises KeyError."""
+        index = FillEventIndex([timedelta(minutes=1)])
+        with pytest.raises(KeyError):
+            index.window("XBT/USD", timedelta(minutes=5))
+
+
+class TestWindowedPatternDetection:
+    """Test cases for pattern detection reading the window index."""
+
+    @pytest.mark.asyncio
+    async def test_accumulation_detected_per_pair(self):
+        """Test accumulation only counts same-pair fills."""
+        system = AdvancedFillEventSystem()
+        for i in range(6):
+            system._store_event(make_event(i, str(50000 + i * 10), pair="XBT/USD"))
+            system._store_event(make_event(i, str(3000 + i), pair="ETH/USD", side="sell"))
+
+        await system._detect_patterns(system.events[-2])
+
+        accumulation = [p for p in system.patterns if p.pattern_type == PatternType.ACCUMULATION]
+        assert len(accumulation) == 1
+        assert accumulation[0].pair == "XBT/USD"
+        assert len(accumulation[0].events) == 6
+        assert accumulation[0].total_volume == Decimal("6.0")
+
+        await system.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_pattern_window_change_is_backfilled(self):
+        """Test that a new pattern window is indexed from stored events."""
+        system = AdvancedFillEventSystem()
+        for i in range(6):
+            system._store_event(make_event(i, "50000"))
+
+        system.pattern_windows[PatternType.ACCUMULATION] = timedelta(minutes=45)
+        await system._detect_patterns(system.events[-1])
+
+        assert system.event_windows.has_window(timedelta(minutes=45))
+        assert any(p.pattern_type == PatternType.ACCUMULATION for p in system.patterns)
+
+        await system.shutdown()
+
+
+class TestBoundedStorage:
+    """Test cases for eviction-coupled indices and correlation limits."""
+
+    @pytest.mark.asyncio
+    async def test_event_index_and_windows_follow_deque(self):
+        """Test that evicted events leave the index and windows."""
+        system = AdvancedFillEventSystem(max_events=5)
+        for i in range(8):
+            system._store_event(make_event(i, "50000"))
+
+        assert len(system.events) == 5
+        assert set(system.event_index) == {e.event_id for e in system.events}
+        assert len(system.event_windows.window("XBT/USD", timedelta(hours=1))) == 5
+
+        await system.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_evicting_last_event_of_pair_drops_pair(self):
+        """Test that a pair with no stored events is removed from the windows."""
+        system = AdvancedFillEventSystem(max_events=2)
+        system._store_event(make_event(0, "3000", pair="ETH/USD"))
+        system._store_event(make_event(1, "50000"))
+        system._store_event(make_event(2, "50000"))
+
+        assert system.event_windows.pairs() == ["XBT/USD"]
+
+        await system.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_pattern_index_follows_deque(self):
+        """Test that evicted patterns leave the pattern index."""
+        system = AdvancedFillEventSystem(max_patterns=2)
+        patterns = [TradingPattern() for _ in range(3)]
+        for pattern in patterns:
+            await system._register_pattern(pattern)
+
+        assert set(system.pattern_index) == {p.pattern_id for p in patterns[1:]}
+
+        await system.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_correlations_capped_and_expired(self):
+        """Test correlation size cap and TTL."""
+        system = AdvancedFillEventSystem(max_correlations=2, correlation_ttl=timedelta(minutes=5))
+        stale = EventCorrelation(detected_at=datetime.now() - timedelta(minutes=10))
+        await system._register_correlation(stale)
+        fresh = [EventCorrelation() for _ in range(3)]
+        for correlation in fresh:
+            await system._register_correlation(correlation)
+
+        assert list(system.correlations) == [c.correlation_id for c in fresh[1:]]
+
+        await system.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_memory_metrics_use_tracemalloc(self):
+        """Test that measured memory is reported while tracing."""
+        system = AdvancedFillEventSystem()
+        was_tracing = tracemalloc.is_tracing()
+        system.enable_memory_tracing()
+        try:
+            for i in range(20):
+                system._store_event(make_event(i, "50000"))
+            memory = system.get_performance_metrics()['memory']
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+        assert memory['memory_tracing'] is True
+        assert memory['event_system_memory_mb'] > 0
+        assert memory['event_index_size'] == 20
+
+        await system.shutdown()
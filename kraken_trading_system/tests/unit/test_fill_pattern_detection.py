@@ -0,0 +1,150 @@
+"""
+Unit tests for array-based and offloaded fill pattern detection.
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.trading_systems.exchanges.kraken.advanced_fill_events import (
+    AdvancedFillEventSystem,
+    FillEvent,
+    PatternType,
+)
+from src.trading_systems.exchanges.kraken.fill_pattern_detection import build_columns, detect_batch
+from src.trading_systems.exchanges.kraken.fill_processor import TradeFill
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def make_fill(i, price, side="buy", volume="1.0"):
+    """Build a synthetic XBT/USD fill."""
+    return TradeFill(
+        trade_id=f"TRADE_{i}",
+        order_id="ORDER_1",
+        volume=Decimal(volume),
+        price=Decimal(price),
+        cost=Decimal(volume) * Decimal(price),
+        pair="XBT/USD",
+        side=side
+    )
+
+
+def make_events():
+    """Steady buys followed by a quick buy/sell sequence."""
+    events = [
+        FillEvent(fill=make_fill(i, str(50000 + i * 10)), timestamp=START + timedelta(seconds=i * 20))
+        for i in range(8)
+    ]
+    for j, (side, price) in enumerate([("buy", "50000"), ("sell", "50500"), ("buy", "50010"), ("sell", "50510")]):
+        events.append(FillEvent(
+            fill=make_fill(8 + j, price, side=side),
+            timestamp=START + timedelta(seconds=160 + j * 2)
+        ))
+    return events
+
+
+class TestArrayDetection:
+    """Test cases for the array detectors."""
+
+    @pytest.mark.asyncio
+    async def test_matches_inline_detection(self):
+        """Test that array detection finds the same patterns as the inline detectors."""
+        events = make_events()
+
+        system = AdvancedFillEventSystem()
+        for event in events:
+            system._store_event(event)
+        await system._detect_patterns(events[-1])
+        await system._analyze_correlations(events[-1])
+        inline = {(p.pattern_type.value, round(p.confidence, 6)) for p in system.patterns}
+        inline_correlations = {c.correlation_type for c in system.correlations.values()}
+
+        patterns, correlations = detect_batch(
+            build_columns(events), [len(events) - 1], system._detection_config()
+        )
+
+        assert {(p.pattern_type, round(p.confidence, 6)) for p in patterns} == inline
+        assert {c.correlation_type for c in correlations} == inline_correlations
+        assert PatternType.ARBITRAGE.value in {p.pattern_type for p in patterns}
+
+        await system.shutdown()
+
+    def test_positions_only_see_earlier_events(self):
+        """Test that an earlier position ignores later events."""
+        events = make_events()
+        system = AdvancedFillEventSystem()
+
+        patterns, _ = detect_batch(build_columns(events), [3], system._detection_config())
+
+        assert all(max(p.indices) <= 3 for p in patterns)
+        assert not any(p.pattern_type == PatternType.ARBITRAGE.value for p in patterns)
+
+
+def detections(system):
+    """Registered patterns and correlations, comparable across systems."""
+    patterns = {(p.pattern_type, tuple(p.events), round(p.confidence, 9)) for p in system.patterns}
+    correlations = {(c.correlation_type, tuple(c.event_ids), round(c.strength, 9)) for c in system.correlations.values()}
+    return patterns, correlations
+
+
+class TestBatchDetection:
+    """Test cases for batched detection against the stored event windows."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_per_event_detection(self):
+        """Test that a batch straddling the window boundary sees the history each event had on arrival."""
+        history = [
+            FillEvent(fill=make_fill(i, str(50000 + i * 10)), timestamp=START + timedelta(minutes=i))
+            for i in range(40)
+        ]
+        batch = [
+            FillEvent(fill=make_fill(40 + j, str(50400 + j * 10)), timestamp=START + timedelta(minutes=40 + j))
+            for j in range(6)
+        ]
+
+        per_event = AdvancedFillEventSystem()
+        batched = AdvancedFillEventSystem()
+        for event in history:
+            per_event._store_event(event)
+            batched._store_event(event)
+        for event in batch:
+            per_event._store_event(event, hold=True)
+            await per_event._run_batch_detection([event])
+
+        with batched.processing_lock:
+            for event in batch:
+                batched._append_event(event, hold=True)
+        await batched._run_batch_detection(batch)
+
+        patterns, correlations = detections(batched)
+        assert any(p[0] == PatternType.ACCUMULATION for p in patterns)
+        assert (patterns, correlations) == detections(per_event)
+        assert batched._detection_columns["XBT/USD"].held == 0
+        assert len(batched._detection_columns["XBT/USD"]) == 31
+
+        await per_event.shutdown()
+        await batched.shutdown()
+
+
+class TestOffloadedDetection:
+    """Test cases for process-pool detection."""
+
+    @pytest.mark.asyncio
+    async def test_offloaded_patterns_registered(self):
+        """Test that patterns found in the pool are registered on the loop."""
+        system = AdvancedFillEventSystem(offload_detection=True, detection_workers=1)
+        try:
+            for i in range(6):
+                await system.process_fill_event(make_fill(i, "50000"))
+            await system.flush_detection()
+
+            accumulation = [p for p in system.patterns if p.pattern_type == PatternType.ACCUMULATION]
+            assert accumulation
+            assert set(accumulation[-1].events) <= set(system.event_index)
+            assert system.get_system_status()['integration']['detection_pool_active'] is True
+        finally:
+            await system.shutdown()
+
+        assert system.detection_pool is None
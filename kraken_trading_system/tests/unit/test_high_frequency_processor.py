@@ -0,0 +1,110 @@
+"""
+Unit tests for batched fill event processing.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from src.trading_systems.exchanges.kraken.advanced_fill_events import (
+    AdvancedFillEventSystem,
+    EventType,
+    HighFrequencyEventProcessor,
+    PatternType,
+)
+from src.trading_systems.exchanges.kraken.fill_processor import TradeFill
+
+
+def make_fill(i, price="50000", side="buy", pair="XBT/USD"):
+    """Build a synthetic fill."""
+    return TradeFill(
+        trade_id=f"TRADE_{i}",
+        order_id="ORDER_1",
+        volume=Decimal("1.0"),
+        price=Decimal(price),
+        cost=Decimal(price),
+        pair=pair,
+        side=side
+    )
+
+
+class TestBatchProcessing:
+    """Test cases for process_fill_events_batch."""
+
+    @pytest.mark.asyncio
+    async def test_batch_stores_and_detects(self):
+        """Test that a batch is stored, processed and run through detection."""
+        system = AdvancedFillEventSystem()
+        received = []
+        system.add_event_handler(EventType.FILL_RECEIVED, received.append)
+        events = await system.process_fill_events_batch([make_fill(i) for i in range(6)])
+
+        assert len(events) == 6
+        assert received == events
+        assert all(e.processed for e in events)
+        assert set(system.event_index) == {e.event_id for e in events}
+        assert any(p.pattern_type == PatternType.ACCUMULATION for p in system.patterns)
+
+        await system.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self):
+        """Test that an empty batch is a no-op."""
+        system = AdvancedFillEventSystem()
+        assert await system.process_fill_events_batch([]) == []
+        await system.shutdown()
+
+
+class TestHighFrequencyEventProcessor:
+    """Test cases for queueing, metrics and adaptive batching."""
+
+    @pytest.mark.asyncio
+    async def test_processes_queued_fills_in_batches(self):
+        """Test that queued fills are processed in batches."""
+        system = AdvancedFillEventSystem()
+        processor = HighFrequencyEventProcessor(system)
+        await processor.start()
+        for i in range(250):
+            await processor.queue_fill(make_fill(i, pair=f"PAIR{i % 5}/USD"))
+        await processor.stop()
+
+        metrics = processor.get_metrics()
+        assert metrics['fills_queued'] == 250
+        assert metrics['fills_processed'] == 250
+        assert metrics['fills_dropped'] == 0
+        assert metrics['average_batch_size'] > 1
+        assert len(system.events) == 250
+
+        await system.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_dropped_fills_are_counted(self):
+        """Test that fills rejected by a full queue are counted."""
+        processor = HighFrequencyEventProcessor(AdvancedFillEventSystem(), max_queue_size=2)
+        for i in range(5):
+            await processor.queue_fill(make_fill(i))
+
+        metrics = processor.get_metrics()
+        assert metrics['fills_queued'] == 2
+        assert metrics['fills_dropped'] == 3
+        assert metrics['max_queue_depth'] == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_size_adapts_to_queue_depth(self):
+        """Test that batch size grows with a backlog and shrinks when idle."""
+        processor = HighFrequencyEventProcessor(
+            AdvancedFillEventSystem(), batch_size=10, min_batch_size=5, max_batch_size=40
+        )
+        for i in range(100):
+            processor.event_queue.put_nowait(make_fill(i))
+
+        processor._adapt_batch_size()
+        processor._adapt_batch_size()
+        processor._adapt_batch_size()
+        assert processor.batch_size == 40
+
+        while not processor.event_queue.empty():
+            processor.event_queue.get_nowait()
+        for _ in range(5):
+            processor._adapt_batch_size()
+        assert processor.batch_size == 5
@@ -0,0 +1,145 @@
+"""
+Unit tests for fill pipeline latency histograms.
+"""
+
+import random
+import time
+from decimal import Decimal
+
+import pytest
+
+from src.trading_systems.exchanges.kraken.account_models import OrderSide, OrderType
+from src.trading_systems.exchanges.kraken.advanced_fill_events import AdvancedFillEventSystem
+from src.trading_systems.exchanges.kraken.fill_processor import FillProcessor
+from src.trading_systems.exchanges.kraken.order_manager import OrderManager
+from src.trading_systems.exchanges.kraken.order_models import OrderCreationRequest
+from src.trading_systems.exchanges.kraken.websocket_client import KrakenWebSocketClient
+from src.trading_systems.utils.latency import (
+    STAGE_END_TO_END,
+    STAGE_EVENT_SYSTEM,
+    STAGE_FILL_PROCESSOR,
+    STAGE_ORDER_MANAGER,
+    STAGE_WEBSOCKET,
+    LatencyHistogram,
+    StageLatencyTracker,
+    fill_pipeline_latency,
+)
+
+
+class TestLatencyHistogram:
+    """Test cases for the log-linear histogram."""
+
+    def test_percentiles_within_bucket_precision(self):
+        """Test that percentiles are within the bucket's relative error."""
+        rng = random.Random(5)
+        values = [int(rng.lognormvariate(11, 1.5)) for _ in range(20000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.9, 0.99):
+            exact = ordered[int(q * len(ordered) + 0.5) - 1]
+            assert histogram.percentile(q) == pytest.approx(exact, rel=1 / 64)
+        assert histogram.max == ordered[-1]
+        assert histogram.min == pytest.approx(ordered[0], rel=1 / 64)
+        assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+    def test_small_values_are_exact(self):
+        """Test that values below 128 ns have their own buckets."""
+        histogram = LatencyHistogram()
+        for value in range(100):
+            histogram.record(value)
+        assert histogram.percentile(0.5) == 49
+        assert histogram.percentile(1.0) == 99
+
+
+class TestStageLatencyTracker:
+    """Test cases for rolling stage histograms and tracing."""
+
+    def test_rotation_keeps_one_previous_interval(self):
+        """Test that exports cover the current and previous interval only."""
+        tracker = StageLatencyTracker()
+        start = time.perf_counter_ns()
+        tracker.record_since("stage", start)
+        tracker.rotate()
+        tracker.record_since("stage", start)
+        assert tracker.export()["stage"]['count'] == 2
+
+        tracker.rotate()
+        assert tracker.export()["stage"]['count'] == 1
+        tracker.rotate()
+        assert tracker.export() == {}
+
+    def test_trace_records_end_to_end(self):
+        """Test that begin/finish record end-to-end latency by trace id."""
+        tracker = StageLatencyTracker(max_traces=2)
+        for trace_id in ("T1", "T2", "T3"):
+            tracker.begin(trace_id)
+
+        # T1 was evicted as the oldest in-flight trace
+        tracker.finish("T1")
+        tracker.finish("T3")
+
+        assert tracker.in_flight == 1
+        assert tracker.export()[STAGE_END_TO_END]['count'] == 1
+
+        tracker.abandon("T2")
+        assert tracker.in_flight == 0
+        assert tracker.export()[STAGE_END_TO_END]['count'] == 1
+
+
+class TestPipelineStages:
+    """Test cases for stage recording in pipeline components."""
+
+    @pytest.mark.asyncio
+    async def test_stages_record_to_shared_tracker(self):
+        """Test that the fill processor and event system record their stages."""
+        before = fill_pipeline_latency.export()
+        processor = FillProcessor()
+        system = AdvancedFillEventSystem()
+
+        fill = await processor.process_fill(
+            "TRADE_1", "ORDER_1", Decimal("1.0"), Decimal("50000"),
+            trade_info={'pair': "XBT/USD", 'type': "buy"}
+        )
+        await system.process_fill_event(fill)
+
+        after = fill_pipeline_latency.export()
+        for stage in (STAGE_FILL_PROCESSOR, STAGE_EVENT_SYSTEM):
+            assert after[stage]['count'] == before.get(stage, {}).get('count', 0) + 1
+
+        metrics = system.get_performance_metrics()
+        assert metrics['latency']['samples'] == 1
+        assert STAGE_EVENT_SYSTEM in metrics['pipeline_latency']
+
+        await system.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_websocket_fill_records_end_to_end(self):
+        """Test that a live fill traced from the websocket finishes after OrderManager."""
+        manager = OrderManager()
+        order = await manager.create_order(OrderCreationRequest(
+            pair="XBT/USD", side=OrderSide.BUY, order_type=OrderType.LIMIT,
+            volume=Decimal("2"), price=Decimal("10000")
+        ))
+        await manager.submit_order(order.order_id)
+        await manager.confirm_order(order.order_id, "EX-LATENCY")
+        client = KrakenWebSocketClient()
+        client.order_manager = manager
+        handled = []
+        client.add_order_event_handler("fill", lambda data: handled.append(data["trade_id"]))
+
+        before = fill_pipeline_latency.export()
+        await client._process_trade_fills([
+            "ownTrades",
+            {"TRADE-LATENCY": {"ordertxid": "EX-LATENCY", "vol": "1", "price": "10000", "fee": "1",
+                               "cost": "10000", "pair": "XBT/USD", "type": "buy"}}
+        ])
+
+        after = fill_pipeline_latency.export()
+        for stage in (STAGE_ORDER_MANAGER, STAGE_WEBSOCKET, STAGE_END_TO_END):
+            assert after[stage]['count'] == before.get(stage, {}).get('count', 0) + 1
+        assert handled == ["TRADE-LATENCY"]
+        assert manager.get_order("EX-LATENCY").volume_executed == Decimal("1")
+        assert "TRADE-LATENCY" not in fill_pipeline_latency._traces
@@ -0,0 +1,103 @@
+"""
+Unit tests for streaming market condition estimators.
+"""
+
+import math
+import random
+from decimal import Decimal
+
+import pytest
+
+from src.trading_systems.exchanges.kraken.account_models import OrderSide
+from src.trading_systems.exchanges.kraken.order_requests import LimitOrderRequest
+from src.trading_systems.risk.market_conditions import MarketConditionMonitor, PairMarketStats
+from src.trading_systems.risk.pre_trade_checks import (
+    AccountBalance,
+    PreTradeRiskValidator,
+    RiskCheckResult,
+    TradingStatistics,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def validate(monitor, pair="XBTUSD"):
+    order = LimitOrderRequest(pair=pair, side=OrderSide.BUY, volume=Decimal("1"), price=Decimal("100"))
+    balances = [AccountBalance(currency="USD", total_balance=Decimal("100000"), available_balance=Decimal("100000"))]
+    responses = PreTradeRiskValidator().validate_order(
+        order, balances, [], TradingStatistics(), market_conditions=monitor
+    )
+    return [r for r in responses if r.result != RiskCheckResult.PASS]
+
+
+class TestPairMarketStats:
+    """Test cases for the per-pair estimators."""
+
+    def test_volatility_tracks_return_variance(self):
+        """Test that EWMA volatility converges to the true per-second volatility."""
+        rng = random.Random(3)
+        stats = PairMarketStats(halflife=600.0)
+        price, now, sigma = 100.0, 0.0, 0.001  # per-second volatility
+        for _ in range(20000):
+            dt = rng.uniform(0.2, 1.8)
+            now += dt
+            price *= math.exp(rng.gauss(0, sigma * math.sqrt(dt)))
+            stats.on_price(price, now)
+        assert stats.volatility(60) == pytest.approx(sigma * math.sqrt(60), rel=0.15)
+
+    def test_realized_range_rolls(self):
+        """Test that the range covers only the rolling window."""
+        stats = PairMarketStats(range_window=10.0)
+        stats.on_price(100.0, 0.0)
+        stats.on_price(110.0, 5.0)
+        stats.on_price(105.0, 12.0)
+        assert stats.realized_range() == pytest.approx(5 / 105)
+        assert stats.realized_range(now=100.0) == 0.0
+
+    def test_spread_and_age(self):
+        """Test spread in basis points and quote age."""
+        stats = PairMarketStats()
+        stats.on_quote(99.5, 100.5, now=10.0)
+        assert stats.spread_bps == pytest.approx(100.0)
+        assert stats.age(15.0) == 5.0
+
+
+class TestMarketConditionsCheck:
+    """Test cases for the market conditions risk check."""
+
+    def test_missing_data_warns(self):
+        """Test the warning when neither prices nor estimators exist."""
+        issues = validate(MarketConditionMonitor())
+        assert [r.message for r in issues] == ["No market price available for validation"]
+
+    def test_calm_market_passes(self):
+        """Test that a tight, quiet market passes."""
+        clock = FakeClock()
+        monitor = MarketConditionMonitor(clock=clock)
+        monitor.on_ticker("XBTUSD", {'a': ["100.01"], 'b': ["99.99"], 'c': ["100.00"]})
+        assert validate(monitor) == []
+
+    def test_blocks_stale_wide_and_volatile_markets(self):
+        """Test the blocking thresholds."""
+        clock = FakeClock()
+        monitor = MarketConditionMonitor(clock=clock)
+
+        monitor.on_quote("XBTUSD", "99", "101")
+        assert "Spread too wide" in validate(monitor)[-1].message
+
+        monitor.on_quote("XBTUSD", "99.99", "100.01")
+        clock.now += 60
+        assert "Stale market data" in validate(monitor)[-1].message
+
+        for price in ("100", "104", "98", "103"):
+            clock.now += 1
+            monitor.on_price("XBTUSD", price)
+        issues = validate(monitor)
+        assert issues[-1].result == RiskCheckResult.BLOCK
+        assert "Volatility too high" in issues[-1].message
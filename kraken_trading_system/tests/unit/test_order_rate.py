@@ -0,0 +1,126 @@
+"""
+Unit tests for sliding-window order rate limits.
+"""
+
+from decimal import Decimal
+
+from src.trading_systems.exchanges.kraken.account_models import OrderSide
+from src.trading_systems.exchanges.kraken.order_requests import LimitOrderRequest
+from src.trading_systems.risk.order_rate import BucketRing, OrderRateTracker
+from src.trading_systems.risk.pre_trade_checks import (
+    AccountBalance,
+    PreTradeRiskValidator,
+    RiskCheckResult,
+    RiskLimits,
+    TradingStatistics,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_order(pair="XBTUSD"):
+    return LimitOrderRequest(pair=pair, side=OrderSide.BUY, volume=Decimal("1"), price=Decimal("100"))
+
+
+def validate(validator, tracker, pair="XBTUSD"):
+    balances = [AccountBalance(currency="USD", total_balance=Decimal("100000"), available_balance=Decimal("100000"))]
+    return validator.validate_order(
+        make_order(pair), balances, [], TradingStatistics(), Decimal("100"), order_rates=tracker
+    )
+
+
+class TestBucketRing:
+    """Test cases for the time-bucket ring."""
+
+    def test_window_slides_by_bucket(self):
+        """Test that events expire once their bucket leaves the window."""
+        ring = BucketRing(1.0, 10)
+        ring.add(10.0)
+        ring.add(10.55, 2)
+        assert ring.count(10.95) == 3
+        assert ring.count(11.05) == 2
+        assert ring.count(11.6) == 0
+
+    def test_long_gap_clears_ring(self):
+        """Test that a gap longer than the window resets the total."""
+        ring = BucketRing(60.0, 60)
+        for second in range(30):
+            ring.add(float(second))
+        assert ring.count(29.0) == 30
+        assert ring.count(500.0) == 0
+
+
+class TestOrderRateLimits:
+    """Test cases for rate limits in the pre-trade checks."""
+
+    def test_blocks_account_orders_per_second(self):
+        """Test that a burst over the per-second limit is blocked."""
+        clock = FakeClock()
+        tracker = OrderRateTracker(clock=clock)
+        validator = PreTradeRiskValidator(RiskLimits(max_orders_per_second=3, max_pair_orders_per_second=10))
+        for i in range(3):
+            tracker.record_order(f"PAIR{i}")
+
+        responses = validate(validator, tracker)
+        assert responses[-1].result == RiskCheckResult.BLOCK
+        assert responses[-1].details['scope'] == "account"
+
+        clock.now += 1.1
+        assert validate(validator, tracker)[-1].result != RiskCheckResult.BLOCK
+
+    def test_blocks_pair_orders_per_minute(self):
+        """Test per-pair limits independently of other pairs."""
+        clock = FakeClock()
+        tracker = OrderRateTracker(clock=clock)
+        validator = PreTradeRiskValidator(RiskLimits(max_pair_orders_per_minute=5))
+        for _ in range(5):
+            tracker.record_order("XBTUSD")
+            clock.now += 2
+
+        assert validate(validator, tracker, "XBTUSD")[-1].details['scope'] == "XBTUSD"
+        assert validate(validator, tracker, "ETHUSD")[-1].result != RiskCheckResult.BLOCK
+
+    def test_basket_orders_count_as_pending(self):
+        """Test that orders earlier in a basket count towards the rate."""
+        tracker = OrderRateTracker(clock=FakeClock())
+        validator = PreTradeRiskValidator(RiskLimits(max_orders_per_second=2))
+        balances = [AccountBalance(currency="USD", total_balance=Decimal("100000"), available_balance=Decimal("100000"))]
+
+        results = validator.validate_orders(
+            [make_order(), make_order(), make_order()], balances, [], TradingStatistics(),
+            {"XBTUSD": Decimal("100")}, order_rates=tracker
+        )
+        assert [r[-1].result == RiskCheckResult.BLOCK for r in results] == [False, False, True]
+
+    def test_basket_pair_limit_without_recorded_orders(self):
+        """Test that pair limits apply to a basket for a pair with no order history."""
+        tracker = OrderRateTracker(clock=FakeClock())
+        validator = PreTradeRiskValidator(RiskLimits(max_orders_per_second=20, max_pair_orders_per_second=5))
+        balances = [AccountBalance(currency="USD", total_balance=Decimal("100000"), available_balance=Decimal("100000"))]
+
+        results = validator.validate_orders(
+            [make_order("XBT/USD") for _ in range(8)], balances, [], TradingStatistics(),
+            {"XBT/USD": Decimal("100")}, order_rates=tracker
+        )
+        assert [r[-1].result == RiskCheckResult.BLOCK for r in results] == [False] * 5 + [True] * 3
+        assert results[-1][-1].details['scope'] == "XBT/USD"
+
+    def test_warns_on_cancel_fill_ratio(self):
+        """Test the cancel-to-fill ratio warning."""
+        clock = FakeClock()
+        tracker = OrderRateTracker(clock=clock)
+        validator = PreTradeRiskValidator(RiskLimits(min_cancels_for_ratio=10, max_cancel_fill_ratio=5.0))
+        tracker.record_fill("XBTUSD")
+        for _ in range(12):
+            tracker.record_cancel("XBTUSD")
+            clock.now += 1
+
+        warnings = [r for r in validate(validator, tracker) if r.result == RiskCheckResult.WARNING]
+        assert any("cancel-to-fill" in r.message for r in warnings)
+        assert tracker.cancel_fill_ratio("XBTUSD") == 12.0
@@ -0,0 +1,113 @@
+"""
+Unit tests for the pre-trade risk pipeline.
+"""
+
+from decimal import Decimal
+
+from src.trading_systems.exchanges.kraken.account_models import OrderSide
+from src.trading_systems.exchanges.kraken.order_requests import LimitOrderRequest
+from src.trading_systems.risk.pre_trade_checks import (
+    PASS_LEVERAGE,
+    AccountBalance,
+    PositionInfo,
+    PreTradeRiskValidator,
+    RiskCheck,
+    RiskCheckResult,
+    RiskLimits,
+    RiskSnapshot,
+    TradingStatistics,
+)
+
+
+def make_order(volume, side=OrderSide.BUY, pair="XBTUSD", price="100"):
+    return LimitOrderRequest(pair=pair, side=side, volume=Decimal(volume), price=Decimal(price))
+
+
+def make_balances(available="10000", total="10000"):
+    return [AccountBalance(currency="USD", total_balance=Decimal(total), available_balance=Decimal(available))]
+
+
+class TestPreTradeRiskValidator:
+    """Test cases for the compiled check pipeline."""
+
+    def test_blocking_checks_run_first(self):
+        """Test that blocking checks are ordered ahead of advisory ones."""
+        validator = PreTradeRiskValidator()
+        names = [check.__name__ for check in validator.risk_checks]
+        assert names[:3] == ['_check_order_size_limits', '_check_daily_limits', '_check_balance_availability']
+        assert names[-1] == '_check_position_concentration'
+
+    def test_passing_order_returns_shared_responses(self):
+        """Test that a clean order runs every check without allocating passes."""
+        validator = PreTradeRiskValidator()
+        responses = validator.validate_order(
+            make_order("1"), make_balances(), [], TradingStatistics(), Decimal("100")
+        )
+        assert len(responses) == len(validator.registered_checks)
+        assert all(r.result == RiskCheckResult.PASS for r in responses)
+        assert PASS_LEVERAGE in responses
+
+    def test_short_circuits_on_block(self):
+        """Test that evaluation stops at the first BLOCK."""
+        validator = PreTradeRiskValidator(RiskLimits(max_order_size_usd=Decimal("500")))
+        responses = validator.validate_order(
+            make_order("10"), make_balances(), [], TradingStatistics(), Decimal("100")
+        )
+        assert len(responses) == 1
+        assert responses[0].result == RiskCheckResult.BLOCK
+        assert "exceeds limit" in responses[0].message
+
+    def test_check_errors_become_failures(self):
+        """Test that an exception in a check is reported as FAIL."""
+        def broken(order_request, estimated_value, snapshot):
+            raise ValueError("boom")
+
+        validator = PreTradeRiskValidator()
+        validator.add_risk_check(RiskCheck('broken', broken))
+        responses = validator.validate_order(
+            make_order("1"), make_balances(), [], TradingStatistics(), Decimal("100")
+        )
+        failures = [r for r in responses if r.result == RiskCheckResult.FAIL]
+        assert len(failures) == 1
+        assert failures[0].details == {'error': "boom"}
+
+
+class TestBatchValidation:
+    """Test cases for basket validation against one snapshot."""
+
+    def test_basket_consumes_balance(self):
+        """Test that accepted buys reduce the balance seen by later orders."""
+        validator = PreTradeRiskValidator()
+        orders = [make_order("40"), make_order("40"), make_order("40")]
+        results = validator.validate_orders(
+            orders, make_balances(available="10000"), [], TradingStatistics(), {"XBTUSD": Decimal("100")}
+        )
+        assert all(r[-1].result != RiskCheckResult.BLOCK for r in results[:2])
+        assert results[2][-1].result == RiskCheckResult.BLOCK
+        assert "Insufficient balance" in results[2][-1].message
+
+    def test_basket_counts_towards_daily_limit(self):
+        """Test that accepted orders count towards the daily trade limit."""
+        validator = PreTradeRiskValidator(RiskLimits(max_daily_trades=2))
+        stats = TradingStatistics(daily_trade_count=1)
+        results = validator.validate_orders(
+            [make_order("1"), make_order("1")], make_balances(), [], stats, {"XBTUSD": Decimal("100")}
+        )
+        assert results[0][-1].result != RiskCheckResult.BLOCK
+        assert results[1][-1].result == RiskCheckResult.BLOCK
+        assert "Daily trade limit" in results[1][-1].message
+
+    def test_shared_snapshot_is_not_mutated(self):
+        """Test that batch validation works on a copy of the snapshot."""
+        snapshot = RiskSnapshot(
+            make_balances(),
+            [PositionInfo(pair="XBTUSD", size=Decimal("2"), current_price=Decimal("100"))],
+            TradingStatistics(),
+            {"XBTUSD": Decimal("100")}
+        )
+        validator = PreTradeRiskValidator()
+        validator.validate_batch_with_snapshot([make_order("1"), make_order("1")], snapshot)
+
+        assert snapshot.available_usd == Decimal("10000")
+        assert snapshot.daily_trade_count == 0
+        assert snapshot.position_values == {"XBTUSD": Decimal("200")}
@@ -0,0 +1,81 @@
+"""
+Unit tests for GCRA limits and the bounded client table.
+"""
+
+import pytest
+
+from src.trading_systems.utils.rate_limit import GCRA, ClientTable
+
+
+class State:
+    def __init__(self):
+        self.tat = 0.0
+
+
+def is_idle(state, now):
+    return state.tat <= now
+
+
+class TestGCRA:
+    """Test cases for the cell rate limit."""
+
+    def test_burst_then_steady_rate(self):
+        """Test that a full burst is allowed and then one event per interval."""
+        limit = GCRA(limit=60, period=60.0)
+        tat, now = 0.0, 100.0
+        for _ in range(60):
+            tat = limit.admit(tat, now)
+            assert tat is not None
+        assert limit.admit(tat, now) is None
+        assert limit.retry_after(tat, now) == pytest.approx(1.0)
+
+        assert limit.admit(tat, now + 0.99) is None
+        tat = limit.admit(tat, now + 1.0)
+        assert tat is not None
+        assert limit.admit(tat, now + 1.0) is None
+
+    def test_recovers_after_period(self):
+        """Test that the full burst is available again after a quiet period."""
+        limit = GCRA(limit=10, period=3600.0)
+        tat = 0.0
+        for _ in range(10):
+            tat = limit.admit(tat, 0.0)
+        assert limit.remaining(tat, 0.0) == 0
+        assert limit.remaining(tat, 360.0) == 1
+        assert limit.remaining(tat, 3600.0) == 10
+
+    def test_rejects_invalid_limits(self):
+        """Test that non-positive limits are rejected."""
+        with pytest.raises(ValueError):
+            GCRA(limit=0, period=60.0)
+
+
+class TestClientTable:
+    """Test cases for the LRU client table."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the table never exceeds max_clients."""
+        table = ClientTable(State, is_idle, max_clients=2)
+        table.touch("a")
+        table.touch("b")
+        table.touch("a")
+        table.touch("c")
+        assert "b" not in table
+        assert "a" in table and "c" in table
+        assert len(table) == 2
+        assert table.evictions == 1
+
+    def test_sweep_drops_idle_clients_from_cold_end(self):
+        """Test that sweeping stops at the first client still limited."""
+        table = ClientTable(State, is_idle, sweep_every=3)
+        table.touch("idle-1").tat = 5.0
+        table.touch("busy").tat = 50.0
+        table.touch("idle-2").tat = 5.0
+
+        for _ in range(3):
+            table.tick(10.0)
+        assert "idle-1" not in table
+        assert "busy" in table and "idle-2" in table
+
+        table.sweep(60.0)
+        assert len(table) == 0
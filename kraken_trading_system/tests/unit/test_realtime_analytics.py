@@ -0,0 +1,352 @@
+"""
+Unit tests for bounded snapshots and rolling metrics in RealTimeAnalyticsEngine.
+"""
+
+import asyncio
+import math
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.trading_systems.exchanges.kraken import realtime_analytics
+from src.trading_systems.exchanges.kraken.fill_processor import TradeFill
+from src.trading_systems.exchanges.kraken.performance_window import FillBuckets, RollingPerformance, SnapshotRing
+from src.trading_systems.exchanges.kraken.position_book import CostBasisMethod, PositionBook
+from src.trading_systems.exchanges.kraken.realtime_analytics import (
+    AlertLevel,
+    RealTimeAnalyticsEngine,
+    RealTimePnL,
+    RiskAlert,
+)
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def make_fill(i, side="buy", price="50000", volume="0.1", pair="XBT/USD", fee="1.0"):
+    """Build a synthetic fill."""
+    return TradeFill(
+        trade_id=f"TRADE_{i}",
+        order_id="ORDER_1",
+        volume=Decimal(volume),
+        price=Decimal(price),
+        cost=Decimal(price) * Decimal(volume),
+        fee=Decimal(fee),
+        pair=pair,
+        side=side
+    )
+
+
+class TestSnapshotRing:
+    """Test cases for the fixed-size snapshot ring."""
+
+    def test_overwrites_oldest_when_full(self):
+        """Test that the ring keeps the newest entries in order."""
+        ring = SnapshotRing(capacity=3)
+        assert ring.latest is None
+
+        for i in range(5):
+            ring.append(START + timedelta(minutes=i), {'i': i})
+
+        assert len(ring) == 3
+        assert [s['i'] for _, s in ring] == [2, 3, 4]
+        assert ring.latest[1]['i'] == 4
+        assert ring.latest_time == START + timedelta(minutes=4)
+        assert [s['i'] for _, s in ring.since(START + timedelta(minutes=3))] == [3, 4]
+        assert [s['i'] for _, s in ring.since(START + timedelta(minutes=2, seconds=30))] == [3, 4]
+        assert [s['i'] for _, s in ring.since(START)] == [2, 3, 4]
+        assert ring.since(START + timedelta(minutes=5)) == []
+
+
+class TestFillBuckets:
+    """Test cases for per-minute fill aggregates."""
+
+    def test_folds_fills_by_minute(self):
+        """Test that fills share a bucket per minute and old minutes are evicted."""
+        buckets = FillBuckets(capacity=3)
+        for i in range(8):
+            buckets.add(START + timedelta(seconds=i * 30), Decimal("1"), Decimal("0.1"), "good")
+        buckets.add(START + timedelta(minutes=2, seconds=59), Decimal("2"), Decimal("0"), "poor")
+
+        assert len(buckets) == 3
+        totals = [(b.start.minute, b.count, b.volume) for b in buckets.since(START)]
+        assert totals == [(3, 2, Decimal("2")), (2, 3, Decimal("4")), (1, 2, Decimal("2"))]
+        assert [b.start.minute for b in buckets.since(START + timedelta(minutes=2, seconds=30))] == [3, 2]
+        assert dict(next(buckets.since(START)).quality) == {"good": 2}
+
+
+class TestRollingPerformance:
+    """Test cases for trailing-window accumulators."""
+
+    def test_profit_loss_and_drawdown_expire(self):
+        """Test that PnL changes and the peak leave the window."""
+        rolling = RollingPerformance(window=timedelta(minutes=10))
+        for minute, pnl in [(0, "0"), (1, "100"), (2, "40"), (8, "70"), (13, "60")]:
+            rolling.add_pnl(START + timedelta(minutes=minute), Decimal(pnl))
+
+        # Changes at 1 and 2 minutes are outside the window ending at 13
+        assert rolling.gross_profit == Decimal("30")
+        assert rolling.gross_loss == Decimal("-10")
+        assert rolling.profit_factor == pytest.approx(3.0)
+        assert rolling.peak_pnl == Decimal("70")
+        assert rolling.drawdown == Decimal("10")
+
+    def test_sharpe_matches_full_recalculation(self):
+        """Test that the rolling Sharpe ratio matches recomputing from history."""
+        rng = random.Random(3)
+        rolling = RollingPerformance(window=timedelta(minutes=60))
+        history = []
+        pnl = 100.0
+        for minute in range(180):
+            pnl += rng.gauss(0, 5)
+            if minute == 150:
+                pnl = 0.0
+            timestamp = START + timedelta(minutes=minute)
+            history.append((timestamp, pnl))
+            rolling.add_snapshot(timestamp, Decimal(str(pnl)))
+
+        cutoff = history[-1][0] - timedelta(minutes=60)
+        recent = [v for ts, v in history if ts >= cutoff]
+        returns = [(b - a) / abs(a) for a, b in zip(recent, recent[1:]) if a != 0]
+        expected = statistics.mean(returns) / statistics.stdev(returns) * math.sqrt(1000)
+
+        assert rolling.returns.count == len(returns)
+        assert rolling.sharpe_ratio(1000) == pytest.approx(expected)
+
+
+class TestPositionBook:
+    """Test cases for lot-based position accounting."""
+
+    def test_fifo_realizes_against_oldest_lots(self):
+        """Test that reducing fills close the oldest lots first."""
+        book = PositionBook(CostBasisMethod.FIFO)
+        book.apply_fill("XBT/USD", "buy", Decimal("1"), Decimal("100"))
+        book.apply_fill("XBT/USD", "buy", Decimal("1"), Decimal("110"))
+
+        realized = book.apply_fill("XBT/USD", "sell", Decimal("1.5"), Decimal("120"))
+
+        position = book.positions["XBT/USD"]
+        assert realized == Decimal("25")  # 1 @ 100 and 0.5 @ 110
+        assert position.quantity == Decimal("0.5")
+        assert position.average_price == Decimal("110")
+
+    def test_average_cost_and_flip(self):
+        """Test average-cost matching and a fill that flips the position."""
+        book = PositionBook(CostBasisMethod.AVERAGE)
+        book.apply_fill("ETH/USD", "buy", Decimal("1"), Decimal("100"))
+        book.apply_fill("ETH/USD", "buy", Decimal("1"), Decimal("110"))
+
+        realized = book.apply_fill("ETH/USD", "sell", Decimal("3"), Decimal("120"))
+
+        position = book.positions["ETH/USD"]
+        assert realized == Decimal("30")  # 2 @ average 105
+        assert position.quantity == Decimal("-1")
+        assert position.average_price == Decimal("120")
+        assert book.apply_fill("ETH/USD", "buy", Decimal("1"), Decimal("125")) == Decimal("-5")
+
+    def test_bulk_mark_matches_per_pair_marks(self):
+        """Test that vectorized mark-to-market matches incremental marks."""
+        rng = random.Random(11)
+        pairs = [f"PAIR{i}/USD" for i in range(40)]
+        bulk = PositionBook()
+        incremental = PositionBook()
+        for i in range(500):
+            pair = rng.choice(pairs)
+            side = rng.choice(["buy", "sell"])
+            volume = Decimal(f"{rng.uniform(0.1, 2):.3f}")
+            price = Decimal(f"{rng.uniform(90, 110):.2f}")
+            bulk.apply_fill(pair, side, volume, price)
+            incremental.apply_fill(pair, side, volume, price)
+
+        prices = {pair: Decimal(f"{rng.uniform(90, 110):.2f}") for pair in pairs}
+        for pair, price in prices.items():
+            incremental.mark(pair, price)
+
+        expected = sum(
+            float(p.quantity) * float(prices[p.pair]) - float(p.cost)
+            for p in bulk.positions.values()
+        )
+        assert bulk.mark_to_market(prices) == pytest.approx(expected)
+        assert incremental.unrealized_pnl == pytest.approx(expected)
+        assert bulk.realized_pnl == sum(p.realized_pnl for p in bulk.positions.values())
+
+    def test_realtime_pnl_counts_closed_trades(self):
+        """Test realized PnL, win rate and per-pair exposure in RealTimePnL."""
+        pnl = RealTimePnL()
+        pnl.update_from_fill(make_fill(1, "buy", "100", volume="1", fee="0"))
+        pnl.update_from_fill(make_fill(2, "buy", "200", volume="1", pair="ETH/USD", fee="0"))
+        pnl.update_from_fill(make_fill(3, "sell", "110", volume="1", fee="0"))
+        pnl.update_from_fill(make_fill(4, "sell", "190", volume="0.5", pair="ETH/USD", fee="0"))
+
+        assert pnl.realized_pnl == Decimal("5")
+        assert pnl.winning_trades == 1
+        assert pnl.losing_trades == 1
+        assert pnl.win_rate == 0.5
+
+        pnl.mark_to_market({"ETH/USD": Decimal("220")})
+        assert pnl.unrealized_pnl == Decimal("10")
+        assert pnl.total_pnl == Decimal("15")
+
+
+class TestRealTimeAnalyticsEngine:
+    """Test cases for engine integration."""
+
+    @pytest.mark.asyncio
+    async def test_snapshots_are_bounded(self):
+        """Test that snapshots stay within the configured capacity."""
+        engine = RealTimeAnalyticsEngine(max_snapshots=2)
+        for i in range(3):
+            # Age the latest snapshot so the next fill takes a new one
+            if engine.performance_snapshots.latest is not None:
+                _, snapshot = engine.performance_snapshots.latest
+                engine.performance_snapshots.append(datetime.now() - timedelta(minutes=2), snapshot)
+            await engine.process_fill(make_fill(i))
+
+        assert len(engine.performance_snapshots) == 2
+        assert engine.get_system_health()['data_points']['performance_snapshots'] == 2
+        assert engine.get_real_time_dashboard()['recent_activity']['fills_last_hour'] == 3
+
+    @pytest.mark.asyncio
+    async def test_recent_fill_times_trimmed_on_append(self):
+        """Test that fill timestamps older than an hour are dropped as fills arrive."""
+        engine = RealTimeAnalyticsEngine()
+        for i in range(5):
+            fill = make_fill(i)
+            fill.timestamp = datetime.now() - timedelta(hours=2)
+            await engine.process_fill(fill)
+        await engine.process_fill(make_fill(5))
+
+        assert len(engine._recent_fill_times) == 1
+
+    @pytest.mark.asyncio
+    async def test_performance_report_from_buckets(self):
+        """Test that the period report sums the buckets and price updates invalidate it."""
+        engine = RealTimeAnalyticsEngine()
+        for i in range(4):
+            fill = make_fill(i, volume="0.5")
+            if i == 0:
+                fill.timestamp = datetime.now() - timedelta(hours=3)
+            await engine.process_fill(fill)
+        engine.fill_history.clear()  # the report must not depend on the fill list
+
+        report = engine.get_performance_report(timedelta(hours=1))
+        assert report['summary_statistics']['total_fills'] == 3
+        assert Decimal(report['summary_statistics']['total_volume']) == Decimal("1.5")
+        assert Decimal(report['summary_statistics']['total_fees']) == Decimal("3.0")
+        assert report['quality_analysis']['fill_quality_distribution']['fair'] == 3
+        assert engine.get_performance_report(timedelta(hours=4))['summary_statistics']['total_fills'] == 4
+
+        version = engine._data_version
+        await engine.update_market_prices({"XBT/USD": Decimal("51000")})
+        assert engine._data_version == version + 1
+        assert engine.get_performance_report(timedelta(hours=1)) is not report
+
+    def test_alert_counts_follow_evictions(self):
+        """Test that per-level alert counts match the bounded deque."""
+        engine = RealTimeAnalyticsEngine()
+        levels = [AlertLevel.CRITICAL, AlertLevel.URGENT, AlertLevel.WARNING]
+        for i in range(engine.alerts.maxlen + 50):
+            engine._record_alert(RiskAlert(
+                timestamp=datetime.now(),
+                level=levels[i % 3],
+                metric="test",
+                current_value=0.0,
+                threshold=0.0,
+                message="test"
+            ))
+
+        risk_status = engine.get_real_time_dashboard()['risk_status']
+        assert risk_status['critical_alerts'] == len([a for a in engine.alerts if a.level == AlertLevel.CRITICAL])
+        assert risk_status['urgent_alerts'] == len([a for a in engine.alerts if a.level == AlertLevel.URGENT])
+
+
+class TestMaterializedDashboard:
+    """Test cases for the materialized, push-based dashboard."""
+
+    def test_reads_reuse_snapshot_until_dirty(self):
+        """Test that unchanged reads return the same snapshot without rebuilding."""
+        engine = RealTimeAnalyticsEngine()
+        first = engine.get_real_time_dashboard()
+        rebuilds = engine.dashboard.rebuilds
+
+        assert engine.get_real_time_dashboard() is first
+        assert engine.get_real_time_dashboard_json() is engine.get_real_time_dashboard_json()
+        assert engine.dashboard.rebuilds == rebuilds
+
+        engine.dashboard.mark_dirty(engine.PRICE_SECTIONS)
+        # Nothing actually changed, so the version stays put
+        assert engine.get_real_time_dashboard()['version'] == first['version']
+
+    @pytest.mark.asyncio
+    async def test_burst_is_published_as_one_diff(self):
+        """Test that a burst of fills is pushed once, with only changed keys."""
+        engine = RealTimeAnalyticsEngine(dashboard_publish_interval=0.05)
+        updates = []
+        snapshot = engine.subscribe_dashboard(updates.append)
+
+        for i in range(20):
+            await engine.process_fill(make_fill(i))
+        assert updates == []
+
+        await asyncio.sleep(0.1)
+
+        assert len(updates) == 1
+        update = updates[0]
+        assert update.previous_version == snapshot['version']
+        assert update.version == engine.get_real_time_dashboard()['version']
+        assert update.changes['trading_stats']['total_trades'] == 20
+        assert 'execution_quality' not in update.changes
+        assert engine.dashboard.rebuilds <= 3
+
+    @pytest.mark.asyncio
+    async def test_idle_dashboard_follows_the_clock(self, monkeypatch):
+        """Test that time-dependent values move on read when the clock advances with no fills."""
+        current = {'now': START}
+
+        class FakeDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return current['now']
+
+        monkeypatch.setattr(realtime_analytics, 'datetime', FakeDatetime)
+        engine = RealTimeAnalyticsEngine()
+        current['monotonic'] = time.monotonic()
+        engine.dashboard.clock = lambda: current['monotonic']
+
+        for i, (side, price) in enumerate([("buy", "100"), ("sell", "120")]):
+            fill = make_fill(i, side=side, price=price, volume="1", fee="0")
+            fill.timestamp = START
+            await engine.process_fill(fill)
+
+        first = engine.get_real_time_dashboard()
+        assert first['recent_activity']['fills_last_hour'] == 2
+        assert Decimal(first['rolling_window']['gross_profit']) > 0
+
+        current['now'] = START + timedelta(hours=2)
+        assert engine.get_real_time_dashboard() is first  # still within the TTL
+
+        current['monotonic'] += engine.dashboard.clock_ttl
+        later = engine.get_real_time_dashboard()
+        assert later['version'] > first['version']
+        assert later['timestamp'] == current['now'].isoformat()
+        assert later['session_duration'] != first['session_duration']
+        assert later['recent_activity']['fills_last_hour'] == 0
+        assert Decimal(later['rolling_window']['gross_profit']) == 0
+        assert later['trading_stats'] is first['trading_stats']
+
+    @pytest.mark.asyncio
+    async def test_price_update_marks_pnl_sections(self):
+        """Test that a mark-to-market tick reaches subscribers."""
+        engine = RealTimeAnalyticsEngine(dashboard_publish_interval=0.01)
+        await engine.process_fill(make_fill(1, price="100", volume="1"))
+        updates = []
+        engine.subscribe_dashboard(updates.append)
+
+        await engine.update_market_prices({"XBT/USD": Decimal("110")})
+        await asyncio.sleep(0.05)
+
+        assert updates[-1].changes['pnl_summary']['unrealized_pnl'] == "10.00000000"
+        engine.dashboard.close()
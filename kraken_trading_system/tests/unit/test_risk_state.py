@@ -0,0 +1,134 @@
+"""
+Unit tests for the live risk state.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from src.trading_systems.exchanges.kraken.account_models import OrderSide, OrderType
+from src.trading_systems.exchanges.kraken.order_manager import OrderManager
+from src.trading_systems.exchanges.kraken.order_models import OrderCreationRequest
+from src.trading_systems.exchanges.kraken.order_requests import LimitOrderRequest
+from src.trading_systems.risk.pre_trade_checks import (
+    AccountBalance,
+    PreTradeRiskValidator,
+    RiskCheckResult,
+    RiskLimits,
+)
+from src.trading_systems.risk.risk_state import LiveRiskState, split_pair
+
+
+def make_state():
+    state = LiveRiskState()
+    state.update_balances([
+        AccountBalance(currency="ZUSD", total_balance=Decimal("100000"), available_balance=Decimal("100000")),
+        AccountBalance(currency="XXBT", total_balance=Decimal("0"), available_balance=Decimal("0")),
+    ])
+    return state
+
+
+class TestLiveRiskState:
+    """Test cases for incrementally maintained risk inputs."""
+
+    def test_split_pair(self):
+        """Test pair splitting for slash and Kraken-style pairs."""
+        assert split_pair("XBT/USD") == ("XBT", "USD")
+        assert split_pair("XBTUSD") == ("XBT", "USD")
+        assert split_pair("XXBTZUSD") == ("XXBT", "ZUSD")
+
+    def test_fills_update_counters_and_balances(self):
+        """Test that fills update daily counters, balances and positions."""
+        state = make_state()
+        state.on_fill("XBT/USD", "buy", Decimal("1"), Decimal("20000"), fee=Decimal("10"))
+
+        snapshot = state.snapshot
+        assert snapshot.daily_trade_count == 1
+        assert snapshot.daily_volume_usd == Decimal("20000")
+        assert snapshot.available_usd == Decimal("79990")
+        assert snapshot.position_values == {"XBT/USD": Decimal("20000")}
+        assert state.asset_exposure() == {"XBT": Decimal("20000")}
+
+    def test_drawdown_from_high_water_mark(self):
+        """Test that drawdown is measured from peak equity."""
+        state = make_state()
+        state.on_fill("XBT/USD", "buy", Decimal("1"), Decimal("20000"))
+        state.mark_prices({"XBT/USD": Decimal("30000")})
+        assert state.high_water_mark == Decimal("110000")
+        assert state.current_drawdown == 0.0
+
+        state.mark_prices({"XBT/USD": Decimal("19000")})
+        assert state.snapshot.current_drawdown == pytest.approx(11000 / 110000)
+        assert state.snapshot.total_portfolio_value == Decimal("19000")
+
+    def test_losses_and_utc_rollover(self):
+        """Test consecutive losses and the daily reset at UTC midnight."""
+        state = make_state()
+        yesterday = datetime(2024, 1, 1, 23, 59, tzinfo=timezone.utc).timestamp()
+        state._rollover_at = datetime(2024, 1, 2, tzinfo=timezone.utc).timestamp()
+
+        state.on_fill("XBT/USD", "buy", Decimal("1"), Decimal("100"), timestamp=yesterday)
+        state.on_fill("XBT/USD", "sell", Decimal("1"), Decimal("90"), timestamp=yesterday)
+        assert state.consecutive_losses == 1
+        assert state.daily_trade_count == 2
+
+        snapshot = state.snapshot
+        assert snapshot.daily_trade_count == 0
+        assert snapshot.daily_volume_usd == Decimal("0")
+        assert snapshot.consecutive_losses == 1
+        assert state.trading_statistics().daily_pnl == Decimal("0")
+
+    def test_daily_realized_pnl_in_statistics(self):
+        """Test that today's realized P&L reaches the trading statistics."""
+        state = make_state()
+        state.on_fill("XBT/USD", "buy", Decimal("1"), Decimal("100"))
+        state.on_fill("XBT/USD", "sell", Decimal("1"), Decimal("90"))
+
+        stats = state.trading_statistics()
+        assert stats.daily_pnl == state.daily_realized_pnl == Decimal("-10")
+        assert stats.daily_trade_count == 2
+
+
+class TestOrderManagerIntegration:
+    """Test cases for state driven by OrderManager events."""
+
+    @pytest.mark.asyncio
+    async def test_open_orders_reserve_balance(self):
+        """Test that open orders reserve balance and fills release it."""
+        manager = OrderManager()
+        state = make_state()
+        state.attach_order_manager(manager)
+
+        order = await manager.create_order(OrderCreationRequest(
+            pair="XBT/USD", side=OrderSide.BUY, order_type=OrderType.LIMIT,
+            volume=Decimal("2"), price=Decimal("10000")
+        ))
+        await manager.submit_order(order.order_id)
+        assert state.reserved_balances() == {"ZUSD": Decimal("20000")}
+        assert state.order_rates.orders_per_second("XBT/USD") == 1
+        assert state.snapshot.available_usd == Decimal("80000")
+
+        await manager.confirm_order(order.order_id, "EX-1")
+        await manager.handle_fill(order.order_id, Decimal("1"), Decimal("10000"), Decimal("5"))
+        assert state.reserved_balances() == {"ZUSD": Decimal("10000")}
+        assert state.daily_trade_count == 1
+        assert state.snapshot.available_usd == Decimal("79995")
+
+        await manager.cancel_order(order.order_id)
+        assert state.reserved_balances() == {}
+        assert state.order_rates.cancels_and_fills() == (1, 1)
+        assert state.snapshot.available_usd == Decimal("89995")
+
+    def test_validator_reads_live_snapshot(self):
+        """Test that validate() uses the live state."""
+        state = make_state()
+        validator = PreTradeRiskValidator(RiskLimits(max_daily_trades=1), risk_state=state)
+        order = LimitOrderRequest(pair="XBTUSD", side=OrderSide.BUY, volume=Decimal("1"), price=Decimal("100"))
+
+        assert validator.validate(order)[-1].result != RiskCheckResult.BLOCK
+        state.on_fill("XBTUSD", OrderSide.BUY, Decimal("1"), Decimal("100"))
+        assert validator.validate(order)[-1].result == RiskCheckResult.BLOCK
+
+        with pytest.raises(ValueError):
+            PreTradeRiskValidator().validate(order)
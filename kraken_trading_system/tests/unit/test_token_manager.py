@@ -291,6 +291,118 @@ class TestKrakenTokenManager:
         assert status["is_valid"] is True
 
 
+class TestBackgroundTokenRefresh:
+    """Test cases for proactive background token refresh."""
+
+    @pytest.fixture
+    def token_manager(self):
+        """Create a token manager instance for testing."""
+        return KrakenTokenManager(refresh_ahead_seconds=240.0)
+
+    @pytest.fixture
+    def mock_http_client(self):
+        """Mock HTTP client issuing sequential tokens."""
+        counter = {"n": 0}
+
+        async def post(*args, **kwargs):
+            counter["n"] += 1
+            response = MagicMock()
+            response.status_code = 200
+            response.json.return_value = {"error": [], "result": {"token": f"token_{counter['n']}"}}
+            return response
+
+        client = AsyncMock()
+        client.post.side_effect = post
+        return client
+
+    @pytest.fixture
+    def mock_settings(self):
+        """Mock settings with test API credentials."""
+        with patch('src.trading_systems.exchanges.kraken.token_manager.settings') as mock:
+            mock.get_api_credentials.return_value = ("test_key", "dGVzdF9zZWNyZXQ=")
+            yield mock
+
+    @pytest.mark.asyncio
+    async def test_top_up_fetches_current_and_spare(self, token_manager, mock_http_client, mock_settings):
+        """Test that the refresher warms both current and spare tokens."""
+        with patch.object(token_manager, '_http_client', mock_http_client):
+            await token_manager._top_up_tokens()
+
+        assert token_manager._current_token.token == "token_1"
+        assert token_manager._spare_token.token == "token_2"
+
+        metrics = token_manager.get_refresh_metrics()
+        assert metrics["refresh_count"] == 2
+        assert metrics["refresh_failures"] == 0
+        assert metrics["last_refresh_latency_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_fast_path_does_not_fetch(self, token_manager, mock_http_client, mock_settings):
+        """Test that a warm token is served without a REST call."""
+        with patch.object(token_manager, '_http_client', mock_http_client):
+            await token_manager._top_up_tokens()
+            token = await token_manager.get_websocket_token()
+
+        assert token == "token_1"
+        assert mock_http_client.post.call_count == 2
+        assert token_manager.get_refresh_metrics()["fast_path_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_spare_promoted_after_invalidation(self, token_manager, mock_http_client, mock_settings):
+        """Test that an invalidated token fails over to the warm spare."""
+        with patch.object(token_manager, '_http_client', mock_http_client):
+            await token_manager._top_up_tokens()
+            await token_manager.invalidate_token()
+            token = await token_manager.get_websocket_token()
+
+        assert token == "token_2"
+        assert mock_http_client.post.call_count == 2
+        assert token_manager._spare_token is None
+        assert token_manager.get_refresh_metrics()["spare_promotions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_ahead_of_expiry(self, token_manager, mock_http_client, mock_settings):
+        """Test that tokens inside the lead window are replaced."""
+        now = datetime.now()
+        token_manager._current_token = WebSocketToken(
+            token="aging_token",
+            created_at=now - timedelta(minutes=12),
+            expires_at=now + timedelta(minutes=3)
+        )
+        token_manager.keep_spare = False
+
+        with patch.object(token_manager, '_http_client', mock_http_client):
+            await token_manager._top_up_tokens()
+
+        assert token_manager._current_token.token == "token_1"
+
+    @pytest.mark.asyncio
+    async def test_failure_is_counted(self, token_manager, mock_settings):
+        """Test that failed refreshes are reported in metrics."""
+        mock_http_client = AsyncMock()
+        mock_http_client.post.side_effect = httpx.ConnectError("Connection failed")
+
+        with patch.object(token_manager, '_http_client', mock_http_client):
+            with pytest.raises(AuthenticationError):
+                await token_manager._top_up_tokens()
+
+        metrics = token_manager.get_refresh_metrics()
+        assert metrics["refresh_failures"] == 1
+        assert metrics["consecutive_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, token_manager, mock_http_client, mock_settings):
+        """Test starting and stopping the background task."""
+        with patch.object(token_manager, '_http_client', mock_http_client):
+            token_manager.start_background_refresh()
+            await asyncio.sleep(0.05)
+            assert token_manager.is_background_refresh_running
+            assert token_manager._current_token is not None
+
+            await token_manager.stop_background_refresh()
+            assert not token_manager.is_background_refresh_running
+
+
 class TestGlobalTokenManager:
     """Test global token manager functionality."""
 
@@ -0,0 +1,140 @@
+"""
+Unit tests for lazy components and background readiness probes in TradingSystemAdapter.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("mcp.server.fastmcp")
+pytest.importorskip("trading_systems")  # mcp_server.main imports the installed package
+
+from src.trading_systems.mcp_server.config import MCPPerformanceConfig, MCPServerConfig  # noqa: E402
+from src.trading_systems.mcp_server.trading_adapter import (  # noqa: E402
+    ReadinessState,
+    TradingSystemAdapter,
+)
+
+
+class StubRestClient:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    async def get_system_status(self):
+        await asyncio.sleep(self.delay)
+        return {"status": "online"}
+
+
+class StubAdapter(TradingSystemAdapter):
+    """Adapter whose builders return stubs instead of exchange clients."""
+
+    rest_delay = 0.0
+    websocket_build_seconds = 0.0
+
+    def _build_rest_client(self):
+        return StubRestClient(self.rest_delay)
+
+    def _build_websocket_client(self):
+        time.sleep(self.websocket_build_seconds)  # a slow import or constructor
+        return object()
+
+    def _build_account_manager(self):
+        return object()
+
+    def _build_order_manager(self):
+        return object()
+
+
+def make_adapter(deadline=1.0, rest_delay=0.0, websocket_build_seconds=0.0):
+    config = MCPServerConfig(
+        enable_real_trading=True,
+        performance=MCPPerformanceConfig(startup_probe_deadline_seconds=deadline)
+    )
+    adapter = StubAdapter(config)
+    adapter.rest_delay = rest_delay
+    adapter.websocket_build_seconds = websocket_build_seconds
+    return adapter
+
+
+class TestAdapterStartup:
+    """Test cases for non-blocking adapter startup."""
+
+    async def test_initialize_returns_immediately(self):
+        """Test that initialize does not wait for the probes."""
+        adapter = make_adapter(rest_delay=0.5)
+
+        started = time.perf_counter()
+        await adapter.initialize()
+
+        assert time.perf_counter() - started < 0.2
+        assert adapter.is_initialized
+        assert adapter.readiness == ReadinessState.STARTING
+        await adapter.shutdown()
+
+    async def test_wait_until_ready_resolves(self):
+        """Test that wait_until_ready returns once every probe passes."""
+        adapter = make_adapter()
+        await adapter.initialize()
+
+        assert await adapter.wait_until_ready(timeout=2.0)
+        assert adapter.readiness == ReadinessState.READY
+        readiness = adapter.get_readiness()
+        assert all(health["ok"] for health in readiness["components"].values())
+        assert readiness["initialized"] == ["account_manager", "order_manager", "rest_client", "websocket_client"]
+        await adapter.shutdown()
+
+    async def test_slow_probe_fails_at_deadline(self):
+        """Test that a probe still running at the deadline is marked failed."""
+        adapter = make_adapter(deadline=0.1, rest_delay=5.0)
+        await adapter.initialize()
+
+        started = time.perf_counter()
+        assert await adapter.wait_until_ready(timeout=2.0)
+
+        assert time.perf_counter() - started < 1.0
+        assert adapter.readiness == ReadinessState.DEGRADED
+        rest_health = adapter.component_health["rest_client"]
+        assert not rest_health["ok"]
+        assert "startup deadline" in rest_health["error"]
+        assert adapter.component_health["websocket_client"]["ok"]
+        await adapter.shutdown()
+
+    async def test_component_access_never_blocks_the_loop(self):
+        """Test that a build still running after its probe timed out does not block property reads."""
+        adapter = make_adapter(deadline=0.05, websocket_build_seconds=0.3)
+        await adapter.initialize()
+        assert await adapter.wait_until_ready(timeout=2.0)
+        assert adapter.readiness == ReadinessState.DEGRADED
+
+        started = time.perf_counter()
+        assert adapter.websocket_client is None
+        assert time.perf_counter() - started < 0.05
+
+        websocket_client = await adapter.get_component("websocket_client")
+        assert adapter.websocket_client is websocket_client
+        assert adapter.get_readiness()["initialized"] == [
+            "account_manager", "order_manager", "rest_client", "websocket_client"
+        ]
+        await adapter.shutdown()
+
+    async def test_property_starts_background_build(self):
+        """Test that reading an unbuilt component builds it off the loop."""
+        adapter = make_adapter()
+        assert adapter._ready_event is None
+
+        assert adapter.order_manager is None
+        assert await adapter.get_component("order_manager") is adapter.order_manager
+        assert adapter.has_component("account_manager")
+
+    async def test_shutdown_cancels_startup(self):
+        """Test that shutdown cancels probes still in progress."""
+        adapter = make_adapter(deadline=10.0, rest_delay=10.0)
+        await adapter.initialize()
+        await asyncio.sleep(0.05)
+
+        await adapter.shutdown()
+
+        assert adapter._startup_task.cancelled()
+        assert not adapter.is_initialized
+        assert adapter.readiness == ReadinessState.STARTING